@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Hesap-kanal geçmiş dizini
+account_channel_requests tablosunun bellek içi bit kümesi (bitmap) kopyası
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SESSION_SUFFIX = '.session'
+
+def account_key(account_name: str) -> str:
+    """Hesap adını '.session' uzantısından bağımsız hale getirir"""
+    if account_name.endswith(SESSION_SUFFIX):
+        return account_name[:-len(SESSION_SUFFIX)]
+    return account_name
+
+class AccountChannelIndex:
+    """Hangi hesabın hangi kanala istek attığını bit kümeleriyle tutar
+
+    Hesaplar ve kanallar sıralı tamsayı kimliklerine eşlenir. Her kanal için
+    hesap bit kümesi, her hesap için de kanal bit kümesi bir Python tamsayısında
+    saklanır; birleşim/fark gibi küme işlemleri tek tamsayı işlemidir. Hesap
+    adları '.session' uzantısı olsa da olmasa da aynı hesaba eşlenir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._account_ids: Dict[str, int] = {}
+        self._account_names: List[str] = []
+        self._channel_ids: Dict[str, int] = {}
+        self._channel_links: List[str] = []
+        self._channel_bits: List[int] = []
+        self._account_bits: List[int] = []
+
+    def _account_id(self, account_name: str) -> int:
+        key = account_key(account_name)
+        account_id = self._account_ids.get(key)
+        if account_id is None:
+            account_id = len(self._account_names)
+            self._account_ids[key] = account_id
+            self._account_names.append(key)
+            self._account_bits.append(0)
+        return account_id
+
+    def _channel_id(self, channel_link: str) -> int:
+        channel_id = self._channel_ids.get(channel_link)
+        if channel_id is None:
+            channel_id = len(self._channel_links)
+            self._channel_ids[channel_link] = channel_id
+            self._channel_links.append(channel_link)
+            self._channel_bits.append(0)
+        return channel_id
+
+    def load(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        """(hesap, kanal) çiftlerini toplu olarak dizine ekler; çift sayısını döndürür
+
+        Kanal kümeleri önce kimlik listelerinde biriktirilir, sonra bayt dizisi
+        üzerinden tek seferde tamsayıya çevrilir (her çift için büyük tamsayı
+        kopyalamaktan kaçınılır).
+        """
+        count = 0
+        with self._lock:
+            pending: Dict[int, List[int]] = {}
+            for account_name, channel_link in pairs:
+                account_id = self._account_id(account_name)
+                channel_id = self._channel_id(channel_link)
+                pending.setdefault(channel_id, []).append(account_id)
+                self._account_bits[account_id] |= 1 << channel_id
+                count += 1
+            for channel_id, account_ids in pending.items():
+                self._channel_bits[channel_id] |= self._ids_to_mask(account_ids)
+        return count
+
+    def _add(self, account_name: str, channel_link: str) -> None:
+        account_id = self._account_id(account_name)
+        channel_id = self._channel_id(channel_link)
+        self._channel_bits[channel_id] |= 1 << account_id
+        self._account_bits[account_id] |= 1 << channel_id
+
+    def add(self, account_name: str, channel_link: str) -> None:
+        with self._lock:
+            self._add(account_name, channel_link)
+
+    def discard_account(self, account_name: str) -> None:
+        """Hesabın tüm kanal geçmişini dizinden siler"""
+        with self._lock:
+            account_id = self._account_ids.get(account_key(account_name))
+            if account_id is None:
+                return
+            channels = self._account_bits[account_id]
+            self._account_bits[account_id] = 0
+            mask = ~(1 << account_id)
+            for channel_id in self._bit_positions(channels):
+                self._channel_bits[channel_id] &= mask
+
+    def contains(self, account_name: str, channel_link: str) -> bool:
+        account_id = self._account_ids.get(account_key(account_name))
+        channel_id = self._channel_ids.get(channel_link)
+        if account_id is None or channel_id is None:
+            return False
+        # Hesabın kanal kümesi küçüktür; kanalın büyük hesap kümesini kaydırmaktan ucuzdur
+        return bool(self._account_bits[account_id] >> channel_id & 1)
+
+    def mask_for(self, account_names: Iterable[str]) -> int:
+        """Hesap listesinin bit kümesi (tekrar tekrar kullanılacak aday kümeleri için)"""
+        with self._lock:
+            return self._ids_to_mask([self._account_id(name) for name in account_names])
+
+    def channel_mask(self, channel_link: str) -> int:
+        """Kanala istek atmış hesapların bit kümesi"""
+        channel_id = self._channel_ids.get(channel_link)
+        return self._channel_bits[channel_id] if channel_id is not None else 0
+
+    def available_mask(self, channel_link: str, candidate_mask: int) -> int:
+        """Aday kümesinden kanala istek atmamış olanlar (tek tamsayı işlemi)"""
+        return candidate_mask & ~self.channel_mask(channel_link)
+
+    def names_for(self, mask: int) -> List[str]:
+        """Bit kümesindeki hesap adlarını (uzantısız) döndürür"""
+        return [self._account_names[account_id] for account_id in self._bit_positions(mask)]
+
+    def available(self, channel_link: str, account_names: List[str]) -> List[str]:
+        """Kanala daha önce istek atmamış hesapları, verilen sırayla döndürür"""
+        channel_id = self._channel_ids.get(channel_link)
+        if channel_id is None or not self._channel_bits[channel_id]:
+            return list(account_names)
+        ids = self._account_ids
+        account_bits = self._account_bits
+        return [name for name in account_names
+                if (account_id := ids.get(account_key(name))) is None
+                or not account_bits[account_id] >> channel_id & 1]
+
+    def channels_for_account(self, account_name: str) -> List[str]:
+        """Hesabın istek attığı kanallar"""
+        account_id = self._account_ids.get(account_key(account_name))
+        if account_id is None:
+            return []
+        return [self._channel_links[channel_id] for channel_id in self._bit_positions(self._account_bits[account_id])]
+
+    def channel_count(self, channel_link: str) -> int:
+        """Kanala istek atmış hesap sayısı"""
+        return self.channel_mask(channel_link).bit_count()
+
+    @staticmethod
+    def _ids_to_mask(ids: List[int]) -> int:
+        if not ids:
+            return 0
+        buffer = bytearray(max(ids) // 8 + 1)
+        for bit in ids:
+            buffer[bit >> 3] |= 1 << (bit & 7)
+        return int.from_bytes(buffer, 'little')
+
+    @staticmethod
+    def _bit_positions(mask: int) -> List[int]:
+        bits = bin(mask)[:1:-1]
+        positions = []
+        index = bits.find('1')
+        while index != -1:
+            positions.append(index)
+            index = bits.find('1', index + 1)
+        return positions
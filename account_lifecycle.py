@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Hesap yaşam döngüsü
+Frozen veya geçersiz çıkan hesabı tek işlemde karantinaya alır: havuzdaki
+client'ı kapatır, session dosyalarını iş parçacığında taşır, bekleyen
+isteklerini sağlıklı hesaplara devreder ve hesabı veritabanından/dizinden siler
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+from database import db_manager
+from session_manager import session_manager
+from join_result import JoinErrorCode
+from metrics import ACCOUNT_QUARANTINES
+
+logger = logging.getLogger(__name__)
+
+# Karantina nedeni -> Sessions altındaki klasör
+QUARANTINE_FOLDERS = {
+    JoinErrorCode.ACCOUNT_FROZEN: "Frozens",
+    JoinErrorCode.ACCOUNT_INVALID: "Invalid",
+}
+
+# Session ile birlikte taşınan yan dosyalar
+SESSION_SIDE_SUFFIXES = ('-journal', '-wal', '-shm')
+
+def move_session_files(sessions_dir: str, session_file: str, folder: str) -> bool:
+    """Session dosyasını (ve yan dosyalarını) ``sessions_dir/folder`` altına taşır.
+
+    Aynı dosya sistemi içinde ``os.replace`` atomiktir ve hedefte aynı adlı
+    dosya varsa üzerine yazar. Ana dosya taşındıysa True döndürür.
+    """
+    target_dir = os.path.join(sessions_dir, folder)
+    os.makedirs(target_dir, exist_ok=True)
+    moved = False
+    for suffix in ('',) + SESSION_SIDE_SUFFIXES:
+        src_path = os.path.join(sessions_dir, session_file + suffix)
+        if not os.path.exists(src_path):
+            continue
+        try:
+            os.replace(src_path, os.path.join(target_dir, session_file + suffix))
+            moved = moved or not suffix
+        except Exception as e:
+            logger.error(f"Session taşınamadı ({session_file + suffix}): {e}")
+    return moved
+
+class AccountLifecycle:
+    """Hesap karantinası
+
+    ``clients`` ve ``proxy_cache`` TelethonManager'ın sözlükleridir; karantinadaki
+    hesabın kayıtları buradan silinir. ``proxy_source`` güncel proxy listesini
+    döndürür; devredilen isteklere devralan hesabın kendi proxy'si bu listeden
+    atanır. Dosya ve veritabanı işleri
+    ``asyncio.to_thread`` ile yürütülür, olay döngüsü bloklanmaz. Aynı hesap için
+    ikinci çağrı yalnızca verilen isteği devreder.
+    """
+
+    def __init__(self, clients: Dict, sessions_dir: str = "Sessions", proxy_cache: Optional[Dict] = None,
+                 proxy_source: Optional[Callable[[], List[str]]] = None):
+        self.clients = clients
+        self.sessions_dir = sessions_dir
+        self.proxy_cache = proxy_cache if proxy_cache is not None else {}
+        self.proxy_source = proxy_source or list
+        self._lock = threading.Lock()
+        self._quarantined: Dict[str, str] = {}
+
+    def is_quarantined(self, account_name: str) -> bool:
+        """Hesap karantinada mı (session dosyası geri konduysa artık değil)"""
+        with self._lock:
+            if account_name not in self._quarantined:
+                return False
+            if os.path.exists(os.path.join(self.sessions_dir, account_name)):
+                # Session yeniden içe aktarılmış
+                del self._quarantined[account_name]
+                return False
+            return True
+
+    async def quarantine(self, account_name: str, code: JoinErrorCode, client=None,
+                         request_id: int = None) -> List[int]:
+        """Hesabı karantinaya alır; başka hesaplara devredilen istek kimliklerini döndürür.
+
+        ``request_id`` yürütücünün elindeki isteğidir; o da devredilmeye çalışılır.
+        """
+        folder = QUARANTINE_FOLDERS.get(code, "Invalid")
+        with self._lock:
+            first = account_name not in self._quarantined
+            self._quarantined[account_name] = folder
+
+        if first:
+            logger.warning(f"🧊 Hesap karantinaya alınıyor ({code.name}): {account_name} -> {folder}/")
+            ACCOUNT_QUARANTINES.inc(reason=folder)
+            client = self.clients.pop(account_name, None) or client
+            self.proxy_cache.pop(account_name, None)
+            if client is not None:
+                try:
+                    await client.disconnect()
+                except Exception:
+                    pass
+            if await asyncio.to_thread(move_session_files, self.sessions_dir, account_name, folder):
+                logger.info(f"📁 Session taşındı: {account_name} -> {folder}/")
+
+        reassigned = await asyncio.to_thread(self._reassign, account_name, request_id)
+        if first:
+            await asyncio.to_thread(db_manager.purge_account, account_name)
+        return reassigned
+
+    def _reassign(self, account_name: str, request_id: Optional[int]) -> List[int]:
+        with self._lock:
+            quarantined = set(self._quarantined)
+        healthy = [name for name in session_manager.get_session_files() if name not in quarantined]
+        return db_manager.reassign_account_requests(account_name, healthy, request_id, self.proxy_source())
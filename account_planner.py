@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Hesap planlayıcı
+Bir kanalın istekleri için hesapları, hesapların diğer kanallardaki yükünü,
+günlük/saatlik sınırlarını ve son sağlık durumunu dikkate alarak seçer
+"""
+
+import heapq
+import random
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def account_health(attempts: int, successes: int) -> float:
+    """Son 24 saatteki başarı oranı (Laplace düzeltmeli, hiç deneme yoksa 1)"""
+    if not attempts:
+        return 1.0
+    return (successes + 1) / (attempts + 1)
+
+def effective_account_spacing(min_interval: float, hourly_cap: int) -> float:
+    """Saatlik sınırı hesap başına en kısa aralığa çevirir (zamanlayıcı bu aralığı uygular)"""
+    if hourly_cap > 0:
+        return max(min_interval, 3600 / hourly_cap)
+    return min_interval
+
+def select_accounts(candidates: List[str], count: int,
+                    load: Optional[Dict[str, Dict]] = None,
+                    daily_cap: int = 0,
+                    rng: Optional[random.Random] = None) -> List[str]:
+    """Kanalın ``count`` isteği için birbirinden farklı hesaplar seçer.
+
+    ``load``: hesap -> {'pending': bekleyen istek, 'used_24h': son 24 saatte biten,
+    'health': 0-1}. Günlük sınıra (bekleyen + son 24 saat) ulaşmış hesaplar elenir;
+    kalanlar önce en az yüklü, eşitlikte en sağlıklı olana göre seçilir. Eşit
+    hesaplar arasında rastgele seçilir. Aynı hesap bir kanala iki kez atanmaz.
+    """
+    rng = rng or random.Random()
+    load = load or {}
+    empty = {'pending': 0, 'used_24h': 0, 'health': 1.0}
+
+    ranked = []
+    capped = 0
+    for account in dict.fromkeys(candidates):
+        stats = load.get(account, empty)
+        used = stats['pending'] + stats['used_24h']
+        if daily_cap and used >= daily_cap:
+            capped += 1
+            continue
+        ranked.append((stats['pending'], -round(stats['health'], 2), rng.random(), account))
+
+    # Küçük seçimlerde kısmi yığın, büyük seçimlerde tam sıralama daha hızlıdır
+    best = heapq.nsmallest(count, ranked) if count * 8 < len(ranked) else sorted(ranked)[:count]
+    selected = [item[-1] for item in best]
+    if len(selected) < count:
+        logger.warning("⚠️ %d istek için yalnızca %d uygun hesap var (%d hesap günlük sınırda)",
+                       count, len(selected), capped)
+    return selected
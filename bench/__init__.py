@@ -0,0 +1,4 @@
+"""
+Performans ölçüm betikleri
+Depo kökünden modül olarak çalıştırılır: python -m bench.<betik>
+"""
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Callback yönlendirici mikro benchmark'ı
+Eski if/elif zinciri ile CallbackRouter çözümleme süresini karşılaştırır
+
+Kullanım:
+    python -m bench.bench_callback_router [tekrar_sayısı]
+"""
+
+import sys
+import json
+import time
+from callback_router import CallbackRouter
+
+# button_callback içindeki eski zincirin sırası: (tür, değer)
+LEGACY_CHAIN = [
+    ('eq', 'main_menu'), ('eq', 'go_back'), ('eq', 'count_sessions'), ('eq', 'list_sessions'),
+    ('eq', 'list_frozen'), ('eq', 'upload_sessions'), ('eq', 'confirm_delete_sessions'),
+    ('eq', 'delete_sessions'), ('eq', 'confirm_delete_frozens'), ('eq', 'delete_frozens'),
+    ('eq', 'proxy_menu'), ('prefix', 'proxy_list_'), ('eq', 'proxy_upload'), ('eq', 'proxy_delete_mode'),
+    ('prefix', 'session_list_'), ('prefix', 'frozen_list_'), ('eq', 'help_info'), ('eq', 'admin_panel'),
+    ('eq', 'admin_management'), ('eq', 'add_admin'), ('eq', 'remove_admin'), ('eq', 'show_logs'),
+    ('eq', 'refresh_sessions'), ('eq', 'add_channel'), ('eq', 'my_channels'), ('eq', 'global_pool'),
+    ('eq', 'start_requests'), ('eq', 'cancel_channel'), ('eq', 'repeat_yes'), ('eq', 'repeat_no'),
+    ('prefix', 'channel_'), ('eq', 'clear_chat'), ('eq', 'admin_list_sessions'), ('eq', 'list_invalid'),
+    ('prefix', 'admin_session_list_'), ('prefix', 'invalid_list_'), ('eq', 'download_active_sessions'),
+    ('eq', 'download_frozen_sessions'), ('eq', 'download_invalid_sessions'),
+]
+
+SAMPLE_DATA = [
+    'main_menu', 'count_sessions', 'proxy_list_3', 'session_list_12', 'admin_session_list_4',
+    'channel_confirm_delete_42', 'channel_planned_42', 'download_invalid_sessions', 'invalid_list_2',
+    'repeat_no', 'show_logs',
+]
+
+def legacy_resolve(data: str):
+    """Eski zincirin davranışını taklit eder (ilk eşleşen dal kazanır)"""
+    for kind, value in LEGACY_CHAIN:
+        if kind == 'eq':
+            if data == value:
+                return value
+        elif data.startswith(value):
+            if value == 'channel_':
+                # handle_channel_action içindeki ikinci ayrıştırma
+                parts = data.split('_')
+                return value, parts[1:-1], int(parts[-1])
+            return value, int(data.split('_')[-1])
+    return None
+
+def build_router() -> CallbackRouter:
+    """Botun desenleriyle aynı yönlendiriciyi kurar"""
+    router = CallbackRouter()
+
+    def noop(*args, **kwargs):
+        return None
+
+    for kind, value in LEGACY_CHAIN:
+        if kind == 'eq':
+            router.add_route(value, noop)
+        elif value != 'channel_':
+            router.add_route(f"{value}{{page:int}}", noop)
+    for action in ('start', 'pause', 'delete', 'confirm_delete', 'refresh', 'planned'):
+        router.add_route(f"channel_{action}_{{channel_id:int}}", noop, action_type=action)
+    return router
+
+def time_it(func, iterations: int) -> float:
+    """Örnek veriler üzerinde ortalama çağrı süresini (ns) döndürür"""
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        for data in SAMPLE_DATA:
+            func(data)
+    elapsed = time.perf_counter_ns() - start
+    return elapsed / (iterations * len(SAMPLE_DATA))
+
+def main(iterations: int = 20000) -> dict:
+    router = build_router()
+    # Her örnek iki yolda da çözülmeli
+    for data in SAMPLE_DATA:
+        assert legacy_resolve(data) is not None and router.resolve(data) is not None, data
+
+    results = {
+        'iterations': iterations,
+        'samples': len(SAMPLE_DATA),
+        'legacy_ns_per_call': round(time_it(legacy_resolve, iterations), 1),
+        'router_ns_per_call': round(time_it(router.resolve, iterations), 1),
+    }
+    results['speedup'] = round(results['legacy_ns_per_call'] / results['router_ns_per_call'], 2)
+    return results
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(json.dumps(main(count), indent=2))
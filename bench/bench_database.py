@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+DatabaseManager mikro benchmark'ı ve yük üreticisi
+Geçici (veya --db ile verilen) bir telegram_bot.db dosyasını gerçekçi hacimlerle doldurur:
+100 kanal, 1M request_pool, 500k account_channel_requests, 50k accounts satırı
+(--scale ile oranlanır). Ardından her public DatabaseManager metodunu
+
+- tek thread'de (metot başına ops/sn, p50/p99),
+- eşzamanlı olarak bot thread'i + işleyici thread'i ile (thread ve metot başına ops/sn)
+
+ölçer. SQLite kilit çekişmesi iki şekilde sayılır: "database is locked" hataları
+(metotlar hatayı loglayıp varsayılan döndürdüğü için log kayıtlarından) ve kilit
+beklemesi sayılan yavaş çağrılar (eşzamanlı süre > tek thread p50 x 5 ve > 20 ms).
+
+Sonuç JSON'dur; --save-baseline ile saklanır, --baseline ile karşılaştırılır.
+
+Kullanım:
+    python -m bench.bench_database --scale 0.05
+    python -m bench.bench_database --db /tmp/bench.db --save-baseline bench_db_baseline.json
+    python -m bench.bench_database --db /tmp/bench.db --reuse --baseline bench_db_baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import sqlite3
+import argparse
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+CHANNELS = 100
+REQUEST_POOL_ROWS = 1_000_000
+ACCOUNT_CHANNEL_ROWS = 500_000
+ACCOUNTS = 50_000
+PENDING_RATIO = 0.25
+
+# Eşzamanlı ölçümde kilit beklemesi sayılacak en küçük süre
+LOCK_WAIT_MIN_SECONDS = 0.02
+LOCK_WAIT_FACTOR = 5
+
+class LockErrorCounter(logging.Handler):
+    """database logger'ına düşen 'database is locked' kayıtlarını sayar"""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.count = 0
+        self._lock_counter = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if 'locked' in record.getMessage():
+            with self._lock_counter:
+                self.count += 1
+
+def seed_database(db: 'DatabaseManager', scale: float, seed: int = 1) -> Dict[str, int]:
+    """Tabloları ölçeklenmiş gerçekçi hacimlerle doldurur"""
+    rng = random.Random(seed)
+    channels = CHANNELS
+    accounts = max(10, int(ACCOUNTS * scale))
+    pool_rows = max(100, int(REQUEST_POOL_ROWS * scale))
+    history_rows = min(max(100, int(ACCOUNT_CHANNEL_ROWS * scale)), accounts * channels)
+    now = datetime.now()
+
+    with sqlite3.connect(db.db_path) as conn:
+        conn.executemany('''
+            INSERT INTO channels (channel_link, total_requests, duration_minutes, user_id, allow_repeat)
+            VALUES (?, ?, ?, ?, ?)
+        ''', ((f"@bench_channel_{c}", pool_rows // channels, 600, str(1000 + c % 10), c % 3 != 0)
+              for c in range(channels)))
+        channel_ids = [row[0] for row in conn.execute('SELECT id FROM channels ORDER BY id')]
+
+        conn.executemany('''
+            INSERT INTO accounts (session_file, proxy_address, proxy_type, last_used)
+            VALUES (?, ?, 'socks5', ?)
+        ''', ((f"bench{a}.session", f"10.{a // 65536 % 256}.{a // 256 % 256}.{a % 256}:1080",
+               now - timedelta(minutes=a % 1440)) for a in range(accounts)))
+
+        def pool_rows_gen():
+            for i in range(pool_rows):
+                account = f"bench{rng.randrange(accounts)}.session"
+                channel_id = channel_ids[i % channels]
+                if rng.random() < PENDING_RATIO:
+                    scheduled = now + timedelta(seconds=rng.randrange(1, 86400 * 7))
+                    yield (channel_id, account, scheduled, 'Bekliyor', None, None, None, 0, None)
+                else:
+                    scheduled = now - timedelta(seconds=rng.randrange(1, 86400 * 30))
+                    started = scheduled + timedelta(seconds=rng.expovariate(1 / 5.0))
+                    failed = rng.random() < 0.1
+                    yield (channel_id, account, scheduled, 'Atlandı' if failed else 'Gönderildi',
+                           scheduled, started, started + timedelta(seconds=rng.uniform(0.5, 3)),
+                           1, rng.choice((1, 2, 4)) if failed else None)
+
+        conn.executemany('''
+            INSERT INTO request_pool (channel_id, account_name, scheduled_time, status,
+                                      claimed_at, started_at, finished_at, attempts, error_code)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', pool_rows_gen())
+
+        per_account = max(1, history_rows // accounts)
+        def history_gen():
+            produced = 0
+            for a in range(accounts):
+                for c in rng.sample(range(channels), min(per_account, channels)):
+                    if produced >= history_rows:
+                        return
+                    produced += 1
+                    yield (f"bench{a}.session", f"@bench_channel_{c}", rng.randint(1, 3))
+
+        conn.executemany('''
+            INSERT OR IGNORE INTO account_channel_requests (account_name, channel_link, request_count)
+            VALUES (?, ?, ?)
+        ''', history_gen())
+        conn.commit()
+
+        counts = {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                  for table in ('channels', 'request_pool', 'account_channel_requests', 'accounts')}
+    return counts
+
+class BenchContext:
+    """Benchmark durumunu ve rastgele girdileri tutar"""
+
+    def __init__(self, db: 'DatabaseManager', seed: int = 1):
+        self.db = db
+        self.rng = random.Random(seed)
+        with sqlite3.connect(db.db_path) as conn:
+            self.channel_ids = [row[0] for row in conn.execute('SELECT id FROM channels ORDER BY id')]
+            self.channel_links = [row[0] for row in conn.execute('SELECT channel_link FROM channels ORDER BY id')]
+            self.max_request_id = conn.execute('SELECT MAX(id) FROM request_pool').fetchone()[0] or 1
+            self.accounts = conn.execute('SELECT COUNT(*) FROM accounts').fetchone()[0] or 1
+        self.session_files = [f"bench{i}.session" for i in range(min(self.accounts, 200))]
+        self.proxies = [f"10.0.{i // 256}.{i % 256}:1080" for i in range(50)]
+        self._serial = 0
+        self._serial_lock = threading.Lock()
+
+    def next_serial(self) -> int:
+        with self._serial_lock:
+            self._serial += 1
+            return self._serial
+
+    def channel_id(self) -> int:
+        return self.rng.choice(self.channel_ids)
+
+    def channel_link(self) -> str:
+        return self.rng.choice(self.channel_links)
+
+    def request_id(self) -> int:
+        return self.rng.randint(1, self.max_request_id)
+
+    def account(self) -> str:
+        return f"bench{self.rng.randrange(self.accounts)}.session"
+
+    def user_id(self) -> str:
+        return str(5000 + self.rng.randrange(1000))
+
+def build_cases(ctx: BenchContext) -> Dict[str, Callable[[], object]]:
+    """Public DatabaseManager metotları için çağrı üreticileri"""
+    db = ctx.db
+    return {
+        'init_database': lambda: db.init_database(),
+        'add_missing_columns': lambda: db.add_missing_columns(),
+        'purge_account': lambda: db.purge_account(f"purge{ctx.next_serial()}.session"),
+        'add_admin': lambda: db.add_admin(f"admin{ctx.next_serial()}", "bench", "Bench", "1"),
+        'remove_admin': lambda: db.remove_admin(f"admin{ctx.rng.randint(1, max(1, ctx._serial))}"),
+        'get_all_admins': lambda: db.get_all_admins(),
+        'is_admin_db': lambda: db.is_admin_db(ctx.user_id()),
+        'add_channel': lambda: db.add_channel(f"@bench_new_{ctx.next_serial()}", 10, 60, ctx.user_id()),
+        'get_channel': lambda: db.get_channel(ctx.channel_id()),
+        'get_user_channels': lambda: db.get_user_channels(str(1000 + ctx.rng.randrange(10))),
+        'create_request_pool': lambda: db.create_request_pool(ctx.channel_id(), ctx.session_files[:5], ctx.proxies),
+        'get_next_available_time': lambda: db.get_next_available_time(),
+        'distribute_proxies': lambda: db.distribute_proxies(ctx.session_files, ctx.proxies),
+        'get_pending_requests': lambda: db.get_pending_requests(1),
+        'update_request_status': lambda: db.update_request_status(ctx.request_id(), 'Gönderildi'),
+        'mark_request_claimed': lambda: db.mark_request_claimed(ctx.request_id()),
+        'mark_request_started': lambda: db.mark_request_started(ctx.request_id()),
+        'get_lateness_report': lambda: db.get_lateness_report(ctx.channel_id()),
+        'set_user_state': lambda: db.set_user_state(ctx.user_id(), 'waiting_request_count', {'channel_link': '@x'}),
+        'get_user_state': lambda: db.get_user_state(ctx.user_id()),
+        'clear_user_state': lambda: db.clear_user_state(ctx.user_id()),
+        'get_all_user_states': lambda: db.get_all_user_states(),
+        'save_user_states': lambda: db.save_user_states({ctx.user_id(): ('waiting_duration', {'n': 1}),
+                                                         ctx.user_id(): None}),
+        'get_request_stats': lambda: db.get_request_stats(ctx.channel_id()),
+        'get_pool_status_counts': lambda: db.get_pool_status_counts(),
+        'get_planned_requests': lambda: db.get_planned_requests(ctx.channel_id(), 10),
+        'update_request_proxy': lambda: db.update_request_proxy(ctx.request_id(), ctx.rng.choice(ctx.proxies)),
+        'get_global_planned_requests': lambda: db.get_global_planned_requests(30),
+        'record_account_channel_request': lambda: db.record_account_channel_request(ctx.account(), ctx.channel_link()),
+        'get_account_channel_requests': lambda: db.get_account_channel_requests(ctx.account(), ctx.channel_link()),
+        'get_available_accounts_for_channel': lambda: db.get_available_accounts_for_channel(
+            ctx.channel_link(), False, ctx.session_files),
+        'get_session_stats': lambda: db.get_session_stats(),
+        'get_global_start_time': lambda: db.get_global_start_time(),
+        'generate_global_random_times': lambda: db.generate_global_random_times(3, 3600),
+        'get_all_scheduled_times': lambda: db.get_all_scheduled_times(),
+        'find_random_time_slot': lambda: db.find_random_time_slot(
+            sorted(ctx.rng.sample(range(86400), 500)), 86400),
+    }
+
+# Bot thread'inin ve işleyici thread'inin eşzamanlı yükü (gerçek çağrı desenlerine göre)
+BOT_WORKLOAD = ('get_user_channels', 'get_request_stats', 'get_user_state', 'set_user_state',
+                'get_global_planned_requests', 'get_pool_status_counts', 'is_admin_db', 'get_channel')
+PROCESSOR_WORKLOAD = ('get_pending_requests', 'mark_request_claimed', 'mark_request_started',
+                      'update_request_status', 'record_account_channel_request')
+
+def public_methods(cls) -> List[str]:
+    return sorted(name for name in dir(cls)
+                  if not name.startswith('_') and callable(getattr(cls, name)))
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def bench_single(cases: Dict[str, Callable], iterations: int, max_seconds: float) -> Dict[str, Dict]:
+    """Her metodu tek thread'de, yineleme veya süre sınırı dolana kadar çalıştırır"""
+    results = {}
+    for name, call in cases.items():
+        durations = []
+        deadline = time.perf_counter() + max_seconds
+        for _ in range(iterations):
+            started = time.perf_counter()
+            call()
+            durations.append(time.perf_counter() - started)
+            if time.perf_counter() > deadline:
+                break
+        total = sum(durations)
+        results[name] = {
+            'calls': len(durations),
+            'ops_per_second': round(len(durations) / total, 1) if total else 0.0,
+            'p50_ms': round(_percentile(durations, 0.50) * 1000, 3),
+            'p99_ms': round(_percentile(durations, 0.99) * 1000, 3),
+        }
+    return results
+
+def bench_concurrent(cases: Dict[str, Callable], duration: float, single: Dict[str, Dict],
+                     lock_counter: LockErrorCounter) -> Dict:
+    """Bot thread'i ve işleyici thread'i aynı veritabanına aynı anda yük bindirir"""
+    stop = threading.Event()
+    per_thread: Dict[str, Dict[str, List[float]]] = {'bot': {}, 'processor': {}}
+    errors_before = lock_counter.count
+
+    def worker(thread_name: str, workload) -> None:
+        timings = per_thread[thread_name]
+        i = 0
+        while not stop.is_set():
+            name = workload[i % len(workload)]
+            started = time.perf_counter()
+            cases[name]()
+            timings.setdefault(name, []).append(time.perf_counter() - started)
+            i += 1
+
+    threads = [threading.Thread(target=worker, args=('bot', BOT_WORKLOAD), daemon=True),
+               threading.Thread(target=worker, args=('processor', PROCESSOR_WORKLOAD), daemon=True)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    result = {'duration_seconds': duration, 'threads': {}, 'methods': {}}
+    lock_waits = 0
+    for thread_name, timings in per_thread.items():
+        calls = sum(len(values) for values in timings.values())
+        result['threads'][thread_name] = {'calls': calls, 'ops_per_second': round(calls / duration, 1)}
+        for name, values in timings.items():
+            baseline_p50 = single.get(name, {}).get('p50_ms', 0) / 1000
+            threshold = max(LOCK_WAIT_MIN_SECONDS, baseline_p50 * LOCK_WAIT_FACTOR)
+            waits = sum(1 for value in values if value > threshold)
+            lock_waits += waits
+            result['methods'][name] = {
+                'calls': len(values),
+                'ops_per_second': round(len(values) / duration, 1),
+                'p50_ms': round(_percentile(values, 0.50) * 1000, 3),
+                'p99_ms': round(_percentile(values, 0.99) * 1000, 3),
+                'lock_waits': waits,
+            }
+    result['lock_waits'] = lock_waits
+    result['lock_errors'] = lock_counter.count - errors_before
+    return result
+
+def diff_against_baseline(result: Dict, baseline: Dict, tolerance: float) -> Dict:
+    """ops/sn değerlerini saklanan sonuçla karşılaştırır; tolerans üstü düşüşler gerileme sayılır"""
+    diff = {'single': {}, 'concurrent': {}, 'regressions': []}
+    for section in ('single', 'concurrent'):
+        current = result[section] if section == 'single' else result[section]['methods']
+        previous = baseline.get(section, {})
+        if section == 'concurrent':
+            previous = previous.get('methods', {})
+        for name, stats in current.items():
+            old = previous.get(name, {}).get('ops_per_second')
+            if not old:
+                continue
+            change = (stats['ops_per_second'] - old) / old
+            diff[section][name] = {'baseline': old, 'current': stats['ops_per_second'],
+                                   'change_pct': round(change * 100, 1)}
+            if change < -tolerance:
+                diff['regressions'].append(f"{section}.{name}")
+    if 'concurrent' in baseline:
+        diff['lock_waits'] = {'baseline': baseline['concurrent'].get('lock_waits'),
+                              'current': result['concurrent']['lock_waits']}
+    return diff
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="DatabaseManager mikro benchmark'ı")
+    parser.add_argument('--db', help="Veritabanı dosyası (varsayılan geçici klasör)")
+    parser.add_argument('--reuse', action='store_true', help="--db zaten doldurulmuşsa yeniden doldurma")
+    parser.add_argument('--scale', type=float, default=1.0, help="Satır hacmi çarpanı (1.0 = 1M request_pool)")
+    parser.add_argument('--iterations', type=int, default=200, help="Tek thread'de metot başına azami çağrı")
+    parser.add_argument('--method-seconds', type=float, default=2.0, help="Tek thread'de metot başına azami süre")
+    parser.add_argument('--concurrent-seconds', type=float, default=10.0, help="Eşzamanlı ölçüm süresi")
+    parser.add_argument('--methods', help="Yalnızca bu metotlar (virgülle ayrılmış)")
+    parser.add_argument('--baseline', help="Karşılaştırılacak önceki sonuç JSON'u")
+    parser.add_argument('--save-baseline', help="Sonucu bu dosyaya kaydet")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Gerileme sayılacak ops/sn düşüş oranı")
+    parser.add_argument('--seed', type=int, default=1, help="Rastgelelik tohumu")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.CRITICAL)
+    workdir = tempfile.mkdtemp(prefix="bench_database_")
+    # get_session_stats gibi metotlar çalışma klasörüne göre dosya okur
+    db_path = os.path.abspath(args.db) if args.db else os.path.join(workdir, 'telegram_bot.db')
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    save_path = os.path.abspath(args.save_baseline) if args.save_baseline else None
+    os.chdir(workdir)
+    # database modülü içe aktarılırken global db_manager çalışma klasöründe oluşturulur
+    from database import DatabaseManager
+
+    seeded = args.reuse and os.path.exists(db_path)
+    db = DatabaseManager(db_path)
+    started = time.perf_counter()
+    if seeded:
+        with sqlite3.connect(db_path) as conn:
+            counts = {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                      for table in ('channels', 'request_pool', 'account_channel_requests', 'accounts')}
+    else:
+        counts = seed_database(db, args.scale, args.seed)
+    seed_seconds = time.perf_counter() - started
+
+    lock_counter = LockErrorCounter()
+    logging.getLogger('database').addHandler(lock_counter)
+
+    ctx = BenchContext(db, args.seed)
+    cases = build_cases(ctx)
+    if args.methods:
+        wanted = set(args.methods.split(','))
+        cases = {name: call for name, call in cases.items() if name in wanted}
+
+    single = bench_single(cases, args.iterations, args.method_seconds)
+    all_cases = build_cases(ctx)
+    concurrent = bench_concurrent(all_cases, args.concurrent_seconds, single, lock_counter)
+
+    result = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'rows': counts,
+        'seed_seconds': round(seed_seconds, 2),
+        'db_size_mb': round(os.path.getsize(db_path) / (1024 * 1024), 1),
+        'uncovered_methods': [name for name in public_methods(DatabaseManager) if name not in all_cases],
+        'single': single,
+        'concurrent': concurrent,
+    }
+    exit_code = 0
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            result['baseline_diff'] = diff_against_baseline(result, json.load(f), args.tolerance)
+        exit_code = 1 if result['baseline_diff']['regressions'] else 0
+    if save_path:
+        with open(save_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Log yükü benchmark'ı
+Bir isteğin işlenmesi sırasında üretilen logları eski (her adım INFO + f-string)
+ve yeni (tek INFO satırı, DEBUG adımlar lazy %, örnekleme, maskeleme) biçimde
+üretir; 10 bin istek başına harcanan süreyi ve yazılan bayt miktarını karşılaştırır.
+
+Kullanım:
+    python -m bench.bench_logging [istek_sayısı]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+from log_manager import LOG_FORMAT, JsonFormatter, RedactingFilter, SamplingFilter
+
+PROXY = {'host': '10.0.0.1', 'port': 1080, 'username': 'user1', 'password': 'secret', 'type': 'socks5'}
+PROXY_ADDRESS = "user1:secret@10.0.0.1:1080"
+
+def legacy_request(log: logging.Logger, i: int) -> None:
+    """Eski kod yolunun istek başına ürettiği log çağrıları"""
+    account = f"acc{i % 500}.session"
+    channel = "https://t.me/+abcdef"
+    log.info(f"📋 1 bekleyen istek işlenecek (sıralı)")
+    log.info(f"📝 İstek işleniyor: {account} -> {channel} (Zaman: 2024-01-01 00:00:00)")
+    log.info(f"🚀 İstek işleniyor: ID={i}, Hesap={account}, Kanal={channel}")
+    log.info(f"📱 Yeni client oluşturuluyor: {account}")
+    log.info(f"🔄 Proxy SOCKS5 olarak ayarlandı: {PROXY['host']}:{PROXY['port']}")
+    log.info(f"🔍 Parse Debug: '{PROXY_ADDRESS}' -> {PROXY}")
+    log.info(f"🌐 İlk proxy kullanılıyor: {PROXY_ADDRESS}")
+    log.info(f"🔍 Proxy Debug: {PROXY}")
+    log.info(f"🌐 SOCKS5 Proxy kullanılıyor: {PROXY['host']}:{PROXY['port']}")
+    log.info(f"Client oluşturuldu: {account}")
+    log.info(f"✅ İlk proxy başarılı, cache'e kaydedildi: {account}")
+    log.info(f"✅ Client başarıyla oluşturuldu: {account}")
+    log.info(f"📤 Katılım isteği gönderiliyor: {account} -> {channel}")
+    log.info(f"🔗 Gizli kanala katılım isteği gönderiliyor: {channel} (Hash: abcdef)")
+    log.info(f"✅ Gizli kanala katılım isteği başarılı: {channel}")
+    log.info(f"✅ İstek başarılı: {account} -> {channel}")
+    log.info(f"⏳ Minimum 5 saniye bekleme...")
+    log.info(f"📊 İstek sonuçları: 1 başarılı, 0 başarısız")
+    log.info(f"🔗 Proxy atandı: {account} -> {PROXY_ADDRESS}")
+
+def current_request(log: logging.Logger, i: int) -> None:
+    """Yeni kod yolunun istek başına ürettiği log çağrıları"""
+    account = f"acc{i % 500}.session"
+    channel = "https://t.me/+abcdef"
+    log.debug("📋 %d bekleyen istek işlenecek (sıralı)", 1)
+    log.debug("📝 İstek işleniyor: %s -> %s (Zaman: %s)", account, channel, "2024-01-01 00:00:00")
+    log.debug("🚀 İstek işleniyor: ID=%s, Hesap=%s, Kanal=%s", i, account, channel)
+    log.debug("📱 Yeni client oluşturuluyor: %s", account)
+    log.debug("Proxy ayrıştırıldı (socks5): %s:%s", PROXY['host'], PROXY['port'])
+    log.debug("🌐 İlk proxy kullanılıyor: %s", PROXY_ADDRESS.rsplit('@', 1)[-1])
+    log.debug("🌐 SOCKS5 Proxy kullanılıyor: %s:%s", PROXY['host'], PROXY['port'])
+    log.debug("Client oluşturuldu: %s", account)
+    log.debug("✅ İlk proxy başarılı, cache'e kaydedildi: %s", account)
+    log.debug("✅ Client başarıyla oluşturuldu: %s", account)
+    log.debug("📤 Katılım isteği gönderiliyor: %s -> %s", account, channel)
+    log.debug("🔗 Gizli kanala katılım isteği gönderiliyor: %s", channel)
+    log.debug("✅ Gizli kanala katılım isteği başarılı: %s", channel)
+    log.info("✅ İstek başarılı: %s -> %s", account, channel,
+             extra={'request_id': i, 'account': account, 'outcome': 'sent'})
+    log.debug("⏳ Minimum 5 saniye bekleme...")
+    log.info("📊 İstek sonuçları: %d başarılı, %d başarısız", 1, 0)
+    log.debug("🔗 Proxy atandı: %s", account, extra={'sample': 'proxy_assigned'})
+
+def run_case(request_func, requests: int, formatter: logging.Formatter, filters) -> dict:
+    """Verilen kod yolunu dosyaya yazan bir handler ile çalıştırır"""
+    path = os.path.join(tempfile.mkdtemp(), "bench.log")
+    handler = logging.FileHandler(path, encoding='utf-8')
+    handler.setFormatter(formatter)
+    for log_filter in filters:
+        handler.addFilter(log_filter)
+    log = logging.getLogger(f"bench_logging.{request_func.__name__}.{id(handler)}")
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    log.addHandler(handler)
+    try:
+        start = time.perf_counter()
+        for i in range(requests):
+            request_func(log, i)
+        elapsed = time.perf_counter() - start
+    finally:
+        log.removeHandler(handler)
+        handler.close()
+    size = os.path.getsize(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = sum(1 for _ in f)
+    os.remove(path)
+    return {'seconds': round(elapsed, 4), 'bytes': size, 'lines': lines}
+
+def main(requests: int = 10000) -> dict:
+    legacy = run_case(legacy_request, requests, logging.Formatter(LOG_FORMAT), [])
+    current_text = run_case(current_request, requests, logging.Formatter(LOG_FORMAT),
+                            [SamplingFilter(), RedactingFilter()])
+    current_json = run_case(current_request, requests, JsonFormatter(),
+                            [SamplingFilter(), RedactingFilter()])
+    per_10k = 10000 / requests
+    return {
+        'requests': requests,
+        'legacy': legacy,
+        'current_text': current_text,
+        'current_json': current_json,
+        'saved_ms_per_10k_requests': round((legacy['seconds'] - current_text['seconds']) * 1000 * per_10k, 1),
+        'saved_bytes_per_10k_requests': int((legacy['bytes'] - current_text['bytes']) * per_10k),
+        'speedup': round(legacy['seconds'] / current_text['seconds'], 2),
+    }
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print(json.dumps(main(count), indent=2))
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Uçtan uca istek hattı benchmark'ı
+Geçici bir çalışma klasöründe sentetik kanal/istek/session verisi oluşturur ve gerçek
+database.py -> RequestProcessor -> TelethonManager hattını sahte Telethon arka ucu
+(bench.fake_telethon) ile çalıştırır. Ağ erişimi gerekmez.
+
+Sonuç JSON olarak yazılır: verim (istek/sn), zamanlayıcı gecikmesi yüzdelikleri,
+toplam veritabanı süresi, katılım sonuçları ve en yüksek RSS.
+
+Kullanım:
+    python -m bench.bench_pipeline --requests 1000 --join-latency 0.005 --floodwait-rate 0.01
+    python -m bench.bench_pipeline --requests 10000 --output sonuc.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import resource
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+# Paket kökü; çalışma klasörü geçici klasöre taşındığında modüller yine bulunmalı
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _prepare_workdir(workdir: str, accounts: int, proxies: int) -> None:
+    """Sessions klasörünü boş session dosyalarıyla, proxies.txt'yi sentetik proxy'lerle doldurur"""
+    sessions_dir = os.path.join(workdir, "Sessions")
+    os.makedirs(sessions_dir, exist_ok=True)
+    for i in range(accounts):
+        open(os.path.join(sessions_dir, f"bench{i}.session"), 'wb').close()
+    with open(os.path.join(workdir, "proxies.txt"), 'w', encoding='utf-8') as f:
+        for i in range(proxies):
+            f.write(f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}:1080:user{i}:pass{i}\n")
+
+def _seed_requests(db_path: str, requests: int, accounts: int, channels: int,
+                   proxies: int, spread_seconds: float, seed: int) -> None:
+    """Kanalları ve bekleyen istekleri doğrudan tabloya yazar"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    with sqlite3.connect(db_path) as conn:
+        channel_ids = []
+        for c in range(channels):
+            cursor = conn.execute('''
+                INSERT INTO channels (channel_link, total_requests, duration_minutes, user_id)
+                VALUES (?, ?, ?, ?)
+            ''', (f"@bench_channel_{c}" if c % 2 else f"https://t.me/+benchhash{c}",
+                  requests // channels + 1, max(1, int(spread_seconds // 60)), "bench"))
+            channel_ids.append(cursor.lastrowid)
+
+        rows = []
+        for i in range(requests):
+            offset = rng.uniform(0, spread_seconds) if spread_seconds > 0 else 0
+            p = i % proxies if proxies else None
+            # request_pool.proxy_address, proxy_manager.get_proxy_string biçimindedir
+            proxy = f"user{p}:pass{p}@10.{p // 65536 % 256}.{p // 256 % 256}.{p % 256}:1080" if proxies else None
+            rows.append((channel_ids[i % channels], f"bench{i % accounts}.session",
+                         now + timedelta(seconds=offset), proxy))
+        conn.executemany('''
+            INSERT INTO request_pool (channel_id, account_name, scheduled_time, status, proxy_address)
+            VALUES (?, ?, ?, 'Bekliyor', ?)
+        ''', rows)
+        conn.commit()
+
+def _peak_rss_mb() -> float:
+    # Linux'ta ru_maxrss kilobayt cinsindendir
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+def run(args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    _prepare_workdir(workdir, args.accounts, args.proxies)
+    # database/proxy_manager/telethon_client global örnekleri çalışma klasörüne göre dosya açar
+    os.chdir(workdir)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    from bench.fake_telethon import FakeTelegramBackend
+    from database import db_manager
+    from metrics import DB_QUERY_SECONDS, JOIN_REQUESTS, SCHEDULER_LAG_SECONDS
+    from telethon_client import telethon_manager
+    from request_processor import RequestProcessor
+
+    _seed_requests(db_manager.db_path, args.requests, args.accounts, args.channels,
+                   args.proxies, args.spread, args.seed)
+
+    backend = FakeTelegramBackend(
+        connect_latency=args.connect_latency,
+        join_latency=args.join_latency,
+        floodwait_rate=args.floodwait_rate,
+        frozen_rate=args.frozen_rate,
+        proxy_failure_rate=args.proxy_failure_rate,
+        seed=args.seed,
+    )
+    backend.install()
+    telethon_manager.min_request_interval = args.min_interval
+    telethon_manager.proxy_retry_delay = args.proxy_retry_delay
+
+    rss_before = _peak_rss_mb()
+    db_before = DB_QUERY_SECONDS.get_sum()
+    processor = RequestProcessor(check_interval=0)
+    started = time.perf_counter()
+    timed_out = False
+    processor.start()
+    try:
+        while True:
+            pending = db_manager.get_pool_status_counts().get('Bekliyor', 0)
+            if not pending:
+                break
+            if args.timeout and time.perf_counter() - started > args.timeout:
+                timed_out = True
+                break
+            time.sleep(args.poll_interval)
+    finally:
+        processor.stop()
+        backend.uninstall()
+    elapsed = time.perf_counter() - started
+
+    statuses = db_manager.get_pool_status_counts()
+    processed = sum(count for status, count in statuses.items() if status != 'Bekliyor')
+    lateness = db_manager.get_lateness_report()['global']
+    db_seconds = DB_QUERY_SECONDS.get_sum() - db_before
+    slowest_queries = sorted(
+        ((labels[0], DB_QUERY_SECONDS.get_sum(query=labels[0])) for labels in DB_QUERY_SECONDS.get_label_values()),
+        key=lambda item: item[1], reverse=True
+    )[:5]
+
+    return {
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        'elapsed_seconds': round(elapsed, 3),
+        'timed_out': timed_out,
+        'processed': processed,
+        'throughput_per_second': round(processed / elapsed, 2) if elapsed else 0.0,
+        'statuses': statuses,
+        'outcomes': {key[0]: int(value) for key, value in JOIN_REQUESTS.get_all().items()},
+        'scheduler_lag_seconds': {
+            'p50': round(lateness['p50'], 3),
+            'p95': round(lateness['p95'], 3),
+            'p99': round(lateness['p99'], 3),
+            'max': round(lateness['max'], 3),
+            'histogram_p95': SCHEDULER_LAG_SECONDS.quantile(0.95),
+        },
+        'db_seconds': round(db_seconds, 3),
+        'db_share': round(db_seconds / elapsed, 3) if elapsed else 0.0,
+        'db_slowest_queries': {name: round(seconds, 3) for name, seconds in slowest_queries},
+        'fake_backend': backend.counters,
+        'peak_rss_mb': {'before': rss_before, 'after': _peak_rss_mb()},
+        'workdir': workdir,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sahte Telethon ile uçtan uca istek hattı benchmark'ı")
+    parser.add_argument('--requests', type=int, default=1000, help="Sentetik istek sayısı")
+    parser.add_argument('--accounts', type=int, default=500, help="Sahte session sayısı")
+    parser.add_argument('--channels', type=int, default=10, help="Kanal sayısı")
+    parser.add_argument('--proxies', type=int, default=100, help="Sentetik proxy sayısı (0 = proxy yok)")
+    parser.add_argument('--spread', type=float, default=0.0,
+                        help="İstekler şimdiden itibaren bu kadar saniyeye yayılır (0 = hepsi vadesi gelmiş)")
+    parser.add_argument('--connect-latency', type=float, default=0.0, help="Sahte bağlanma gecikmesi (sn)")
+    parser.add_argument('--join-latency', type=float, default=0.0, help="Sahte katılım gecikmesi (sn)")
+    parser.add_argument('--floodwait-rate', type=float, default=0.0, help="FloodWait olasılığı")
+    parser.add_argument('--frozen-rate', type=float, default=0.0, help="FROZEN olasılığı")
+    parser.add_argument('--proxy-failure-rate', type=float, default=0.0, help="Proxy bağlantı hatası olasılığı")
+    parser.add_argument('--min-interval', type=float, default=0.0,
+                        help="İstekler arası minimum bekleme (üretimde 5 sn)")
+    parser.add_argument('--proxy-retry-delay', type=float, default=0.0,
+                        help="Alternatif proxy denemeleri arası bekleme (üretimde 1 sn)")
+    parser.add_argument('--poll-interval', type=float, default=0.2, help="Havuz kontrol aralığı (sn)")
+    parser.add_argument('--timeout', type=float, default=0.0, help="Azami çalışma süresi (sn, 0 = sınırsız)")
+    parser.add_argument('--seed', type=int, default=1, help="Rastgelelik tohumu")
+    parser.add_argument('--output', help="Sonucu ayrıca bu JSON dosyasına yaz")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    logging.basicConfig(level=logging.WARNING)
+    result = run(args)
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+    return result
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Sahte Telethon arka ucu
+TelethonManager'ın kullandığı TelegramClient yerine geçen, ağa çıkmayan bir client.
+Bağlanma/katılım gecikmesi, FloodWait, FROZEN ve proxy hatası oranları ayarlanabilir.
+
+Kullanım:
+    backend = FakeTelegramBackend(join_latency=0.01, floodwait_rate=0.02)
+    backend.install()   # telethon_client.TelegramClient'ı değiştirir
+    ...
+    backend.uninstall()
+"""
+
+import asyncio
+import random
+import threading
+from typing import Dict, Optional
+from telethon.errors import rpc_message_to_error
+from telethon.tl.types import RpcError
+
+def rpc_error(request, code: int, message: str) -> Exception:
+    """Telegram'ın döndürdüğü hatayı Telethon'un yaptığı gibi hata örneğine çevirir"""
+    return rpc_message_to_error(RpcError(error_code=code, error_message=message), request)
+
+class FakeTelegramClient:
+    """TelegramClient'ın TelethonManager tarafından kullanılan alt kümesi"""
+
+    def __init__(self, backend: 'FakeTelegramBackend', session: str, api_id, api_hash,
+                 proxy: Optional[Dict] = None, **kwargs):
+        self.backend = backend
+        self.session = session
+        self.proxy = proxy
+        self.connected = False
+
+    async def connect(self) -> None:
+        await asyncio.sleep(self.backend.connect_latency)
+        if self.proxy and self.backend.roll(self.backend.proxy_failure_rate):
+            self.backend.count('proxy_failures')
+            raise ConnectionError(f"Proxy bağlantısı reddedildi: {self.proxy.get('addr')}:{self.proxy.get('port')}")
+        self.connected = True
+        self.backend.count('connects')
+
+    async def is_user_authorized(self) -> bool:
+        return not self.backend.roll(self.backend.unauthorized_rate)
+
+    async def disconnect(self) -> None:
+        self.connected = False
+
+    async def get_me(self):
+        return None
+
+    async def __call__(self, request):
+        """JoinChannelRequest / ImportChatInviteRequest çağrısı"""
+        await asyncio.sleep(self.backend.join_latency)
+        if self.backend.roll(self.backend.frozen_rate):
+            self.backend.count('frozen')
+            raise rpc_error(request, 420, "FROZEN_METHOD_INVALID")
+        if self.backend.roll(self.backend.floodwait_rate):
+            self.backend.count('floodwait')
+            raise rpc_error(request, 420, f"FLOOD_WAIT_{self.backend.floodwait_seconds}")
+        self.backend.count('joins')
+        return None
+
+class FakeTelegramBackend:
+    """Sahte client'ların davranışını ve sayaçlarını tutar"""
+
+    def __init__(self, connect_latency: float = 0.0, join_latency: float = 0.0,
+                 floodwait_rate: float = 0.0, floodwait_seconds: int = 30,
+                 frozen_rate: float = 0.0, proxy_failure_rate: float = 0.0,
+                 unauthorized_rate: float = 0.0, seed: Optional[int] = None):
+        self.connect_latency = connect_latency
+        self.join_latency = join_latency
+        self.floodwait_rate = floodwait_rate
+        self.floodwait_seconds = floodwait_seconds
+        self.frozen_rate = frozen_rate
+        self.proxy_failure_rate = proxy_failure_rate
+        self.unauthorized_rate = unauthorized_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {}
+        self._original = None
+
+    def roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def create_client(self, session: str, api_id, api_hash, **kwargs) -> FakeTelegramClient:
+        return FakeTelegramClient(self, session, api_id, api_hash, **kwargs)
+
+    def install(self) -> None:
+        """telethon_client modülündeki TelegramClient'ı sahte client ile değiştirir"""
+        import telethon_client
+        if self._original is None:
+            self._original = telethon_client.TelegramClient
+        telethon_client.TelegramClient = self.create_client
+
+    def uninstall(self) -> None:
+        import telethon_client
+        if self._original is not None:
+            telethon_client.TelegramClient = self._original
+            self._original = None
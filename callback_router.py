@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Callback yönlendirici
+Buton callback_data değerlerini handler'lara eşler (tam eşleşme + önek ağacı)
+"""
+
+import re
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Desteklenen parametre tipleri: {page:int}, {level:str}
+PARAM_TYPES: Dict[str, Callable[[str], Any]] = {
+    'int': int,
+    'str': str,
+}
+
+_PARAM_RE = re.compile(r'\{(\w+):(\w+)\}')
+
+
+class _Route:
+    """Kayıtlı tek bir rota"""
+
+    __slots__ = ('pattern', 'handler', 'fixed_kwargs', 'params')
+
+    def __init__(self, pattern: str, handler: Callable, fixed_kwargs: Dict[str, Any],
+                 params: List[Tuple[str, Callable[[str], Any]]]):
+        self.pattern = pattern
+        self.handler = handler
+        self.fixed_kwargs = fixed_kwargs
+        self.params = params
+
+    def parse(self, tokens: List[str]) -> Optional[Dict[str, Any]]:
+        """Önekten sonra kalan parçaları tipli parametrelere çevirir.
+
+        Son parametre kalan tüm parçaları ('_' ile birleştirerek) alır.
+        """
+        count = len(self.params)
+        if len(tokens) < count:
+            return None
+        values = tokens[:count - 1] + ['_'.join(tokens[count - 1:])]
+        parsed = {}
+        for (name, converter), raw in zip(self.params, values):
+            if not raw:
+                return None
+            try:
+                parsed[name] = converter(raw)
+            except ValueError:
+                return None
+        return parsed
+
+
+class _TrieNode:
+    """Önek ağacı düğümü ('_' ile ayrılmış parçalar üzerinden)"""
+
+    __slots__ = ('children', 'route')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.route: Optional[_Route] = None
+
+
+class CallbackRouter:
+    """Deklaratif callback yönlendirici
+
+    Parametresiz desenler sözlükte tutulur (O(1) arama). Parametreli desenlerin
+    sabit önekleri '_' ile ayrılmış parçalar halinde bir önek ağacına eklenir;
+    arama maliyeti callback_data'daki parça sayısıyla sınırlıdır (64 bayt
+    sınırı nedeniyle pratikte sabittir). Eşleşmede her zaman EN UZUN önek
+    kazanır, böylece ``session_list_`` / ``admin_session_list_`` gibi çakışmalar
+    kayıt sırasından bağımsız olarak doğru çözülür.
+
+    Örnek:
+        router = CallbackRouter()
+
+        @router.route("main_menu")
+        @router.route("session_list_{page:int}")
+        async def handler(self, update, context, page: int = 1): ...
+    """
+
+    def __init__(self):
+        self._exact: Dict[str, _Route] = {}
+        self._root = _TrieNode()
+        self._patterns: List[str] = []
+
+    def route(self, pattern: str, **fixed_kwargs) -> Callable:
+        """Handler'ı verilen desen için kaydeden dekoratör.
+
+        ``fixed_kwargs`` handler'a her çağrıda sabit olarak geçirilir
+        (örn: ``session_type="active"``).
+        """
+        def decorator(handler: Callable) -> Callable:
+            self.add_route(pattern, handler, **fixed_kwargs)
+            return handler
+        return decorator
+
+    def add_route(self, pattern: str, handler: Callable, **fixed_kwargs) -> None:
+        """Deseni kaydeder; aynı desen iki kez kaydedilirse ValueError fırlatır"""
+        match = _PARAM_RE.search(pattern)
+        if not match:
+            if pattern in self._exact:
+                raise ValueError(f"Callback deseni zaten kayıtlı: {pattern}")
+            self._exact[pattern] = _Route(pattern, handler, fixed_kwargs, [])
+            self._patterns.append(pattern)
+            return
+
+        prefix = pattern[:match.start()]
+        if not prefix or not prefix.endswith('_'):
+            raise ValueError(f"Parametreli desenin '_' ile biten sabit bir öneki olmalı: {pattern}")
+
+        # Parametre kısmı yalnızca '_' ile ayrılmış {ad:tip} bloklarından oluşmalı
+        param_section = pattern[match.start():]
+        found = _PARAM_RE.findall(param_section)
+        if '_'.join(f"{{{name}:{type_name}}}" for name, type_name in found) != param_section:
+            raise ValueError(f"Geçersiz parametre bloğu ({param_section}): {pattern}")
+        params = []
+        for name, type_name in found:
+            if type_name not in PARAM_TYPES:
+                raise ValueError(f"Bilinmeyen parametre tipi ({type_name}): {pattern}")
+            params.append((name, PARAM_TYPES[type_name]))
+
+        node = self._root
+        for token in prefix[:-1].split('_'):
+            node = node.children.setdefault(token, _TrieNode())
+        if node.route is not None:
+            raise ValueError(f"Callback öneki zaten kayıtlı: {prefix} ({node.route.pattern})")
+        node.route = _Route(pattern, handler, fixed_kwargs, params)
+        self._patterns.append(pattern)
+
+    def resolve(self, data: str) -> Optional[Tuple[Callable, Dict[str, Any]]]:
+        """callback_data için (handler, kwargs) döndürür; eşleşme yoksa None"""
+        route = self._exact.get(data)
+        if route is not None:
+            return route.handler, route.fixed_kwargs
+
+        # Önek ağacında parça parça yürü, rota taşıyan düğümleri not et
+        tokens = data.split('_')
+        candidates = []
+        node = self._root
+        for depth, token in enumerate(tokens):
+            node = node.children.get(token)
+            if node is None:
+                break
+            if node.route is not None:
+                candidates.append((depth + 1, node.route))
+
+        # En uzun önekten başlayarak parametreleri çözülebilen ilk rotayı seç
+        for depth, route in reversed(candidates):
+            params = route.parse(tokens[depth:])
+            if params is not None:
+                if route.fixed_kwargs:
+                    params.update(route.fixed_kwargs)
+                return route.handler, params
+        return None
+
+    async def dispatch(self, owner: Any, update: Any, context: Any, data: str) -> bool:
+        """callback_data'yı çözer ve handler'ı çağırır; eşleşme yoksa False döndürür"""
+        resolved = self.resolve(data)
+        if resolved is None:
+            return False
+        handler, kwargs = resolved
+        await handler(owner, update, context, **kwargs)
+        return True
+
+    def get_patterns(self) -> List[str]:
+        """Kayıtlı tüm desenleri kayıt sırasıyla döndürür"""
+        return list(self._patterns)
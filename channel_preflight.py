@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Kanal linki ön kontrolü
+Havuz oluşturulmadan önce linkin çözülebildiğini doğrulamak için yardımcılar:
+link ayrıştırma, ölü link hatalarının tanınması ve Telegram yanıtlarından kanal
+bilgisi çıkarma
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+from join_result import classify_join_error, JoinErrorCode, DEAD_LINK_ERRORS
+
+logger = logging.getLogger(__name__)
+
+# channel_metadata.link_status değerleri
+LINK_OK = 'ok'
+LINK_DEAD = 'dead'
+LINK_UNKNOWN = 'unknown'
+
+def parse_channel_link(channel_link: str) -> Tuple[str, str]:
+    """Linki ('invite', davet kodu) veya ('username', kullanıcı adı) olarak ayrıştırır"""
+    link = channel_link.strip()
+    if link.startswith('@'):
+        return 'username', link[1:]
+    identifier = link.split('t.me/')[-1].strip('/')
+    if identifier.startswith('+'):
+        return 'invite', identifier[1:]
+    if identifier.startswith('joinchat/'):
+        return 'invite', identifier[len('joinchat/'):]
+    return 'username', identifier
+
+def dead_link_reason(error: Exception) -> Optional[str]:
+    """Hata linkin ölü olduğunu gösteriyorsa nedenini (RPC hata adı), değilse None döndürür"""
+    result = classify_join_error(error)
+    return result.rpc_error if result.code == JoinErrorCode.DEAD_LINK else None
+
+def metadata_from_invite(invite) -> Dict:
+    """CheckChatInviteRequest yanıtından kanal bilgisi çıkarır.
+
+    ChatInviteAlready/ChatInvitePeek sohbet nesnesini (``chat``) taşır; ChatInvite
+    yalnızca başlık, üye sayısı ve onay gereksinimini içerir.
+    """
+    chat = getattr(invite, 'chat', None)
+    if chat is not None:
+        metadata = metadata_from_chat(chat)
+        metadata['requires_approval'] = bool(getattr(invite, 'request_needed', False)
+                                             or metadata['requires_approval'])
+        return metadata
+    return {
+        'link_status': LINK_OK,
+        'chat_id': None,
+        'title': getattr(invite, 'title', None),
+        'requires_approval': bool(getattr(invite, 'request_needed', False)),
+        'participants_count': getattr(invite, 'participants_count', None),
+    }
+
+def metadata_from_chat(chat, participants_count: Optional[int] = None) -> Dict:
+    """Channel/Chat nesnesinden kanal bilgisi çıkarır"""
+    return {
+        'link_status': LINK_OK,
+        'chat_id': getattr(chat, 'id', None),
+        'title': getattr(chat, 'title', None),
+        'requires_approval': bool(getattr(chat, 'join_request', False)),
+        'participants_count': participants_count if participants_count is not None
+                              else getattr(chat, 'participants_count', None),
+    }
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Sohbet kilitleri
+Aynı anahtara (sohbet ID'si) ait işleri sıralar; bekleyeni kalmayan kilit silinir
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Hashable
+
+class ChatLocks:
+    """Sohbet başına asyncio kilidi
+
+    Aynı sohbet için ``hold`` çağrıları geliş sırasıyla tek tek çalışır; farklı
+    sohbetler birbirini beklemez. Kilit, onu tutan ve bekleyen kalmayınca
+    sözlükten silinir; sözlük yalnızca etkin sohbetler kadar büyür.
+    """
+
+    def __init__(self):
+        # chat_id -> [kilit, tutan + bekleyen sayısı]
+        self._locks: Dict[Hashable, list] = {}
+
+    @asynccontextmanager
+    async def hold(self, chat_id: Hashable) -> AsyncIterator[None]:
+        """Sohbetin kilidini alır; çıkışta (hata olsa da) bırakır ve gerekirse siler"""
+        entry = self._locks.get(chat_id)
+        if entry is None:
+            entry = [asyncio.Lock(), 0]
+            self._locks[chat_id] = entry
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            # Bekleyen kalmadıysa kilidi bırak (sözlük sınırsız büyümesin)
+            if entry[1] == 0 and self._locks.get(chat_id) is entry:
+                del self._locks[chat_id]
+
+    def clear(self) -> None:
+        """Tüm kilitleri unutur (kapatma)"""
+        self._locks.clear()
+
+    def __len__(self) -> int:
+        return len(self._locks)
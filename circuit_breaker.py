@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Kanal devre kesicisi
+Kanala ait katılım hataları (JoinResult.signature) art arda aynı şekilde
+tekrarlanınca kampanyanın durdurulması gerektiğini bildirir
+"""
+
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from join_result import DEAD_LINK_ERRORS
+
+logger = logging.getLogger(__name__)
+
+# Kanal sahibine gösterilen durdurma nedenleri
+FAILURE_DESCRIPTIONS = {
+    'CHANNEL_PRIVATE': "Kanal özel yapıldı veya hesapların erişimi yok",
+    'CHANNEL_PUBLIC_GROUP_NA': "Kanal artık kullanılamıyor",
+    'CHAT_INVALID': "Sohbet geçersiz",
+    'USERS_TOO_MUCH': "Kanal üye/katılım isteği sınırına ulaştı",
+}
+
+def describe_failure(signature: str) -> str:
+    """Durdurma nedenini kullanıcıya gösterilecek metne çevirir"""
+    if signature in DEAD_LINK_ERRORS:
+        return "Kanal linki geçersiz veya süresi dolmuş"
+    return FAILURE_DESCRIPTIONS.get(signature, "Kanala yapılan istekler aynı hatayla sonuçlanıyor")
+
+# Kanal durdurulmadan önce gereken ardışık aynı hata sayısı (varsayılan)
+DEFAULT_THRESHOLD = 3
+
+class ChannelCircuitBreaker:
+    """Kanal başına ardışık aynı kanal hatasını sayar.
+
+    Başarılı istek ya da farklı bir kanal hatası sayacı sıfırlar; hesaba ait
+    hatalar (client açılamadı, FloodWait, frozen) kanal hakkında bilgi vermediği
+    için sayılmaz. ``record_failure`` eşiğe ulaşıldığında yalnızca bir kez True
+    döndürür; kanal yeniden başlatılınca ``reset`` ile sayaç temizlenir.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD):
+        self.threshold = max(1, threshold)
+        self._lock = threading.Lock()
+        # channel_id -> (imza, ardışık sayı)
+        self._streaks: Dict[int, Tuple[str, int]] = {}
+
+    def record_success(self, channel_id: int) -> None:
+        with self._lock:
+            self._streaks.pop(channel_id, None)
+
+    def record_failure(self, channel_id: int, signature: Optional[str]) -> bool:
+        if not signature:
+            return False
+        with self._lock:
+            previous, count = self._streaks.get(channel_id, (signature, 0))
+            count = count + 1 if previous == signature else 1
+            self._streaks[channel_id] = (signature, count)
+            return count == self.threshold
+
+    def reset(self, channel_id: int) -> None:
+        with self._lock:
+            self._streaks.pop(channel_id, None)
+
+    def streak(self, channel_id: int) -> Tuple[Optional[str], int]:
+        """Kanalın mevcut (imza, ardışık sayı) durumu"""
+        with self._lock:
+            return self._streaks.get(channel_id, (None, 0))
@@ -6,7 +6,8 @@ Bu dosyada bot API ve admin bilgileri saklanır
 
 import os
 import json
-from typing import List, Dict, Any
+import hashlib
+from typing import List, Dict, Any, Optional
 
 # Sabitlenen kimlik bilgileri: Bu değerler kullanılır, dosya yapılandırmasına ihtiyaç yok
 # DİKKAT: Bu yaklaşım token'ı repoda düz metin olarak saklar.
@@ -46,6 +47,19 @@ class BotConfig:
             "admin_ids": ["1113025571"],
             "webhook_url": "",
             "webhook_port": 8443,
+            "webhook_listen": "0.0.0.0",
+            "webhook_path": "telegram",
+            "webhook_secret": "",
+            "max_concurrent_updates": 16,
+            "export_compression_level": 0,  # 0 = ZIP_STORED
+            "export_max_archive_mb": 49,
+            "metrics_port": 8000,  # 0 = kapalı
+            "max_accounts_per_proxy": 0,  # 0 = hesapları proxy'lere eşit böl
+            "account_min_interval": 60,  # Aynı hesabın iki isteği arası en az saniye
+            "account_daily_cap": 0,  # Hesap başına 24 saatte en fazla istek (0 = sınırsız)
+            "account_hourly_cap": 0,  # Hesap başına saatte en fazla istek (0 = sınırsız)
+            "preflight_cache_minutes": 360,  # Kanal linki ön kontrol sonucunun geçerlilik süresi (dakika)
+            "circuit_breaker_threshold": 3,  # Kanalı durduran ardışık aynı kanal hatası sayısı
             "debug_mode": True,
             "max_file_size": 20,  # MB
             "allowed_file_types": ["jpg", "jpeg", "png", "gif", "mp4", "mp3", "pdf", "txt", "doc", "docx"],
@@ -117,6 +131,58 @@ class BotConfig:
         """Webhook port numarasını döndürür"""
         return self.config.get("webhook_port", 8443)
     
+    def get_webhook_listen(self) -> str:
+        """Webhook sunucusunun dinleyeceği adresi döndürür"""
+        return self.config.get("webhook_listen", "0.0.0.0")
+    
+    def get_webhook_path(self) -> str:
+        """Webhook URL yolunu döndürür (örn: telegram)"""
+        return self.config.get("webhook_path", "telegram")
+    
+    def get_webhook_secret(self) -> str:
+        """Webhook gizli anahtarını döndürür"""
+        return self.config.get("webhook_secret", "")
+    
+    def get_max_concurrent_updates(self) -> int:
+        """Aynı anda işlenebilecek en fazla güncelleme sayısını döndürür"""
+        return self.config.get("max_concurrent_updates", 16)
+    
+    def get_export_compression_level(self) -> int:
+        """Session ZIP sıkıştırma seviyesini döndürür (0 = sıkıştırmasız)"""
+        return self.config.get("export_compression_level", 0)
+    
+    def get_export_max_archive_mb(self) -> int:
+        """Tek bir session ZIP arşivinin en büyük boyutunu döndürür (MB)"""
+        return self.config.get("export_max_archive_mb", 49)
+    
+    def get_metrics_port(self) -> int:
+        """/metrics HTTP sunucusunun portunu döndürür (0 = kapalı)"""
+        return self.config.get("metrics_port", 8000)
+    
+    def get_max_accounts_per_proxy(self) -> int:
+        """Bir proxy'ye atanabilecek en fazla hesap sayısını döndürür (0 = otomatik)"""
+        return self.config.get("max_accounts_per_proxy", 0)
+    
+    def get_account_min_interval(self) -> int:
+        """Aynı hesabın iki isteği arasındaki en kısa süreyi döndürür (saniye)"""
+        return self.config.get("account_min_interval", 60)
+    
+    def get_account_daily_cap(self) -> int:
+        """Hesap başına 24 saatlik istek sınırını döndürür (0 = sınırsız)"""
+        return self.config.get("account_daily_cap", 0)
+    
+    def get_account_hourly_cap(self) -> int:
+        """Hesap başına saatlik istek sınırını döndürür (0 = sınırsız)"""
+        return self.config.get("account_hourly_cap", 0)
+    
+    def get_preflight_cache_minutes(self) -> int:
+        """Kanal linki ön kontrol sonucunun önbellekte kalma süresini döndürür (dakika)"""
+        return self.config.get("preflight_cache_minutes", 360)
+    
+    def get_circuit_breaker_threshold(self) -> int:
+        """Kanalı durduran ardışık aynı kanal hatası sayısını döndürür"""
+        return self.config.get("circuit_breaker_threshold", 3)
+    
     def is_debug_mode(self) -> bool:
         """Debug modunun açık olup olmadığını kontrol eder"""
         return self.config.get("debug_mode", True)
@@ -208,6 +274,110 @@ def remove_admin(admin_id: str) -> bool:
 def update_bot_api(new_api: str) -> bool:
     return bot_config.update_bot_api(new_api)
 
+def get_webhook_url() -> str:
+    # Ortam değişkeni öncelikli: WEBHOOK_URL (boşsa polling kullanılır)
+    env_url = os.environ.get("WEBHOOK_URL")
+    if env_url is not None:
+        return env_url.strip()
+    return bot_config.get_webhook_url()
+
+def get_webhook_port() -> int:
+    env_port = os.environ.get("WEBHOOK_PORT")
+    if env_port:
+        return int(env_port)
+    return int(bot_config.get_webhook_port())
+
+def get_webhook_listen() -> str:
+    return os.environ.get("WEBHOOK_LISTEN") or bot_config.get_webhook_listen()
+
+def get_webhook_path() -> str:
+    path = os.environ.get("WEBHOOK_PATH") or bot_config.get_webhook_path()
+    return path.strip('/')
+
+def get_webhook_secret() -> str:
+    # 1) Ortam değişkeni veya konfigürasyon
+    secret = os.environ.get("WEBHOOK_SECRET") or bot_config.get_webhook_secret()
+    if secret:
+        return secret
+    # 2) Token'dan türetilmiş sabit anahtar (Telegram yalnızca A-Z, a-z, 0-9, _ ve - kabul eder)
+    return hashlib.sha256(get_bot_api().encode('utf-8')).hexdigest()
+
+def get_webhook_settings() -> Optional[Dict[str, Any]]:
+    """Application.run_webhook argümanlarını döndürür; webhook URL'i boşsa None (polling)"""
+    webhook_url = get_webhook_url()
+    if not webhook_url:
+        return None
+    url_path = get_webhook_path()
+    return {
+        'listen': get_webhook_listen(),
+        'port': get_webhook_port(),
+        'url_path': url_path,
+        'webhook_url': f"{webhook_url.rstrip('/')}/{url_path}",
+        'secret_token': get_webhook_secret(),
+    }
+
+def get_max_concurrent_updates() -> int:
+    # Ortam değişkeni: MAX_CONCURRENT_UPDATES (en az 1)
+    env_value = os.environ.get("MAX_CONCURRENT_UPDATES")
+    if env_value:
+        return max(1, int(env_value))
+    return max(1, int(bot_config.get_max_concurrent_updates()))
+
+def get_export_compression_level() -> int:
+    # Ortam değişkeni: EXPORT_COMPRESSION_LEVEL (0-9, 0 = ZIP_STORED)
+    env_value = os.environ.get("EXPORT_COMPRESSION_LEVEL")
+    level = int(env_value) if env_value else int(bot_config.get_export_compression_level())
+    return min(9, max(0, level))
+
+def get_export_max_archive_bytes() -> int:
+    # Ortam değişkeni: EXPORT_MAX_ARCHIVE_MB (Telegram bot yükleme sınırı 50 MB)
+    env_value = os.environ.get("EXPORT_MAX_ARCHIVE_MB")
+    size_mb = int(env_value) if env_value else int(bot_config.get_export_max_archive_mb())
+    return max(1, min(50, size_mb)) * 1024 * 1024
+
+def get_metrics_port() -> int:
+    # Ortam değişkeni: METRICS_PORT (0 = metrik sunucusu kapalı)
+    env_value = os.environ.get("METRICS_PORT")
+    if env_value is not None and env_value.strip():
+        return int(env_value)
+    return int(bot_config.get_metrics_port())
+
+def get_max_accounts_per_proxy() -> int:
+    # Ortam değişkeni: MAX_ACCOUNTS_PER_PROXY (0 = hesap sayısı / proxy sayısı, yukarı yuvarlanır)
+    env_value = os.environ.get("MAX_ACCOUNTS_PER_PROXY")
+    value = int(env_value) if env_value else int(bot_config.get_max_accounts_per_proxy())
+    return max(0, value)
+
+def get_account_min_interval() -> int:
+    # Ortam değişkeni: ACCOUNT_MIN_INTERVAL (saniye)
+    env_value = os.environ.get("ACCOUNT_MIN_INTERVAL")
+    value = int(env_value) if env_value else int(bot_config.get_account_min_interval())
+    return max(0, value)
+
+def get_account_daily_cap() -> int:
+    # Ortam değişkeni: ACCOUNT_DAILY_CAP (0 = sınırsız)
+    env_value = os.environ.get("ACCOUNT_DAILY_CAP")
+    value = int(env_value) if env_value else int(bot_config.get_account_daily_cap())
+    return max(0, value)
+
+def get_account_hourly_cap() -> int:
+    # Ortam değişkeni: ACCOUNT_HOURLY_CAP (0 = sınırsız)
+    env_value = os.environ.get("ACCOUNT_HOURLY_CAP")
+    value = int(env_value) if env_value else int(bot_config.get_account_hourly_cap())
+    return max(0, value)
+
+def get_preflight_cache_minutes() -> int:
+    # Ortam değişkeni: PREFLIGHT_CACHE_MINUTES (0 = her seferinde yeniden kontrol)
+    env_value = os.environ.get("PREFLIGHT_CACHE_MINUTES")
+    value = int(env_value) if env_value else int(bot_config.get_preflight_cache_minutes())
+    return max(0, value)
+
+def get_circuit_breaker_threshold() -> int:
+    # Ortam değişkeni: CIRCUIT_BREAKER_THRESHOLD (en az 1)
+    env_value = os.environ.get("CIRCUIT_BREAKER_THRESHOLD")
+    value = int(env_value) if env_value else int(bot_config.get_circuit_breaker_threshold())
+    return max(1, value)
+
 if __name__ == "__main__":
     # Test için konfigürasyon özetini göster
     print(bot_config.get_config_summary())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tembel (lazy) global örnekler
+Modül seviyesindeki db_manager, proxy_manager, telethon_manager gibi örnekler içe
+aktarma anında değil, ilk kullanıldıklarında oluşturulur. Testler ve yardımcı
+scriptler gerçek örnek oluşmadan önce kendi örneklerini verebilir (override).
+Her örneğin oluşturulma süresi başlangıç raporunda ve metriklerde görünür.
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, List
+
+from metrics import STARTUP_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_registry: List['LazySingleton'] = []
+_registry_lock = threading.Lock()
+
+class LazySingleton:
+    """İlk öznitelik erişiminde factory() ile oluşturulan ve ona yönlenen vekil nesne.
+
+    ``from database import db_manager`` gibi mevcut içe aktarmalar değişmeden çalışır;
+    öznitelik okuma/yazma gerçek örneğe iletilir. Oluşturma thread-safe'tir ve süreç
+    başına bir kez yapılır.
+    """
+
+    __slots__ = ('_lazy_name', '_lazy_factory', '_lazy_instance', '_lazy_lock', '_lazy_init_seconds')
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        object.__setattr__(self, '_lazy_name', name)
+        object.__setattr__(self, '_lazy_factory', factory)
+        object.__setattr__(self, '_lazy_instance', None)
+        object.__setattr__(self, '_lazy_lock', threading.RLock())
+        object.__setattr__(self, '_lazy_init_seconds', None)
+        with _registry_lock:
+            _registry.append(self)
+
+    def _lazy_get(self) -> Any:
+        instance = self._lazy_instance
+        if instance is not None:
+            return instance
+        with self._lazy_lock:
+            if self._lazy_instance is None:
+                started = time.perf_counter()
+                instance = self._lazy_factory()
+                elapsed = time.perf_counter() - started
+                object.__setattr__(self, '_lazy_instance', instance)
+                object.__setattr__(self, '_lazy_init_seconds', elapsed)
+                STARTUP_SECONDS.set(elapsed, component=self._lazy_name)
+                logger.debug("%s oluşturuldu (%.1f ms)", self._lazy_name, elapsed * 1000)
+            return self._lazy_instance
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._lazy_get(), item)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        setattr(self._lazy_get(), key, value)
+
+    def __delattr__(self, item: str) -> None:
+        delattr(self._lazy_get(), item)
+
+    def __repr__(self) -> str:
+        state = "hazır" if self._lazy_instance is not None else "henüz oluşturulmadı"
+        return f"<LazySingleton {self._lazy_name} ({state})>"
+
+def get_instance(singleton: Any) -> Any:
+    """Vekilin arkasındaki gerçek örneği (gerekirse oluşturarak) döndürür"""
+    if isinstance(singleton, LazySingleton):
+        return singleton._lazy_get()
+    return singleton
+
+def is_initialized(singleton: LazySingleton) -> bool:
+    """Gerçek örnek oluşturulmuş mu"""
+    return singleton._lazy_instance is not None
+
+def override(singleton: LazySingleton, instance: Any) -> None:
+    """Gerçek örneği verilen nesneyle değiştirir (testler, geçici veritabanı vb.)"""
+    with singleton._lazy_lock:
+        object.__setattr__(singleton, '_lazy_instance', instance)
+        object.__setattr__(singleton, '_lazy_init_seconds', 0.0)
+
+def reset(singleton: LazySingleton) -> None:
+    """Örneği unutur; bir sonraki erişimde factory yeniden çalışır"""
+    with singleton._lazy_lock:
+        object.__setattr__(singleton, '_lazy_instance', None)
+        object.__setattr__(singleton, '_lazy_init_seconds', None)
+
+def get_startup_report() -> Dict[str, float]:
+    """Oluşturulmuş örneklerin oluşturulma sürelerini (saniye) döndürür"""
+    with _registry_lock:
+        singletons = list(_registry)
+    return {singleton._lazy_name: singleton._lazy_init_seconds
+            for singleton in singletons if singleton._lazy_init_seconds is not None}
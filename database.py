@@ -9,11 +9,242 @@ import os
 import logging
 import random
 import json
+import math
+import functools
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
+from metrics import DB_QUERY_SECONDS, POOL_DEPTH
+from container import LazySingleton
+from proxy_assignment import assign_proxies, get_proxy_health_weights
+from scheduler import plan_fair_schedule, align_to_slot, SLOT_SECONDS
+from account_planner import select_accounts, account_health, effective_account_spacing
+from account_index import AccountChannelIndex, account_key
+from join_result import JoinErrorCode, JOIN_ERROR_NAMES, SUCCESS_CODES, ACCOUNT_NEUTRAL_CODES, MAX_ATTEMPTS
 
 logger = logging.getLogger(__name__)
 
+# request_pool.error_code değerleri (tam liste: join_result.JoinErrorCode)
+ERROR_CLIENT_UNAVAILABLE = JoinErrorCode.CLIENT_UNAVAILABLE
+ERROR_JOIN_FAILED = JoinErrorCode.JOIN_FAILED
+ERROR_ACCOUNT_FROZEN = JoinErrorCode.ACCOUNT_FROZEN
+ERROR_FLOODWAIT = JoinErrorCode.FLOODWAIT
+ERROR_DEAD_LINK = JoinErrorCode.DEAD_LINK
+ERROR_CHANNEL_STOPPED = JoinErrorCode.CHANNEL_STOPPED
+ERROR_INTERNAL = JoinErrorCode.INTERNAL
+
+ERROR_CODE_NAMES = JOIN_ERROR_NAMES
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Sıralı listeden en yakın sıra yöntemiyle yüzdelik değerini döndürür"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+# Şema sürümü (PRAGMA user_version); yeni geçiş eklerken artırılır
+SCHEMA_VERSION = 7
+
+# Bu sürümden eski dosyalar geçişte artımlı vakum moduna alınır (işlem dışında çalışır)
+_INCREMENTAL_VACUUM_VERSION = 7
+
+# Şeması doğrulanmış veritabanı dosyaları (süreç genelinde)
+_schema_ready_paths = set()
+_schema_lock = threading.Lock()
+
+def _table_columns(cursor: sqlite3.Cursor, table: str) -> set:
+    cursor.execute(f'PRAGMA table_info({table})')
+    return {row[1] for row in cursor.fetchall()}
+
+def _create_tables(cursor: sqlite3.Cursor) -> None:
+    """v1: temel tablolar"""
+    # Kanal tablosu
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS channels (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            channel_link TEXT NOT NULL,
+            total_requests INTEGER NOT NULL,
+            duration_minutes INTEGER NOT NULL,
+            allow_repeat BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'active',
+            user_id TEXT NOT NULL,
+            UNIQUE(channel_link, user_id)
+        )
+    ''')
+    
+    # İstek havuzu tablosu
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS request_pool (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            channel_id INTEGER NOT NULL,
+            account_name TEXT NOT NULL,
+            scheduled_time TIMESTAMP NOT NULL,
+            status TEXT DEFAULT 'Bekliyor',
+            proxy_address TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            claimed_at TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            attempts INTEGER DEFAULT 0,
+            error_code INTEGER,
+            FOREIGN KEY (channel_id) REFERENCES channels (id)
+        )
+    ''')
+    
+    # Hesap-Proxy ilişki tablosu
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS accounts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_file TEXT NOT NULL UNIQUE,
+            proxy_address TEXT,
+            proxy_type TEXT DEFAULT 'http',
+            is_active BOOLEAN DEFAULT 1,
+            last_used TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Kullanıcı durumu tablosu (form doldurma süreci için)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_states (
+            user_id TEXT PRIMARY KEY,
+            current_state TEXT,
+            temp_data TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Hesap-Kanal istek geçmişi tablosu
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS account_channel_requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            account_name TEXT NOT NULL,
+            channel_link TEXT NOT NULL,
+            request_count INTEGER DEFAULT 1,
+            last_request_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(account_name, channel_link)
+        )
+    ''')
+    
+    # Admin yönetimi tablosu
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS admins (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL UNIQUE,
+            username TEXT,
+            first_name TEXT,
+            added_by TEXT,
+            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_active BOOLEAN DEFAULT 1
+        )
+    ''')
+
+def _add_missing_columns(cursor: sqlite3.Cursor) -> None:
+    """v2: eski veritabanlarına sonradan eklenen sütunlar"""
+    for table, column, definition in (
+        ('channels', 'allow_repeat', 'BOOLEAN DEFAULT 1'),
+        ('request_pool', 'claimed_at', 'TIMESTAMP'),
+        ('request_pool', 'started_at', 'TIMESTAMP'),
+        ('request_pool', 'finished_at', 'TIMESTAMP'),
+        ('request_pool', 'attempts', 'INTEGER DEFAULT 0'),
+        ('request_pool', 'error_code', 'INTEGER'),
+    ):
+        if column not in _table_columns(cursor, table):
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+            logger.info(f"{table}.{column} sütunu eklendi")
+
+def _add_channel_deadline(cursor: sqlite3.Cursor) -> None:
+    """v3: kanal bitiş zamanı (adil zamanlayıcı için)"""
+    if 'deadline_at' not in _table_columns(cursor, 'channels'):
+        cursor.execute('ALTER TABLE channels ADD COLUMN deadline_at TIMESTAMP')
+
+def _create_history_tables(cursor: sqlite3.Cursor) -> None:
+    """v4: tamamlanan istek arşivi, arşiv sayaçları ve sıcak tablo indeksleri"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS request_history (
+            id INTEGER PRIMARY KEY,
+            channel_id INTEGER NOT NULL,
+            account_name TEXT NOT NULL,
+            scheduled_time TIMESTAMP NOT NULL,
+            status TEXT NOT NULL,
+            proxy_address TEXT,
+            created_at TIMESTAMP,
+            claimed_at TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            attempts INTEGER DEFAULT 0,
+            error_code INTEGER,
+            archive_month TEXT NOT NULL,
+            archived_at TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_request_history_month ON request_history (archive_month, channel_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_request_history_channel ON request_history (channel_id, status)')
+    
+    # Arşivlenen satırların kanal/durum sayaçları (istatistikler arşivi taramadan doğru kalır)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archived_request_counts (
+            channel_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (channel_id, status)
+        )
+    ''')
+    
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_request_pool_status_time ON request_pool (status, scheduled_time)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_request_pool_channel ON request_pool (channel_id, status)')
+
+def _create_channel_metadata(cursor: sqlite3.Cursor) -> None:
+    """v5: ön kontrolde çözülen kanal bilgisi önbelleği (link başına)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS channel_metadata (
+            channel_link TEXT PRIMARY KEY,
+            chat_id INTEGER,
+            title TEXT,
+            requires_approval BOOLEAN,
+            participants_count INTEGER,
+            link_status TEXT NOT NULL,
+            error TEXT,
+            checked_at TIMESTAMP NOT NULL
+        )
+    ''')
+
+def _add_channel_stop_columns(cursor: sqlite3.Cursor) -> None:
+    """v6: devre kesicinin durdurma nedeni ve sahibine bildirim durumu"""
+    columns = _table_columns(cursor, 'channels')
+    for column, definition in (
+        ('stop_reason', 'TEXT'),
+        ('stopped_at', 'TIMESTAMP'),
+        ('stop_notified', 'BOOLEAN DEFAULT 1'),
+    ):
+        if column not in columns:
+            cursor.execute(f'ALTER TABLE channels ADD COLUMN {column} {definition}')
+
+# (hedef sürüm, geçiş) sırayla uygulanır
+_MIGRATIONS = (
+    (1, _create_tables),
+    (2, _add_missing_columns),
+    (3, _add_channel_deadline),
+    (4, _create_history_tables),
+    (5, _create_channel_metadata),
+    (6, _add_channel_stop_columns),
+)
+
+# Arşive taşınan sütunlar (request_pool ile request_history'de aynı adlar)
+_HISTORY_COLUMNS = ('id, channel_id, account_name, scheduled_time, status, proxy_address, created_at, '
+                    'claimed_at, started_at, finished_at, attempts, error_code')
+
+def timed_query(func):
+    """Metodun süresini tgbot_db_query_seconds{query=<metot adı>} histogramına yazar"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with DB_QUERY_SECONDS.time(query=func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
 class DatabaseManager:
     """Veritabanı yönetim sınıfı"""
     
@@ -29,133 +260,100 @@ class DatabaseManager:
                 except Exception:
                     pass
             self.db_path = os.path.join(data_dir, 'telegram_bot.db')
+        self._account_index: Optional[AccountChannelIndex] = None
+        self._account_index_lock = threading.Lock()
         self.init_database()
     
+    @property
+    def account_index(self) -> AccountChannelIndex:
+        """account_channel_requests tablosunun bellek içi dizini (ilk kullanımda yüklenir)"""
+        if self._account_index is None:
+            with self._account_index_lock:
+                if self._account_index is None:
+                    index = AccountChannelIndex()
+                    try:
+                        with sqlite3.connect(self.db_path) as conn:
+                            cursor = conn.cursor()
+                            cursor.execute('SELECT account_name, channel_link FROM account_channel_requests')
+                            count = index.load(cursor)
+                        logger.info("Hesap-kanal dizini yüklendi: %d kayıt", count)
+                    except Exception as e:
+                        # Yüklenemeyen dizin önbelleğe alınmaz, sonraki çağrıda yeniden denenir
+                        logger.error(f"Hesap-kanal dizini yüklenemedi: {e}")
+                        return index
+                    self._account_index = index
+        return self._account_index
+    
     def init_database(self) -> None:
-        """Veritabanını başlatır ve tabloları oluşturur"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Kanal tablosu
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS channels (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        channel_link TEXT NOT NULL,
-                        total_requests INTEGER NOT NULL,
-                        duration_minutes INTEGER NOT NULL,
-                        allow_repeat BOOLEAN DEFAULT 1,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        status TEXT DEFAULT 'active',
-                        user_id TEXT NOT NULL,
-                        UNIQUE(channel_link, user_id)
-                    )
-                ''')
-                
-                # Mevcut tablolara eksik sütunları ekle
-                self.add_missing_columns()
-                
-                # İstek havuzu tablosu
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS request_pool (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        channel_id INTEGER NOT NULL,
-                        account_name TEXT NOT NULL,
-                        scheduled_time TIMESTAMP NOT NULL,
-                        status TEXT DEFAULT 'Bekliyor',
-                        proxy_address TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (channel_id) REFERENCES channels (id)
-                    )
-                ''')
-                
-                # Hesap-Proxy ilişki tablosu
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS accounts (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        session_file TEXT NOT NULL UNIQUE,
-                        proxy_address TEXT,
-                        proxy_type TEXT DEFAULT 'http',
-                        is_active BOOLEAN DEFAULT 1,
-                        last_used TIMESTAMP,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Kullanıcı durumu tablosu (form doldurma süreci için)
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS user_states (
-                        user_id TEXT PRIMARY KEY,
-                        current_state TEXT,
-                        temp_data TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Hesap-Kanal istek geçmişi tablosu
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS account_channel_requests (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        account_name TEXT NOT NULL,
-                        channel_link TEXT NOT NULL,
-                        request_count INTEGER DEFAULT 1,
-                        last_request_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(account_name, channel_link)
-                    )
-                ''')
-                
-                # Admin yönetimi tablosu
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS admins (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id TEXT NOT NULL UNIQUE,
-                        username TEXT,
-                        first_name TEXT,
-                        added_by TEXT,
-                        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        is_active BOOLEAN DEFAULT 1
-                    )
-                ''')
-                
-                conn.commit()
-                logger.info("Veritabanı tabloları başarıyla oluşturuldu")
-                
-        except Exception as e:
-            logger.error(f"Veritabanı başlatılamadı: {e}")
-            raise
+        """Şema sürümünü kontrol eder, gerekirse tabloları oluşturur/geçişleri çalıştırır.
+
+        PRAGMA user_version güncelse hiçbir DDL çalışmaz; aynı dosya için kontrol
+        süreç başına bir kez yapılır.
+        """
+        path_key = os.path.abspath(self.db_path)
+        if path_key in _schema_ready_paths:
+            return
+        with _schema_lock:
+            if path_key in _schema_ready_paths:
+                return
+            try:
+                with sqlite3.connect(self.db_path) as conn:
+                    version = conn.execute('PRAGMA user_version').fetchone()[0]
+                    if version < SCHEMA_VERSION:
+                        self._migrate(conn, version)
+                    elif version > SCHEMA_VERSION:
+                        logger.warning(f"Veritabanı şeması koddan yeni (v{version} > v{SCHEMA_VERSION})")
+                _schema_ready_paths.add(path_key)
+                
+            except Exception as e:
+                logger.error(f"Veritabanı başlatılamadı: {e}")
+                raise
+    
+    def _migrate(self, conn: sqlite3.Connection, version: int) -> None:
+        """Eksik şema geçişlerini tek işlemde sırayla uygular ve user_version'ı günceller.
+
+        Artımlı vakuma geçiş (v7) tam VACUUM gerektirir; işlem içinde çalışamadığı
+        için commit'ten sonra, başlangıçta bir kez yapılır. İşleyici yalnızca
+        ``PRAGMA incremental_vacuum`` çalıştırır.
+        """
+        cursor = conn.cursor()
+        for target, migration in _MIGRATIONS:
+            if version < target:
+                migration(cursor)
+                logger.info(f"Veritabanı şeması v{target} sürümüne yükseltildi")
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        conn.commit()
+        
+        if version < _INCREMENTAL_VACUUM_VERSION and conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conn.execute('VACUUM')
+            logger.info(f"Veritabanı şeması v{_INCREMENTAL_VACUUM_VERSION} sürümüne yükseltildi (artımlı vakum)")
     
     def add_missing_columns(self) -> None:
-        """Mevcut tablolara eksik sütunları ekler"""
+        """Mevcut tablolara eksik sütunları ekler (sürüm kontrolünden bağımsız, idempotent)"""
         try:
             with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # channels tablosuna allow_repeat sütunu ekle
-                try:
-                    cursor.execute('ALTER TABLE channels ADD COLUMN allow_repeat BOOLEAN DEFAULT 1')
-                    logger.info("allow_repeat sütunu eklendi")
-                except sqlite3.OperationalError as e:
-                    if "duplicate column name" in str(e):
-                        logger.info("allow_repeat sütunu zaten mevcut")
-                    else:
-                        logger.warning(f"allow_repeat sütunu eklenemedi: {e}")
-                
+                _add_missing_columns(conn.cursor())
                 conn.commit()
                 
         except Exception as e:
             logger.error(f"Eksik sütunlar eklenemedi: {e}")
     
     def purge_account(self, account_name: str) -> None:
-        """Hesabı ve ilgili planlanan istekleri veritabanından temizler"""
+        """Hesabı ve henüz gönderilmemiş isteklerini veritabanından temizler.
+
+        Yalnızca bekleyen, alınmamış istekler silinir. Sonuçlanmış istekler
+        (``Gönderildi``/``Atlandı``) istatistikler ve havuz tamamlama için kalır;
+        yürütücünün elindeki istek de silinmez, sonucu yürütücü tarafından yazılır.
+        """
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                # request_pool'dan sil
+                # request_pool'dan yalnızca bekleyen, alınmamış istekleri sil
                 cursor.execute(
-                    "DELETE FROM request_pool WHERE account_name = ?",
+                    "DELETE FROM request_pool WHERE account_name = ? "
+                    "AND status = 'Bekliyor' AND claimed_at IS NULL",
                     (account_name,)
                 )
                 
@@ -168,14 +366,16 @@ class DatabaseManager:
                 # İsteğe bağlı: geçmiş tablosundan da kaldır
                 try:
                     cursor.execute(
-                        "DELETE FROM account_channel_requests WHERE account_name = ?",
-                        (account_name,)
+                        "DELETE FROM account_channel_requests WHERE account_name IN (?, ?)",
+                        (account_key(account_name), account_key(account_name) + '.session')
                     )
                 except Exception:
                     # Tablo olmayabilir; sessiz geç
                     pass
                 
                 conn.commit()
+                if self._account_index is not None:
+                    self._account_index.discard_account(account_name)
                 logger.info(f"Hesap temizlendi: {account_name}")
         except Exception as e:
             logger.error(f"Hesap temizlenemedi ({account_name}): {e}")
@@ -285,12 +485,12 @@ class DatabaseManager:
                     channel_id = existing_channel[0]
                     cursor.execute('''
                         UPDATE channels 
-                        SET total_requests = ?, duration_minutes = ?, allow_repeat = ?, status = 'active', created_at = CURRENT_TIMESTAMP
+                        SET total_requests = ?, duration_minutes = ?, allow_repeat = ?, status = 'active',
+                            created_at = CURRENT_TIMESTAMP, deadline_at = NULL, stop_reason = NULL
                         WHERE id = ?
                     ''', (total_requests, duration_minutes, allow_repeat, channel_id))
                     
-                    # Eski istekleri temizle
-                    cursor.execute('DELETE FROM request_pool WHERE channel_id = ?', (channel_id,))
+                    # Mevcut istekler korunur; eksik/fazla kısım create_request_pool'da tamamlanır
                     
                     conn.commit()
                     logger.info(f"Kanal güncellendi: {channel_link} (ID: {channel_id})")
@@ -311,6 +511,7 @@ class DatabaseManager:
             logger.error(f"Kanal eklenemedi: {e}")
             return None
     
+    @timed_query
     def get_channel(self, channel_id: int) -> Optional[Dict]:
         """Kanal bilgilerini getirir"""
         try:
@@ -366,8 +567,15 @@ class DatabaseManager:
             logger.error(f"Kullanıcı kanalları alınamadı: {e}")
             return []
     
+    @timed_query
     def create_request_pool(self, channel_id: int, session_files: List[str], proxies: List[str]) -> bool:
-        """Global rastgele zaman dağılımı ile istek havuzunu oluşturur"""
+        """Kanalın istek havuzunu hedef sayıya tamamlar.
+
+        Gönderilmiş ve bekleyen istekler korunur; yalnızca eksik istekler eklenir
+        (hedef düşürüldüyse en geç planlanmış bekleyenler silinir). Yeni kanalın
+        istekleri tüm aktif kanallarla adil biçimde yeniden planlanır; tamamlamada
+        ise yalnızca yeni istekler boş slotlara yerleşir, mevcut zamanlar değişmez.
+        """
         try:
             # Proxy kontrolü - en az 1 proxy olmalı
             if not proxies or len(proxies) == 0:
@@ -378,83 +586,445 @@ class DatabaseManager:
             if not channel:
                 return False
             
-            # Kullanılabilir hesapları al
-            available_accounts = self.get_available_accounts_for_channel(
-                channel['channel_link'], 
-                channel.get('allow_repeat', True), 
-                session_files
-            )
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT account_name, status FROM request_pool
+                    WHERE channel_id = ? AND status IN ('Gönderildi', 'Bekliyor')
+                ''', (channel_id,))
+                existing = cursor.fetchall()
+                # Arşivdeki gönderilmiş istekler de sayılır
+                cursor.execute('''
+                    SELECT account_name, status FROM request_history
+                    WHERE channel_id = ? AND status = 'Gönderildi'
+                ''', (channel_id,))
+                archived = cursor.fetchall()
+                cursor.execute('SELECT deadline_at FROM channels WHERE id = ?', (channel_id,))
+                deadline_at = cursor.fetchone()[0]
+            
+            pending = sum(1 for _, status in existing if status == 'Bekliyor')
+            existing += archived
+            sent = len(existing) - pending
+            delta = channel['total_requests'] - sent - pending
+            
+            if delta < 0:
+                return self._trim_pending_requests(channel_id, -delta)
+            if delta == 0:
+                logger.info(f"İstek havuzu zaten tamam: {channel['channel_link']} ({sent} gönderildi, {pending} bekliyor)")
+                return True
+            
+            # Kullanılabilir hesapları al (bu kanalda isteği olan hesaplar hariç)
+            used_accounts = {account_name for account_name, _ in existing}
+            available_accounts = [
+                account for account in self.get_available_accounts_for_channel(
+                    channel['channel_link'], 
+                    channel.get('allow_repeat', True), 
+                    session_files
+                )
+                if account not in used_accounts
+            ]
             
             if not available_accounts:
                 logger.warning(f"Kanal için kullanılabilir hesap bulunamadı: {channel['channel_link']}")
                 return False
             
-            # Proxy sayısı kontrolü
-            if len(proxies) < len(available_accounts):
-                logger.warning(f"⚠️ Proxy sayısı ({len(proxies)}) hesap sayısından ({len(available_accounts)}) az! Bazı hesaplar proxy olmadan çalışacak.")
+            # İstek sayısını kullanılabilir hesap sayısı ile sınırla
+            actual_requests = min(delta, len(available_accounts))
             
-            # İstek sayısını toplam hesap sayısı ile sınırla
-            max_requests = len(available_accounts)
-            actual_requests = min(channel['total_requests'], max_requests)
+            if actual_requests < delta:
+                logger.warning(f"İstek sayısı sınırlandırıldı: {delta} -> {actual_requests} (Kullanılabilir hesap sayısı: {len(available_accounts)})")
             
-            if actual_requests < channel['total_requests']:
-                logger.warning(f"İstek sayısı sınırlandırıldı: {channel['total_requests']} -> {actual_requests} (Toplam hesap sayısı: {max_requests})")
+            # Hesap seçimi: kanal başına her hesap en fazla bir kez, yükü az ve sağlıklı olan önce
+            from config import get_account_daily_cap
+            selected_accounts = select_accounts(
+                available_accounts, actual_requests, self.get_account_load(), get_account_daily_cap()
+            )
+            if not selected_accounts:
+                logger.warning(f"Kanal için günlük sınırı dolmamış hesap yok: {channel['channel_link']}")
+                return False
             
-            # Proxy dağıtımı
-            account_proxy_map = self.distribute_proxies(available_accounts, proxies)
+            # Proxy dağıtımı tüm hesaplar üzerinden yapılır (proxy'ler kanallar arasında paylaşılır)
+            account_proxy_map = self.distribute_proxies(session_files, proxies)
             
             # Proxy olmayan hesapları kontrol et
-            accounts_without_proxy = [acc for acc, proxy in account_proxy_map.items() if not proxy]
+            accounts_without_proxy = [acc for acc in selected_accounts if not account_proxy_map.get(acc)]
             if accounts_without_proxy:
-                logger.warning(f"⚠️ Proxy atanmayan hesaplar: {accounts_without_proxy}")
-            
-            # GLOBAL ZAMAN DAĞILIMI SİSTEMİ
-            start_time = self.get_global_start_time()
+                logger.warning("⚠️ Proxy atanmayan hesap sayısı: %d", len(accounts_without_proxy))
             
-            # Kanal süresini al (dakika cinsinden)
+            # Bitiş zamanı: devam eden kampanyada korunur, yoksa kanal süresinden hesaplanır
             duration_minutes = channel.get('duration_minutes', 60)
-            total_seconds = duration_minutes * 60
-            
-            # Minimum 5 saniye aralık kontrolü
-            min_interval = 5
-            required_time = (actual_requests - 1) * min_interval
-            
-            if required_time > total_seconds:
-                # Gerekli süre verilen süreyi aşıyorsa, süreyi uzat
-                total_seconds = required_time
-                logger.warning(f"⚠️ Gerekli süre ({required_time//60} dk) verilen süreyi ({duration_minutes} dk) aştı. Süre otomatik uzatıldı.")
+            now = datetime.now()
+            deadline = datetime.fromisoformat(deadline_at) if deadline_at else None
+            if not deadline or deadline <= now:
+                deadline = now + timedelta(minutes=duration_minutes)
             
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
+                cursor.execute('UPDATE channels SET deadline_at = ? WHERE id = ?', (deadline, channel_id))
                 
-                # Mevcut istekleri temizle
-                cursor.execute('DELETE FROM request_pool WHERE channel_id = ?', (channel_id,))
-                
-                # GLOBAL RASTGELE ZAMAN NOKTALARI OLUŞTUR
-                time_points = self.generate_global_random_times(actual_requests, total_seconds, min_interval)
-                
-                # İstekleri oluştur
-                for i, time_offset in enumerate(time_points):
-                    scheduled_time = start_time + timedelta(seconds=time_offset)
-                    
-                    # Random hesap seç (sadece kullanılabilir hesaplardan)
-                    account_name = random.choice(available_accounts)
+                # Yalnızca eksik istekleri ekle (seçilen her hesaba bir istek)
+                new_ids = []
+                for account_name in selected_accounts:
                     proxy_address = account_proxy_map.get(account_name, "")
-                    
                     cursor.execute('''
                         INSERT INTO request_pool 
                         (channel_id, account_name, scheduled_time, proxy_address, status)
                         VALUES (?, ?, ?, ?, ?)
-                    ''', (channel_id, account_name, scheduled_time, proxy_address, 'Bekliyor'))
+                    ''', (channel_id, account_name, now, proxy_address, 'Bekliyor'))
+                    new_ids.append(cursor.lastrowid)
                 
+                # Görünen plan bozulmaz: yeni istekler diğer kanalların arkasına değil,
+                # aralarındaki boş slotlara yerleşir. Ekleme ile planlama aynı işlemdedir;
+                # planlama başarısız olursa satırlar geri alınır, havuz bir anda tetiklenmez
+                self._reschedule(cursor, now, request_ids=new_ids)
                 conn.commit()
-                logger.info(f"🎯 Global rastgele istek havuzu oluşturuldu: {actual_requests} istek ({duration_minutes} dk içinde)")
-                return True
+            
+            logger.info(f"🎯 İstek havuzu tamamlandı: {len(new_ids)} yeni istek "
+                        f"({sent} gönderildi, {pending} bekliyor, {duration_minutes} dk)")
+            return True
                 
         except Exception as e:
             logger.error(f"İstek havuzu oluşturulamadı: {e}")
             return False
     
+    @timed_query
+    def reassign_account_requests(self, account_name: str, session_files: List[str],
+                                  request_id: int = None, proxies: List[str] = None) -> List[int]:
+        """Hesabın bekleyen isteklerini sağlıklı hesaplara devreder (karantina).
+
+        Her kanal için adaylar havuz oluşturmadaki kurallarla seçilir: kanalda isteği
+        olmayan (tekrar kapalıysa hiç istek atmamış) hesaplar, yükü az olan önce.
+        Satırın kanalı korunur; proxy devralan hesabın kendi atamasıdır (``proxies``
+        verilirse havuz oluşturmadaki gibi ``distribute_proxies`` ile, verilmezse
+        accounts tablosundaki kaydı). Deneme sayısı yeni hesap için sıfırlanır;
+        devredilen istekler boş slotlara yeniden planlanır. Yürütücünün almış olduğu
+        istekler yalnızca ``request_id`` ile verilirse devredilir. Yerine hesap
+        bulunamayan istekler bu metotta değişmez; karantinada ardından gelen
+        ``purge_account`` onları siler. Devredilen istek kimliklerini döndürür.
+        """
+        from config import get_account_daily_cap
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT rp.id, rp.channel_id, c.channel_link, c.allow_repeat
+                    FROM request_pool rp
+                    JOIN channels c ON rp.channel_id = c.id
+                    WHERE rp.account_name = ? AND rp.status = 'Bekliyor'
+                    AND (rp.claimed_at IS NULL OR rp.id = ?)
+                    ORDER BY rp.scheduled_time ASC, rp.id ASC
+                ''', (account_name, request_id))
+                rows = cursor.fetchall()
+                if not rows:
+                    return []
+                
+                channels: Dict[int, Tuple[str, bool, List[int]]] = {}
+                for row_id, channel_id, channel_link, allow_repeat in rows:
+                    channels.setdefault(channel_id, (channel_link, bool(allow_repeat), []))[2].append(row_id)
+                
+                key = account_key(account_name)
+                healthy = [name for name in session_files if account_key(name) != key]
+                load = self.get_account_load()
+                daily_cap = get_account_daily_cap()
+                empty = {'pending': 0, 'used_24h': 0, 'health': 1.0}
+                assignments = []
+                for channel_id, (channel_link, allow_repeat, request_ids) in channels.items():
+                    cursor.execute('''
+                        SELECT account_name FROM request_pool
+                        WHERE channel_id = ? AND status IN ('Gönderildi', 'Bekliyor')
+                        UNION
+                        SELECT account_name FROM request_history
+                        WHERE channel_id = ? AND status = 'Gönderildi'
+                    ''', (channel_id, channel_id))
+                    used = {row[0] for row in cursor.fetchall()}
+                    candidates = [account for account in self.get_available_accounts_for_channel(
+                                      channel_link, allow_repeat, healthy)
+                                  if account not in used]
+                    selected = select_accounts(candidates, len(request_ids), load, daily_cap)
+                    for row_id, account in zip(request_ids, selected):
+                        assignments.append((account, row_id))
+                        # Sonraki kanallar bu atamaları yük olarak görsün
+                        stats = load.setdefault(account, dict(empty))
+                        stats['pending'] += 1
+                
+                # Devralan hesap karantinadakinin proxy'siyle değil, kendi proxy'siyle bağlanır
+                new_accounts = list(dict.fromkeys(account for account, _ in assignments))
+                if proxies:
+                    account_proxies = self.distribute_proxies(new_accounts, proxies)
+                else:
+                    placeholders = ', '.join('?' for _ in new_accounts)
+                    cursor.execute(f'''
+                        SELECT session_file, proxy_address FROM accounts WHERE session_file IN ({placeholders})
+                    ''', new_accounts)
+                    account_proxies = dict(cursor.fetchall())
+                
+                cursor.executemany('''
+                    UPDATE request_pool
+                    SET account_name = ?, proxy_address = ?, claimed_at = NULL, started_at = NULL, attempts = 0
+                    WHERE id = ?
+                ''', [(account, account_proxies.get(account) or None, row_id) for account, row_id in assignments])
+                conn.commit()
+            
+            reassigned = [row_id for _, row_id in assignments]
+            if reassigned:
+                # Yeni hesapların diğer istekleriyle aralık kuralı korunur
+                self.reschedule_pending(request_ids=reassigned)
+            logger.info(f"🔀 {account_name}: {len(reassigned)}/{len(rows)} bekleyen istek başka hesaplara devredildi")
+            return reassigned
+            
+        except Exception as e:
+            logger.error(f"İstekler devredilemedi ({account_name}): {e}")
+            return []
+    
+    def _trim_pending_requests(self, channel_id: int, count: int) -> bool:
+        """Hedef düşürüldüğünde en geç planlanmış, alınmamış bekleyen istekleri siler"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    DELETE FROM request_pool WHERE id IN (
+                        SELECT id FROM request_pool
+                        WHERE channel_id = ? AND status = 'Bekliyor' AND claimed_at IS NULL
+                        ORDER BY scheduled_time DESC
+                        LIMIT ?
+                    )
+                ''', (channel_id, count))
+                conn.commit()
+                logger.info(f"İstek havuzu küçültüldü: kanal {channel_id}, {cursor.rowcount} bekleyen istek silindi")
+                return True
+                
+        except Exception as e:
+            logger.error(f"Bekleyen istekler silinemedi: {e}")
+            return False
+    
+    @timed_query
+    def reschedule_pending(self, now: datetime = None, request_ids: List[int] = None) -> int:
+        """Aktif kanalların bekleyen isteklerini adil zamanlayıcıyla artımlı planlar.
+
+        Yerleşmiş istekler yerinde kalır ve slotlarını/hesaplarını dolu tutar; böylece
+        kanal eklemek, duraklatmak veya silmek diğer kanalların görünen planını
+        bozmaz. ``request_ids`` verilirse yalnızca bu istekler (yeni veya devredilen)
+        boş slotlara yerleşir. Verilmezse yalnızca bitiş zamanını aşmış istekler
+        boşalan slotlara yeniden planlanır. Yürütücünün almış olduğu istekler her
+        zaman yerinde kalır. Rastgelelik istek kimliklerinden tohumlanır; aynı girdi
+        aynı planı verir. Güncellenen satır sayısını döndürür.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                changed = self._reschedule(conn.cursor(), now, request_ids)
+                conn.commit()
+                return changed
+                
+        except Exception as e:
+            logger.error(f"İstekler yeniden planlanamadı: {e}")
+            return 0
+    
+    def _reschedule(self, cursor: sqlite3.Cursor, now: datetime = None, request_ids: List[int] = None) -> int:
+        """reschedule_pending'in çağıranın işlemi içinde çalışan gövdesi (commit etmez, hata yükseltir)"""
+        from config import get_account_min_interval, get_account_hourly_cap
+        now = align_to_slot(now or datetime.now())
+        slot = timedelta(seconds=SLOT_SECONDS)
+        cursor.execute('''
+            SELECT rp.id, rp.channel_id, rp.account_name, rp.scheduled_time, rp.claimed_at, c.deadline_at
+            FROM request_pool rp
+            JOIN channels c ON rp.channel_id = c.id
+            WHERE rp.status = 'Bekliyor' AND c.status = 'active'
+            ORDER BY rp.scheduled_time ASC, rp.id ASC
+        ''')
+        rows = cursor.fetchall()
+        
+        queues: Dict[int, Dict] = {}
+        current: Dict[int, str] = {}
+        blocked_slots = []
+        account_times: Dict[str, List[datetime]] = {}
+        only = set(request_ids) if request_ids is not None else None
+        spacing = timedelta(seconds=effective_account_spacing(get_account_min_interval(),
+                                                              get_account_hourly_cap()))
+        for request_id, channel_id, account_name, scheduled_time, claimed_at, deadline_at in rows:
+            scheduled = datetime.fromisoformat(scheduled_time)
+            deadline = datetime.fromisoformat(deadline_at) if deadline_at else scheduled
+            if only is not None:
+                fixed = request_id not in only
+            else:
+                # Tam planlamada yalnızca bitiş zamanını aşmış istekler yer değiştirir
+                fixed = scheduled <= deadline + slot
+            if claimed_at or fixed:
+                # Yürütücü bu isteği aldı ya da zamanı sabit; slotu ve hesabı dolu say
+                blocked_slots.append(scheduled)
+                account_times.setdefault(account_name, []).append(scheduled)
+                continue
+            queue = queues.setdefault(channel_id, {'requests': [], 'deadline': None})
+            queue['requests'].append((request_id, account_name))
+            queue['deadline'] = max(queue['deadline'] or deadline, deadline)
+            current[request_id] = scheduled_time
+        
+        if not queues:
+            return 0
+        
+        plan = plan_fair_schedule(queues, now, SLOT_SECONDS, spacing.total_seconds(),
+                                  account_times=account_times, blocked_slots=blocked_slots,
+                                  rng=random.Random(min(current)))
+        changed = [(scheduled, request_id) for request_id, scheduled in plan.items()
+                   if str(scheduled) != current[request_id]]
+        cursor.executemany('UPDATE request_pool SET scheduled_time = ? WHERE id = ?', changed)
+        
+        logger.info("🗓️ %d kanalın %d isteği yeniden planlandı (%d değişti)",
+                    len(queues), len(plan), len(changed))
+        return len(changed)
+    
+    @timed_query
+    def get_account_load(self, now: datetime = None) -> Dict[str, Dict]:
+        """Hesap başına bekleyen istek, son 24 saatte denenen istek ve sağlık değerini döndürür.
+
+        Yalnızca fiilen denenmiş (``started_at`` dolu) istekler sayılır; kanal
+        durdurulduğu için atlanan veya kanaldan kaynaklanan sonuçlar
+        (``ACCOUNT_NEUTRAL_CODES``) ne günlük sınırı ne de sağlığı etkiler.
+        """
+        since = (now or datetime.now()) - timedelta(hours=24)
+        neutral = ', '.join(str(int(code)) for code in sorted(ACCOUNT_NEUTRAL_CODES))
+        attempted = (f"finished_at >= ? AND started_at IS NOT NULL "
+                     f"AND COALESCE(error_code, -1) NOT IN ({neutral})")
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT account_name,
+                           SUM(CASE WHEN status = 'Bekliyor' THEN 1 ELSE 0 END),
+                           SUM(CASE WHEN status != 'Bekliyor' AND {attempted} THEN 1 ELSE 0 END),
+                           SUM(CASE WHEN status = 'Gönderildi' AND {attempted} THEN 1 ELSE 0 END)
+                    FROM request_pool
+                    WHERE status = 'Bekliyor' OR finished_at >= ?
+                    GROUP BY account_name
+                ''', (since, since, since))
+                
+                return {
+                    account_name: {
+                        'pending': pending,
+                        'used_24h': used,
+                        'health': account_health(used, successes),
+                    }
+                    for account_name, pending, used, successes in cursor.fetchall()
+                }
+                
+        except Exception as e:
+            logger.error(f"Hesap yükü alınamadı: {e}")
+            return {}
+    
+    @timed_query
+    def compact_request_pool(self, older_than_hours: int = 24, batch_size: int = 5000,
+                             now: datetime = None) -> int:
+        """Sonuçlanmış eski istekleri request_history arşivine taşır.
+
+        Satırlar aylık bölüm (archive_month) etiketiyle, küçük partiler halinde ve her
+        parti ayrı işlemde taşınır; kanal/durum sayaçları archived_request_counts'ta
+        güncellenir. Son 24 saat (hesap yükü hesabı için) sıcak tabloda kalır.
+        Ardından boşalan sayfalar geri verilir ve PRAGMA optimize çalışır.
+        Taşınan satır sayısını döndürür.
+        """
+        cutoff = (now or datetime.now()) - timedelta(hours=older_than_hours)
+        moved = 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('CREATE TEMP TABLE IF NOT EXISTS compact_ids (id INTEGER PRIMARY KEY)')
+                while True:
+                    cursor.execute('DELETE FROM compact_ids')
+                    cursor.execute('''
+                        INSERT INTO compact_ids
+                        SELECT id FROM request_pool
+                        WHERE status != 'Bekliyor' AND COALESCE(finished_at, scheduled_time) < ?
+                        ORDER BY id
+                        LIMIT ?
+                    ''', (cutoff, batch_size))
+                    if cursor.rowcount <= 0:
+                        break
+                    batch = cursor.rowcount
+                    
+                    cursor.execute(f'''
+                        INSERT OR REPLACE INTO request_history ({_HISTORY_COLUMNS}, archive_month, archived_at)
+                        SELECT {_HISTORY_COLUMNS}, substr(COALESCE(finished_at, scheduled_time), 1, 7), ?
+                        FROM request_pool WHERE id IN (SELECT id FROM compact_ids)
+                    ''', (datetime.now(),))
+                    cursor.execute('''
+                        INSERT INTO archived_request_counts (channel_id, status, count)
+                        SELECT channel_id, status, COUNT(*) FROM request_pool
+                        WHERE id IN (SELECT id FROM compact_ids)
+                        GROUP BY channel_id, status
+                        ON CONFLICT(channel_id, status) DO UPDATE SET count = count + excluded.count
+                    ''')
+                    cursor.execute('DELETE FROM request_pool WHERE id IN (SELECT id FROM compact_ids)')
+                    conn.commit()
+                    moved += batch
+                    if batch < batch_size:
+                        break
+                
+                if moved:
+                    self._reclaim_space(conn)
+                logger.info("🗄️ %d sonuçlanmış istek arşive taşındı", moved)
+                return moved
+                
+        except Exception as e:
+            logger.error(f"İstek havuzu sıkıştırılamadı: {e}")
+            return moved
+    
+    def _reclaim_space(self, conn: sqlite3.Connection, pages: int = 2000) -> None:
+        """Boş sayfaları dosyaya geri verir ve sorgu planlayıcı istatistiklerini günceller.
+
+        Yalnızca artımlı vakum çalışır (artımlı moda geçiş şema geçişindedir);
+        işleyici çalışırken veritabanını kilitleyen tam VACUUM yapılmaz.
+        """
+        conn.execute(f'PRAGMA incremental_vacuum({int(pages)})')
+        conn.execute('PRAGMA optimize')
+    
+    @timed_query
+    def get_request_history(self, channel_id: int = None, month: str = None, status: str = None,
+                            since: datetime = None, until: datetime = None, limit: int = 1000) -> List[Dict]:
+        """Arşivlenmiş istekleri döndürür (month: 'YYYY-MM', since/until: finished_at aralığı)"""
+        conditions = []
+        params: List = []
+        for clause, value in (('channel_id = ?', channel_id), ('archive_month = ?', month),
+                              ('status = ?', status), ('finished_at >= ?', since),
+                              ('finished_at < ?', until)):
+            if value is not None:
+                conditions.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT {_HISTORY_COLUMNS}, archive_month FROM request_history
+                    {where}
+                    ORDER BY id DESC
+                    LIMIT ?
+                ''', (*params, limit))
+                return [dict(row) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            logger.error(f"İstek arşivi alınamadı: {e}")
+            return []
+    
+    @timed_query
+    def get_request_history_summary(self) -> Dict[str, Dict[str, int]]:
+        """Arşivi ay ve duruma göre sayar: {'2026-01': {'Gönderildi': 10, ...}}"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT archive_month, status, COUNT(*) FROM request_history
+                    GROUP BY archive_month, status
+                    ORDER BY archive_month
+                ''')
+                summary: Dict[str, Dict[str, int]] = {}
+                for month, status, count in cursor.fetchall():
+                    summary.setdefault(month, {})[status] = count
+                return summary
+                
+        except Exception as e:
+            logger.error(f"Arşiv özeti alınamadı: {e}")
+            return {}
+    
     def get_next_available_time(self) -> datetime:
         """Son istekten sonraki uygun zamanı döndürür"""
         try:
@@ -480,34 +1050,208 @@ class DatabaseManager:
             logger.error(f"Son istek zamanı alınamadı: {e}")
             return datetime.now()
     
-    def distribute_proxies(self, session_files: List[str], proxies: List[str]) -> Dict[str, str]:
-        """Proxy'leri hesaplara dağıtır - her hesaba kalıcı proxy ata"""
-        account_proxy_map = {}
+    @timed_query
+    def distribute_proxies(self, session_files: List[str], proxies: List[str],
+                           max_accounts_per_proxy: Optional[int] = None) -> Dict[str, str]:
+        """Proxy'leri hesaplara dağıtır - önceki atamaları koruyarak accounts tablosuna yazar.
+
+        Proxy'ler tüm hesaplarca paylaşılır: ``session_files`` yalnızca bir kanalın
+        hesapları olsa da dağıtım, accounts tablosunda proxy'si kayıtlı diğer
+        hesaplarla birlikte yapılır (kapasite ve mevcut yük hepsine göre hesaplanır).
+        Yalnızca ``session_files`` için atama döndürülür.
+        """
+        account_proxy_map = {session_file: "" for session_file in session_files}
         
-        if not proxies:
+        if not proxies or not session_files:
             return account_proxy_map
         
-        # Her hesaba kalıcı olarak bir proxy ata
-        for i, session_file in enumerate(session_files):
-            if i < len(proxies):
-                # Proxy varsa ata
-                proxy_address = proxies[i]
-                account_proxy_map[session_file] = proxy_address
-                logger.info(f"🔗 Proxy atandı: {session_file} -> {proxy_address}")
-            else:
-                # Proxy yoksa boş bırak
-                account_proxy_map[session_file] = ""
-                logger.warning(f"⚠️ Proxy atanamadı: {session_file}")
+        if max_accounts_per_proxy is None:
+            from config import get_max_accounts_per_proxy
+            max_accounts_per_proxy = get_max_accounts_per_proxy()
         
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT session_file, proxy_address FROM accounts
+                    WHERE proxy_address IS NOT NULL AND proxy_address != ''
+                ''')
+                previous = dict(cursor.fetchall())
+                
+                all_accounts = list(dict.fromkeys(list(session_files) + list(previous)))
+                assignment = assign_proxies(
+                    all_accounts, proxies, previous=previous,
+                    weights=get_proxy_health_weights(proxies),
+                    max_accounts_per_proxy=max_accounts_per_proxy
+                )
+                account_proxy_map = {session_file: assignment[session_file] for session_file in session_files}
+                
+                # Yalnızca değişen atamalar yazılır; is_active/last_used korunur
+                changed = [(session_file, proxy_address or None)
+                           for session_file, proxy_address in assignment.items()
+                           if previous.get(session_file, "") != proxy_address]
+                cursor.executemany('''
+                    INSERT INTO accounts (session_file, proxy_address) VALUES (?, ?)
+                    ON CONFLICT(session_file) DO UPDATE SET proxy_address = excluded.proxy_address
+                ''', changed)
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Proxy atamaları kaydedilemedi: {e}")
+        
+        # Hesap başına değil, dağıtım başına tek satır
+        unassigned = sum(1 for proxy_address in account_proxy_map.values() if not proxy_address)
+        logger.info("🔗 %d hesaba proxy atandı, %d hesap proxy'siz", len(account_proxy_map) - unassigned, unassigned)
         return account_proxy_map
     
+    @timed_query
+    def save_channel_metadata(self, channel_link: str, metadata: Dict) -> bool:
+        """Ön kontrol sonucunu (başlık, kimlik, onay gereksinimi, üye sayısı, link durumu) saklar"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO channel_metadata
+                        (channel_link, chat_id, title, requires_approval, participants_count, link_status, error, checked_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(channel_link) DO UPDATE SET
+                        chat_id = COALESCE(excluded.chat_id, chat_id),
+                        title = COALESCE(excluded.title, title),
+                        requires_approval = COALESCE(excluded.requires_approval, requires_approval),
+                        participants_count = COALESCE(excluded.participants_count, participants_count),
+                        link_status = excluded.link_status,
+                        error = excluded.error,
+                        checked_at = excluded.checked_at
+                ''', (channel_link, metadata.get('chat_id'), metadata.get('title'),
+                      metadata.get('requires_approval'), metadata.get('participants_count'),
+                      metadata['link_status'], metadata.get('error'), metadata.get('checked_at') or datetime.now()))
+                conn.commit()
+                return True
+                
+        except Exception as e:
+            logger.error(f"Kanal bilgisi kaydedilemedi: {e}")
+            return False
+    
+    @timed_query
+    def get_channel_metadata(self, channel_link: str, max_age_minutes: int = None) -> Optional[Dict]:
+        """Önbellekteki kanal bilgisini döndürür; ``max_age_minutes``'tan eskiyse None"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT chat_id, title, requires_approval, participants_count, link_status, error, checked_at
+                    FROM channel_metadata WHERE channel_link = ?
+                ''', (channel_link,))
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                
+                checked_at = datetime.fromisoformat(row[6])
+                if max_age_minutes is not None and datetime.now() - checked_at > timedelta(minutes=max_age_minutes):
+                    return None
+                return {
+                    'channel_link': channel_link,
+                    'chat_id': row[0],
+                    'title': row[1],
+                    'requires_approval': None if row[2] is None else bool(row[2]),
+                    'participants_count': row[3],
+                    'link_status': row[4],
+                    'error': row[5],
+                    'checked_at': checked_at,
+                }
+                
+        except Exception as e:
+            logger.error(f"Kanal bilgisi alınamadı: {e}")
+            return None
+    
+    @timed_query
+    def stop_channel(self, channel_id: int, error_code: int = JoinErrorCode.CHANNEL_PAUSED,
+                     reason: str = None) -> int:
+        """Kanalı duraklatır ve bekleyen tüm isteklerini tek sorguda atlar.
+
+        ``reason`` verilirse (devre kesici, ölü link) kanala yazılır ve sahibine
+        bildirim gönderilmek üzere işaretlenir; elle duraklatmada bildirim yapılmaz.
+        Atlanan isteklere ``error_code`` yazılır: elle duraklatma ``CHANNEL_PAUSED``,
+        devre kesici ``CHANNEL_STOPPED`` kullanır; geçmiş ve istatistikte ayrışırlar.
+        Boşalan slotlar diğer kanallara dağıtılır. Atlanan istek sayısını döndürür.
+        """
+        now = datetime.now()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    UPDATE channels
+                    SET status = 'paused', stop_reason = ?, stopped_at = ?, stop_notified = ?
+                    WHERE id = ?
+                ''', (reason, now, reason is None, channel_id))
+                cursor.execute('''
+                    UPDATE request_pool
+                    SET status = 'Atlandı', finished_at = ?, error_code = ?
+                    WHERE channel_id = ? AND status = 'Bekliyor'
+                ''', (now, error_code, channel_id))
+                skipped = cursor.rowcount
+                conn.commit()
+            
+            if reason:
+                logger.warning("⛔ Kanal %s durduruldu (%s), %d bekleyen istek atlandı", channel_id, reason, skipped)
+            else:
+                logger.info("⏸️ Kanal %s duraklatıldı, %d bekleyen istek iptal edildi", channel_id, skipped)
+            self.reschedule_pending()
+            return skipped
+            
+        except Exception as e:
+            logger.error(f"Kanal durdurulamadı: {e}")
+            return 0
+    
+    @timed_query
+    def get_stopped_channels_to_notify(self) -> List[Dict]:
+        """Otomatik durdurulmuş ve sahibine henüz bildirilmemiş kanalları döndürür"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT c.id, c.channel_link, c.user_id, c.stop_reason, c.stopped_at,
+                           (SELECT COUNT(*) FROM request_pool rp
+                            WHERE rp.channel_id = c.id AND rp.error_code = ?)
+                    FROM channels c
+                    WHERE c.stop_notified = 0 AND c.stop_reason IS NOT NULL
+                    ORDER BY c.stopped_at
+                ''', (ERROR_CHANNEL_STOPPED,))
+                return [{
+                    'id': row[0],
+                    'channel_link': row[1],
+                    'user_id': row[2],
+                    'stop_reason': row[3],
+                    'stopped_at': row[4],
+                    'skipped': row[5],
+                } for row in cursor.fetchall()]
+                
+        except Exception as e:
+            logger.error(f"Durdurulan kanallar alınamadı: {e}")
+            return []
+    
+    @timed_query
+    def mark_stop_notified(self, channel_id: int) -> bool:
+        """Kanal sahibine durdurma bildiriminin gönderildiğini kaydeder"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('UPDATE channels SET stop_notified = 1 WHERE id = ?', (channel_id,))
+                conn.commit()
+                return cursor.rowcount > 0
+                
+        except Exception as e:
+            logger.error(f"Bildirim durumu kaydedilemedi: {e}")
+            return False
+    
+    @timed_query
     def get_pending_requests(self, limit: int = 10) -> List[Dict]:
         """Bekleyen istekleri getirir"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    SELECT rp.*, c.channel_link 
+                    SELECT rp.id, rp.channel_id, rp.account_name, rp.scheduled_time, rp.status,
+                           rp.proxy_address, rp.created_at, c.channel_link
                     FROM request_pool rp
                     JOIN channels c ON rp.channel_id = c.id
                     WHERE rp.status = 'Bekliyor' 
@@ -535,24 +1279,163 @@ class DatabaseManager:
             logger.error(f"Bekleyen istekler alınamadı: {e}")
             return []
     
-    def update_request_status(self, request_id: int, status: str) -> bool:
-        """İstek durumunu günceller"""
+    @timed_query
+    def update_request_status(self, request_id: int, status: str, error_code: int = None) -> bool:
+        """İstek durumunu günceller; sonuçlanan isteklerde bitiş zamanı ve hata kodunu yazar"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                if status == 'Bekliyor':
+                    cursor.execute('''
+                        UPDATE request_pool
+                        SET status = ?
+                        WHERE id = ?
+                    ''', (status, request_id))
+                else:
+                    cursor.execute('''
+                        UPDATE request_pool
+                        SET status = ?, finished_at = ?, error_code = ?
+                        WHERE id = ?
+                    ''', (status, datetime.now(), error_code, request_id))
+                
+                conn.commit()
+                return cursor.rowcount > 0
+        
+        except Exception as e:
+            logger.error(f"İstek durumu güncellenemedi: {e}")
+            return False
+    
+    @timed_query
+    def retry_request(self, request_id: int, delay_seconds: float, error_code: int,
+                      max_attempts: int = MAX_ATTEMPTS) -> bool:
+        """İsteği ``delay_seconds`` sonrasına yeniden kuyruğa alır.
+
+        Deneme sayısı ``max_attempts``'a ulaştıysa hiçbir şey yapmaz ve False
+        döndürür (çağıran isteği sonuçlandırır). Son hata kodu satırda kalır.
+        """
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    UPDATE request_pool 
-                    SET status = ? 
+                    UPDATE request_pool
+                    SET status = 'Bekliyor', scheduled_time = ?, claimed_at = NULL, started_at = NULL,
+                        error_code = ?
+                    WHERE id = ? AND COALESCE(attempts, 0) < ?
+                ''', (datetime.now() + timedelta(seconds=delay_seconds), error_code, request_id, max_attempts))
+                conn.commit()
+                return cursor.rowcount > 0
+        
+        except Exception as e:
+            logger.error(f"İstek yeniden kuyruğa alınamadı: {e}")
+            return False
+    
+    @timed_query
+    def mark_request_claimed(self, request_id: int) -> bool:
+        """İsteğin yürütücü tarafından alındığı anı kaydeder ve deneme sayısını artırır"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    UPDATE request_pool
+                    SET claimed_at = ?, attempts = COALESCE(attempts, 0) + 1
                     WHERE id = ?
-                ''', (status, request_id))
+                ''', (datetime.now(), request_id))
                 
                 conn.commit()
                 return cursor.rowcount > 0
+        
+        except Exception as e:
+            logger.error(f"İstek alınma zamanı kaydedilemedi: {e}")
+            return False
+    
+    @timed_query
+    def mark_request_started(self, request_id: int) -> bool:
+        """İsteğin fiilen işlenmeye başladığı anı kaydeder"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    UPDATE request_pool
+                    SET started_at = ?
+                    WHERE id = ?
+                ''', (datetime.now(), request_id))
                 
+                conn.commit()
+                return cursor.rowcount > 0
+        
         except Exception as e:
-            logger.error(f"İstek durumu güncellenemedi: {e}")
+            logger.error(f"İstek başlama zamanı kaydedilemedi: {e}")
             return False
     
+    @timed_query
+    def get_lateness_report(self, channel_id: int = None, include_archive: bool = True) -> Dict:
+        """Başlamış isteklerin gecikme (started_at - scheduled_time) yüzdeliklerini döndürür.
+        
+        Sonuç: {'global': özet, 'channels': {kanal_id: özet}}; özet alanları
+        count, p50, p95, p99, max (saniye), avg_duration (saniye), avg_attempts
+        ve hata adına göre errors sayacıdır. ``include_archive`` ile
+        request_history'deki istekler de dahil edilir.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                select = '''
+                    SELECT rp.channel_id, c.channel_link,
+                           (julianday(rp.started_at) - julianday(rp.scheduled_time)) * 86400.0,
+                           (julianday(rp.finished_at) - julianday(rp.started_at)) * 86400.0,
+                           rp.attempts, rp.error_code
+                    FROM {table} rp
+                    LEFT JOIN channels c ON rp.channel_id = c.id
+                    WHERE rp.started_at IS NOT NULL
+                '''
+                if channel_id is not None:
+                    select += ' AND rp.channel_id = ?'
+                tables = ('request_pool', 'request_history') if include_archive else ('request_pool',)
+                query = ' UNION ALL '.join(select.format(table=table) for table in tables)
+                params = (channel_id,) * len(tables) if channel_id is not None else ()
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+        
+        except Exception as e:
+            logger.error(f"Gecikme raporu alınamadı: {e}")
+            return {'global': self._summarize_lateness([]), 'channels': {}}
+        
+        by_channel: Dict[int, List[tuple]] = {}
+        links: Dict[int, str] = {}
+        for row in rows:
+            by_channel.setdefault(row[0], []).append(row)
+            links[row[0]] = row[1]
+        
+        channels = {}
+        for cid, channel_rows in by_channel.items():
+            summary = self._summarize_lateness(channel_rows)
+            summary['channel_link'] = links.get(cid)
+            channels[cid] = summary
+        return {'global': self._summarize_lateness(rows), 'channels': channels}
+    
+    @staticmethod
+    def _summarize_lateness(rows: List[tuple]) -> Dict:
+        """get_lateness_report satırlarından özet istatistik üretir"""
+        lags = sorted(max(0.0, row[2]) for row in rows if row[2] is not None)
+        durations = [row[3] for row in rows if row[3] is not None and row[3] >= 0]
+        attempts = [row[4] or 0 for row in rows]
+        errors: Dict[str, int] = {}
+        for row in rows:
+            # "Zaten üye" gibi başarılı sonuç kodları hata sayılmaz
+            if row[5] and row[5] not in SUCCESS_CODES:
+                name = ERROR_CODE_NAMES.get(row[5], str(row[5]))
+                errors[name] = errors.get(name, 0) + 1
+        return {
+            'count': len(rows),
+            'p50': _percentile(lags, 0.50),
+            'p95': _percentile(lags, 0.95),
+            'p99': _percentile(lags, 0.99),
+            'max': lags[-1] if lags else 0.0,
+            'avg_duration': sum(durations) / len(durations) if durations else 0.0,
+            'avg_attempts': sum(attempts) / len(attempts) if attempts else 0.0,
+            'errors': errors,
+        }
+    
     def set_user_state(self, user_id: str, state: str, temp_data: Dict = None) -> bool:
         """Kullanıcı durumunu ayarlar"""
         try:
@@ -608,6 +1491,60 @@ class DatabaseManager:
             logger.error(f"Kullanıcı durumu temizlenemedi: {e}")
             return False
     
+    def get_all_user_states(self) -> List[Dict]:
+        """Tüm kullanıcı durumlarını döndürür (başlangıçta belleğe yüklemek için)"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT user_id, current_state, temp_data, updated_at FROM user_states')
+
+                states = []
+                for user_id, state, temp_data, updated_at in cursor.fetchall():
+                    states.append({
+                        'user_id': user_id,
+                        'state': state,
+                        'temp_data': json.loads(temp_data) if temp_data else {},
+                        'updated_at': updated_at
+                    })
+                return states
+
+        except Exception as e:
+            logger.error(f"Kullanıcı durumları alınamadı: {e}")
+            return []
+
+    @timed_query
+    def save_user_states(self, updates: Dict[str, Optional[Tuple[str, Dict]]]) -> bool:
+        """Birden fazla kullanıcı durumunu tek işlemde yazar.
+
+        updates: user_id -> (state, temp_data) veya silinecekse None
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+
+                rows = [
+                    (user_id, value[0], json.dumps(value[1]) if value[1] else None)
+                    for user_id, value in updates.items() if value is not None
+                ]
+                deleted = [(user_id,) for user_id, value in updates.items() if value is None]
+
+                if rows:
+                    cursor.executemany('''
+                        INSERT OR REPLACE INTO user_states
+                        (user_id, current_state, temp_data, updated_at)
+                        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                    ''', rows)
+                if deleted:
+                    cursor.executemany('DELETE FROM user_states WHERE user_id = ?', deleted)
+
+                conn.commit()
+                return True
+
+        except Exception as e:
+            logger.error(f"Kullanıcı durumları kaydedilemedi: {e}")
+            return False
+
+    @timed_query
     def get_request_stats(self, channel_id: int) -> Dict:
         """İstek istatistiklerini getirir"""
         try:
@@ -624,12 +1561,35 @@ class DatabaseManager:
                 for row in cursor.fetchall():
                     stats[row[0]] = row[1]
                 
+                # Arşive taşınmış istekler
+                cursor.execute('''
+                    SELECT status, count FROM archived_request_counts WHERE channel_id = ?
+                ''', (channel_id,))
+                for status, count in cursor.fetchall():
+                    stats[status] = stats.get(status, 0) + count
+                
                 return stats
                 
         except Exception as e:
             logger.error(f"İstek istatistikleri alınamadı: {e}")
             return {'Bekliyor': 0, 'Gönderildi': 0, 'Atlandı': 0}
     
+    def get_pool_status_counts(self) -> Dict[str, int]:
+        """request_pool satır sayılarını duruma göre döndürür (tüm kanallar).
+
+        Her /metrics okumasında çağrılır; süresi ölçülmez, aksi halde okuma
+        tgbot_db_query_seconds'ı değiştirir.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT status, COUNT(*) FROM request_pool GROUP BY status')
+                return {status: count for status, count in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Havuz durum sayıları alınamadı: {e}")
+            return {}
+    
+    @timed_query
     def get_planned_requests(self, channel_id: int, limit: int = 10) -> List[Dict]:
         """Kanal için planlanan istekleri döndürür"""
         try:
@@ -674,6 +1634,7 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"İstek proxy güncellenemedi (ID={request_id}): {e}")
     
+    @timed_query
     def get_global_planned_requests(self, limit: int = 30) -> List[Dict]:
         """Tüm kanallar için planlanan istekleri döndürür"""
         try:
@@ -710,6 +1671,7 @@ class DatabaseManager:
             logger.error(f"Global planlanan istekler alınamadı: {e}")
             return []
     
+    @timed_query
     def record_account_channel_request(self, account_name: str, channel_link: str) -> None:
         """Hesap-kanal istek geçmişini kaydeder"""
         try:
@@ -726,29 +1688,32 @@ class DatabaseManager:
                 ''', (account_name, channel_link, account_name, channel_link))
                 
                 conn.commit()
-                logger.info(f"Hesap-kanal istek geçmişi kaydedildi: {account_name} -> {channel_link}")
+            
+            if self._account_index is not None:
+                self._account_index.add(account_name, channel_link)
+            logger.debug("Hesap-kanal istek geçmişi kaydedildi: %s -> %s", account_name, channel_link)
                 
         except Exception as e:
             logger.error(f"Hesap-kanal istek geçmişi kaydedilemedi: {e}")
     
     def get_account_channel_requests(self, account_name: str, channel_link: str) -> bool:
-        """Hesabın daha önce bu kanala istek atıp atmadığını kontrol eder"""
+        """Hesabın daha önce bu kanala istek atıp atmadığını kontrol eder ('.session' uzantısından bağımsız)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT COUNT(*) FROM account_channel_requests 
-                    WHERE account_name = ? AND channel_link = ?
-                ''', (account_name, channel_link))
-                
-                count = cursor.fetchone()[0]
-                return count > 0
+            return self.account_index.contains(account_name, channel_link)
                 
         except Exception as e:
             logger.error(f"Hesap-kanal istek geçmişi kontrol edilemedi: {e}")
             return False
     
+    def get_account_channels(self, account_name: str) -> List[str]:
+        """Hesabın daha önce istek attığı kanalları döndürür"""
+        try:
+            return self.account_index.channels_for_account(account_name)
+        except Exception as e:
+            logger.error(f"Hesap kanal geçmişi alınamadı: {e}")
+            return []
+    
+    @timed_query
     def get_available_accounts_for_channel(self, channel_link: str, allow_repeat: bool, session_files: List[str]) -> List[str]:
         """Kanal için kullanılabilir hesapları döndürür"""
         try:
@@ -757,18 +1722,13 @@ class DatabaseManager:
                 return session_files
             
             # Tekrar isteklere izin verilmiyorsa, daha önce istek atmamış hesapları döndür
-            available_accounts = []
-            for session_file in session_files:
-                account_name = session_file.replace('.session', '')
-                if not self.get_account_channel_requests(account_name, channel_link):
-                    available_accounts.append(session_file)
-            
-            return available_accounts
+            return self.account_index.available(channel_link, session_files)
             
         except Exception as e:
             logger.error(f"Kullanılabilir hesaplar alınamadı: {e}")
             return session_files
     
+    @timed_query
     def get_session_stats(self) -> Dict:
         """Session dosyalarının istatistiklerini döndürür"""
         try:
@@ -957,7 +1917,10 @@ class DatabaseManager:
             return (existing_times[-1] + min_interval) if existing_times else 0
 
 # Global veritabanı instance'ı
-db_manager = DatabaseManager()
+db_manager = LazySingleton('db_manager', DatabaseManager)
+
+# Havuz derinliği her /metrics okumasında veritabanından hesaplanır
+POOL_DEPTH.set_function(lambda: {(status,): count for status, count in db_manager.get_pool_status_counts().items()})
 
 if __name__ == "__main__":
     # Test
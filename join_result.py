@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Katılım sonucu sınıflandırması
+join_channel sonuçlarını tamsayı hata kodlarına ve yeniden deneme politikalarına
+çevirir; request_pool.error_code, devre kesici ve metrikler bu kodları kullanır
+"""
+
+import re
+import asyncio
+import logging
+from enum import Enum, IntEnum
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class JoinErrorCode(IntEnum):
+    """request_pool.error_code değerleri (veritabanında kalıcıdır; mevcut değerler değiştirilmez)"""
+    OK = 0
+    CLIENT_UNAVAILABLE = 1
+    JOIN_FAILED = 2
+    ACCOUNT_FROZEN = 3
+    FLOODWAIT = 4
+    DEAD_LINK = 5
+    CHANNEL_STOPPED = 6
+    ALREADY_PARTICIPANT = 7
+    INTERNAL = 9
+    CHANNEL_UNAVAILABLE = 10
+    CHANNEL_FULL = 11
+    ACCOUNT_INVALID = 12
+    ACCOUNT_LIMIT = 13
+    NETWORK = 14
+    CHANNEL_PAUSED = 15
+
+class RetryPolicy(Enum):
+    """Bir sonuçtan sonra ne yapılacağı"""
+    SUCCESS = 'success'                    # İstek tamamlandı
+    RETRYABLE = 'retryable'                # Geçici sorun; kısa süre sonra tekrar denenir
+    RESCHEDULE = 'reschedule'              # Telegram'ın bildirdiği süre kadar sonra tekrar denenir
+    TERMINAL_REQUEST = 'terminal_request'  # Yalnızca bu istek başarısız
+    TERMINAL_ACCOUNT = 'terminal_account'  # Hesap bu işi yapamaz (frozen, silinmiş, sınır)
+    TERMINAL_CHANNEL = 'terminal_channel'  # Hangi hesapla denenirse denensin aynı sonuç
+
+# Metrik etiketleri ve rapor adları (mevcut adlar korunur)
+JOIN_ERROR_NAMES = {
+    JoinErrorCode.OK: 'sent',
+    JoinErrorCode.CLIENT_UNAVAILABLE: 'client_unavailable',
+    JoinErrorCode.JOIN_FAILED: 'join_failed',
+    JoinErrorCode.ACCOUNT_FROZEN: 'frozen',
+    JoinErrorCode.FLOODWAIT: 'floodwait',
+    JoinErrorCode.DEAD_LINK: 'dead_link',
+    JoinErrorCode.CHANNEL_STOPPED: 'channel_stopped',
+    JoinErrorCode.ALREADY_PARTICIPANT: 'already_participant',
+    JoinErrorCode.INTERNAL: 'internal',
+    JoinErrorCode.CHANNEL_UNAVAILABLE: 'channel_unavailable',
+    JoinErrorCode.CHANNEL_FULL: 'channel_full',
+    JoinErrorCode.ACCOUNT_INVALID: 'account_invalid',
+    JoinErrorCode.ACCOUNT_LIMIT: 'account_limit',
+    JoinErrorCode.NETWORK: 'network',
+    JoinErrorCode.CHANNEL_PAUSED: 'channel_paused',
+}
+
+RETRY_POLICIES = {
+    JoinErrorCode.OK: RetryPolicy.SUCCESS,
+    JoinErrorCode.ALREADY_PARTICIPANT: RetryPolicy.SUCCESS,
+    JoinErrorCode.CLIENT_UNAVAILABLE: RetryPolicy.RETRYABLE,
+    JoinErrorCode.NETWORK: RetryPolicy.RETRYABLE,
+    JoinErrorCode.FLOODWAIT: RetryPolicy.RESCHEDULE,
+    JoinErrorCode.JOIN_FAILED: RetryPolicy.TERMINAL_REQUEST,
+    JoinErrorCode.INTERNAL: RetryPolicy.TERMINAL_REQUEST,
+    JoinErrorCode.CHANNEL_STOPPED: RetryPolicy.TERMINAL_REQUEST,
+    JoinErrorCode.CHANNEL_PAUSED: RetryPolicy.TERMINAL_REQUEST,
+    JoinErrorCode.ACCOUNT_FROZEN: RetryPolicy.TERMINAL_ACCOUNT,
+    JoinErrorCode.ACCOUNT_INVALID: RetryPolicy.TERMINAL_ACCOUNT,
+    JoinErrorCode.ACCOUNT_LIMIT: RetryPolicy.TERMINAL_ACCOUNT,
+    JoinErrorCode.DEAD_LINK: RetryPolicy.TERMINAL_CHANNEL,
+    JoinErrorCode.CHANNEL_UNAVAILABLE: RetryPolicy.TERMINAL_CHANNEL,
+    JoinErrorCode.CHANNEL_FULL: RetryPolicy.TERMINAL_CHANNEL,
+}
+
+# Linkin kalıcı olarak geçersiz olduğunu gösteren Telegram RPC hataları
+DEAD_LINK_ERRORS = frozenset({
+    'INVITE_HASH_EXPIRED',
+    'INVITE_HASH_INVALID',
+    'INVITE_HASH_EMPTY',
+    'USERNAME_NOT_OCCUPIED',
+    'USERNAME_INVALID',
+    'CHANNEL_INVALID',
+})
+
+# Metrik etiketi rapor adından farklı olan kodlar (mevcut etiketler korunur)
+_METRIC_OUTCOMES = {
+    JoinErrorCode.JOIN_FAILED: 'failed',
+    JoinErrorCode.INTERNAL: 'error',
+}
+
+# Başarılı sayılan kodlar (istek 'Gönderildi' olur)
+SUCCESS_CODES = frozenset(code for code, policy in RETRY_POLICIES.items() if policy is RetryPolicy.SUCCESS)
+
+# Hesabın yüküne ve sağlığına sayılmayan kodlar: kanaldan kaynaklanan sonuçlar, kanal durdurma ve duraklatma
+ACCOUNT_NEUTRAL_CODES = frozenset(
+    {code for code, policy in RETRY_POLICIES.items() if policy is RetryPolicy.TERMINAL_CHANNEL}
+    | {JoinErrorCode.CHANNEL_STOPPED, JoinErrorCode.CHANNEL_PAUSED}
+)
+
+# Telegram RPC hata adı -> kod
+RPC_ERROR_CODES = {
+    'USER_ALREADY_PARTICIPANT': JoinErrorCode.ALREADY_PARTICIPANT,
+    # Onaylı kanallarda katılım isteği gönderildi demektir
+    'INVITE_REQUEST_SENT': JoinErrorCode.OK,
+    'CHANNEL_PRIVATE': JoinErrorCode.CHANNEL_UNAVAILABLE,
+    'CHANNEL_PUBLIC_GROUP_NA': JoinErrorCode.CHANNEL_UNAVAILABLE,
+    'CHAT_INVALID': JoinErrorCode.CHANNEL_UNAVAILABLE,
+    'USERS_TOO_MUCH': JoinErrorCode.CHANNEL_FULL,
+    'CHANNELS_TOO_MUCH': JoinErrorCode.ACCOUNT_LIMIT,
+    'USER_CHANNELS_TOO_MUCH': JoinErrorCode.ACCOUNT_LIMIT,
+    'USER_DEACTIVATED': JoinErrorCode.ACCOUNT_INVALID,
+    'USER_DEACTIVATED_BAN': JoinErrorCode.ACCOUNT_INVALID,
+    'AUTH_KEY_UNREGISTERED': JoinErrorCode.ACCOUNT_INVALID,
+    'SESSION_REVOKED': JoinErrorCode.ACCOUNT_INVALID,
+    **{name: JoinErrorCode.DEAD_LINK for name in DEAD_LINK_ERRORS},
+}
+
+# Yeniden deneme sınırları
+MAX_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 60
+MAX_RESCHEDULE_SECONDS = 3600
+
+# Telethon'un kullanıcı adını çözemediğinde fırlattığı ValueError metinleri
+_UNRESOLVED_USERNAME_TEXTS = ('No user has', 'Cannot find any entity')
+
+class JoinResult:
+    """Tek bir katılım denemesinin sonucu.
+
+    ``code`` kalıcı hata kodu, ``rpc_error`` Telegram'ın hata adı (varsa),
+    ``retry_after`` FloodWait süresi (saniye), ``message`` log için açıklamadır.
+    """
+
+    __slots__ = ('code', 'message', 'rpc_error', 'retry_after')
+
+    def __init__(self, code: JoinErrorCode, message: str = "", rpc_error: str = None, retry_after: int = 0):
+        self.code = code
+        self.message = message
+        self.rpc_error = rpc_error
+        self.retry_after = retry_after
+
+    def __repr__(self) -> str:
+        return f"JoinResult({self.code.name}, {self.message!r})"
+
+    @property
+    def policy(self) -> RetryPolicy:
+        return RETRY_POLICIES[self.code]
+
+    @property
+    def success(self) -> bool:
+        return self.code in SUCCESS_CODES
+
+    @property
+    def outcome(self) -> str:
+        """Metrik etiketi (tgbot_join_requests_total{outcome})"""
+        return _METRIC_OUTCOMES.get(self.code) or JOIN_ERROR_NAMES[self.code]
+
+    @property
+    def error_code(self) -> Optional[int]:
+        """request_pool.error_code'a yazılacak değer (düz başarıda NULL)"""
+        return None if self.code == JoinErrorCode.OK else int(self.code)
+
+    @property
+    def signature(self) -> Optional[str]:
+        """Devre kesici imzası: yalnızca kanala ait hatalarda RPC hata adı (yoksa kod adı)"""
+        if self.policy is not RetryPolicy.TERMINAL_CHANNEL:
+            return None
+        return self.rpc_error or self.code.name
+
+    def retry_delay(self) -> Optional[int]:
+        """Tekrar denemeden önce beklenecek süre; tekrar denenmeyecekse None"""
+        if self.policy is RetryPolicy.RETRYABLE:
+            return RETRY_DELAY_SECONDS
+        if self.policy is RetryPolicy.RESCHEDULE and self.retry_after <= MAX_RESCHEDULE_SECONDS:
+            return max(self.retry_after, 1)
+        return None
+
+# Telethon'un bilinen her RPC hatası için ürettiği sınıfların modülü
+_RPC_ERROR_LIST_MODULE = 'telethon.errors.rpcerrorlist'
+
+def rpc_error_name(error: Exception) -> Optional[str]:
+    """Telegram RPC hata adını döndürür (ör. ChannelPrivateError -> 'CHANNEL_PRIVATE').
+
+    Bilinen hatalar için Telethon üretilmiş bir sınıf fırlatır; bu sınıfların
+    ``message`` alanı hata adını değil kategoriyi ('BAD_REQUEST', 'FLOOD') taşır,
+    bu yüzden ad sınıftan türetilir (FloodWaitError -> 'FLOOD_WAIT'). Telethon'un
+    tanımadığı hatalar temel sınıfla fırlatılır ve adı örneğin kendi ``message``
+    alanındadır.
+    """
+    for cls in type(error).__mro__:
+        if cls.__module__ == _RPC_ERROR_LIST_MODULE and cls.__name__.endswith('Error'):
+            return re.sub(r'(?<!^)(?=[A-Z])', '_', cls.__name__[:-len('Error')]).upper()
+    if type(error).__module__.startswith('telethon'):
+        message = vars(error).get('message')
+        if isinstance(message, str) and message.isupper():
+            return message
+    return None
+
+def classify_join_error(error: Exception) -> JoinResult:
+    """join_channel sırasında fırlatılan hatayı JoinResult'a çevirir"""
+    rpc_error = rpc_error_name(error)
+
+    seconds = getattr(error, 'seconds', None)
+    if isinstance(seconds, int) and rpc_error and rpc_error.startswith(('FLOOD_WAIT', 'FLOOD_PREMIUM_WAIT')):
+        return JoinResult(JoinErrorCode.FLOODWAIT, f"Rate limit: {seconds} saniye bekle", rpc_error, seconds)
+    if rpc_error in RPC_ERROR_CODES:
+        return JoinResult(RPC_ERROR_CODES[rpc_error], str(error), rpc_error)
+    if rpc_error and 'FROZEN' in rpc_error:
+        return JoinResult(JoinErrorCode.ACCOUNT_FROZEN, str(error), rpc_error)
+    if isinstance(error, ValueError) and str(error).startswith(_UNRESOLVED_USERNAME_TEXTS):
+        return JoinResult(JoinErrorCode.DEAD_LINK, str(error), 'USERNAME_NOT_OCCUPIED')
+    if isinstance(error, (ConnectionError, asyncio.TimeoutError, OSError)):
+        return JoinResult(JoinErrorCode.NETWORK, str(error) or type(error).__name__)
+    if "You have successfully requested" in str(error):
+        return JoinResult(JoinErrorCode.OK, str(error))
+    return JoinResult(JoinErrorCode.JOIN_FAILED, str(error), rpc_error)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Zamanlayıcı gecikme raporu
+request_pool'daki claimed/started/finished zamanlarından kanal bazlı ve genel
+gecikme yüzdeliklerini (p50/p95/p99) çıkarır ve olası nedeni tahmin eder.
+
+Kullanım:
+    python lateness_report.py [--channel KANAL_ID] [--json] [--db YOL]
+"""
+
+import sys
+import json
+import argparse
+from typing import Dict
+
+# Gecikme bu değeri (saniye) aşarsa kampanya "kayıyor" sayılır
+LATE_P95_SECONDS = 60.0
+# Bir hata türünün istekler içindeki payı bu oranı aşarsa neden olarak gösterilir
+CAUSE_ERROR_RATIO = 0.2
+# Ortalama işlem süresi bunu aşarsa client/proxy kurulumu yavaş demektir
+SLOW_DURATION_SECONDS = 20.0
+
+def diagnose_lateness(summary: Dict) -> str:
+    """Özet istatistikten gecikmenin olası nedenini tek satırlık metin olarak döndürür"""
+    count = summary.get('count', 0)
+    if not count:
+        return "Henüz başlamış istek yok"
+    errors = summary.get('errors', {})
+    floodwait_ratio = errors.get('floodwait', 0) / count
+    proxy_ratio = errors.get('client_unavailable', 0) / count
+    if summary.get('p95', 0) <= LATE_P95_SECONDS and floodwait_ratio < CAUSE_ERROR_RATIO and proxy_ratio < CAUSE_ERROR_RATIO:
+        return "Zamanında"
+    if proxy_ratio >= CAUSE_ERROR_RATIO or summary.get('avg_duration', 0) > SLOW_DURATION_SECONDS:
+        return "Proxy/bağlantı sorunu (client oluşturulamıyor veya yavaş)"
+    if floodwait_ratio >= CAUSE_ERROR_RATIO:
+        return "FloodWait (hesaplar hız sınırına takılıyor)"
+    return "Yürütücü kapasitesi (istekler sırada bekliyor)"
+
+def format_report(report: Dict, top: int = 10) -> str:
+    """Raporu düz metin tablo olarak biçimlendirir"""
+    def row(name: str, summary: Dict) -> str:
+        return (f"{name:<40} {summary['count']:>6} {summary['p50']:>8.1f} {summary['p95']:>8.1f} "
+                f"{summary['p99']:>8.1f} {summary['max']:>8.1f} {summary['avg_attempts']:>6.2f}  "
+                f"{diagnose_lateness(summary)}")
+
+    lines = [f"{'Kanal':<40} {'İstek':>6} {'p50 sn':>8} {'p95 sn':>8} {'p99 sn':>8} {'max sn':>8} {'deneme':>6}  Neden"]
+    lines.append(row("GENEL", report['global']))
+    channels = sorted(report['channels'].items(), key=lambda item: item[1]['p95'], reverse=True)
+    for channel_id, summary in channels[:top]:
+        name = f"#{channel_id} {summary.get('channel_link') or ''}"
+        lines.append(row(name[:40], summary))
+    return "\n".join(lines)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="İstek gecikme (SLA) raporu")
+    parser.add_argument('--channel', type=int, help="Yalnızca bu kanal ID'si")
+    parser.add_argument('--json', action='store_true', help="JSON çıktı ver")
+    parser.add_argument('--db', help="Veritabanı dosyası (varsayılan data/telegram_bot.db)")
+    parser.add_argument('--top', type=int, default=10, help="Gösterilecek en geç kanal sayısı")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        from database import DatabaseManager
+        manager = DatabaseManager(args.db)
+    else:
+        from database import db_manager as manager
+
+    report = manager.get_lateness_report(args.channel)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(report, args.top))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Log yöneticisi
+Konsol + dönen log dosyası + son kayıtlar için bellek içi halka tampon,
+isteğe bağlı JSON çıktı, kimlik bilgisi maskeleme ve tekrarlayan olay örnekleme
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Varsayılan log dosyası kalıcı data klasöründe tutulur
+DEFAULT_LOG_FILE = os.path.join('data', 'bot.log')
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_BUFFER_SIZE = 2000
+# Alt sistem başına varsayılan seviyeler (LOG_LEVELS ile ezilebilir)
+DEFAULT_LOGGER_LEVELS = {
+    'telethon': 'WARNING',
+    'httpx': 'WARNING',
+}
+# Örneklenen olaylarda varsayılan: ilk kayıt ve ardından her N. kayıt yazılır
+DEFAULT_SAMPLE_EVERY = 100
+
+# LogRecord'un standart alanları (JSON çıktıda "extra" alanlarını ayırmak için)
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+# user:pass@host ve 'password': '...' biçimindeki kimlik bilgileri
+_CREDENTIAL_PATTERNS = [
+    (re.compile(r'([\w.%+-]+):([^\s:@/]+)@([\w.-]+:\d+)'), r'***:***@\3'),
+    (re.compile(r"""(['"]?(?:password|username|api_hash|bot_api|token)['"]?\s*[:=]\s*)(['"])(.*?)\2""", re.IGNORECASE),
+     r'\1\2***\2'),
+    (re.compile(r'\b\d{6,12}:[A-Za-z0-9_-]{30,}\b'), '***BOT_TOKEN***'),
+]
+
+def redact(text: str) -> str:
+    """Metindeki proxy kimlik bilgilerini, şifre alanlarını ve bot token'larını maskeler"""
+    for pattern, replacement in _CREDENTIAL_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+class RedactingFilter(logging.Filter):
+    """Handler'a ulaşan her kaydın mesajını maskeler (biçimlendirme bir kez yapılır)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Aynı kayıt birden fazla handler'dan geçer; maskeleme bir kez yapılır
+        if getattr(record, '_redacted', False):
+            return True
+        record._redacted = True
+        try:
+            message = record.getMessage()
+        except Exception:
+            return True
+        redacted = redact(message)
+        if redacted != message:
+            record.msg = redacted
+            record.args = None
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Tekrarlayan olayları örnekler
+
+    Yalnızca ``extra={'sample': 'anahtar'}`` ile işaretlenen kayıtlara uygulanır:
+    her anahtarın ilk kaydı ve sonra her ``every``. kaydı geçer; geçen kayda
+    ``sampled`` (o ana kadar kaç olay olduğu) alanı eklenir.
+    """
+
+    def __init__(self, every: int = DEFAULT_SAMPLE_EVERY):
+        super().__init__()
+        self.every = max(1, every)
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, 'sample', None)
+        if key is None:
+            return True
+        # Aynı kayıt birden fazla handler'dan geçer; karar bir kez verilir
+        decision = getattr(record, '_sample_pass', None)
+        if decision is not None:
+            return decision
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        decision = count == 1 or count % self.every == 0
+        record._sample_pass = decision
+        if decision:
+            record.sampled = count
+        return decision
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satırlık JSON nesnesi olarak biçimlendirir
+
+    ``extra`` ile verilen alanlar (request_id, account, outcome ...) nesneye
+    ayrı anahtarlar olarak eklenir; log toplayıcılarda filtrelenebilir.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in payload and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+class RingBufferHandler(logging.Handler):
+    """Son ``capacity`` kaydı bellekte tutan log handler'ı
+
+    Kayıtlar biçimlendirilmiş olarak (seviye, logger adı, satır) saklanır; en
+    eskiler otomatik olarak düşer, bu yüzden bellek kullanımı sabittir.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_SIZE):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.records.append((record.levelno, record.name, self.format(record)))
+        except Exception:
+            self.handleError(record)
+
+    def get_lines(self, lines: int = 30, min_level: Optional[int] = None,
+                  logger_name: Optional[str] = None) -> List[str]:
+        """Filtreye uyan son ``lines`` satırı eskiden yeniye döndürür"""
+        # Ekleme yapan thread'lerle yarışmamak için anlık kopya al
+        with self.lock:
+            snapshot = list(self.records)
+        result = []
+        for levelno, name, line in reversed(snapshot):
+            if min_level is not None and levelno < min_level:
+                continue
+            if logger_name and not _logger_matches(name, logger_name):
+                continue
+            result.append(line)
+            if len(result) >= lines:
+                break
+        result.reverse()
+        return result
+
+def _logger_matches(name: str, logger_name: str) -> bool:
+    """Logger adı filtreyle aynı mı veya filtrenin alt logger'ı mı"""
+    return name == logger_name or name.startswith(logger_name + '.')
+
+def _parse_line(line: str):
+    """LOG_FORMAT veya JSON ile yazılmış satırdan (logger adı, seviye adı) çıkarır"""
+    if line.startswith('{'):
+        try:
+            payload = json.loads(line)
+            return payload.get('logger'), payload.get('level')
+        except ValueError:
+            return None, None
+    parts = line.split(' - ', 3)
+    if len(parts) < 4:
+        return None, None
+    return parts[1], parts[2]
+
+def tail_file(path: str, lines: int = 30, block_size: int = 8192) -> List[str]:
+    """Dosyanın son ``lines`` satırını sondan geriye bloklar halinde okuyarak döndürür.
+
+    Dosya boyutundan bağımsız olarak yalnızca gereken kadar blok okunur.
+    """
+    if lines <= 0:
+        return []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        chunks = []
+        newline_count = 0
+        # Son satırın sonundaki '\n' sayılmasın diye bir fazlasını ara
+        while position > 0 and newline_count <= lines:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size)
+            chunks.append(chunk)
+            newline_count += chunk.count(b'\n')
+    data = b''.join(reversed(chunks))
+    text = data.decode('utf-8', errors='replace')
+    return text.splitlines()[-lines:]
+
+def tail_file_filtered(path: str, lines: int = 30, min_level: Optional[int] = None,
+                       logger_name: Optional[str] = None, max_scan_lines: int = 20000) -> List[str]:
+    """Filtreli tail: uyan satırlar bulunana kadar pencereyi büyüterek geriye okur.
+
+    En fazla ``max_scan_lines`` satır taranır (nadir görülen bir seviye için
+    tüm dosyanın okunmasını engeller).
+    """
+    if min_level is None and not logger_name:
+        return tail_file(path, lines)
+    window = lines * 4
+    while True:
+        candidates = tail_file(path, window)
+        matched = []
+        for line in candidates:
+            name, level_name = _parse_line(line)
+            if name is None:
+                continue
+            level_value = logging.getLevelName(level_name)
+            if min_level is not None and (not isinstance(level_value, int) or level_value < min_level):
+                continue
+            if logger_name and not _logger_matches(name, logger_name):
+                continue
+            matched.append(line)
+        if len(matched) >= lines or len(candidates) < window or window >= max_scan_lines:
+            return matched[-lines:]
+        window = min(window * 4, max_scan_lines)
+
+# Global halka tampon ve örnekleme filtresi (setup_logging tarafından kurulur)
+ring_buffer_handler = RingBufferHandler()
+sampling_filter = SamplingFilter()
+_setup_lock = threading.Lock()
+_configured_log_file: Optional[str] = None
+
+def get_log_file() -> str:
+    # Ortam değişkeni öncelikli: LOG_FILE (boş ise dosyaya yazılmaz)
+    env_value = os.environ.get("LOG_FILE")
+    if env_value is not None:
+        return env_value.strip()
+    return DEFAULT_LOG_FILE
+
+def get_log_level() -> int:
+    # Ortam değişkeni: LOG_LEVEL (DEBUG, INFO, WARNING, ...)
+    level = logging.getLevelName(os.environ.get("LOG_LEVEL", "INFO").upper())
+    return level if isinstance(level, int) else logging.INFO
+
+def get_logger_levels() -> Dict[str, str]:
+    # Ortam değişkeni: LOG_LEVELS="telethon_client=WARNING,proxy_manager=DEBUG"
+    levels = dict(DEFAULT_LOGGER_LEVELS)
+    for item in os.environ.get("LOG_LEVELS", "").split(','):
+        name, _, level_name = item.partition('=')
+        if name.strip() and level_name.strip():
+            levels[name.strip()] = level_name.strip().upper()
+    return levels
+
+def use_json_format() -> bool:
+    # Ortam değişkeni: LOG_FORMAT=json (konsol ve dosya JSON satırları yazar)
+    return os.environ.get("LOG_FORMAT", "").strip().lower() == "json"
+
+def get_sample_every() -> int:
+    # Ortam değişkeni: LOG_SAMPLE_EVERY (örneklenen olaylarda her N. kayıt)
+    env_value = os.environ.get("LOG_SAMPLE_EVERY")
+    return max(1, int(env_value)) if env_value else DEFAULT_SAMPLE_EVERY
+
+def setup_logging(log_file: Optional[str] = None, level: Optional[int] = None,
+                  max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUP_COUNT,
+                  json_format: Optional[bool] = None) -> None:
+    """Root logger'ı konsol, dönen dosya ve halka tampon ile yapılandırır.
+
+    Tüm handler'lar kimlik bilgisi maskeleme ve olay örnekleme filtrelerini
+    kullanır. Birden fazla modül çağırsa da handler'lar yalnızca bir kez eklenir.
+    """
+    global _configured_log_file
+    with _setup_lock:
+        root = logging.getLogger()
+        if ring_buffer_handler in root.handlers:
+            return
+        text_formatter = logging.Formatter(LOG_FORMAT)
+        json_format = use_json_format() if json_format is None else json_format
+        formatter = JsonFormatter() if json_format else text_formatter
+        root.setLevel(level if level is not None else get_log_level())
+        for name, level_name in get_logger_levels().items():
+            logging.getLogger(name).setLevel(level_name)
+
+        sampling_filter.every = get_sample_every()
+        redacting_filter = RedactingFilter()
+
+        def add_handler(handler: logging.Handler, handler_formatter: logging.Formatter) -> None:
+            handler.setFormatter(handler_formatter)
+            # Sıra önemli: önce örnekleme (elenen kayıt hiç biçimlendirilmez), sonra maskeleme
+            handler.addFilter(sampling_filter)
+            handler.addFilter(redacting_filter)
+            root.addHandler(handler)
+
+        # Önceden basicConfig ile eklenmiş konsol handler'ları yenisiyle değiştir
+        for existing in [h for h in root.handlers if type(h) is logging.StreamHandler]:
+            root.removeHandler(existing)
+        add_handler(logging.StreamHandler(), formatter)
+
+        log_file = get_log_file() if log_file is None else log_file
+        if log_file:
+            try:
+                log_dir = os.path.dirname(log_file)
+                if log_dir:
+                    os.makedirs(log_dir, exist_ok=True)
+                file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes,
+                                                   backupCount=backup_count, encoding='utf-8')
+                add_handler(file_handler, formatter)
+                _configured_log_file = log_file
+            except OSError as e:
+                root.error(f"Log dosyası açılamadı ({log_file}): {e}")
+
+        # Bot içinde okunacağı için tampon her zaman düz metin tutar
+        add_handler(ring_buffer_handler, text_formatter)
+
+def get_recent_logs(lines: int = 30, level: Optional[str] = None,
+                    logger_name: Optional[str] = None) -> List[str]:
+    """Son log satırlarını döndürür (önce bellekten, boşsa log dosyasından).
+
+    ``level`` verilirse o seviye ve üstü, ``logger_name`` verilirse yalnızca o
+    logger ve alt logger'ları döndürülür.
+    """
+    min_level = logging.getLevelName(level.upper()) if level else None
+    if not isinstance(min_level, int):
+        min_level = None
+    result = ring_buffer_handler.get_lines(lines, min_level, logger_name)
+    if result:
+        return result
+    log_file = _configured_log_file or get_log_file()
+    if log_file and os.path.exists(log_file):
+        return tail_file_filtered(log_file, lines, min_level, logger_name)
+    return []
@@ -10,12 +10,13 @@ import logging
 from datetime import datetime
 from telegram_bot import TelegramBot
 from request_processor import request_scheduler
+from log_manager import setup_logging
+from metrics import start_metrics_server
+from config import get_metrics_port
+from container import get_startup_report
 
-# Logging ayarları
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+# Logging ayarları (konsol + dönen dosya + bellek içi tampon)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 def main():
@@ -53,16 +54,21 @@ def main():
     print("\n✅ Uygulama başarıyla başlatıldı!")
     print("🤖 Telegram Bot çalışıyor...")
     print("⚙️ İstek işleyici başlatılıyor...")
-    print("📊 Loglar konsol çıktısında görünecek")
+    print("📊 Loglar konsolda ve data/bot.log dosyasında görünecek")
     print("🔄 Botu durdurmak için Ctrl+C tuşlayın")
     print("=" * 60)
     
     try:
+        # Metrik sunucusunu başlat (/metrics)
+        start_metrics_server(get_metrics_port())
+        
         # İstek işleyiciyi başlat
         request_scheduler.start_processing()
         
         # Telegram Bot'u başlat
         bot = TelegramBot()
+        startup = ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in get_startup_report().items())
+        logger.info(f"Başlangıç süreleri: {startup or '-'}")
         bot.run()
         
     except KeyboardInterrupt:
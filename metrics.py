@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Metrik toplama
+İstek hattı için sayaç, gösterge ve histogramlar; Prometheus metin formatında /metrics
+"""
+
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Süre histogramları için varsayılan kova sınırları (saniye)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Zamanlayıcı gecikmesi ve FloodWait gibi uzun süreler için kovalar (saniye)
+LONG_BUCKETS = (1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0, 7200.0)
+
+LabelValues = Tuple[str, ...]
+
+def _format_labels(labelnames: Sequence[str], values: LabelValues, extra: str = '') -> str:
+    """{ad="değer",...} biçiminde etiket metni üretir"""
+    parts = []
+    for name, value in zip(labelnames, values):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{escaped}"')
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class _Metric:
+    """Ortak metrik altyapısı (ad, açıklama, etiketler, kilit)"""
+
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} etiketleri {self.labelnames} olmalı, verilen: {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç"""
+
+    metric_type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError("Sayaç azaltılamaz")
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._label_values(labels), 0)
+
+    def get_all(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def _render_samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self.get_all().items())]
+
+class Gauge(_Metric):
+    """Anlık değer; istenirse değerler okuma anında bir fonksiyondan alınır"""
+
+    metric_type = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], Dict[LabelValues, float]]] = None
+
+    def set(self, value: float, **labels) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], Dict[LabelValues, float]]) -> None:
+        """Değerleri her okumada ``function()`` sonucundan alır ({etiket_tuple: değer})"""
+        self._function = function
+
+    def get_all(self) -> Dict[LabelValues, float]:
+        if self._function is not None:
+            try:
+                return dict(self._function())
+            except Exception as e:
+                logger.error(f"{self.name} göstergesi okunamadı: {e}")
+                return {}
+        with self._lock:
+            return dict(self._values)
+
+    def _render_samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self.get_all().items())]
+
+class Histogram(_Metric):
+    """Kovalara ayrılmış gözlem dağılımı (toplam ve sayı ile birlikte)"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # etiketler -> [kova sayıları (+Inf dahil), toplam, sayı]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[key] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Blok süresini gözlemler (istisna olsa bile)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _merged(self, labels: Optional[Dict[str, str]] = None) -> Tuple[List[int], float, int]:
+        """Verilen etiketlere uyan serileri birleştirir (etiket yoksa hepsi)"""
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        count = 0
+        with self._lock:
+            for key, (bucket_counts, series_sum, series_count) in self._series.items():
+                if labels and any(key[self.labelnames.index(name)] != str(value) for name, value in labels.items()):
+                    continue
+                counts = [a + b for a, b in zip(counts, bucket_counts)]
+                total += series_sum
+                count += series_count
+        return counts, total, count
+
+    def get_count(self, **labels) -> int:
+        return self._merged(labels)[2]
+
+    def get_sum(self, **labels) -> float:
+        return self._merged(labels)[1]
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Kova sınırları arasında doğrusal yaklaşımla yüzdelik değeri tahmin eder"""
+        counts, _, count = self._merged(labels)
+        if not count:
+            return None
+        target = q * count
+        cumulative = 0
+        lower = 0.0
+        for index, bucket_count in enumerate(counts):
+            upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+            if bucket_count and cumulative + bucket_count >= target:
+                if index >= len(self.buckets):
+                    return upper
+                return lower + (upper - lower) * (target - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = upper
+        return self.buckets[-1]
+
+    def get_label_values(self) -> List[LabelValues]:
+        with self._lock:
+            return sorted(self._series)
+
+    def _render_samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            series_items = sorted((key, (list(c), s, n)) for key, (c, s, n) in self._series.items())
+        for key, (bucket_counts, series_sum, series_count) in series_items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), bucket_counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels_text = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels_text} {_format_value(series_sum)}")
+            lines.append(f"{self.name}_count{labels_text} {series_count}")
+        return lines
+
+class MetricsRegistry:
+    """Metrikleri adlarıyla tutar ve Prometheus metin formatında döker"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metrik zaten kayıtlı: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+# Global metrik kaydı ve istek hattı metrikleri
+metrics_registry = MetricsRegistry()
+
+JOIN_REQUESTS = metrics_registry.counter(
+    'tgbot_join_requests_total', 'Kanal katılım istekleri (sonuca göre)', ['outcome'])
+FLOODWAIT_SECONDS = metrics_registry.histogram(
+    'tgbot_floodwait_seconds', 'Telegram FloodWait bekleme süreleri', buckets=LONG_BUCKETS)
+CLIENT_CREATE_SECONDS = metrics_registry.histogram(
+    'tgbot_client_create_seconds', 'Telethon client oluşturma süresi (proxy ve sonuca göre)', ['proxy', 'result'])
+SCHEDULER_LAG_SECONDS = metrics_registry.histogram(
+    'tgbot_scheduler_lag_seconds', 'Gerçek başlangıç ile scheduled_time arasındaki gecikme', buckets=LONG_BUCKETS)
+POOL_DEPTH = metrics_registry.gauge(
+    'tgbot_request_pool_depth', 'request_pool satır sayısı (duruma göre)', ['status'])
+DB_QUERY_SECONDS = metrics_registry.histogram(
+    'tgbot_db_query_seconds', 'Veritabanı sorgu süresi (metoda göre)', ['query'])
+HANDLER_SECONDS = metrics_registry.histogram(
+    'tgbot_bot_handler_seconds', 'Bot handler süresi (handler adına göre)', ['handler'])
+ACCOUNT_QUARANTINES = metrics_registry.counter(
+    'tgbot_account_quarantines_total', 'Karantinaya alınan hesaplar (klasöre göre)', ['reason'])
+STARTUP_SECONDS = metrics_registry.gauge(
+    'tgbot_startup_seconds', 'Global örneklerin oluşturulma süresi (bileşene göre)', ['component'])
+
+def _make_request_handler():
+    """/metrics ve /healthz handler sınıfını üretir.
+
+    http.server yalnızca sunucu başlatılırken içe aktarılır; metrics modülünü içe
+    aktaran CLI araçları bu maliyeti ödemez.
+    """
+    from http.server import BaseHTTPRequestHandler
+
+    class _MetricsRequestHandler(BaseHTTPRequestHandler):
+        """/metrics ve /healthz uç noktaları"""
+
+        def do_GET(self) -> None:
+            path = self.path.split('?', 1)[0]
+            if path == '/metrics':
+                body = metrics_registry.render().encode('utf-8')
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                status = 200
+            elif path == '/healthz':
+                body, content_type, status = b'ok\n', 'text/plain; charset=utf-8', 200
+            else:
+                body, content_type, status = b'not found\n', 'text/plain; charset=utf-8', 404
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            # Her scrape için erişim logu yazma
+            pass
+
+    return _MetricsRequestHandler
+
+def start_metrics_server(port: int, host: str = '0.0.0.0') -> Optional['ThreadingHTTPServer']:
+    """Metrik HTTP sunucusunu arka plan thread'inde başlatır (port 0 ise kapalı)"""
+    if not port:
+        return None
+    from http.server import ThreadingHTTPServer
+    try:
+        server = ThreadingHTTPServer((host, port), _make_request_handler())
+    except OSError as e:
+        logger.error(f"Metrik sunucusu başlatılamadı ({host}:{port}): {e}")
+        return None
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    logger.info(f"📈 Metrik sunucusu başlatıldı: http://{host}:{port}/metrics")
+    return server
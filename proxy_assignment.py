@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Hesap-proxy atama motoru
+Ağırlıklı rendezvous (HRW) hashing ile her hesaba kararlı bir proxy seçer
+"""
+
+import math
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_MASK64 = (1 << 64) - 1
+# Sağlık ağırlığı bunun altındaki proxy'lerdeki mevcut atamalar korunmaz
+MIN_STICKY_WEIGHT = 0.25
+# Ağırlık hiçbir zaman sıfır olmaz; sağlıksız proxy'ler yalnızca son çare olarak seçilir
+MIN_WEIGHT = 0.01
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def _mix64(value: int) -> int:
+    """splitmix64 sonlandırıcısı; iki hash'in XOR'unu düzgün dağılımlı hale getirir"""
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & _MASK64
+    return value ^ (value >> 31)
+
+def rendezvous_score(account_hash: int, proxy_hash: int, weight: float = 1.0) -> float:
+    """Ağırlıklı rendezvous skoru: -w / ln(u), u hesap+proxy çiftine özgü (0, 1) sayısı"""
+    u = (_mix64(account_hash ^ proxy_hash) + 1) / (_MASK64 + 2)
+    return -weight / math.log(u)
+
+def proxy_host_port(proxy_address: str) -> str:
+    """user:pass@host:port biçiminden host:port kısmını döndürür (metrik etiketiyle aynı)"""
+    return proxy_address.rsplit('@', 1)[-1]
+
+def get_proxy_health_weights(proxies: Iterable[str]) -> Dict[str, float]:
+    """Client oluşturma sonuçlarından proxy başına sağlık ağırlığı (0-1) hesaplar.
+
+    tgbot_client_create_seconds{proxy,result} sayaçları kullanılır; hiç denenmemiş
+    proxy'nin ağırlığı 1'dir, her başarısızlık ağırlığı Laplace düzeltmesiyle düşürür.
+    """
+    from metrics import CLIENT_CREATE_SECONDS
+
+    totals: Dict[str, int] = {}
+    successes: Dict[str, int] = {}
+    for proxy_label, result in CLIENT_CREATE_SECONDS.get_label_values():
+        count = CLIENT_CREATE_SECONDS.get_count(proxy=proxy_label, result=result)
+        totals[proxy_label] = totals.get(proxy_label, 0) + count
+        if result == 'ok':
+            successes[proxy_label] = successes.get(proxy_label, 0) + count
+
+    weights = {}
+    for proxy in proxies:
+        label = proxy_host_port(proxy)
+        total = totals.get(label, 0)
+        weights[proxy] = 1.0 if not total else max(MIN_WEIGHT, (successes.get(label, 0) + 1) / (total + 1))
+    return weights
+
+def assign_proxies(accounts: List[str], proxies: List[str],
+                   previous: Optional[Dict[str, str]] = None,
+                   weights: Optional[Dict[str, float]] = None,
+                   max_accounts_per_proxy: int = 0) -> Dict[str, str]:
+    """Hesaplara proxy atar; proxy'siz kalan hesaplar "" alır.
+
+    - Önceki atama, proxy hâlâ listede, yeterince sağlıklı ve kapasitesi doluysa korunur
+      (hesap aynı IP'den bağlanmaya devam eder).
+    - Yeni/boşta kalan hesaplar, ağırlıklı rendezvous sıralamasında kapasitesi dolmamış
+      ilk proxy'ye atanır. Liste değiştiğinde yalnızca etkilenen hesaplar yer değiştirir.
+    - ``max_accounts_per_proxy`` 0 ise kapasite hesapları proxy'lere eşit böler.
+
+    Maliyet, yeni atanan hesap sayısı x proxy sayısıdır; kalıcı atamalar için sıfırdır.
+    """
+    assignment: Dict[str, str] = {}
+    if not proxies:
+        return {account: "" for account in accounts}
+
+    unique_proxies = list(dict.fromkeys(proxies))
+    weights = weights or {}
+    capacity = max_accounts_per_proxy or math.ceil(len(accounts) / len(unique_proxies))
+    load = {proxy: 0 for proxy in unique_proxies}
+    previous = previous or {}
+
+    # Deterministik sonuç için hesaplar sıralı işlenir
+    ordered_accounts = sorted(dict.fromkeys(accounts))
+    pending = []
+    for account in ordered_accounts:
+        proxy = previous.get(account)
+        if (proxy in load and load[proxy] < capacity
+                and weights.get(proxy, 1.0) >= MIN_STICKY_WEIGHT):
+            assignment[account] = proxy
+            load[proxy] += 1
+        else:
+            pending.append(account)
+
+    proxy_hashes = [(proxy, _hash64(proxy), max(MIN_WEIGHT, weights.get(proxy, 1.0))) for proxy in unique_proxies]
+    for account in pending:
+        free = [(proxy, proxy_hash, weight) for proxy, proxy_hash, weight in proxy_hashes if load[proxy] < capacity]
+        if not free:
+            assignment[account] = ""
+            continue
+        account_hash = _hash64(account)
+        best = max(free, key=lambda item: rendezvous_score(account_hash, item[1], item[2]))[0]
+        assignment[account] = best
+        load[best] += 1
+
+    kept = len(ordered_accounts) - len(pending)
+    unassigned = sum(1 for proxy in assignment.values() if not proxy)
+    logger.info("🔗 Proxy ataması: %d korundu, %d yeni, %d proxy'siz (kapasite %d/proxy)",
+                kept, len(pending) - unassigned, unassigned, capacity)
+    return {account: assignment.get(account, "") for account in accounts}
@@ -4,12 +4,12 @@ Proxy yönetim sınıfı
 Proxy dosyasını okur ve hesaplara dağıtır
 """
 
-import os
-import random
 import sqlite3
 import logging
 from typing import List, Dict, Optional, Tuple
-from database import DatabaseManager
+from database import db_manager
+from container import LazySingleton
+from proxy_store import ProxyStore
 import socks  # SOCKS5 desteği için
 
 logger = logging.getLogger(__name__)
@@ -19,80 +19,52 @@ class ProxyManager:
     
     def __init__(self, proxy_file: str = "proxies.txt"):
         self.proxy_file = proxy_file
-        self.db_manager = DatabaseManager()
-        self.proxies = self.load_proxies()
+        # Ayrı DatabaseManager yerine paylaşılan örnek; şema işlemleri süreçte bir kez yapılır
+        self.db_manager = db_manager
+        self.store = ProxyStore(proxy_file, self.parse_proxy_line)
+        self.store.refresh()
+    
+    @property
+    def proxies(self) -> List[Dict]:
+        """Geçerli proxy'lerin listesi (dosya değişmedikçe yeniden ayrıştırılmaz)"""
+        return self.store.proxies
     
     def load_proxies(self) -> List[Dict]:
-        """Proxy dosyasını yükler"""
-        proxies = []
-        
-        if not os.path.exists(self.proxy_file):
-            logger.warning(f"Proxy dosyası bulunamadı: {self.proxy_file}")
-            return proxies
-        
-        try:
-            with open(self.proxy_file, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    
-                    # Boş satır ve yorum satırlarını atla
-                    if not line or line.startswith('#'):
-                        continue
-                    
-                    # Proxy formatını parse et
-                    proxy_info = self.parse_proxy_line(line)
-                    if proxy_info:
-                        proxies.append(proxy_info)
-                    else:
-                        logger.warning(f"Geçersiz proxy formatı (satır {line_num}): {line}")
-            
-            logger.info(f"{len(proxies)} proxy yüklendi")
-            return proxies
-            
-        except Exception as e:
-            logger.error(f"Proxy dosyası yüklenemedi: {e}")
-            return []
+        """Proxy dosyasını (değiştiyse) yükler ve geçerli proxy'leri döndürür"""
+        self.store.refresh()
+        return self.store.proxies
 
     def get_raw_lines(self) -> List[str]:
-        """proxies.txt içeriğini ham satırlar halinde döndürür (yorumlar/boşlar hariç değil)."""
-        if not os.path.exists(self.proxy_file):
-            return []
-        try:
-            with open(self.proxy_file, 'r', encoding='utf-8') as f:
-                return [line.rstrip('\n') for line in f]
-        except Exception as e:
-            logger.error(f"Proxy dosyası okunamadı: {e}")
-            return []
+        """proxies.txt'deki boş olmayan satırları (yorumlar dahil) sırayla döndürür."""
+        self.store.refresh()
+        return self.store.export_lines()
 
     def write_raw_lines(self, lines: List[str]) -> bool:
-        """Ham satırları proxies.txt dosyasına yazar ve cache'i yeniler."""
-        try:
-            with open(self.proxy_file, 'w', encoding='utf-8') as f:
-                for line in lines:
-                    f.write(f"{line}\n")
-            self.reload_proxies()
-            return True
-        except Exception as e:
-            logger.error(f"Proxy dosyası yazılamadı: {e}")
-            return False
+        """Ham satırları proxies.txt dosyasına yazar; değişmeyen satırlar yeniden ayrıştırılmaz."""
+        return self.store.replace_all(lines)
+
+    def add_proxies(self, lines: List[str]) -> int:
+        """Satırları toplu ekler (var olanlar atlanır); eklenen sayısını döndürür."""
+        self.store.refresh()
+        return self.store.add(lines)
+
+    def remove_proxies(self, lines: List[str]) -> int:
+        """Satırları toplu siler; silinen sayısını döndürür."""
+        self.store.refresh()
+        return self.store.remove(lines)
+
+    def delete_proxies_by_index(self, indexes_1_based: List[int]) -> int:
+        """1'den başlayan index'lerdeki satırları tek yazmada siler; silinen sayısını döndürür."""
+        self.store.refresh()
+        return self.store.remove_indexes(indexes_1_based)
 
     def delete_proxy_by_index(self, index_1_based: int) -> bool:
         """1'den başlayan index ile bir satırı siler."""
-        lines = self.get_raw_lines()
-        if index_1_based < 1 or index_1_based > len(lines):
-            return False
-        del lines[index_1_based - 1]
-        return self.write_raw_lines(lines)
+        return self.delete_proxies_by_index([index_1_based]) > 0
 
     def delete_proxy_by_line(self, line_text: str) -> bool:
         """Tam satır eşleşmesi ile siler."""
-        lines = self.get_raw_lines()
-        try:
-            idx = lines.index(line_text)
-        except ValueError:
-            return False
-        del lines[idx]
-        return self.write_raw_lines(lines)
+        return self.remove_proxies([line_text]) > 0
     
     def parse_proxy_line(self, line: str) -> Optional[Dict]:
         """Proxy satırını parse eder. Desteklenen formatlar:
@@ -152,10 +124,8 @@ class ProxyManager:
             
             # Tüm proxy'leri SOCKS5 olarak kullan (daha güvenilir)
             proxy_info['type'] = 'socks5'
-            logger.info(f"🔄 Proxy SOCKS5 olarak ayarlandı: {proxy_info['host']}:{proxy_info['port']}")
-            
-            # Debug: Parse edilen proxy bilgisini logla
-            logger.info(f"🔍 Parse Debug: '{line}' -> {proxy_info}")
+            # Her proxy için çağrılır: kimlik bilgisi olmadan, yalnızca DEBUG'da
+            logger.debug("Proxy ayrıştırıldı (socks5): %s:%s", proxy_info['host'], proxy_info['port'])
             
             return proxy_info
             
@@ -198,9 +168,6 @@ class ProxyManager:
     
     def get_telethon_proxy(self, proxy_info: Dict) -> Dict:
         """Telethon için proxy formatına çevirir - SOCKS5 odaklı sistem"""
-        # Debug: Proxy bilgilerini logla
-        logger.info(f"🔍 Proxy Debug: {proxy_info}")
-        
         # SOCKS5 proxy formatı (Telethon için)
         return {
             'proxy_type': socks.SOCKS5,
@@ -211,21 +178,14 @@ class ProxyManager:
         }
     
     def assign_proxies_to_accounts(self, session_files: List[str]) -> Dict[str, Dict]:
-        """Proxy'leri hesaplara atar"""
+        """Proxy'leri hesaplara atar (DatabaseManager.distribute_proxies ile aynı motor)"""
         if not self.proxies:
             logger.warning("Proxy bulunamadı, proxy olmadan devam ediliyor")
             return {session_file: None for session_file in session_files}
         
-        # Proxy'leri döngüsel olarak dağıt
-        account_proxy_map = {}
-        for i, session_file in enumerate(session_files):
-            proxy_index = i % len(self.proxies)
-            account_proxy_map[session_file] = self.proxies[proxy_index]
-        
-        # Veritabanına kaydet
-        self.save_proxy_assignments(account_proxy_map)
-        
-        return account_proxy_map
+        by_string = {self.get_proxy_string(proxy_info): proxy_info for proxy_info in self.proxies}
+        assignments = self.db_manager.distribute_proxies(session_files, list(by_string))
+        return {session_file: by_string.get(proxy_string) for session_file, proxy_string in assignments.items()}
     
     def save_proxy_assignments(self, account_proxy_map: Dict[str, Dict]) -> None:
         """Proxy atamalarını veritabanına kaydeder"""
@@ -331,21 +291,19 @@ class ProxyManager:
     
     def get_random_proxy(self) -> Optional[Dict]:
         """Random proxy döndürür"""
-        if not self.proxies:
-            return None
-        return random.choice(self.proxies)
+        return self.store.random_proxy()
     
     def get_proxy_count(self) -> int:
         """Toplam proxy sayısını döndürür"""
-        return len(self.proxies)
+        return len(self.store)
     
-    def reload_proxies(self) -> int:
-        """Proxy'leri yeniden yükler"""
-        self.proxies = self.load_proxies()
-        return len(self.proxies)
+    def reload_proxies(self, force: bool = False) -> int:
+        """Proxy dosyası değiştiyse yeniden yükler (force ile her durumda)"""
+        self.store.refresh(force)
+        return len(self.store)
 
 # Global proxy manager instance'ı
-proxy_manager = ProxyManager()
+proxy_manager = LazySingleton('proxy_manager', ProxyManager)
 
 if __name__ == "__main__":
     # Test
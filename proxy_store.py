@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Proxy deposu
+proxies.txt satırlarını satır metnine göre anahtarlanmış bellek içi bir dizinde tutar
+"""
+
+import os
+import random
+import logging
+import tempfile
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ProxyStore:
+    """proxies.txt'nin dizinlenmiş bellek içi kopyası
+
+    Satırlar, dosyadaki sırayı koruyan bir sözlükte satır metnine göre tutulur;
+    arama, ekleme ve silme O(1)'dir. Geçerli satırların ayrıştırılmış hali ayrıca
+    saklanır. ``refresh()`` dosyanın mtime/boyutu değişmedikçe hiçbir şey yapmaz,
+    değiştiyse yalnızca yeni satırları ayrıştırır. Toplu ekleme/silme dosyayı bir
+    kez, atomik olarak yazar.
+    """
+
+    def __init__(self, proxy_file: str, parser: Callable[[str], Optional[Dict]]):
+        self.proxy_file = proxy_file
+        self.parser = parser
+        # satır -> ayrıştırılmış proxy (yorum/geçersiz satırlarda None)
+        self._entries: Dict[str, Optional[Dict]] = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+        # Sıra/proxy listesi önbellekleri; değişiklikte geçersiz kılınır
+        self._lines_cache: Optional[List[str]] = None
+        self._proxies_cache: Optional[List[Dict]] = None
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.proxy_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _invalidate(self) -> None:
+        self._lines_cache = None
+        self._proxies_cache = None
+
+    def _parse(self, line: str) -> Optional[Dict]:
+        if line.startswith('#'):
+            return None
+        return self.parser(line)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Dosya değiştiyse dizini günceller; güncelleme yapıldıysa True döndürür"""
+        with self._lock:
+            signature = self._file_signature()
+            if not force and signature == self._signature:
+                return False
+            if signature is None:
+                if self._entries:
+                    logger.warning(f"Proxy dosyası bulunamadı: {self.proxy_file}")
+                self._entries = {}
+                self._signature = None
+                self._invalidate()
+                return True
+            try:
+                with open(self.proxy_file, 'r', encoding='utf-8') as f:
+                    raw_lines = f.read().splitlines()
+            except Exception as e:
+                logger.error(f"Proxy dosyası okunamadı: {e}")
+                return False
+
+            previous = self._entries
+            entries: Dict[str, Optional[Dict]] = {}
+            parsed = 0
+            for raw_line in raw_lines:
+                line = raw_line.strip()
+                if not line or line in entries:
+                    continue
+                if line in previous:
+                    entries[line] = previous[line]
+                else:
+                    entries[line] = self._parse(line)
+                    parsed += 1
+            self._entries = entries
+            self._signature = signature
+            self._invalidate()
+            invalid = sum(1 for line, info in entries.items() if info is None and not line.startswith('#'))
+            if invalid:
+                logger.warning("Geçersiz proxy satırı sayısı: %d", invalid)
+            logger.info("Proxy dosyası yüklendi: %d proxy (%d yeni satır ayrıştırıldı)",
+                        len(self.proxies), parsed)
+            return True
+
+    def _write(self) -> bool:
+        """Dizini dosyaya atomik olarak yazar"""
+        directory = os.path.dirname(os.path.abspath(self.proxy_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.proxies_', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for line in self._entries:
+                    f.write(f"{line}\n")
+            os.replace(tmp_path, self.proxy_file)
+        except Exception as e:
+            logger.error(f"Proxy dosyası yazılamadı: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+        # Kendi yazdığımız dosyayı yeniden ayrıştırmaya gerek yok
+        self._signature = self._file_signature()
+        return True
+
+    @property
+    def lines(self) -> List[str]:
+        """Dosyadaki sırayla tüm (boş olmayan) satırlar"""
+        with self._lock:
+            if self._lines_cache is None:
+                self._lines_cache = list(self._entries)
+            return self._lines_cache
+
+    @property
+    def proxies(self) -> List[Dict]:
+        """Geçerli satırların ayrıştırılmış halleri"""
+        with self._lock:
+            if self._proxies_cache is None:
+                self._proxies_cache = [info for info in self._entries.values() if info]
+            return self._proxies_cache
+
+    def __len__(self) -> int:
+        return len(self.proxies)
+
+    def __contains__(self, line: str) -> bool:
+        return line.strip() in self._entries
+
+    def get(self, line: str) -> Optional[Dict]:
+        """Satır metnine göre ayrıştırılmış proxy'yi döndürür"""
+        return self._entries.get(line.strip())
+
+    def get_line(self, index_1_based: int) -> Optional[str]:
+        """1'den başlayan sıra numarasındaki satırı döndürür"""
+        lines = self.lines
+        if 1 <= index_1_based <= len(lines):
+            return lines[index_1_based - 1]
+        return None
+
+    def random_proxy(self) -> Optional[Dict]:
+        proxies = self.proxies
+        return random.choice(proxies) if proxies else None
+
+    def add(self, lines: Iterable[str]) -> int:
+        """Satırları ekler (zaten var olanlar atlanır); eklenen sayısını döndürür"""
+        with self._lock:
+            added = 0
+            for raw_line in lines:
+                line = raw_line.strip()
+                if not line or line in self._entries:
+                    continue
+                self._entries[line] = self._parse(line)
+                added += 1
+            if added:
+                self._invalidate()
+                if not self._write():
+                    return 0
+            return added
+
+    def remove(self, lines: Iterable[str]) -> int:
+        """Satırları siler; silinen sayısını döndürür"""
+        with self._lock:
+            removed = 0
+            for raw_line in lines:
+                line = raw_line.strip()
+                if line in self._entries:
+                    del self._entries[line]
+                    removed += 1
+            if removed:
+                self._invalidate()
+                if not self._write():
+                    return 0
+            return removed
+
+    def remove_indexes(self, indexes_1_based: Iterable[int]) -> int:
+        """Sıra numaralarına göre satırları tek seferde siler"""
+        with self._lock:
+            lines = self.lines
+            targets = [lines[i - 1] for i in set(indexes_1_based) if 1 <= i <= len(lines)]
+            return self.remove(targets)
+
+    def replace_all(self, lines: Iterable[str]) -> bool:
+        """Tüm içeriği verilen satırlarla değiştirir (dosya içe aktarma)"""
+        with self._lock:
+            previous = self._entries
+            entries: Dict[str, Optional[Dict]] = {}
+            for raw_line in lines:
+                line = raw_line.strip()
+                if not line or line in entries:
+                    continue
+                entries[line] = previous[line] if line in previous else self._parse(line)
+            self._entries = entries
+            self._invalidate()
+            return self._write()
+
+    def export_lines(self) -> List[str]:
+        """Dizinin dosyaya yazılacak satırlarını döndürür"""
+        return list(self.lines)
@@ -4,6 +4,7 @@
 Bekleyen istekleri sürekli kontrol eder ve işler
 """
 
+import time
 import asyncio
 import logging
 import threading
@@ -22,6 +23,9 @@ class RequestProcessor:
         self.is_running = False
         self.process_thread = None
         self.stop_event = threading.Event()
+        # Sonuçlanmış isteklerin arşive taşınma aralığı (saniye, 0 = kapalı)
+        self.compaction_interval = 3600
+        self.last_compaction = 0.0
     
     def start(self) -> None:
         """İstek işleyiciyi başlatır"""
@@ -69,6 +73,8 @@ class RequestProcessor:
             except Exception as e:
                 logger.error(f"İstek işleme döngüsü hatası: {e}")
             
+            self._maybe_compact()
+            
             # Bekle
             self.stop_event.wait(self.check_interval)
     
@@ -91,6 +97,19 @@ class RequestProcessor:
         except Exception as e:
             logger.error(f"💥 İşlem döngüsü hatası: {e}")
     
+    def _maybe_compact(self) -> None:
+        """Aralık dolduysa sonuçlanmış istekleri arşive taşır"""
+        if not self.compaction_interval:
+            return
+        now = time.monotonic()
+        if self.last_compaction and now - self.last_compaction < self.compaction_interval:
+            return
+        self.last_compaction = now
+        try:
+            db_manager.compact_request_pool()
+        except Exception as e:
+            logger.error(f"Arşivleme hatası: {e}")
+    
     async def _cleanup_old_clients(self) -> None:
         """Eski client'ları temizler"""
         try:
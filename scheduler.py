@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Global istek zamanlayıcısı
+Birden fazla kanalın bekleyen isteklerini ağırlıklı adil kuyruklama (WFQ) ile
+ortak zaman dilimlerine serpiştirir
+"""
+
+import heapq
+import bisect
+import random
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Yürütücü istekleri tek tek, aralarında en az bu kadar bekleyerek işler
+SLOT_SECONDS = 5
+# Aynı hesabın uygun bir istek bulmak için kuyrukta en fazla bu kadar ilerisine bakılır
+ACCOUNT_LOOKAHEAD = 64
+
+def align_to_slot(moment: datetime, slot_seconds: float = SLOT_SECONDS) -> datetime:
+    """Anı ortak slot ızgarasına (epoch'tan itibaren slot_seconds katları) yukarı yuvarlar.
+
+    Farklı anlarda yapılan planlar aynı ızgarayı kullanır; yerinde kalan istekler
+    sonraki planlarda tam olarak bir slotu doldurur.
+    """
+    timestamp = moment.timestamp()
+    return datetime.fromtimestamp(-(-timestamp // slot_seconds) * slot_seconds)
+
+def release_offsets(count: int, window_seconds: float, rng: random.Random) -> List[float]:
+    """Kanal penceresine yayılmış rastgele serbest bırakılma anları (saniye, ilki 0)"""
+    if count <= 0:
+        return []
+    offsets = sorted(rng.uniform(0, window_seconds) for _ in range(count - 1))
+    return [0.0] + offsets
+
+def account_is_free(times: List[datetime], slot_time: datetime, spacing: timedelta) -> bool:
+    """Hesabın sıralı istek zamanlarından hiçbiri slot_time'a spacing'den yakın değilse True"""
+    index = bisect.bisect_right(times, slot_time - spacing)
+    return index == len(times) or times[index] >= slot_time + spacing
+
+def plan_fair_schedule(queues: Dict[int, Dict], start: datetime,
+                       slot_seconds: float = SLOT_SECONDS,
+                       account_spacing: float = 0,
+                       account_times: Optional[Dict[str, List[datetime]]] = None,
+                       blocked_slots: Optional[List[datetime]] = None,
+                       rng: Optional[random.Random] = None) -> Dict[int, datetime]:
+    """Kanalların isteklerini ortak slotlara adil biçimde dağıtır.
+
+    ``queues``: kanal_id -> {'requests': [(istek_id, hesap), ...], 'deadline': datetime}
+
+    Her kanalın ağırlığı, kalan istek sayısının bitiş zamanına kadar kalan süreye
+    oranıdır (gereken hız). Her slotta, serbest bırakılma anı gelmiş kanallar
+    arasından sanal bitiş zamanı en küçük olana istek verilir; böylece kapasite
+    yetmediğinde tüm kanallar pencerelerine orantılı olarak gecikir, yettiğinde
+    istekler pencere boyunca rastgele yayılır. Aynı hesaba ait iki istek arasında
+    en az ``account_spacing`` saniye bırakılır; ``account_times`` yerinde kalan
+    isteklerin hesap başına zamanlarıdır. ``blocked_slots`` dolu slotlardır.
+
+    Dönen sözlük istek_id -> planlanan zaman'dır.
+    """
+    rng = rng or random.Random()
+    account_times = {account: sorted(times) for account, times in (account_times or {}).items()}
+    blocked = {int((slot - start).total_seconds() // slot_seconds) for slot in (blocked_slots or []) if slot >= start}
+    spacing = timedelta(seconds=account_spacing)
+
+    state = {}
+    heap: List[Tuple[float, int]] = []
+    for channel_id, queue in queues.items():
+        # Ters sırada tutulur: sıradaki istek listenin sonundadır, pop ucuzdur
+        requests = list(reversed(queue['requests']))
+        if not requests:
+            continue
+        window = max(slot_seconds, (queue['deadline'] - start).total_seconds())
+        weight = len(requests) / window
+        state[channel_id] = {
+            'requests': requests,
+            'releases': release_offsets(len(requests), window * (len(requests) - 1) / len(requests), rng),
+            'served': 0,
+            'step': 1.0 / weight,
+            'deadline': queue['deadline'],
+        }
+        # Sanal zaman: tüm kanallar aynı noktadan başlar, ağırlığa göre ilerler
+        heapq.heappush(heap, (state[channel_id]['step'], channel_id))
+
+    plan: Dict[int, datetime] = {}
+    late: Dict[int, float] = {}
+    slot = 0
+    while heap:
+        if slot in blocked:
+            slot += 1
+            continue
+        now_offset = slot * slot_seconds
+        slot_time = start + timedelta(seconds=now_offset)
+        deferred = []
+        chosen = None
+        while heap:
+            virtual_finish, channel_id = heapq.heappop(heap)
+            channel = state[channel_id]
+            if channel['releases'][channel['served']] > now_offset:
+                deferred.append((virtual_finish, channel_id))
+                continue
+            requests = channel['requests']
+            index = next((i for i in range(len(requests) - 1, max(-1, len(requests) - 1 - ACCOUNT_LOOKAHEAD), -1)
+                          if not account_spacing
+                          or account_is_free(account_times.get(requests[i][1], []), slot_time, spacing)), None)
+            if index is None:
+                deferred.append((virtual_finish, channel_id))
+                continue
+            chosen = (virtual_finish, channel_id, index)
+            break
+        for item in deferred:
+            heapq.heappush(heap, item)
+
+        if chosen is None:
+            # Uygun kanal yok: bir sonraki serbest bırakılma anına atla
+            next_release = min((state[cid]['releases'][state[cid]['served']] for _, cid in heap), default=now_offset)
+            slot = max(slot + 1, int(-(-next_release // slot_seconds)))
+            continue
+
+        virtual_finish, channel_id, index = chosen
+        channel = state[channel_id]
+        request_id, account = channel['requests'].pop(index)
+        plan[request_id] = slot_time
+        if account_spacing:
+            bisect.insort(account_times.setdefault(account, []), slot_time)
+        channel['served'] += 1
+        if channel['requests']:
+            heapq.heappush(heap, (virtual_finish + channel['step'], channel_id))
+        elif slot_time - channel['deadline'] > timedelta(seconds=slot_seconds):
+            late[channel_id] = (slot_time - channel['deadline']).total_seconds()
+        slot += 1
+
+    if late:
+        logger.warning("⚠️ %d kanal bitiş zamanını aşıyor (kapasite yetersiz, en fazla %.0f sn)",
+                       len(late), max(late.values()))
+    return plan
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Webhook test aracı
+Kaydedilmiş bir Update JSON dosyasını yerel webhook endpoint'ine gönderir
+
+Kullanım:
+    python send_test_update.py update.json
+    python send_test_update.py update.json http://127.0.0.1:8443/telegram
+"""
+
+import sys
+import json
+import requests
+from config import get_webhook_port, get_webhook_path, get_webhook_secret
+
+def send_test_update(update_file: str, endpoint: str = None) -> int:
+    """Update JSON'unu webhook'a POST eder ve HTTP durum kodunu döndürür"""
+    endpoint = endpoint or f"http://127.0.0.1:{get_webhook_port()}/{get_webhook_path()}"
+
+    with open(update_file, 'r', encoding='utf-8') as f:
+        update = json.load(f)
+
+    response = requests.post(
+        endpoint,
+        json=update,
+        headers={"X-Telegram-Bot-Api-Secret-Token": get_webhook_secret()},
+        timeout=10
+    )
+
+    print(f"Endpoint: {endpoint}")
+    print(f"Durum: {response.status_code}")
+    if response.text:
+        print(f"Yanıt: {response.text}")
+    return response.status_code
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    status = send_test_update(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    sys.exit(0 if status == 200 else 1)
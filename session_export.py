@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Session dışa aktarma
+Session dosyalarını belleği şişirmeden, boyut sınırına göre bölünmüş ZIP arşivlerine yazar
+"""
+
+import os
+import zipfile
+import logging
+import tempfile
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Telegram bot API dosya yükleme sınırı 50 MB; zarf/başlık payı bırak
+DEFAULT_MAX_ARCHIVE_BYTES = 49 * 1024 * 1024
+# Bu boyuta kadar arşiv bellekte tutulur, aşınca diske taşar
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+# ZIP yerel başlık + merkezi dizin kaydı + bitiş kaydı için dosya başı pay
+_ENTRY_OVERHEAD = 30 + 46 + 22
+
+def _part_name(zip_name: str, part: int, part_count: int) -> str:
+    """Tek arşivse adı aynen, birden fazlaysa parça numaralı adı döndürür"""
+    if part_count == 1:
+        return zip_name
+    base, ext = os.path.splitext(zip_name)
+    return f"{base}_part{part}{ext or '.zip'}"
+
+def _estimate_entry_size(file_size: int, arcname: str, compress_type: int) -> int:
+    """Dosyanın arşivde kaplayacağı en kötü durum boyutunu tahmin eder.
+
+    Deflate sıkıştırılamayan veride bile çok az büyür; küçük bir pay yeterlidir.
+    """
+    estimate = file_size + _ENTRY_OVERHEAD + 2 * len(arcname.encode('utf-8'))
+    if compress_type == zipfile.ZIP_DEFLATED:
+        estimate += file_size // 1000 + 64
+    return estimate
+
+def build_session_archives(source_dir: str, session_files: List[str], zip_name: str,
+                           max_archive_bytes: int = DEFAULT_MAX_ARCHIVE_BYTES,
+                           compression_level: int = 0,
+                           report: Optional[Callable[[int, int], None]] = None) -> List[Tuple[str, tempfile.SpooledTemporaryFile]]:
+    """Session dosyalarını bir veya daha fazla ZIP arşivine yazar (thread içinde çalışır).
+
+    Her arşiv ``SpooledTemporaryFile`` içine yazılır; ``SPOOL_MAX_BYTES`` aşılınca
+    içerik diske taşındığı için bellek kullanımı arşiv boyutundan bağımsızdır.
+    ``compression_level`` 0 ise dosyalar sıkıştırılmadan (ZIP_STORED) eklenir -
+    SQLite session dosyaları zaten yoğun olduğu için bu en hızlı seçenektir;
+    1-9 arası değerler ZIP_DEFLATED ile o seviyede sıkıştırır.
+
+    Dönen (dosya_adı, dosya) listesindeki dosyalar başa sarılmıştır; kapatmak
+    çağıranın sorumluluğundadır.
+    """
+    if compression_level > 0:
+        compress_type = zipfile.ZIP_DEFLATED
+        compresslevel = min(compression_level, 9)
+    else:
+        compress_type = zipfile.ZIP_STORED
+        compresslevel = None
+
+    archives: List[tempfile.SpooledTemporaryFile] = []
+    spool = None
+    zip_file = None
+    # Merkezi dizin, yazılan veriye ek olarak kapanışta eklenir
+    pending_directory = 0
+    entries = 0
+    total = len(session_files)
+
+    def close_current() -> None:
+        nonlocal zip_file, spool
+        if zip_file is not None:
+            zip_file.close()
+            spool.seek(0)
+            archives.append(spool)
+        zip_file = None
+        spool = None
+
+    try:
+        for i, session_file in enumerate(session_files, 1):
+            file_path = os.path.join(source_dir, session_file)
+            try:
+                file_size = os.path.getsize(file_path)
+            except OSError:
+                # Bu arada taşınmış/silinmiş dosyalar atlanır
+                if report:
+                    report(i, total)
+                continue
+
+            estimate = _estimate_entry_size(file_size, session_file, compress_type)
+            if zip_file is not None and entries and spool.tell() + pending_directory + estimate > max_archive_bytes:
+                close_current()
+            if zip_file is None:
+                spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+                zip_file = zipfile.ZipFile(spool, 'w', compress_type, compresslevel=compresslevel)
+                pending_directory = 0
+                entries = 0
+            if estimate > max_archive_bytes:
+                logger.warning(f"{session_file} tek başına arşiv sınırını aşıyor ({file_size} bayt)")
+
+            zip_file.write(file_path, session_file)
+            pending_directory += 46 + len(session_file.encode('utf-8'))
+            entries += 1
+            if report:
+                report(i, total)
+
+        close_current()
+    except Exception:
+        if zip_file is not None:
+            zip_file.close()
+        if spool is not None:
+            spool.close()
+        for archive in archives:
+            archive.close()
+        raise
+
+    return [(_part_name(zip_name, part, len(archives)), archive)
+            for part, archive in enumerate(archives, 1)]
+
+def get_archive_size(archive) -> int:
+    """Başa sarılmış arşiv dosyasının boyutunu, konumu değiştirmeden döndürür"""
+    position = archive.tell()
+    archive.seek(0, os.SEEK_END)
+    size = archive.tell()
+    archive.seek(position)
+    return size
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Session dosya yöneticisi
+Sessions klasöründeki .session dosyalarını listeler, içe aktarır ve siler
+"""
+
+import os
+import io
+import glob
+import hashlib
+import sqlite3
+import logging
+import zipfile
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+from container import LazySingleton
+
+logger = logging.getLogger(__name__)
+
+# Geçerli bir SQLite veritabanının ilk 16 baytı
+SQLITE_HEADER = b'SQLite format 3\x00'
+# ZIP içe aktarmada kullanılan thread sayısı
+IMPORT_WORKERS = 8
+
+class SessionManager:
+    """Session dosyalarını yöneten sınıf"""
+    
+    def __init__(self, sessions_dir: str = "Sessions"):
+        self.sessions_dir = sessions_dir
+        # yol -> ((mtime_ns, boyut), parmak izi)
+        self._fingerprint_cache: Dict[str, Tuple[Tuple[int, int], Optional[str]]] = {}
+        self._import_lock = threading.Lock()
+        self.ensure_sessions_dir()
+    
+    def ensure_sessions_dir(self) -> None:
+        """Sessions klasörünün var olduğundan emin olur"""
+        if not os.path.exists(self.sessions_dir):
+            os.makedirs(self.sessions_dir)
+            logger.info(f"Sessions klasörü oluşturuldu: {self.sessions_dir}")
+    
+    def count_session_files(self) -> int:
+        """Sessions klasöründeki .session dosyalarının sayısını döndürür"""
+        try:
+            # .session uzantılı dosyaları bul
+            pattern = os.path.join(self.sessions_dir, "*.session")
+            session_files = glob.glob(pattern)
+            count = len(session_files)
+            
+            logger.info(f"Sessions klasöründe {count} adet .session dosyası bulundu")
+            return count
+            
+        except Exception as e:
+            logger.error(f"Session dosyaları sayılırken hata: {e}")
+            return 0
+    
+    def get_session_files(self) -> List[str]:
+        """Sessions klasöründeki .session dosyalarının listesini döndürür"""
+        try:
+            pattern = os.path.join(self.sessions_dir, "*.session")
+            session_files = glob.glob(pattern)
+            # Frozens alt klasöründekileri dışla
+            frozens_dir = os.path.join(self.sessions_dir, "Frozens")
+            if os.path.isdir(frozens_dir):
+                frozen_names = set(os.listdir(frozens_dir))
+                session_files = [p for p in session_files if os.path.basename(p) not in frozen_names]
+            
+            # Sadece dosya adlarını döndür (tam yol değil)
+            file_names = [os.path.basename(f) for f in session_files]
+            return file_names
+            
+        except Exception as e:
+            logger.error(f"Session dosyaları listelenirken hata: {e}")
+            return []
+    
+    def get_session_info(self) -> dict:
+        """Session dosyaları hakkında detaylı bilgi döndürür"""
+        try:
+            session_files = self.get_session_files()
+            total_count = len(session_files)
+            
+            # Dosya boyutlarını hesapla
+            total_size = 0
+            for file_name in session_files:
+                file_path = os.path.join(self.sessions_dir, file_name)
+                if os.path.exists(file_path):
+                    total_size += os.path.getsize(file_path)
+            
+            # Boyutu MB'ye çevir
+            size_mb = total_size / (1024 * 1024)
+            
+            return {
+                "total_count": total_count,
+                "total_size_mb": round(size_mb, 2),
+                "files": session_files
+            }
+            
+        except Exception as e:
+            logger.error(f"Session bilgileri alınırken hata: {e}")
+            return {
+                "total_count": 0,
+                "total_size_mb": 0,
+                "files": []
+            }
+    
+    def get_frozen_count(self) -> int:
+        """Frozen hesap sayısını döndürür"""
+        try:
+            frozens_dir = os.path.join(self.sessions_dir, "Frozens")
+            if not os.path.exists(frozens_dir):
+                return 0
+            
+            pattern = os.path.join(frozens_dir, "*.session")
+            frozen_files = glob.glob(pattern)
+            return len(frozen_files)
+            
+        except Exception as e:
+            logger.error(f"Frozen hesap sayısı alınırken hata: {e}")
+            return 0
+    
+    def get_frozen_files(self) -> List[str]:
+        """Frozen dosyaların listesini döndürür"""
+        try:
+            frozens_dir = os.path.join(self.sessions_dir, "Frozens")
+            if not os.path.exists(frozens_dir):
+                return []
+            
+            pattern = os.path.join(frozens_dir, "*.session")
+            frozen_files = glob.glob(pattern)
+            
+            # Sadece dosya adlarını döndür
+            file_names = [os.path.basename(f) for f in frozen_files]
+            return file_names
+            
+        except Exception as e:
+            logger.error(f"Frozen dosyalar alınırken hata: {e}")
+            return []
+    
+    def get_frozen_info(self) -> dict:
+        """Frozen dosyalar hakkında detaylı bilgi döndürür"""
+        try:
+            frozens_dir = os.path.join(self.sessions_dir, "Frozens")
+            if not os.path.exists(frozens_dir):
+                return {
+                    'total_count': 0,
+                    'total_size_mb': 0,
+                    'files': []
+                }
+            
+            frozen_files = self.get_frozen_files()
+            total_count = len(frozen_files)
+            
+            # Dosya boyutlarını hesapla
+            total_size = 0
+            for file_name in frozen_files:
+                file_path = os.path.join(frozens_dir, file_name)
+                if os.path.exists(file_path):
+                    total_size += os.path.getsize(file_path)
+            
+            # Boyutu MB'ye çevir
+            size_mb = total_size / (1024 * 1024)
+            
+            return {
+                "total_count": total_count,
+                "total_size_mb": round(size_mb, 2),
+                "files": frozen_files
+            }
+            
+        except Exception as e:
+            logger.error(f"Frozen bilgileri alınırken hata: {e}")
+            return {
+                "total_count": 0,
+                "total_size_mb": 0,
+                "files": []
+            }
+
+    def _sanitize_filename(self, file_name: str) -> str:
+        """Gelen dosya adını güvenli bir ada dönüştürür (.session uzantısını korur)."""
+        base = os.path.basename(file_name)
+        # uzantı kontrolü
+        if not base.endswith('.session'):
+            base = f"{base}.session" if '.session' not in base else base
+        # izin verilmeyen karakterleri temizle
+        safe = ''.join(ch for ch in base if ch.isalnum() or ch in ('-', '_', '.', '+'))
+        if not safe.endswith('.session'):
+            safe += '.session'
+        return safe
+
+    @staticmethod
+    def get_auth_key_fingerprint(file_bytes: bytes) -> Optional[str]:
+        """Telethon SQLite session içeriğini doğrular ve auth key parmak izini döndürür.
+
+        Parmak izi, Telegram'ın auth_key_id tanımıyla aynıdır (SHA1(auth_key)'in
+        son 8 baytı). Aynı hesabın farklı adlarla yüklenen kopyaları aynı parmak
+        izini verir. Geçerli bir session değilse None döner. Doğrulama tamamen
+        bellekte yapılır (diske yazmadan).
+        """
+        if len(file_bytes) < 100 or bytes(file_bytes[:16]) != SQLITE_HEADER:
+            return None
+        conn = sqlite3.connect(':memory:')
+        try:
+            conn.deserialize(bytes(file_bytes))
+            row = conn.execute("SELECT auth_key FROM sessions WHERE auth_key IS NOT NULL LIMIT 1").fetchone()
+        except sqlite3.Error:
+            return None
+        finally:
+            conn.close()
+        if not row or not row[0]:
+            return None
+        return hashlib.sha1(row[0]).digest()[-8:].hex()
+
+    def _get_session_dirs(self) -> List[str]:
+        """Aktif, frozen ve invalid session klasörlerini döndürür"""
+        return [
+            self.sessions_dir,
+            os.path.join(self.sessions_dir, "Frozens"),
+            os.path.join(self.sessions_dir, "Invalid"),
+        ]
+
+    def get_known_fingerprints(self) -> Dict[str, str]:
+        """Diskteki tüm session'ların parmak izi -> yol eşlemesini döndürür.
+
+        Dosyalar (yol, mtime, boyut) ile önbelleğe alınır; değişmeyen dosyalar
+        tekrar okunmaz.
+        """
+        fingerprints = {}
+        seen_paths = set()
+        for directory in self._get_session_dirs():
+            if not os.path.isdir(directory):
+                continue
+            for path in glob.glob(os.path.join(directory, "*.session")):
+                seen_paths.add(path)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                cache_key = (stat.st_mtime_ns, stat.st_size)
+                cached = self._fingerprint_cache.get(path)
+                if cached and cached[0] == cache_key:
+                    fingerprint = cached[1]
+                else:
+                    try:
+                        with open(path, 'rb') as f:
+                            fingerprint = self.get_auth_key_fingerprint(f.read())
+                    except OSError:
+                        continue
+                    self._fingerprint_cache[path] = (cache_key, fingerprint)
+                if fingerprint:
+                    fingerprints.setdefault(fingerprint, path)
+        # Silinmiş dosyaların önbellek kayıtlarını at
+        for path in list(self._fingerprint_cache):
+            if path not in seen_paths:
+                del self._fingerprint_cache[path]
+        return fingerprints
+
+    def _write_atomic(self, file_name: str, file_bytes: bytes) -> None:
+        """Dosyayı önce geçici ada yazar, ardından tek adımda yerine taşır"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.sessions_dir, prefix='.import_', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(file_bytes)
+            os.replace(tmp_path, os.path.join(self.sessions_dir, file_name))
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _import_one(self, file_name: str, file_bytes: bytes, fingerprints: Dict[str, str],
+                    reserved_names: set, lock: threading.Lock) -> Tuple[str, str]:
+        """Tek bir session'ı doğrular, tekrar değilse kaydeder.
+
+        (durum, dosya_adı) döndürür; durum 'saved', 'duplicate' veya 'invalid' olur.
+        """
+        fingerprint = self.get_auth_key_fingerprint(file_bytes)
+        if fingerprint is None:
+            return 'invalid', file_name
+
+        safe_name = self._sanitize_filename(file_name)
+        with lock:
+            if fingerprint in fingerprints:
+                return 'duplicate', os.path.basename(fingerprints[fingerprint])
+            # Aynı adda farklı bir hesap varsa parmak iziyle benzersizleştir
+            if safe_name in reserved_names or os.path.exists(os.path.join(self.sessions_dir, safe_name)):
+                name, ext = os.path.splitext(safe_name)
+                safe_name = f"{name}_{fingerprint[:8]}{ext}"
+            fingerprints[fingerprint] = os.path.join(self.sessions_dir, safe_name)
+            reserved_names.add(safe_name)
+
+        try:
+            self._write_atomic(safe_name, file_bytes)
+        except Exception:
+            with lock:
+                fingerprints.pop(fingerprint, None)
+                reserved_names.discard(safe_name)
+            raise
+        return 'saved', safe_name
+
+    def import_session_bytes(self, file_name: str, file_bytes: bytes) -> Tuple[str, str]:
+        """Tek bir .session içeriğini içe aktarır.
+
+        (durum, dosya_adı) döndürür; durum 'saved', 'duplicate' (aynı hesap zaten
+        var, dosya_adı mevcut kopyadır) veya 'invalid' olur.
+        """
+        self.ensure_sessions_dir()
+        with self._import_lock:
+            return self._import_one(file_name, file_bytes, self.get_known_fingerprints(), set(), threading.Lock())
+
+    def import_sessions_from_zip(self, zip_source: Union[bytes, bytearray, memoryview, io.IOBase],
+                                 max_workers: int = IMPORT_WORKERS) -> Dict[str, int]:
+        """ZIP içindeki .session dosyalarını paralel olarak içe aktarır.
+
+        ZIP doğrudan bellekteki tampondan okunur (geçici dosya yazılmaz). Her
+        üye Telethon session'ı olarak doğrulanır, auth key parmak izine göre
+        tekrarlar elenir ve dosyalar atomik olarak yazılır.
+        {'saved', 'duplicate', 'invalid', 'failed'} sayılarını döndürür.
+        """
+        self.ensure_sessions_dir()
+        if isinstance(zip_source, (bytes, bytearray, memoryview)):
+            zip_source = io.BytesIO(zip_source)
+        result = {'saved': 0, 'duplicate': 0, 'invalid': 0, 'failed': 0}
+
+        with self._import_lock, zipfile.ZipFile(zip_source, 'r') as zf:
+            members = [info for info in zf.infolist()
+                       if not info.is_dir() and info.filename.lower().endswith('.session')]
+            fingerprints = self.get_known_fingerprints()
+            reserved_names = set()
+            lock = threading.Lock()
+
+            def process(info: zipfile.ZipInfo) -> str:
+                # ZipFile okumaları kendi içinde kilitlidir; açma/çözme thread'lerde paralel yürür
+                with zf.open(info) as src:
+                    data = src.read()
+                status, _ = self._import_one(os.path.basename(info.filename), data,
+                                             fingerprints, reserved_names, lock)
+                return status
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(process, info) for info in members]
+                for future in futures:
+                    try:
+                        result[future.result()] += 1
+                    except Exception as e:
+                        logger.error(f"ZIP üyesi içe aktarılamadı: {e}")
+                        result['failed'] += 1
+
+        logger.info(f"ZIP içe aktarma: {result['saved']} kaydedildi, {result['duplicate']} tekrar, "
+                    f"{result['invalid']} geçersiz, {result['failed']} hata")
+        return result
+
+    def delete_all_sessions(self) -> int:
+        """Frozens haricindeki tüm .session dosyalarını siler ve kaç dosya silindiğini döndürür."""
+        try:
+            self.ensure_sessions_dir()
+            pattern = os.path.join(self.sessions_dir, "*.session")
+            files = glob.glob(pattern)
+            frozens_dir = os.path.join(self.sessions_dir, "Frozens")
+            frozen_names = set(os.listdir(frozens_dir)) if os.path.isdir(frozens_dir) else set()
+            deleted = 0
+            for path in files:
+                name = os.path.basename(path)
+                if name in frozen_names:
+                    continue
+                try:
+                    os.remove(path)
+                    deleted += 1
+                except Exception:
+                    continue
+            return deleted
+        except Exception as e:
+            logger.error(f"Session dosyaları silinirken hata: {e}")
+            return 0
+
+# Global session manager
+session_manager = LazySingleton('session_manager', SessionManager)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Kullanıcı durum (FSM) önbelleği
+user_states tablosunun önünde bellek içi, write-through durum deposu
+"""
+
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from database import db_manager
+
+logger = logging.getLogger(__name__)
+
+class UserStateStore:
+    """Bellek içi kullanıcı durum deposu
+
+    Okumalar tamamen bellekten yapılır. Yazmalar önce belleğe uygulanır, ardından
+    arka plandaki yazıcı thread'i tarafından toplu olarak user_states tablosuna
+    aktarılır (aynı kullanıcının ardışık yazmaları tek satıra indirgenir).
+    ``ttl_seconds`` boyunca dokunulmayan (yarım bırakılmış) formlar silinir.
+    """
+
+    def __init__(self, db=None, ttl_seconds: int = 3600, flush_interval: float = 1.0):
+        self.db = db or db_manager
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval = flush_interval
+        # user_id -> (state, temp_data, son_dokunma_zamanı)
+        self._states: Dict[str, Tuple[str, Dict, float]] = {}
+        # user_id -> (state, temp_data) veya silme için None
+        self._dirty: Dict[str, Optional[Tuple[str, Dict]]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._writer_thread = None
+
+    def start(self) -> None:
+        """Durumları veritabanından yükler ve yazıcı thread'ini başlatır"""
+        if self._writer_thread and self._writer_thread.is_alive():
+            return
+        self.restore()
+        self._stop_event.clear()
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="user-state-writer", daemon=True)
+        self._writer_thread.start()
+
+    def stop(self) -> None:
+        """Yazıcı thread'ini durdurur ve bekleyen yazmaları aktarır"""
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._writer_thread:
+            self._writer_thread.join(timeout=5)
+            self._writer_thread = None
+        self.flush()
+
+    def restore(self) -> int:
+        """user_states tablosundaki süresi dolmamış durumları belleğe yükler"""
+        now = time.time()
+        loaded = 0
+        expired = []
+        for row in self.db.get_all_user_states():
+            touched_at = self._parse_timestamp(row.get('updated_at')) or now
+            if now - touched_at > self.ttl_seconds:
+                expired.append(row['user_id'])
+                continue
+            with self._lock:
+                self._states[row['user_id']] = (row['state'], row['temp_data'], touched_at)
+            loaded += 1
+
+        if expired:
+            with self._lock:
+                for user_id in expired:
+                    self._dirty[user_id] = None
+            self._wakeup.set()
+        logger.info(f"{loaded} kullanıcı durumu belleğe yüklendi ({len(expired)} süresi dolmuş)")
+        return loaded
+
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> Optional[float]:
+        """SQLite CURRENT_TIMESTAMP (UTC) değerini epoch saniyesine çevirir"""
+        if not value:
+            return None
+        try:
+            parsed = datetime.strptime(value[:19], '%Y-%m-%d %H:%M:%S')
+            return parsed.replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            return None
+
+    def get_user_state(self, user_id: str) -> Tuple[Optional[str], Dict]:
+        """Kullanıcı durumunu döndürür; temp_data kopyalanır (çağıran değiştirebilir)"""
+        with self._lock:
+            entry = self._states.get(user_id)
+            if entry is None:
+                return None, {}
+            state, temp_data, touched_at = entry
+            if time.time() - touched_at > self.ttl_seconds:
+                # Yarım bırakılmış form - süresi doldu
+                del self._states[user_id]
+                self._dirty[user_id] = None
+                self._wakeup.set()
+                return None, {}
+            return state, dict(temp_data)
+
+    def set_user_state(self, user_id: str, state: str, temp_data: Dict = None) -> bool:
+        """Kullanıcı durumunu ayarlar (kalıcı yazma arka planda yapılır)"""
+        data = dict(temp_data) if temp_data else {}
+        with self._lock:
+            self._states[user_id] = (state, data, time.time())
+            self._dirty[user_id] = (state, data)
+        self._wakeup.set()
+        return True
+
+    def clear_user_state(self, user_id: str) -> bool:
+        """Kullanıcı durumunu temizler"""
+        with self._lock:
+            self._states.pop(user_id, None)
+            self._dirty[user_id] = None
+        self._wakeup.set()
+        return True
+
+    def expire_stale(self) -> int:
+        """Süresi dolmuş durumları temizler ve kaç tane silindiğini döndürür"""
+        now = time.time()
+        with self._lock:
+            stale = [user_id for user_id, (_, _, touched_at) in self._states.items()
+                     if now - touched_at > self.ttl_seconds]
+            for user_id in stale:
+                del self._states[user_id]
+                self._dirty[user_id] = None
+        if stale:
+            logger.debug(f"{len(stale)} yarım kalmış form temizlendi")
+        return len(stale)
+
+    def flush(self) -> bool:
+        """Bekleyen yazmaları tek işlemde veritabanına aktarır"""
+        with self._lock:
+            if not self._dirty:
+                return True
+            pending = self._dirty
+            self._dirty = {}
+
+        if self.db.save_user_states(pending):
+            return True
+
+        # Başarısız olursa, bu arada yenisi yazılmamış kayıtları geri koy
+        with self._lock:
+            for user_id, value in pending.items():
+                self._dirty.setdefault(user_id, value)
+        return False
+
+    def _writer_loop(self) -> None:
+        """Arka plan yazıcısı - değişiklikleri kısa aralıklarla toplu yazar"""
+        last_sweep = time.time()
+        while not self._stop_event.is_set():
+            self._wakeup.wait(timeout=60)
+            self._wakeup.clear()
+            # Aynı anda gelen yazmaları biriktirmek için kısa bekleme
+            self._stop_event.wait(self.flush_interval)
+
+            if time.time() - last_sweep > 60:
+                self.expire_stale()
+                last_sweep = time.time()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Kullanıcı durumları yazılamadı: {e}")
+
+# Global kullanıcı durum deposu
+user_state_store = UserStateStore()
@@ -5,249 +5,48 @@ Sessions klasöründeki .session dosyalarını sayar ve kullanıcıya gösterir
 """
 
 import os
+import io
+import html
 import glob
-import zipfile
-import tempfile
+import asyncio
 import sqlite3
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
-from config import get_bot_api, get_admin_ids, is_admin
+from config import (
+    get_bot_api, get_admin_ids, is_admin,
+    get_webhook_settings,
+    get_max_concurrent_updates, get_export_compression_level, get_export_max_archive_bytes,
+    get_preflight_cache_minutes
+)
 from database import db_manager
+from join_result import JoinErrorCode
+from telethon_client import telethon_manager
+from channel_preflight import LINK_DEAD, LINK_UNKNOWN
+from circuit_breaker import describe_failure
 from proxy_manager import proxy_manager
-
-# Logging ayarları
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
+from update_processor import ChatOrderedUpdateProcessor
+from callback_router import CallbackRouter
+from state_store import user_state_store
+from session_manager import SessionManager, session_manager
+from session_export import build_session_archives, get_archive_size
+from lateness_report import diagnose_lateness
+from log_manager import setup_logging, get_recent_logs
+from metrics import (
+    JOIN_REQUESTS, FLOODWAIT_SECONDS, CLIENT_CREATE_SECONDS, SCHEDULER_LAG_SECONDS,
+    POOL_DEPTH, DB_QUERY_SECONDS, HANDLER_SECONDS
 )
+
+# Logging ayarları (konsol + dönen dosya + bellek içi tampon)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # HTTP isteklerini azalt
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
-class SessionManager:
-    """Session dosyalarını yöneten sınıf"""
-    
-    def __init__(self, sessions_dir: str = "Sessions"):
-        self.sessions_dir = sessions_dir
-        self.ensure_sessions_dir()
-    
-    def ensure_sessions_dir(self) -> None:
-        """Sessions klasörünün var olduğundan emin olur"""
-        if not os.path.exists(self.sessions_dir):
-            os.makedirs(self.sessions_dir)
-            logger.info(f"Sessions klasörü oluşturuldu: {self.sessions_dir}")
-    
-    def count_session_files(self) -> int:
-        """Sessions klasöründeki .session dosyalarının sayısını döndürür"""
-        try:
-            # .session uzantılı dosyaları bul
-            pattern = os.path.join(self.sessions_dir, "*.session")
-            session_files = glob.glob(pattern)
-            count = len(session_files)
-            
-            logger.info(f"Sessions klasöründe {count} adet .session dosyası bulundu")
-            return count
-            
-        except Exception as e:
-            logger.error(f"Session dosyaları sayılırken hata: {e}")
-            return 0
-    
-    def get_session_files(self) -> List[str]:
-        """Sessions klasöründeki .session dosyalarının listesini döndürür"""
-        try:
-            pattern = os.path.join(self.sessions_dir, "*.session")
-            session_files = glob.glob(pattern)
-            # Frozens alt klasöründekileri dışla
-            frozens_dir = os.path.join(self.sessions_dir, "Frozens")
-            if os.path.isdir(frozens_dir):
-                frozen_names = set(os.listdir(frozens_dir))
-                session_files = [p for p in session_files if os.path.basename(p) not in frozen_names]
-            
-            # Sadece dosya adlarını döndür (tam yol değil)
-            file_names = [os.path.basename(f) for f in session_files]
-            return file_names
-            
-        except Exception as e:
-            logger.error(f"Session dosyaları listelenirken hata: {e}")
-            return []
-    
-    def get_session_info(self) -> dict:
-        """Session dosyaları hakkında detaylı bilgi döndürür"""
-        try:
-            session_files = self.get_session_files()
-            total_count = len(session_files)
-            
-            # Dosya boyutlarını hesapla
-            total_size = 0
-            for file_name in session_files:
-                file_path = os.path.join(self.sessions_dir, file_name)
-                if os.path.exists(file_path):
-                    total_size += os.path.getsize(file_path)
-            
-            # Boyutu MB'ye çevir
-            size_mb = total_size / (1024 * 1024)
-            
-            return {
-                "total_count": total_count,
-                "total_size_mb": round(size_mb, 2),
-                "files": session_files
-            }
-            
-        except Exception as e:
-            logger.error(f"Session bilgileri alınırken hata: {e}")
-            return {
-                "total_count": 0,
-                "total_size_mb": 0,
-                "files": []
-            }
-    
-    def get_frozen_count(self) -> int:
-        """Frozen hesap sayısını döndürür"""
-        try:
-            frozens_dir = os.path.join(self.sessions_dir, "Frozens")
-            if not os.path.exists(frozens_dir):
-                return 0
-            
-            pattern = os.path.join(frozens_dir, "*.session")
-            frozen_files = glob.glob(pattern)
-            return len(frozen_files)
-            
-        except Exception as e:
-            logger.error(f"Frozen hesap sayısı alınırken hata: {e}")
-            return 0
-    
-    def get_frozen_files(self) -> List[str]:
-        """Frozen dosyaların listesini döndürür"""
-        try:
-            frozens_dir = os.path.join(self.sessions_dir, "Frozens")
-            if not os.path.exists(frozens_dir):
-                return []
-            
-            pattern = os.path.join(frozens_dir, "*.session")
-            frozen_files = glob.glob(pattern)
-            
-            # Sadece dosya adlarını döndür
-            file_names = [os.path.basename(f) for f in frozen_files]
-            return file_names
-            
-        except Exception as e:
-            logger.error(f"Frozen dosyalar alınırken hata: {e}")
-            return []
-    
-    def get_frozen_info(self) -> dict:
-        """Frozen dosyalar hakkında detaylı bilgi döndürür"""
-        try:
-            frozens_dir = os.path.join(self.sessions_dir, "Frozens")
-            if not os.path.exists(frozens_dir):
-                return {
-                    'total_count': 0,
-                    'total_size_mb': 0,
-                    'files': []
-                }
-            
-            frozen_files = self.get_frozen_files()
-            total_count = len(frozen_files)
-            
-            # Dosya boyutlarını hesapla
-            total_size = 0
-            for file_name in frozen_files:
-                file_path = os.path.join(frozens_dir, file_name)
-                if os.path.exists(file_path):
-                    total_size += os.path.getsize(file_path)
-            
-            # Boyutu MB'ye çevir
-            size_mb = total_size / (1024 * 1024)
-            
-            return {
-                "total_count": total_count,
-                "total_size_mb": round(size_mb, 2),
-                "files": frozen_files
-            }
-            
-        except Exception as e:
-            logger.error(f"Frozen bilgileri alınırken hata: {e}")
-            return {
-                "total_count": 0,
-                "total_size_mb": 0,
-                "files": []
-            }
-
-    def _sanitize_filename(self, file_name: str) -> str:
-        """Gelen dosya adını güvenli bir ada dönüştürür (.session uzantısını korur)."""
-        base = os.path.basename(file_name)
-        # uzantı kontrolü
-        if not base.endswith('.session'):
-            base = f"{base}.session" if '.session' not in base else base
-        # izin verilmeyen karakterleri temizle
-        safe = ''.join(ch for ch in base if ch.isalnum() or ch in ('-', '_', '.', '+'))
-        if not safe.endswith('.session'):
-            safe += '.session'
-        return safe
-
-    def save_session_bytes(self, file_name: str, file_bytes: bytes) -> str:
-        """Verilen içerikle Sessions klasörüne .session kaydeder ve dosya adını döndürür."""
-        self.ensure_sessions_dir()
-        safe_name = self._sanitize_filename(file_name)
-        target_path = os.path.join(self.sessions_dir, safe_name)
-        # Aynı isim varsa benzersizleştir
-        if os.path.exists(target_path):
-            name, ext = os.path.splitext(safe_name)
-            i = 1
-            while os.path.exists(os.path.join(self.sessions_dir, f"{name}_{i}{ext}")):
-                i += 1
-            safe_name = f"{name}_{i}{ext}"
-            target_path = os.path.join(self.sessions_dir, safe_name)
-        with open(target_path, 'wb') as f:
-            f.write(file_bytes)
-        return safe_name
-
-    def import_sessions_from_zip(self, zip_bytes: bytes) -> int:
-        """ZIP içinden .session dosyalarını çıkarıp kaydeder, kaç tane kaydedildiğini döndürür."""
-        saved = 0
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp_zip = os.path.join(tmpdir, 'upload.zip')
-            with open(tmp_zip, 'wb') as f:
-                f.write(zip_bytes)
-            with zipfile.ZipFile(tmp_zip, 'r') as zf:
-                for info in zf.infolist():
-                    if info.is_dir():
-                        continue
-                    if not info.filename.lower().endswith('.session'):
-                        continue
-                    with zf.open(info) as src:
-                        data = src.read()
-                        self.save_session_bytes(os.path.basename(info.filename), data)
-                        saved += 1
-        return saved
-
-    def delete_all_sessions(self) -> int:
-        """Frozens haricindeki tüm .session dosyalarını siler ve kaç dosya silindiğini döndürür."""
-        try:
-            self.ensure_sessions_dir()
-            pattern = os.path.join(self.sessions_dir, "*.session")
-            files = glob.glob(pattern)
-            frozens_dir = os.path.join(self.sessions_dir, "Frozens")
-            frozen_names = set(os.listdir(frozens_dir)) if os.path.isdir(frozens_dir) else set()
-            deleted = 0
-            for path in files:
-                name = os.path.basename(path)
-                if name in frozen_names:
-                    continue
-                try:
-                    os.remove(path)
-                    deleted += 1
-                except Exception:
-                    continue
-            return deleted
-        except Exception as e:
-            logger.error(f"Session dosyaları silinirken hata: {e}")
-            return 0
-
-# Global session manager
-session_manager = SessionManager()
+# Buton callback'leri için yönlendirici (handler'lar dekoratörlerle kaydedilir)
+callback_router = CallbackRouter()
 
 class TelegramBot:
     """Telegram Bot sınıfı"""
@@ -259,14 +58,77 @@ class TelegramBot:
         # Amaç: Yeni bir mesaj göndermeden önce, sohbetteki eski bot mesajlarını silmek
         self.chat_id_to_message_ids = {}
         
+        # Devre kesicinin durdurduğu kanalların sahiplerine bildirim aralığı (saniye)
+        self.stop_notice_interval = 15
+        self.stop_notice_task = None
+        
         if not self.bot_token:
             raise ValueError("Bot API token bulunamadı! Lütfen config.py dosyasını kontrol edin.")
         
-        # Application oluştur
-        self.application = Application.builder().token(self.bot_token).build()
+        # Application oluştur - sohbetler paralel, aynı sohbetin güncellemeleri sıralı işlenir
+        self.update_processor = ChatOrderedUpdateProcessor(get_max_concurrent_updates())
+        self.application = (
+            Application.builder()
+            .token(self.bot_token)
+            .concurrent_updates(self.update_processor)
+            .post_init(self._post_init)
+            .post_shutdown(self._post_shutdown)
+            .build()
+        )
         
         # Handler'ları ekle
         self.setup_handlers()
+        
+        # Form durumlarını belleğe yükle (kalıcı yazma arka planda yapılır)
+        user_state_store.start()
+    
+    async def _post_init(self, application: Application) -> None:
+        """Uygulama başlarken arka plan görevlerini başlatır"""
+        self.stop_notice_task = asyncio.create_task(self._stop_notice_loop())
+    
+    async def _post_shutdown(self, application: Application) -> None:
+        """Arka plan görevlerini durdurur"""
+        if self.stop_notice_task:
+            self.stop_notice_task.cancel()
+    
+    async def _stop_notice_loop(self) -> None:
+        """Otomatik durdurulan kanalları periyodik olarak sahiplerine bildirir"""
+        while True:
+            await asyncio.sleep(self.stop_notice_interval)
+            try:
+                await self.notify_stopped_channels()
+            except Exception as e:
+                logger.error(f"Durdurma bildirimi hatası: {e}")
+    
+    async def notify_stopped_channels(self) -> int:
+        """Devre kesicinin durdurduğu kanalların sahiplerine mesaj gönderir; gönderilen sayıyı döndürür"""
+        channels = await asyncio.to_thread(db_manager.get_stopped_channels_to_notify)
+        sent = 0
+        for channel in channels:
+            message = (
+                "⛔ <b>Kampanya Durduruldu</b>\n\n"
+                f"📺 Kanal: <code>{html.escape(channel['channel_link'])}</code>\n"
+                f"❗ Neden: {describe_failure(channel['stop_reason'])} "
+                f"(<code>{html.escape(channel['stop_reason'])}</code>)\n"
+                f"⏭️ Atlanan bekleyen istek: <code>{channel['skipped']}</code>\n\n"
+                "Art arda gelen istekler aynı hatayla sonuçlandığı için kampanya otomatik "
+                "olarak durduruldu. Sorunu giderdikten sonra yeniden başlatabilirsiniz."
+            )
+            keyboard = [
+                [InlineKeyboardButton("▶️ Yeniden Başlat", callback_data=f"channel_start_{channel['id']}")],
+                [InlineKeyboardButton("🏠 Ana Menü", callback_data="main_menu")]
+            ]
+            try:
+                await self.application.bot.send_message(
+                    chat_id=int(channel['user_id']), text=message,
+                    reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML'
+                )
+                sent += 1
+            except Exception as e:
+                # Bot engellenmiş olabilir; bildirim her döngüde tekrar denenmez
+                logger.error(f"Durdurma bildirimi gönderilemedi (kullanıcı {channel['user_id']}): {e}")
+            await asyncio.to_thread(db_manager.mark_stop_notified, channel['id'])
+        return sent
     
     def create_navigation_buttons(self, current_screen: str = "main") -> List[List[InlineKeyboardButton]]:
         """Navigasyon butonlarını oluşturur"""
@@ -288,6 +150,7 @@ class TelegramBot:
         self.application.add_handler(CommandHandler("start", self.start_command))
         self.application.add_handler(CommandHandler("help", self.help_command))
         self.application.add_handler(CommandHandler("sessions", self.sessions_command))
+        self.application.add_handler(CommandHandler("metrics", self.show_metrics))
         
         # Callback query handler (buton tıklamaları)
         self.application.add_handler(CallbackQueryHandler(self.button_callback))
@@ -454,96 +317,19 @@ class TelegramBot:
         await self.show_session_count(update, context)
     
     async def button_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """Buton tıklama callback handler'ı"""
+        """Buton tıklama callback handler'ı - callback_router üzerinden yönlendirir"""
         query = update.callback_query
         await query.answer()
         
-        data = query.data
-        
-        if data == "main_menu":
-            await self.show_main_menu(update, context)
-        elif data == "go_back":
-            await self.go_back(update, context)
-        elif data == "count_sessions":
-            await self.show_session_count(update, context)
-        elif data == "list_sessions":
-            await self.show_session_list(update, context)
-        elif data == "list_frozen":
-            await self.show_frozen_list(update, context)
-        elif data == "upload_sessions":
-            await self.start_upload_sessions(update, context)
-        elif data == "confirm_delete_sessions":
-            await self.confirm_delete_sessions(update, context)
-        elif data == "delete_sessions":
-            await self.delete_sessions(update, context)
-        elif data == "confirm_delete_frozens":
-            await self.confirm_delete_frozens(update, context)
-        elif data == "delete_frozens":
-            await self.delete_frozens(update, context)
-        elif data == "proxy_menu":
-            await self.show_proxy_menu(update, context)
-        elif data.startswith("proxy_list_"):
-            page = int(data.split("_")[-1])
-            await self.show_proxy_list(update, context, page)
-        elif data == "proxy_upload":
-            await self.start_proxy_upload(update, context)
-        elif data == "proxy_delete_mode":
-            await self.start_proxy_delete(update, context)
-        elif data.startswith("session_list_"):
-            page = int(data.split("_")[-1])
-            await self.show_session_list(update, context, page)
-        elif data.startswith("frozen_list_"):
-            page = int(data.split("_")[-1])
-            await self.show_frozen_list(update, context, page)
-        elif data == "help_info":
-            await self.show_help_info(update, context)
-        elif data == "admin_panel":
-            await self.show_admin_panel(update, context)
-        elif data == "admin_management":
-            await self.show_admin_management(update, context)
-        elif data == "add_admin":
-            await self.start_add_admin(update, context)
-        elif data == "remove_admin":
-            await self.start_remove_admin(update, context)
-        elif data == "show_logs":
-            await self.show_logs(update, context)
-        elif data == "refresh_sessions":
-            await self.show_session_count(update, context)
-        elif data == "add_channel":
-            await self.start_add_channel(update, context)
-        elif data == "my_channels":
-            await self.show_my_channels(update, context)
-        elif data == "global_pool":
-            await self.show_global_pool(update, context)
-        elif data == "start_requests":
-            await self.start_requests_callback(update, context)
-        elif data == "cancel_channel":
-            await self.cancel_channel_add(update, context)
-        elif data == "repeat_yes":
-            await self.handle_repeat_choice_callback(update, context, "yes")
-        elif data == "repeat_no":
-            await self.handle_repeat_choice_callback(update, context, "no")
-        elif data.startswith("channel_"):
-            await self.handle_channel_action(update, context, data)
-        elif data == "clear_chat":
-            await self.clear_chat(update, context)
-        elif data == "admin_list_sessions":
-            await self.show_admin_session_list(update, context)
-        elif data == "list_invalid":
-            await self.show_invalid_list(update, context)
-        elif data.startswith("admin_session_list_"):
-            page = int(data.split("_")[-1])
-            await self.show_admin_session_list(update, context, page)
-        elif data.startswith("invalid_list_"):
-            page = int(data.split("_")[-1])
-            await self.show_invalid_list(update, context, page)
-        elif data == "download_active_sessions":
-            await self.download_sessions(update, context, "active")
-        elif data == "download_frozen_sessions":
-            await self.download_sessions(update, context, "frozen")
-        elif data == "download_invalid_sessions":
-            await self.download_sessions(update, context, "invalid")
+        resolved = callback_router.resolve(query.data)
+        if resolved is None:
+            logger.warning(f"Bilinmeyen callback verisi: {query.data}")
+            return
+        handler, kwargs = resolved
+        with HANDLER_SECONDS.time(handler=handler.__name__):
+            await handler(self, update, context, **kwargs)
     
+    @callback_router.route("main_menu")
     async def show_main_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Ana menüyü gösterir"""
         user_id = str(update.effective_user.id)
@@ -569,10 +355,12 @@ class TelegramBot:
         
         await self.edit_or_send_message(update, context, "Ana Menü", reply_markup)
     
+    @callback_router.route("go_back")
     async def go_back(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Geri döner (şimdilik ana menüye)"""
         await self.show_main_menu(update, context)
     
+    @callback_router.route("clear_chat")
     async def clear_chat(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Chat'i temizler (kendisi hariç tüm mesajları siler)"""
         try:
@@ -622,15 +410,43 @@ class TelegramBot:
             logger.error(f"Chat temizleme hatası: {e}")
             await update.effective_message.reply_text("❌ Chat temizlenirken hata oluştu!")
     
+    async def run_with_progress(self, message, title: str, func, *args):
+        """Senkron ve uzun süren bir işi thread'de çalıştırır.
+        
+        ``func`` son argüman olarak ``report(done, total)`` fonksiyonunu alır; ilerleme
+        birkaç saniyede bir ``message`` düzenlenerek kullanıcıya bildirilir.
+        """
+        progress = {'done': 0, 'total': 0}
+        
+        def report(done: int, total: int) -> None:
+            progress['done'] = done
+            progress['total'] = total
+        
+        task = asyncio.ensure_future(asyncio.to_thread(func, *args, report))
+        last_shown = None
+        while not task.done():
+            await asyncio.wait({task}, timeout=2)
+            current = (progress['done'], progress['total'])
+            if task.done() or not current[1] or current == last_shown:
+                continue
+            last_shown = current
+            try:
+                await message.edit_text(f"⏳ {title} ({current[0]}/{current[1]})")
+            except Exception:
+                # "Message is not modified" vb. hatalar ilerlemeyi durdurmasın
+                pass
+        return task.result()
+    
+    @callback_router.route("download_active_sessions", session_type="active")
+    @callback_router.route("download_frozen_sessions", session_type="frozen")
+    @callback_router.route("download_invalid_sessions", session_type="invalid")
     async def download_sessions(self, update: Update, context: ContextTypes.DEFAULT_TYPE, session_type: str) -> None:
-        """Session dosyalarını ZIP olarak indirir"""
+        """Session dosyalarını ZIP olarak indirir (arka plan görevi olarak)"""
         try:
-            import zipfile
-            import io
-            
             # Session dosyalarını topla
             session_files = []
             zip_name = ""
+            source_dir = "Sessions"
             
             if session_type == "active":
                 session_files = session_manager.get_session_files()
@@ -638,10 +454,11 @@ class TelegramBot:
             elif session_type == "frozen":
                 session_files = session_manager.get_frozen_files()
                 zip_name = "frozen_sessions.zip"
+                source_dir = os.path.join("Sessions", "Frozens")
             elif session_type == "invalid":
-                invalid_dir = os.path.join("Sessions", "Invalid")
-                if os.path.exists(invalid_dir):
-                    pattern = os.path.join(invalid_dir, "*.session")
+                source_dir = os.path.join("Sessions", "Invalid")
+                if os.path.exists(source_dir):
+                    pattern = os.path.join(source_dir, "*.session")
                     invalid_files = glob.glob(pattern)
                     session_files = [os.path.basename(f) for f in invalid_files]
                 zip_name = "invalid_sessions.zip"
@@ -650,44 +467,67 @@ class TelegramBot:
                 await update.effective_message.reply_text(f"❌ {session_type.title()} session dosyası bulunamadı!")
                 return
             
-            # ZIP dosyası oluştur
-            zip_buffer = io.BytesIO()
-            
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for session_file in session_files:
-                    if session_type == "active":
-                        file_path = os.path.join("Sessions", session_file)
-                    elif session_type == "frozen":
-                        file_path = os.path.join("Sessions", "Frozens", session_file)
-                    elif session_type == "invalid":
-                        file_path = os.path.join("Sessions", "Invalid", session_file)
-                    
-                    if os.path.exists(file_path):
-                        zip_file.write(file_path, session_file)
+            progress_message = await update.effective_message.reply_text(f"⏳ {zip_name} hazırlanıyor...")
             
-            zip_buffer.seek(0)
+            # ZIP oluşturma ve gönderme arka planda sürer; handler hemen döner
+            context.application.create_task(
+                self._send_sessions_zip(update, context, session_type, source_dir, session_files, zip_name, progress_message),
+                update=update
+            )
             
-            # Dosyayı gönder
-            await context.bot.send_document(
-                chat_id=update.effective_chat.id,
-                document=zip_buffer.getvalue(),
-                filename=zip_name,
-                caption=f"📥 {session_type.title()} Session Dosyaları ({len(session_files)} adet)"
+        except Exception as e:
+            logger.error(f"Session indirme hatası: {e}")
+            await update.effective_message.reply_text(f"❌ Dosya indirilirken hata oluştu: {str(e)}")
+    
+    async def _send_sessions_zip(self, update: Update, context: ContextTypes.DEFAULT_TYPE, session_type: str,
+                                 source_dir: str, session_files: List[str], zip_name: str, progress_message) -> None:
+        """ZIP arşivlerini hazırlar, sırayla gönderir ve ilerleme mesajını günceller"""
+        archives = []
+        try:
+            # Arşivler diske taşabilen geçici dosyalara yazılır; boyut sınırında bölünür
+            archives = await self.run_with_progress(
+                progress_message, f"{zip_name} hazırlanıyor", build_session_archives,
+                source_dir, session_files, zip_name,
+                get_export_max_archive_bytes(), get_export_compression_level()
             )
             
+            for part, (archive_name, archive) in enumerate(archives, 1):
+                caption = f"📥 {session_type.title()} Session Dosyaları ({len(session_files)} adet)"
+                if len(archives) > 1:
+                    caption += f" - Parça {part}/{len(archives)}"
+                logger.info(f"{archive_name} gönderiliyor ({get_archive_size(archive)} bayt)")
+                await context.bot.send_document(
+                    chat_id=update.effective_chat.id,
+                    document=archive,
+                    filename=archive_name,
+                    caption=caption
+                )
+                # Gönderilen parçayı hemen bırak (diskteki geçici dosya silinir)
+                archive.close()
+            
             # Başarı mesajı
             message = f"✅ {len(session_files)} adet {session_type} session dosyası ZIP olarak gönderildi!"
+            if len(archives) > 1:
+                message += f"\n📦 Boyut sınırı nedeniyle {len(archives)} parçaya bölündü."
             keyboard = [
                 [InlineKeyboardButton("🏠 Ana Menü", callback_data="main_menu")]
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await update.effective_message.reply_text(message, reply_markup=reply_markup)
+            await progress_message.edit_text(message, reply_markup=reply_markup)
             
         except Exception as e:
             logger.error(f"Session indirme hatası: {e}")
-            await update.effective_message.reply_text(f"❌ Dosya indirilirken hata oluştu: {str(e)}")
+            try:
+                await progress_message.edit_text(f"❌ Dosya indirilirken hata oluştu: {str(e)}")
+            except Exception:
+                pass
+        finally:
+            for _, archive in archives:
+                archive.close()
     
+    @callback_router.route("count_sessions")
+    @callback_router.route("refresh_sessions")
     async def show_session_count(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Session sayısını gösterir"""
         try:
@@ -727,6 +567,8 @@ class TelegramBot:
             await self.edit_or_send_message(update, context, error_message)
             logger.error(f"Session sayısı gösterilirken hata: {e}")
     
+    @callback_router.route("list_sessions")
+    @callback_router.route("session_list_{page:int}")
     async def show_session_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 1) -> None:
         """Session dosyalarının listesini gösterir (sayfalı)"""
         try:
@@ -772,6 +614,8 @@ class TelegramBot:
             await self.edit_or_send_message(update, context, error_message)
             logger.error(f"Session listesi gösterilirken hata: {e}")
 
+    @callback_router.route("admin_list_sessions")
+    @callback_router.route("admin_session_list_{page:int}")
     async def show_admin_session_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 1) -> None:
         """Admin için session dosyalarının listesini gösterir (sayfalı) - Tümünü Sil butonu ile"""
         try:
@@ -823,6 +667,8 @@ class TelegramBot:
             await self.edit_or_send_message(update, context, error_message)
             logger.error(f"Admin session listesi gösterilirken hata: {e}")
 
+    @callback_router.route("list_invalid")
+    @callback_router.route("invalid_list_{page:int}")
     async def show_invalid_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 1) -> None:
         """Invalid hesapların listesini gösterir (sayfalı)"""
         try:
@@ -876,6 +722,7 @@ class TelegramBot:
             await self.edit_or_send_message(update, context, error_message)
             logger.error(f"Invalid listesi gösterilirken hata: {e}")
 
+    @callback_router.route("confirm_delete_sessions")
     async def confirm_delete_sessions(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Tüm aktif session dosyalarını silme onayı."""
         user_id = str(update.effective_user.id)
@@ -892,6 +739,7 @@ class TelegramBot:
         ]
         await self.edit_or_send_message(update, context, message, InlineKeyboardMarkup(keyboard), parse_mode='HTML')
 
+    @callback_router.route("delete_sessions")
     async def delete_sessions(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Tüm aktif session dosyalarını siler."""
         user_id = str(update.effective_user.id)
@@ -906,6 +754,8 @@ class TelegramBot:
         ]
         await self.edit_or_send_message(update, context, message, InlineKeyboardMarkup(keyboard))
     
+    @callback_router.route("list_frozen")
+    @callback_router.route("frozen_list_{page:int}")
     async def show_frozen_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 1) -> None:
         """Frozen hesapların listesini gösterir (sayfalı)"""
         try:
@@ -951,6 +801,7 @@ class TelegramBot:
             await self.edit_or_send_message(update, context, error_message)
             logger.error(f"Frozen listesi gösterilirken hata: {e}")
 
+    @callback_router.route("confirm_delete_frozens")
     async def confirm_delete_frozens(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Frozen .session dosyalarını topluca silme onayı"""
         user_id = str(update.effective_user.id)
@@ -967,6 +818,7 @@ class TelegramBot:
         ]
         await self.edit_or_send_message(update, context, message, InlineKeyboardMarkup(keyboard), parse_mode='HTML')
 
+    @callback_router.route("delete_frozens")
     async def delete_frozens(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Frozen .session dosyalarını siler"""
         user_id = str(update.effective_user.id)
@@ -988,11 +840,12 @@ class TelegramBot:
         except Exception as e:
             await self.edit_or_send_message(update, context, f"❌ Hata: {str(e)}")
 
+    @callback_router.route("upload_sessions")
     async def start_upload_sessions(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Session yükleme akışını başlatır."""
         user_id = str(update.effective_user.id)
         # Kullanıcı durumunu ayarla
-        db_manager.set_user_state(user_id, "waiting_upload", {})
+        user_state_store.set_user_state(user_id, "waiting_upload", {})
         message = (
             "⬆️ <b>Session Yükleme</b>\n\n"
             "• Bir veya birden fazla <code>.session</code> dosyasını bu sohbete gönderin.\n"
@@ -1009,7 +862,7 @@ class TelegramBot:
         """Gönderilen dosyaları işler: .session veya .zip"""
         try:
             user_id = str(update.effective_user.id)
-            state, _ = db_manager.get_user_state(user_id)
+            state, _ = user_state_store.get_user_state(user_id)
             # Proxy upload akışı mı?
             if state == "waiting_proxy_upload":
                 await self.handle_proxy_upload(update, context)
@@ -1020,27 +873,38 @@ class TelegramBot:
             document = update.message.document
             if not document:
                 return
-            file = await context.bot.get_file(document.file_id)
-            data = await file.download_as_bytearray()
             filename = (document.file_name or 'upload').lower()
-            saved_count = 0
-            saved_names = []
-            if filename.endswith('.zip'):
-                saved_count = session_manager.import_sessions_from_zip(bytes(data))
-            elif filename.endswith('.session'):
-                saved_name = session_manager.save_session_bytes(filename, bytes(data))
-                saved_count = 1
-                saved_names = [saved_name]
-            else:
+            if not filename.endswith(('.zip', '.session')):
                 await update.message.reply_text("❌ Sadece .session veya .zip dosyaları kabul edilir.")
                 return
+            file = await context.bot.get_file(document.file_id)
+            # Dosya doğrudan bellekteki tampona indirilir (geçici dosya yok)
+            buffer = io.BytesIO()
+            await file.download_to_memory(buffer)
+            if filename.endswith('.zip'):
+                buffer.seek(0)
+                result = await asyncio.to_thread(session_manager.import_sessions_from_zip, buffer)
+                saved_names = []
+            else:
+                status, name = await asyncio.to_thread(
+                    session_manager.import_session_bytes, filename, buffer.getvalue()
+                )
+                result = {'saved': 0, 'duplicate': 0, 'invalid': 0, 'failed': 0}
+                result[status] += 1
+                saved_names = [name] if status == 'saved' else []
             # Yükleme bilgisi
             info = session_manager.get_session_info()
             text = (
                 "✅ Yükleme tamamlandı!\n\n"
-                f"Kaydedilen dosya sayısı: {saved_count}\n"
-                f"Toplam aktif hesap: {info['total_count']}\n"
+                f"Kaydedilen dosya sayısı: {result['saved']}\n"
             )
+            if result['duplicate']:
+                text += f"Zaten kayıtlı (atlandı): {result['duplicate']}\n"
+            if result['invalid']:
+                text += f"Geçersiz session (atlandı): {result['invalid']}\n"
+            if result['failed']:
+                text += f"Yazılamayan: {result['failed']}\n"
+            text += f"Toplam aktif hesap: {info['total_count']}\n"
             if saved_names:
                 text += "\n" + "\n".join(f"• {name}" for name in saved_names)
             keyboard = [
@@ -1056,7 +920,7 @@ class TelegramBot:
         """proxies.txt yükleme handler'ı"""
         try:
             user_id = str(update.effective_user.id)
-            state, _ = db_manager.get_user_state(user_id)
+            state, _ = user_state_store.get_user_state(user_id)
             if state != "waiting_proxy_upload":
                 # Yükleme menüsünden gelinmemişse görmezden gel
                 return
@@ -1068,8 +932,8 @@ class TelegramBot:
             data = await file.download_as_bytearray()
             text = bytes(data).decode('utf-8', errors='ignore')
             lines = [ln.rstrip('\r') for ln in text.split('\n')]
-            if proxy_manager.write_raw_lines(lines):
-                db_manager.clear_user_state(user_id)
+            if await asyncio.to_thread(proxy_manager.write_raw_lines, lines):
+                user_state_store.clear_user_state(user_id)
                 count = proxy_manager.get_proxy_count()
                 await update.message.reply_text(f"✅ Proxy dosyası güncellendi. Toplam: {count}")
                 # Menüye dönüş butonu
@@ -1083,6 +947,7 @@ class TelegramBot:
             logger.error(f"Proxy upload hatası: {e}")
             await update.message.reply_text(f"❌ Hata: {str(e)}")
     
+    @callback_router.route("help_info")
     async def show_help_info(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Yardım bilgilerini gösterir"""
         help_message = """
@@ -1112,6 +977,7 @@ Bu bot, Sessions klasöründeki .session uzantılı dosyaları sayar ve bilgiler
         
         await self.edit_or_send_message(update, context, help_message, reply_markup)
     
+    @callback_router.route("proxy_menu")
     async def show_proxy_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Proxy ayarları ana menüsü"""
         user_id = str(update.effective_user.id)
@@ -1127,6 +993,7 @@ Bu bot, Sessions klasöründeki .session uzantılı dosyaları sayar ve bilgiler
         ]
         await self.edit_or_send_message(update, context, message, InlineKeyboardMarkup(keyboard), parse_mode='HTML')
 
+    @callback_router.route("proxy_list_{page:int}")
     async def show_proxy_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 1) -> None:
         """Proxyleri 30'arlı sayfalar halinde listeler"""
         user_id = str(update.effective_user.id)
@@ -1159,13 +1026,14 @@ Bu bot, Sessions klasöründeki .session uzantılı dosyaları sayar ve bilgiler
         reply_markup = InlineKeyboardMarkup(keyboard)
         await self.edit_or_send_message(update, context, message, reply_markup, parse_mode='HTML')
 
+    @callback_router.route("proxy_upload")
     async def start_proxy_upload(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Proxy yükleme modunu başlatır"""
         user_id = str(update.effective_user.id)
         if not is_admin(user_id):
             await self.edit_or_send_message(update, context, "❌ Bu özelliği kullanma yetkiniz yok!")
             return
-        db_manager.set_user_state(user_id, "waiting_proxy_upload", {})
+        user_state_store.set_user_state(user_id, "waiting_proxy_upload", {})
         message = (
             "⬆️ <b>Proxy Yükle</b>\n\n"
             "Lütfen <code>proxies.txt</code> dosyasını gönderin. Mevcut dosya üzerine yazılır."
@@ -1173,21 +1041,23 @@ Bu bot, Sessions klasöründeki .session uzantılı dosyaları sayar ve bilgiler
         keyboard = [[InlineKeyboardButton("🧰 Proxy Menüsü", callback_data="proxy_menu")]]
         await self.edit_or_send_message(update, context, message, InlineKeyboardMarkup(keyboard), parse_mode='HTML')
 
+    @callback_router.route("proxy_delete_mode")
     async def start_proxy_delete(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Proxy silme modunu başlatır (ID ile veya satırı yapıştırarak)"""
         user_id = str(update.effective_user.id)
         if not is_admin(user_id):
             await self.edit_or_send_message(update, context, "❌ Bu özelliği kullanma yetkiniz yok!")
             return
-        db_manager.set_user_state(user_id, "waiting_proxy_delete", {})
+        user_state_store.set_user_state(user_id, "waiting_proxy_delete", {})
         message = (
             "🗑️ <b>Proxy Silme</b>\n\n"
-            "Silmek için ya ID numarasını gönderin (örn: 12) ya da \n"
-            "silmek istediğiniz proxy satırını aynen yapıştırın."
+            "Silmek için ya ID numaralarını gönderin (örn: 12 veya 3, 7, 12) ya da \n"
+            "silmek istediğiniz proxy satırlarını (her satıra bir tane) aynen yapıştırın."
         )
         keyboard = [[InlineKeyboardButton("🧰 Proxy Menüsü", callback_data="proxy_menu")]]
         await self.edit_or_send_message(update, context, message, InlineKeyboardMarkup(keyboard), parse_mode='HTML')
     
+    @callback_router.route("admin_panel")
     async def show_admin_panel(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Admin panelini gösterir"""
         user_id = str(update.effective_user.id)
@@ -1214,7 +1084,9 @@ Bu bot, Sessions klasöründeki .session uzantılı dosyaları sayar ve bilgiler
             [InlineKeyboardButton("📋 Session Listesi", callback_data="admin_list_sessions")],
             [InlineKeyboardButton("🗑️ Frozenları Sil", callback_data="confirm_delete_frozens")],
             [InlineKeyboardButton("📊 Session Raporu", callback_data="count_sessions")],
-            [InlineKeyboardButton("📋 Logları Gör", callback_data="show_logs")]
+            [InlineKeyboardButton("📋 Logları Gör", callback_data="show_logs")],
+            [InlineKeyboardButton("📈 Metrikler", callback_data="show_metrics")],
+            [InlineKeyboardButton("⏱️ Gecikme Raporu", callback_data="lateness_report")]
         ]
         
         # Navigasyon butonlarını ekle
@@ -1225,6 +1097,7 @@ Bu bot, Sessions klasöründeki .session uzantılı dosyaları sayar ve bilgiler
         
         await self.edit_or_send_message(update, context, admin_message, reply_markup)
     
+    @callback_router.route("admin_management")
     async def show_admin_management(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Admin yönetimi panelini gösterir"""
         user_id = str(update.effective_user.id)
@@ -1265,6 +1138,7 @@ Bu bot, Sessions klasöründeki .session uzantılı dosyaları sayar ve bilgiler
         
         await self.edit_or_send_message(update, context, message, reply_markup)
     
+    @callback_router.route("add_admin")
     async def start_add_admin(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Admin ekleme sürecini başlatır"""
         user_id = str(update.effective_user.id)
@@ -1274,7 +1148,7 @@ Bu bot, Sessions klasöründeki .session uzantılı dosyaları sayar ve bilgiler
             return
         
         # Kullanıcı durumunu ayarla
-        db_manager.set_user_state(user_id, "waiting_admin_id", {})
+        user_state_store.set_user_state(user_id, "waiting_admin_id", {})
         
         message = """
 ➕ **Admin Ekleme**
@@ -1297,6 +1171,7 @@ Lütfen eklemek istediğiniz kullanıcının Telegram ID'sini girin:
         
         await self.edit_or_send_message(update, context, message, reply_markup)
     
+    @callback_router.route("remove_admin")
     async def start_remove_admin(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Admin çıkarma sürecini başlatır"""
         user_id = str(update.effective_user.id)
@@ -1306,7 +1181,7 @@ Lütfen eklemek istediğiniz kullanıcının Telegram ID'sini girin:
             return
         
         # Kullanıcı durumunu ayarla
-        db_manager.set_user_state(user_id, "waiting_remove_admin_id", {})
+        user_state_store.set_user_state(user_id, "waiting_remove_admin_id", {})
         
         message = """
 ➖ **Admin Çıkarma**
@@ -1372,7 +1247,7 @@ Lütfen çıkarmak istediğiniz admin'in Telegram ID'sini girin:
                 message = "❌ Admin eklenirken hata oluştu!"
             
             # Kullanıcı durumunu temizle
-            db_manager.clear_user_state(user_id)
+            user_state_store.clear_user_state(user_id)
             
             keyboard = [
                 [InlineKeyboardButton("👥 Admin Yönetimi", callback_data="admin_management")]
@@ -1409,7 +1284,7 @@ Lütfen çıkarmak istediğiniz admin'in Telegram ID'sini girin:
                 message = f"❌ Admin bulunamadı! (ID: {admin_id})"
             
             # Kullanıcı durumunu temizle
-            db_manager.clear_user_state(user_id)
+            user_state_store.clear_user_state(user_id)
             
             keyboard = [
                 [InlineKeyboardButton("👥 Admin Yönetimi", callback_data="admin_management")]
@@ -1422,12 +1297,42 @@ Lütfen çıkarmak istediğiniz admin'in Telegram ID'sini girin:
             logger.error(f"Admin çıkarma hatası: {e}")
             await update.message.reply_text(f"❌ Hata oluştu: {str(e)}")
     
+    async def handle_proxy_delete(self, update: Update, context: ContextTypes.DEFAULT_TYPE, text: str) -> None:
+        """Silinecek proxy'leri işler: ID listesi (örn. 3, 7 12) veya satır başına bir proxy"""
+        user_id = str(update.effective_user.id)
+        
+        try:
+            if not is_admin(user_id):
+                user_state_store.clear_user_state(user_id)
+                return
+            
+            tokens = text.replace(',', ' ').split()
+            if tokens and all(token.isdigit() for token in tokens):
+                indexes = [int(token) for token in tokens]
+                removed = await asyncio.to_thread(proxy_manager.delete_proxies_by_index, indexes)
+            else:
+                lines = [line.strip() for line in text.splitlines() if line.strip()]
+                removed = await asyncio.to_thread(proxy_manager.remove_proxies, lines)
+            
+            user_state_store.clear_user_state(user_id)
+            if removed:
+                message = f"✅ {removed} proxy silindi. Kalan: {proxy_manager.get_proxy_count()}"
+            else:
+                message = "❌ Eşleşen proxy bulunamadı."
+            keyboard = [[InlineKeyboardButton("🧰 Proxy Menüsü", callback_data="proxy_menu")]]
+            await update.message.reply_text(message, reply_markup=InlineKeyboardMarkup(keyboard))
+            
+        except Exception as e:
+            logger.error(f"Proxy silme hatası: {e}")
+            await update.message.reply_text(f"❌ Hata oluştu: {str(e)}")
+    
+    @callback_router.route("add_channel")
     async def start_add_channel(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Kanal ekleme sürecini başlatır"""
         user_id = str(update.effective_user.id)
         
         # Kullanıcı durumunu ayarla
-        db_manager.set_user_state(user_id, "waiting_channel_link", {})
+        user_state_store.set_user_state(user_id, "waiting_channel_link", {})
         
         message = """
 ➕ **Kanal Ekleme**
@@ -1457,6 +1362,7 @@ Lütfen kanal linkini giriniz:
         
         await self.edit_or_send_message(update, context, message, reply_markup)
     
+    @callback_router.route("my_channels")
     async def show_my_channels(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Kullanıcının kanallarını gösterir"""
         user_id = str(update.effective_user.id)
@@ -1569,12 +1475,13 @@ Lütfen tekrar deneyin veya Ana Menü'ye dönün.
             error_msg = f"❌ Kanal #{channel_number} mesajı gönderilemedi: {str(e)}"
             await update.effective_message.reply_text(error_msg)
     
+    @callback_router.route("cancel_channel")
     async def cancel_channel_add(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Kanal ekleme işlemini iptal eder"""
         user_id = str(update.effective_user.id)
         
         # Kullanıcı durumunu temizle
-        db_manager.clear_user_state(user_id)
+        user_state_store.clear_user_state(user_id)
         
         message = """
 ❌ **Kanal Ekleme İptal Edildi**
@@ -1591,7 +1498,7 @@ Ana menüye dönüyorsunuz.
         
         try:
             # Kullanıcı durumunu al
-            state, temp_data = db_manager.get_user_state(user_id)
+            state, temp_data = user_state_store.get_user_state(user_id)
             
             if state != "ready_to_start":
                 await self.edit_or_send_message(update, context, "❌ Geçersiz işlem durumu!")
@@ -1608,16 +1515,21 @@ Ana menüye dönüyorsunuz.
                 await self.edit_or_send_message(update, context, "❌ Hiç session dosyası bulunamadı!")
                 return
             
+            # Ölü linke istek havuzu yazılmaz
+            channel = db_manager.get_channel(channel_id)
+            if channel and await self._refuse_dead_link(update, context, channel['channel_link']):
+                return
+            
             # Proxy'leri yükle
             proxy_manager.reload_proxies()
             proxies = [proxy_manager.get_proxy_string(p) for p in proxy_manager.proxies]
             
-            # İstek havuzunu oluştur
-            success = db_manager.create_request_pool(channel_id, session_files, proxies)
+            # İstek havuzunu oluştur (event loop'u bloklamamak için thread'de)
+            success = await asyncio.to_thread(db_manager.create_request_pool, channel_id, session_files, proxies)
             
             if success:
                 # Kullanıcı durumunu temizle
-                db_manager.clear_user_state(user_id)
+                user_state_store.clear_user_state(user_id)
                 
                 message = """
 🚀 **İstek Gönderme Başlatıldı!**
@@ -1657,13 +1569,14 @@ Ana menüden "📺 Kanallarım" ile ilerlemeyi takip edebilirsiniz.
             await self.edit_or_send_message(update, context, error_message)
             logger.error(f"İstek başlatılırken hata: {e}")
     
+    @callback_router.route("start_requests")
     async def start_requests_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """İstek gönderme işlemini başlatır (callback handler için)"""
         user_id = str(update.effective_user.id)
         
         try:
             # Kullanıcı durumunu al
-            state, temp_data = db_manager.get_user_state(user_id)
+            state, temp_data = user_state_store.get_user_state(user_id)
             
             # Eğer kullanıcı durumu yoksa, son eklenen kanalı bul
             if not state or state not in ["ready_to_start", "waiting_repeat_choice"]:
@@ -1688,16 +1601,21 @@ Ana menüden "📺 Kanallarım" ile ilerlemeyi takip edebilirsiniz.
                 await self.edit_or_send_message(update, context, "❌ Hiç session dosyası bulunamadı!")
                 return
             
+            # Ölü linke istek havuzu yazılmaz
+            channel = db_manager.get_channel(channel_id)
+            if channel and await self._refuse_dead_link(update, context, channel['channel_link']):
+                return
+            
             # Proxy'leri yükle
             proxy_manager.reload_proxies()
             proxies = [proxy_manager.get_proxy_string(p) for p in proxy_manager.proxies]
             
-            # İstek havuzunu oluştur
-            success = db_manager.create_request_pool(channel_id, session_files, proxies)
+            # İstek havuzunu oluştur (event loop'u bloklamamak için thread'de)
+            success = await asyncio.to_thread(db_manager.create_request_pool, channel_id, session_files, proxies)
             
             if success:
                 # Kullanıcı durumunu temizle
-                db_manager.clear_user_state(user_id)
+                user_state_store.clear_user_state(user_id)
                 
                 message = """
 🚀 **İstek Gönderme Başlatıldı!**
@@ -1742,7 +1660,7 @@ Ana menüden "📺 Kanallarım" ile ilerlemeyi takip edebilirsiniz.
         
         try:
             # Kullanıcı durumunu al
-            state, temp_data = db_manager.get_user_state(user_id)
+            state, temp_data = user_state_store.get_user_state(user_id)
             
             if not state:
                 # Normal mesaj, işleme
@@ -1760,9 +1678,11 @@ Ana menüden "📺 Kanallarım" ile ilerlemeyi takip edebilirsiniz.
                 await self.handle_admin_id(update, context, message_text)
             elif state == "waiting_remove_admin_id":
                 await self.handle_remove_admin_id(update, context, message_text)
+            elif state == "waiting_proxy_delete":
+                await self.handle_proxy_delete(update, context, message_text)
             else:
                 # Bilinmeyen durum, temizle
-                db_manager.clear_user_state(user_id)
+                user_state_store.clear_user_state(user_id)
                 
         except Exception as e:
             logger.error(f"Mesaj işlenirken hata: {e}")
@@ -1799,9 +1719,18 @@ Lütfen tekrar deneyin veya Ana Menü'ye dönün.
             )
             return
         
+        # Linki bir hesapla çöz; ölü linke kampanya oluşturulmaz
+        metadata = await self.preflight_channel_link(link)
+        if metadata['link_status'] == LINK_DEAD:
+            await update.message.reply_text(
+                self.format_preflight(metadata) + "\n\nLütfen başka bir kanal linki girin:",
+                parse_mode='HTML'
+            )
+            return
+        
         # Geçici veriyi güncelle
         temp_data = {'channel_link': link}
-        db_manager.set_user_state(user_id, "waiting_request_count", temp_data)
+        user_state_store.set_user_state(user_id, "waiting_request_count", temp_data)
         
         # Önceki mesajları sil
         try:
@@ -1818,10 +1747,11 @@ Lütfen tekrar deneyin veya Ana Menü'ye dönün.
 📊 **İstek Sayısı**
 
 Kanal: `{}`
+{}
 🔹 Aktif hesap: `{}`
 
 Kaç istek? (1-1000)
-        """.format(link, active_count)
+        """.format(link, self.format_preflight(metadata), active_count)
         
         # İptal ve Ana Menü butonları
         keyboard = [
@@ -1846,9 +1776,9 @@ Kaç istek? (1-1000)
                 return
             
             # Geçici veriyi güncelle
-            state, temp_data = db_manager.get_user_state(user_id)
+            state, temp_data = user_state_store.get_user_state(user_id)
             temp_data['total_requests'] = count
-            db_manager.set_user_state(user_id, "waiting_duration", temp_data)
+            user_state_store.set_user_state(user_id, "waiting_duration", temp_data)
             
             # Önceki mesajları sil
             try:
@@ -1898,13 +1828,13 @@ Kaç dakika? (maksimum 1440)
                 return
             
             # Geçici veriyi al ve 4. soruyu sor
-            state, temp_data = db_manager.get_user_state(user_id)
+            state, temp_data = user_state_store.get_user_state(user_id)
             channel_link = temp_data.get('channel_link')
             total_requests = temp_data.get('total_requests')
             
             # 4. soru: Tekrar istek gönderme
             temp_data['duration'] = duration
-            db_manager.set_user_state(user_id, "waiting_repeat_choice", temp_data)
+            user_state_store.set_user_state(user_id, "waiting_repeat_choice", temp_data)
             
             # Önceki mesajları sil
             try:
@@ -1959,7 +1889,7 @@ Sorun devam ederse:
             
             # Geçici veriyi güncelle
             temp_data['channel_id'] = channel_id
-            db_manager.set_user_state(user_id, "ready_to_start", temp_data)
+            user_state_store.set_user_state(user_id, "ready_to_start", temp_data)
             
             # Kanalın yeni mi yoksa güncellenmiş mi olduğunu kontrol et
             channel = db_manager.get_channel(channel_id)
@@ -2006,6 +1936,50 @@ Başlatmak için aşağıdaki butona basın:
                 "Lütfen sadece sayı girin (örn: 60):"
             )
     
+    async def preflight_channel_link(self, channel_link: str, force: bool = False) -> Dict:
+        """Kanal linkini ön kontrolden geçirir; güncel sonuç önbellekteyse Telegram'a gidilmez"""
+        if not force:
+            cached = await asyncio.to_thread(db_manager.get_channel_metadata, channel_link,
+                                             get_preflight_cache_minutes())
+            if cached:
+                return cached
+        
+        metadata = await telethon_manager.check_channel_link(channel_link, session_manager.get_session_files())
+        if metadata['link_status'] != LINK_UNKNOWN:
+            # Doğrulanamayan sonuç önbelleğe alınmaz, sonraki denemede yeniden kontrol edilir
+            await asyncio.to_thread(db_manager.save_channel_metadata, channel_link, metadata)
+        return metadata
+    
+    @staticmethod
+    def format_preflight(metadata: Dict) -> str:
+        """Ön kontrol sonucunu kullanıcıya gösterilecek satırlara çevirir (HTML)"""
+        error = html.escape(str(metadata.get('error') or ''))
+        if metadata['link_status'] == LINK_DEAD:
+            return f"❌ Kanal linki geçersiz veya süresi dolmuş (<code>{error}</code>)"
+        if metadata['link_status'] == LINK_UNKNOWN:
+            return f"⚠️ Link doğrulanamadı, istekler yine de planlanabilir (<code>{error}</code>)"
+        
+        participants = metadata.get('participants_count')
+        lines = [f"📺 Başlık: <b>{html.escape(metadata.get('title') or '-')}</b>"]
+        lines.append(f"👥 Üye: <code>{participants if participants is not None else '-'}</code>")
+        lines.append(f"🔐 Katılım onayı: {'Gerekli' if metadata.get('requires_approval') else 'Gerekmiyor'}")
+        return "\n".join(lines)
+    
+    async def _refuse_dead_link(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                                channel_link: str, force: bool = False) -> bool:
+        """Link ölüyse kullanıcıyı uyarır ve True döndürür (havuz oluşturulmaz)"""
+        metadata = await self.preflight_channel_link(channel_link, force=force)
+        if metadata['link_status'] != LINK_DEAD:
+            return False
+        
+        keyboard = [[InlineKeyboardButton("🏠 Ana Menü", callback_data="main_menu")]]
+        await self.edit_or_send_message(
+            update, context,
+            f"{self.format_preflight(metadata)}\n\nİstek havuzu oluşturulmadı.",
+            InlineKeyboardMarkup(keyboard), parse_mode='HTML'
+        )
+        return True
+    
     def is_valid_channel_link(self, link: str) -> bool:
         """Kanal linkinin geçerli olup olmadığını kontrol eder"""
         import re
@@ -2026,30 +2000,17 @@ Başlatmak için aşağıdaki butona basın:
         
         return False
     
-    async def handle_channel_action(self, update: Update, context: ContextTypes.DEFAULT_TYPE, action: str) -> None:
-        """Kanal yönetim işlemlerini handle eder"""
+    @callback_router.route("channel_start_{channel_id:int}", action_type="start")
+    @callback_router.route("channel_pause_{channel_id:int}", action_type="pause")
+    @callback_router.route("channel_delete_{channel_id:int}", action_type="delete")
+    @callback_router.route("channel_confirm_delete_{channel_id:int}", action_type="confirm_delete")
+    @callback_router.route("channel_refresh_{channel_id:int}", action_type="refresh")
+    @callback_router.route("channel_planned_{channel_id:int}", action_type="planned")
+    async def handle_channel_action(self, update: Update, context: ContextTypes.DEFAULT_TYPE, action_type: str, channel_id: int) -> None:
+        """Kanal yönetim işlemlerini handle eder (action_type ve channel_id router tarafından çözülür)"""
         user_id = str(update.effective_user.id)
         
         try:
-            # Action'ı parse et
-            parts = action.split('_')
-            if len(parts) < 3:
-                await self.edit_or_send_message(update, context, "❌ Geçersiz işlem!")
-                return
-            
-            # Action type'ı belirle
-            if len(parts) == 3:
-                # channel_start_1, channel_pause_1, channel_delete_1
-                action_type = parts[1]  # start, pause, delete
-                channel_id = int(parts[2])
-            elif len(parts) == 4:
-                # channel_confirm_delete_1
-                action_type = f"{parts[1]}_{parts[2]}"  # confirm_delete
-                channel_id = int(parts[3])
-            else:
-                await self.edit_or_send_message(update, context, f"❌ Geçersiz işlem formatı! Action: {action}")
-                return
-            
             # Kanalın kullanıcıya ait olup olmadığını kontrol et
             channel = db_manager.get_channel(channel_id)
             if not channel or channel['user_id'] != user_id:
@@ -2069,19 +2030,24 @@ Başlatmak için aşağıdaki butona basın:
             elif action_type == "planned":
                 await self.show_planned_requests(update, context, channel_id)
             else:
-                await self.edit_or_send_message(update, context, f"❌ Geçersiz işlem! Action: {action}, Type: {action_type}")
+                await self.edit_or_send_message(update, context, f"❌ Geçersiz işlem! Type: {action_type}")
                 
         except Exception as e:
-            logger.error(f"Kanal işlemi hatası: {e}, Action: {action}")
+            logger.error(f"Kanal işlemi hatası: {e}, Type: {action_type}, Kanal: {channel_id}")
             await self.edit_or_send_message(update, context, f"❌ Hata oluştu: {str(e)}")
     
     async def start_channel(self, update: Update, context: ContextTypes.DEFAULT_TYPE, channel_id: int) -> None:
         """Kanalı başlatır"""
         try:
-            # Kanal durumunu aktif yap
+            # Ölü linke istek havuzu yazılmaz (durdurulmuş kampanya yeniden başlatılırken link tekrar kontrol edilir)
+            channel = db_manager.get_channel(channel_id)
+            if channel and await self._refuse_dead_link(update, context, channel['channel_link'], force=True):
+                return
+            
+            # Kanal durumunu aktif yap (önceki otomatik durdurma nedeni temizlenir)
             with sqlite3.connect(db_manager.db_path) as conn:
                 cursor = conn.cursor()
-                cursor.execute('UPDATE channels SET status = ? WHERE id = ?', ('active', channel_id))
+                cursor.execute('UPDATE channels SET status = ?, stop_reason = NULL WHERE id = ?', ('active', channel_id))
                 conn.commit()
             
             # Session dosyalarını al
@@ -2094,8 +2060,8 @@ Başlatmak için aşağıdaki butona basın:
             proxy_manager.reload_proxies()
             proxies = [proxy_manager.get_proxy_string(p) for p in proxy_manager.proxies]
             
-            # İstek havuzunu oluştur
-            success = db_manager.create_request_pool(channel_id, session_files, proxies)
+            # İstek havuzunu oluştur (event loop'u bloklamamak için thread'de)
+            success = await asyncio.to_thread(db_manager.create_request_pool, channel_id, session_files, proxies)
             
             if success:
                 message = f"""
@@ -2123,18 +2089,8 @@ Kanallarım listesinden ilerlemeyi takip edebilirsiniz.
     async def pause_channel(self, update: Update, context: ContextTypes.DEFAULT_TYPE, channel_id: int) -> None:
         """Kanalı duraklatır"""
         try:
-            # Kanal durumunu duraklatılmış yap
-            with sqlite3.connect(db_manager.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('UPDATE channels SET status = ? WHERE id = ?', ('paused', channel_id))
-                
-                # Bekleyen istekleri iptal et
-                cursor.execute('''
-                    UPDATE request_pool 
-                    SET status = 'Atlandı' 
-                    WHERE channel_id = ? AND status = 'Bekliyor'
-                ''', (channel_id,))
-                conn.commit()
+            # Kanalı duraklat, bekleyen istekleri tek sorguda iptal et ve boşalan slotları dağıt
+            await asyncio.to_thread(db_manager.stop_channel, channel_id, JoinErrorCode.CHANNEL_PAUSED)
             
             message = """
 ⏸️ **Kanal Duraklatıldı!**
@@ -2195,6 +2151,10 @@ Bu işlem geri alınamaz!
                 cursor.execute('DELETE FROM request_pool WHERE channel_id = ?', (channel_id,))
                 deleted_requests = cursor.rowcount
                 
+                # Arşivlenmiş istekleri ve sayaçlarını sil
+                cursor.execute('DELETE FROM request_history WHERE channel_id = ?', (channel_id,))
+                cursor.execute('DELETE FROM archived_request_counts WHERE channel_id = ?', (channel_id,))
+                
                 # Kanalı sil
                 cursor.execute('DELETE FROM channels WHERE id = ?', (channel_id,))
                 deleted_channels = cursor.rowcount
@@ -2203,6 +2163,8 @@ Bu işlem geri alınamaz!
                 
                 logger.info(f"Kanal silindi: ID={channel_id}, Link={channel[1]}, Silinen istekler={deleted_requests}")
             
+            await asyncio.to_thread(db_manager.reschedule_pending)
+            
             message = f"""
 🗑️ **Kanal Başarıyla Silindi!**
 
@@ -2285,6 +2247,7 @@ Toplam: {len(planned_requests)} istek
             logger.error(f"Planlanan istekler gösterilirken hata: {e}")
             await self.edit_or_send_message(update, context, f"❌ Hata oluştu: {str(e)}")
     
+    @callback_router.route("global_pool")
     async def show_global_pool(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Global havuzu gösterir"""
         try:
@@ -2338,7 +2301,7 @@ Toplam: {len(global_requests)} planlanmış istek
         
         try:
             # Geçici veriyi al
-            state, temp_data = db_manager.get_user_state(user_id)
+            state, temp_data = user_state_store.get_user_state(user_id)
             channel_link = temp_data.get('channel_link')
             total_requests = temp_data.get('total_requests')
             duration = temp_data.get('duration')
@@ -2367,7 +2330,7 @@ Sorun devam ederse:
                 return
             
             # Kullanıcı durumunu temizle
-            db_manager.clear_user_state(user_id)
+            user_state_store.clear_user_state(user_id)
             
             # Başarı mesajı
             repeat_text = "Evet" if choice == "yes" else "Hayır"
@@ -2403,13 +2366,15 @@ Başlatmak için aşağıdaki butona basın:
             logger.error(f"Tekrar seçimi işlenirken hata: {e}")
             await self.edit_or_send_message(update, context, f"❌ Hata oluştu: {str(e)}")
     
+    @callback_router.route("repeat_yes", choice="yes")
+    @callback_router.route("repeat_no", choice="no")
     async def handle_repeat_choice_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE, choice: str) -> None:
         """Tekrar istek gönderme seçimini işler (callback handler için)"""
         user_id = str(update.effective_user.id)
         
         try:
             # Geçici veriyi al
-            state, temp_data = db_manager.get_user_state(user_id)
+            state, temp_data = user_state_store.get_user_state(user_id)
             channel_link = temp_data.get('channel_link')
             total_requests = temp_data.get('total_requests')
             duration = temp_data.get('duration')
@@ -2441,7 +2406,7 @@ Sorun devam ederse:
                 return
             
             # Kullanıcı durumunu temizle
-            db_manager.clear_user_state(user_id)
+            user_state_store.clear_user_state(user_id)
             
             # Başarı mesajı
             repeat_text = "Evet" if choice == "yes" else "Hayır"
@@ -2477,56 +2442,54 @@ Başlatmak için aşağıdaki butona basın:
             logger.error(f"Tekrar seçimi işlenirken hata: {e}")
             await self.edit_or_send_message(update, context, f"❌ Hata oluştu: {str(e)}")
     
-    def get_recent_logs(self, lines: int = 30) -> str:
-        """Son N satır log'u döndürür"""
+    def get_recent_logs(self, lines: int = 30, level: Optional[str] = None, logger_name: Optional[str] = None) -> str:
+        """Son N satır log'u döndürür (bellek tamponu veya log dosyasının sonu)"""
         try:
-            import subprocess
-            import os
-            import logging
-            
-            # Önce bot.log dosyasını kontrol et
-            log_file = "bot.log"
-            if os.path.exists(log_file):
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    all_lines = f.readlines()
-                    recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-                    return ''.join(recent_lines)
-            
-            # Docker container'da mı çalışıyor kontrol et
-            if os.path.exists('/.dockerenv'):
-                # Docker container'da - konsol loglarını al
-                try:
-                    # Docker logs komutunu çalıştır
-                    result = subprocess.run(
-                        ['docker', 'logs', '--tail', str(lines), '$(docker ps --format "{{.Names}}" | grep python-app)'],
-                        capture_output=True, text=True, shell=True, timeout=10
-                    )
-                    if result.returncode == 0 and result.stdout:
-                        return result.stdout
-                    else:
-                        return "Docker logları alınamadı. Coolify panelinden görüntüleyin."
-                except Exception as e:
-                    return f"Docker log hatası: {str(e)}"
-            else:
-                return "Log dosyası bulunamadı."
-                    
+            recent_lines = get_recent_logs(lines, level, logger_name)
+            if not recent_lines:
+                return "Log kaydı bulunamadı."
+            return '\n'.join(recent_lines)
         except Exception as e:
             return f"Log okuma hatası: {e}"
     
-    async def show_logs(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """Son logları gösterir"""
+    @callback_router.route("show_logs")
+    @callback_router.route("show_logs_level_{level:str}")
+    @callback_router.route("show_logs_logger_{logger_name:str}")
+    async def show_logs(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                        level: Optional[str] = None, logger_name: Optional[str] = None) -> None:
+        """Son logları gösterir (seviye veya logger'a göre filtrelenebilir)"""
         try:
-            logs = self.get_recent_logs(30)
+            logs = html.escape(self.get_recent_logs(30, level, logger_name))
             
             # Log çok uzunsa böl
-            if len(logs) > 4000:
-                logs = logs[-4000:] + "\n... (Son 30 satır)"
-            
-            message = f"📋 <b>Son 30 Log Satırı:</b>\n\n<code>{logs}</code>"
-            
-            # Yenile ve Geri butonları
+            if len(logs) > 3800:
+                logs = "...\n" + logs[-3800:]
+            
+            title = "Son 30 Log Satırı"
+            if level:
+                title += f" ({level} ve üstü)"
+            elif logger_name:
+                title += f" ({logger_name})"
+            message = f"📋 <b>{title}:</b>\n\n<code>{logs}</code>"
+            
+            # Filtre, Yenile ve Geri butonları
+            refresh_data = "show_logs"
+            if level:
+                refresh_data = f"show_logs_level_{level}"
+            elif logger_name:
+                refresh_data = f"show_logs_logger_{logger_name}"
             keyboard = [
-                [InlineKeyboardButton("🔄 Yenile", callback_data="show_logs")],
+                [
+                    InlineKeyboardButton("❌ ERROR", callback_data="show_logs_level_ERROR"),
+                    InlineKeyboardButton("⚠️ WARNING", callback_data="show_logs_level_WARNING"),
+                    InlineKeyboardButton("📋 Tümü", callback_data="show_logs")
+                ],
+                [
+                    InlineKeyboardButton("🤖 Bot", callback_data="show_logs_logger_telegram_bot"),
+                    InlineKeyboardButton("⚙️ İşleyici", callback_data="show_logs_logger_request_processor"),
+                    InlineKeyboardButton("📡 Telethon", callback_data="show_logs_logger_telethon_client")
+                ],
+                [InlineKeyboardButton("🔄 Yenile", callback_data=refresh_data)],
                 [InlineKeyboardButton("⬅️ Geri", callback_data="admin_panel")]
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -2537,10 +2500,127 @@ Başlatmak için aşağıdaki butona basın:
             logger.error(f"Log gösterimi hatası: {e}")
             await update.callback_query.answer("❌ Log gösterilemedi", show_alert=True)
     
+    @staticmethod
+    def _format_seconds(value: Optional[float]) -> str:
+        """Süreyi okunabilir kısa metne çevirir"""
+        if value is None:
+            return "-"
+        if value < 1:
+            return f"{value * 1000:.0f} ms"
+        if value < 120:
+            return f"{value:.1f} sn"
+        return f"{value / 60:.1f} dk"
+    
+    @callback_router.route("show_metrics")
+    async def show_metrics(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """İstek hattı metriklerinin özetini gösterir (/metrics komutu veya admin paneli)"""
+        try:
+            if not is_admin(str(update.effective_user.id)):
+                await self.edit_or_send_message(update, context, "❌ Bu özelliği kullanma yetkiniz yok!")
+                return
+            
+            joins = {key[0]: int(value) for key, value in JOIN_REQUESTS.get_all().items()}
+            join_lines = "\n".join(f"• {outcome}: <code>{count}</code>" for outcome, count in sorted(joins.items())) or "• -"
+            pool = await asyncio.to_thread(POOL_DEPTH.get_all)
+            pool_lines = "\n".join(f"• {key[0]}: <code>{int(value)}</code>" for key, value in sorted(pool.items())) or "• -"
+            
+            fmt = self._format_seconds
+            client_count = CLIENT_CREATE_SECONDS.get_count()
+            client_failed = client_count - CLIENT_CREATE_SECONDS.get_count(result="ok")
+            db_slowest = sorted(
+                ((labels[0], DB_QUERY_SECONDS.quantile(0.95, query=labels[0])) for labels in DB_QUERY_SECONDS.get_label_values()),
+                key=lambda item: item[1] or 0, reverse=True
+            )[:3]
+            db_lines = "\n".join(f"• {name}: p95 <code>{fmt(value)}</code>" for name, value in db_slowest) or "• -"
+            
+            message = (
+                "📈 <b>İstek Hattı Metrikleri</b>\n\n"
+                f"<b>Katılım sonuçları:</b>\n{join_lines}\n\n"
+                f"<b>Havuz derinliği:</b>\n{pool_lines}\n\n"
+                f"<b>Zamanlayıcı gecikmesi:</b> p50 <code>{fmt(SCHEDULER_LAG_SECONDS.quantile(0.5))}</code>, "
+                f"p95 <code>{fmt(SCHEDULER_LAG_SECONDS.quantile(0.95))}</code>\n"
+                f"<b>FloodWait:</b> <code>{FLOODWAIT_SECONDS.get_count()}</code> kez, "
+                f"toplam <code>{fmt(FLOODWAIT_SECONDS.get_sum() or None)}</code>\n"
+                f"<b>Client oluşturma:</b> <code>{client_count}</code> deneme, <code>{client_failed}</code> başarısız, "
+                f"p95 <code>{fmt(CLIENT_CREATE_SECONDS.quantile(0.95))}</code>\n"
+                f"<b>Bot handler p95:</b> <code>{fmt(HANDLER_SECONDS.quantile(0.95))}</code>\n\n"
+                f"<b>En yavaş sorgular:</b>\n{db_lines}"
+            )
+            keyboard = [
+                [InlineKeyboardButton("🔄 Yenile", callback_data="show_metrics")],
+                [InlineKeyboardButton("⬅️ Geri", callback_data="admin_panel")]
+            ]
+            await self.edit_or_send_message(update, context, message, InlineKeyboardMarkup(keyboard), parse_mode='HTML')
+            
+        except Exception as e:
+            logger.error(f"Metrik gösterimi hatası: {e}")
+            await self.edit_or_send_message(update, context, f"❌ Metrikler gösterilemedi: {str(e)}")
+    
+    @callback_router.route("lateness_report")
+    async def show_lateness_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Planlanan zamana göre gecikme yüzdeliklerini ve olası nedeni gösterir"""
+        try:
+            if not is_admin(str(update.effective_user.id)):
+                await self.edit_or_send_message(update, context, "❌ Bu özelliği kullanma yetkiniz yok!")
+                return
+            
+            report = await asyncio.to_thread(db_manager.get_lateness_report)
+            fmt = self._format_seconds
+            
+            def summary_line(summary: dict) -> str:
+                return (f"p50 <code>{fmt(summary['p50'])}</code>, p95 <code>{fmt(summary['p95'])}</code>, "
+                        f"p99 <code>{fmt(summary['p99'])}</code> ({summary['count']} istek)")
+            
+            overall = report['global']
+            channels = sorted(report['channels'].items(), key=lambda item: item[1]['p95'], reverse=True)[:5]
+            channel_lines = "\n".join(
+                f"• #{channel_id} {html.escape(summary.get('channel_link') or '')}\n"
+                f"  {summary_line(summary)}\n  ↳ {html.escape(diagnose_lateness(summary))}"
+                for channel_id, summary in channels
+            ) or "• -"
+            errors = ", ".join(f"{name}: {count}" for name, count in sorted(overall['errors'].items())) or "-"
+            
+            message = (
+                "⏱️ <b>Gecikme Raporu</b>\n\n"
+                f"<b>Genel:</b> {summary_line(overall)}\n"
+                f"<b>Ortalama işlem süresi:</b> <code>{fmt(overall['avg_duration'])}</code>, "
+                f"ortalama deneme <code>{overall['avg_attempts']:.2f}</code>\n"
+                f"<b>Hatalar:</b> {html.escape(errors)}\n"
+                f"<b>Olası neden:</b> {html.escape(diagnose_lateness(overall))}\n\n"
+                f"<b>En geç kanallar:</b>\n{channel_lines}"
+            )
+            keyboard = [
+                [InlineKeyboardButton("🔄 Yenile", callback_data="lateness_report")],
+                [InlineKeyboardButton("⬅️ Geri", callback_data="admin_panel")]
+            ]
+            await self.edit_or_send_message(update, context, message, InlineKeyboardMarkup(keyboard), parse_mode='HTML')
+            
+        except Exception as e:
+            logger.error(f"Gecikme raporu gösterimi hatası: {e}")
+            await self.edit_or_send_message(update, context, f"❌ Gecikme raporu gösterilemedi: {str(e)}")
+    
     def run(self) -> None:
-        """Botu çalıştırır"""
-        logger.info("Bot başlatılıyor...")
-        self.application.run_polling()
+        """Botu çalıştırır (webhook URL ayarlıysa webhook, değilse polling)"""
+        webhook = get_webhook_settings()
+        try:
+            if webhook:
+                self.run_webhook(webhook)
+            else:
+                logger.info("Bot başlatılıyor (polling)...")
+                self.application.run_polling(allowed_updates=Update.ALL_TYPES)
+        finally:
+            # Bekleyen form durumlarını diske yaz
+            user_state_store.stop()
+    
+    def run_webhook(self, webhook: Dict) -> None:
+        """Botu Application'ın dahili webhook sunucusu ile çalıştırır (ayarlar: get_webhook_settings).
+        
+        Telegram her isteği X-Telegram-Bot-Api-Secret-Token başlığı ile gönderir;
+        başlık eşleşmezse istek 403 ile reddedilir.
+        """
+        logger.info(f"Bot başlatılıyor (webhook): {webhook['webhook_url']} -> "
+                    f"{webhook['listen']}:{webhook['port']}/{webhook['url_path']}")
+        self.application.run_webhook(allowed_updates=Update.ALL_TYPES, **webhook)
 
 def main():
     """Ana fonksiyon"""
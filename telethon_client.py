@@ -5,18 +5,28 @@ Session dosyaları ile Telegram hesaplarına bağlanır ve kanal katılım istek
 """
 
 import os
+import time
 import asyncio
 import logging
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from telethon import TelegramClient, events
-from telethon.errors import SessionPasswordNeededError, FloodWaitError, ChannelPrivateError
-from telethon.tl.functions.channels import JoinChannelRequest
-from telethon.tl.functions.messages import ImportChatInviteRequest
+from telethon.errors import SessionPasswordNeededError, FloodWaitError
+from telethon.tl.functions.channels import JoinChannelRequest, GetFullChannelRequest
+from telethon.tl.functions.messages import ImportChatInviteRequest, CheckChatInviteRequest
+from telethon.tl.functions.contacts import ResolveUsernameRequest
 from database import db_manager
 from proxy_manager import proxy_manager
+from account_planner import select_accounts
+from channel_preflight import (parse_channel_link, dead_link_reason, metadata_from_invite, metadata_from_chat,
+                               LINK_DEAD, LINK_UNKNOWN)
+from circuit_breaker import ChannelCircuitBreaker
+from join_result import JoinResult, JoinErrorCode, classify_join_error, DEAD_LINK_ERRORS
+from account_lifecycle import AccountLifecycle, QUARANTINE_FOLDERS
+from config import get_circuit_breaker_threshold
+from metrics import JOIN_REQUESTS, FLOODWAIT_SECONDS, CLIENT_CREATE_SECONDS, SCHEDULER_LAG_SECONDS
+from container import LazySingleton
 import socks  # SOCKS5 desteği için
-import shutil  # Invalid session taşıma için
 
 logger = logging.getLogger(__name__)
 
@@ -36,8 +46,30 @@ class TelethonManager:
         # Proxy cache - her hesap için çalışan proxy
         self.account_proxy_cache = {}
         
-    async def create_client(self, session_file: str, proxy_info: Dict = None) -> Optional[TelegramClient]:
-        """Session dosyası için client oluşturur"""
+        # İstekler arası minimum bekleme ve alternatif proxy denemeleri arası bekleme (saniye)
+        self.min_request_interval = 5
+        self.proxy_retry_delay = 1
+        
+        # Kanal başına ardışık aynı kanal hatası (eşikte kampanya durdurulur)
+        self.circuit_breaker = ChannelCircuitBreaker(get_circuit_breaker_threshold())
+        
+        # Frozen/geçersiz hesapların karantinası
+        self.lifecycle = AccountLifecycle(
+            self.clients, self.sessions_dir, self.account_proxy_cache,
+            proxy_source=lambda: [proxy_manager.get_proxy_string(p) for p in proxy_manager.proxies]
+        )
+        
+    async def create_client(self, session_file: str, proxy_info: Dict = None,
+                            quarantine: bool = True) -> Optional[TelegramClient]:
+        """Session dosyası için client oluşturur.
+
+        ``quarantine`` False ise yetkisiz session karantinaya alınmaz, yalnızca
+        client kapatılır; işleyici döngüsü dışından (bot iş parçacığı) yapılan
+        çağrılar ``clients``/``account_proxy_cache`` sözlüklerine dokunmamalıdır.
+        """
+        started = time.perf_counter()
+        proxy_label = f"{proxy_info['host']}:{proxy_info['port']}" if proxy_info else "none"
+        result = "error"
         try:
             session_path = os.path.join(self.sessions_dir, session_file)
             
@@ -49,7 +81,7 @@ class TelethonManager:
             proxy = None
             if proxy_info:
                 proxy = proxy_manager.get_telethon_proxy(proxy_info)
-                logger.info(f"🌐 SOCKS5 Proxy kullanılıyor: {proxy_info['host']}:{proxy_info['port']}")
+                logger.debug("🌐 SOCKS5 Proxy kullanılıyor: %s:%s", proxy_info['host'], proxy_info['port'])
             
             # Client oluştur - timeout sürelerini kısalt
             client = TelegramClient(
@@ -66,79 +98,54 @@ class TelethonManager:
             await client.connect()
             
             if not await client.is_user_authorized():
+                result = "unauthorized"
                 logger.warning(f"Session yetkilendirilmemiş: {session_file}")
                 
-                # Önce client'ı kapat
-                await client.disconnect()
-                
-                # Sonra session'ı taşı
-                try:
-                    invalid_path = os.path.join(self.invalid_dir, session_file)
-                    shutil.move(session_path, invalid_path)
-                    logger.info(f"📁 Geçersiz session taşındı: {session_file} -> Invalid/")
-                except Exception as move_error:
-                    logger.error(f"Session taşınamadı ({session_file}): {move_error}")
-                
+                if quarantine:
+                    # Client'ı kapat, session'ı Invalid/ altına taşı ve isteklerini devret
+                    await self.lifecycle.quarantine(session_file, JoinErrorCode.ACCOUNT_INVALID, client)
+                else:
+                    await client.disconnect()
                 return None
             
-            logger.info(f"Client oluşturuldu: {session_file}")
+            logger.debug("Client oluşturuldu: %s", session_file)
+            result = "ok"
             return client
             
         except Exception as e:
             logger.error(f"Client oluşturulamadı ({session_file}): {e}")
             return None
+        finally:
+            CLIENT_CREATE_SECONDS.observe(time.perf_counter() - started, proxy=proxy_label, result=result)
     
-    async def join_channel(self, client: TelegramClient, channel_link: str) -> Tuple[bool, str]:
-        """Kanala katılım isteği gönderir"""
+    async def join_channel(self, client: TelegramClient, channel_link: str) -> JoinResult:
+        """Kanala katılım isteği gönderir; sonucu hata kodu ve yeniden deneme politikasıyla döndürür"""
+        kind, identifier = parse_channel_link(channel_link)
+        if not identifier:
+            return JoinResult(JoinErrorCode.DEAD_LINK, "Geçersiz kanal linki")
+        
         try:
-            # Link formatını düzenle
-            if channel_link.startswith('@'):
-                channel_link = channel_link[1:]
-            elif not channel_link.startswith('https://t.me/'):
-                channel_link = f"https://t.me/{channel_link}"
-            
-            # Kanal linkini parse et
-            if 't.me/' in channel_link:
-                channel_identifier = channel_link.split('t.me/')[-1]
+            if kind == 'invite':
+                # Gizli kanal için ImportChatInviteRequest kullan
+                logger.debug("🔗 Gizli kanala katılım isteği gönderiliyor: %s", channel_link)
+                await client(ImportChatInviteRequest(identifier))
             else:
-                return False, "Geçersiz kanal linki"
+                # Normal kanal için JoinChannelRequest kullan
+                logger.debug("🔗 Normal kanala katılım isteği gönderiliyor: %s", channel_link)
+                await client(JoinChannelRequest(identifier))
+            logger.debug("✅ Kanal katılım isteği başarılı: %s", channel_link)
+            return JoinResult(JoinErrorCode.OK, "Kanal katılım isteği gönderildi")
             
-            # Katılım isteği gönder
-            try:
-                # Gizli kanal linki kontrolü (+ ile başlıyorsa)
-                if channel_identifier.startswith('+'):
-                    # Gizli kanal için ImportChatInviteRequest kullan
-                    invite_hash = channel_identifier[1:]  # + işaretini kaldır
-                    logger.info(f"🔗 Gizli kanala katılım isteği gönderiliyor: {channel_link} (Hash: {invite_hash})")
-                    await client(ImportChatInviteRequest(invite_hash))
-                    logger.info(f"✅ Gizli kanala katılım isteği başarılı: {channel_link}")
-                    return True, "Gizli kanala katılım isteği gönderildi"
-                else:
-                    # Normal kanal için JoinChannelRequest kullan
-                    logger.info(f"🔗 Normal kanala katılım isteği gönderiliyor: {channel_link} (Username: {channel_identifier})")
-                    await client(JoinChannelRequest(channel_identifier))
-                    logger.info(f"✅ Normal kanala katılım isteği başarılı: {channel_link}")
-                    return True, "Kanal katılım isteği gönderildi"
-                
-            except ChannelPrivateError:
-                logger.warning(f"❌ Kanal özel veya erişim yok: {channel_link}")
-                return False, "Kanal özel veya erişim yok"
-            except FloodWaitError as e:
-                logger.warning(f"⏳ Rate limit: {e.seconds} saniye bekle - {channel_link}")
-                return False, f"Rate limit: {e.seconds} saniye bekle"
-            except Exception as e:
-                error_msg = str(e)
-                # "You have successfully requested" mesajı aslında başarılı
-                if "You have successfully requested" in error_msg:
-                    logger.info(f"✅ Kanal katılım isteği başarılı ({channel_link}): {error_msg}")
-                    return True, "Başarılı"
-                else:
-                    logger.error(f"❌ Kanal katılım hatası ({channel_link}): {error_msg}")
-                    return False, f"Hata: {error_msg}"
-                
         except Exception as e:
-            logger.error(f"Kanal katılım hatası: {e}")
-            return False, f"Bağlantı hatası: {str(e)}"
+            result = classify_join_error(e)
+            if result.code == JoinErrorCode.FLOODWAIT:
+                FLOODWAIT_SECONDS.observe(result.retry_after)
+            if result.success:
+                # Onaylı kanala istek gönderildi veya hesap zaten üye
+                logger.debug("✅ Kanal katılımı başarılı sayıldı (%s): %s", result.outcome, channel_link)
+            else:
+                logger.warning(f"❌ Kanal katılım hatası ({result.outcome}, {channel_link}): {result.message}")
+            return result
     
     async def process_request(self, request_data: Dict) -> bool:
         """Tek bir isteği işler"""
@@ -147,126 +154,207 @@ class TelethonManager:
         channel_link = request_data['channel_link']
         proxy_address = request_data.get('proxy_address')
         
-        logger.info(f"🚀 İstek işleniyor: ID={request_id}, Hesap={account_name}, Kanal={channel_link}")
+        logger.debug("🚀 İstek işleniyor: ID=%s, Hesap=%s, Kanal=%s", request_id, account_name, channel_link)
         
         try:
             # Client'ı al veya oluştur
             client = self.clients.get(account_name)
             if not client:
-                logger.info(f"📱 Yeni client oluşturuluyor: {account_name}")
+                logger.debug("📱 Yeni client oluşturuluyor: %s", account_name)
                 
                 # Önce cache'den çalışan proxy'yi dene
                 cached_proxy = self.account_proxy_cache.get(account_name)
                 if cached_proxy:
-                    logger.info(f"🔄 Cache'den proxy kullanılıyor: {account_name}")
+                    logger.debug("🔄 Cache'den proxy kullanılıyor: %s", account_name)
                     client = await self.create_client(account_name, cached_proxy)
                     if client:
-                        logger.info(f"✅ Cache proxy başarılı: {account_name}")
+                        logger.debug("✅ Cache proxy başarılı: %s", account_name)
                     else:
                         # Cache proxy başarısız, cache'i temizle
                         del self.account_proxy_cache[account_name]
-                        logger.warning(f"⚠️ Cache proxy başarısız, temizlendi: {account_name}")
+                        logger.warning("⚠️ Cache proxy başarısız, temizlendi: %s", account_name)
                 
-                if not client:
+                if not client and not self.lifecycle.is_quarantined(account_name):
                     # İlk proxy'yi dene
                     initial_proxy_info = None
                     if proxy_address:
                         initial_proxy_info = proxy_manager.parse_proxy_string(proxy_address)
-                        logger.info(f"🌐 İlk proxy kullanılıyor: {proxy_address}")
+                        # proxy_address kullanıcı adı/şifre içerebilir; yalnızca host:port yazılır
+                        logger.debug("🌐 İlk proxy kullanılıyor: %s", proxy_address.rsplit('@', 1)[-1])
                     
                     client = await self.create_client(account_name, initial_proxy_info)
                     
                     if client:
                         # İlk proxy başarılı, cache'e kaydet
                         self.account_proxy_cache[account_name] = initial_proxy_info
-                        logger.info(f"✅ İlk proxy başarılı, cache'e kaydedildi: {account_name}")
+                        logger.debug("✅ İlk proxy başarılı, cache'e kaydedildi: %s", account_name)
                     else:
                         # Alternatif proxy'leri dene
-                        logger.warning(f"⚠️ İlk proxy başarısız, alternatif proxy'ler deneniyor: {account_name}")
+                        logger.warning("⚠️ İlk proxy başarısız, alternatif proxy'ler deneniyor: %s", account_name)
                         
                         for i in range(1, 6):  # 1'den 5'e kadar deneme
-                            logger.info(f"🔄 Alternatif proxy {i}/5 deneniyor...")
-                            await asyncio.sleep(1)  # Her deneme arasında 1 saniye bekle
+                            if self.lifecycle.is_quarantined(account_name):
+                                break  # Session geçersiz; proxy değiştirmek sonucu değiştirmez
+                            await asyncio.sleep(self.proxy_retry_delay)  # Her deneme arasında kısa bekleme
                             
                             alt_proxy_info = proxy_manager.get_random_proxy()
                             if alt_proxy_info:
-                                logger.info(f"🔄 Alternatif proxy {i}/5 deneniyor: {proxy_manager.get_proxy_string(alt_proxy_info)}")
+                                logger.debug("🔄 Alternatif proxy %d/5 deneniyor: %s:%s", i, alt_proxy_info['host'], alt_proxy_info['port'])
                                 client = await self.create_client(account_name, alt_proxy_info)
                                 if client:
                                     # Alternatif proxy başarılı, cache'e kaydet
                                     self.account_proxy_cache[account_name] = alt_proxy_info
-                                    logger.info(f"✅ Alternatif proxy {i} başarılı, cache'e kaydedildi: {account_name}")
+                                    logger.info("✅ Alternatif proxy %d başarılı, cache'e kaydedildi: %s", i, account_name)
                                     break  # Başarılı olursa döngüden çık
                             else:
                                 logger.warning("⚠️ Alternatif proxy bulunamadı.")
                                 break  # Alternatif proxy yoksa döngüden çık
                 
+                if not client and self.lifecycle.is_quarantined(account_name):
+                    return await self.hand_over_request(request_data, JoinResult(JoinErrorCode.ACCOUNT_INVALID,
+                                                                                 "Session yetkilendirilmemiş"))
                 if not client:
                     logger.error(f"❌ Client oluşturulamadı: {account_name}")
-                    db_manager.update_request_status(request_id, "Atlandı")
-                    return False
+                    return self.record_result(request_data, JoinResult(JoinErrorCode.CLIENT_UNAVAILABLE,
+                                                                       "Client oluşturulamadı"))
                 else:
-                    logger.info(f"✅ Client başarıyla oluşturuldu: {account_name}")
+                    logger.debug("✅ Client başarıyla oluşturuldu: %s", account_name)
                     self.clients[account_name] = client
             else:
-                logger.info(f"♻️ Mevcut client kullanılıyor: {account_name}")
+                logger.debug("♻️ Mevcut client kullanılıyor: %s", account_name)
             
             # Kanala katılım isteği gönder
-            logger.info(f"📤 Katılım isteği gönderiliyor: {account_name} -> {channel_link}")
-            success, message = await self.join_channel(client, channel_link)
+            logger.debug("📤 Katılım isteği gönderiliyor: %s -> %s", account_name, channel_link)
+            result = await self.join_channel(client, channel_link)
             
-            if success:
-                db_manager.update_request_status(request_id, "Gönderildi")
-                # İstek geçmişini kaydet
-                db_manager.record_account_channel_request(account_name, channel_link)
-                logger.info(f"✅ İstek başarılı: {account_name} -> {channel_link}")
-                return True
-            else:
-                # FROZEN hesabı tespit et ve temizle
-                error_text = str(message or "")
-                if "FROZEN" in error_text or "FROZEN_METHOD_INVALID" in error_text:
-                    logger.error(f"🧊 Hesap frozen tespit edildi: {account_name}")
-                    try:
-                        # Client bağlantısını kesin
-                        try:
-                            await client.disconnect()
-                        except Exception:
-                            pass
-                        # Haritada da kapat
-                        if account_name in self.clients:
-                            del self.clients[account_name]
-                        
-                        # Session dosyasını Frozens klasörüne taşı
-                        sessions_root = self.sessions_dir
-                        frozens_dir = os.path.join(sessions_root, "Frozens")
-                        os.makedirs(frozens_dir, exist_ok=True)
-                        src_path = os.path.join(sessions_root, account_name)
-                        dst_path = os.path.join(frozens_dir, account_name)
-                        try:
-                            # Windows'ta kilidi kaldırmak için yeniden adlandırmayı zorla
-                            if os.path.exists(dst_path):
-                                os.remove(dst_path)
-                        except Exception:
-                            pass
-                        try:
-                            os.replace(src_path, dst_path)
-                            logger.info(f"📁 Session taşındı -> {dst_path}")
-                        except Exception as move_err:
-                            logger.error(f"Session taşınamadı ({account_name}): {move_err}")
-                        
-                        # Veritabanını temizle
-                        db_manager.purge_account(account_name)
-                    except Exception as clean_err:
-                        logger.error(f"Frozen hesap temizleme hatası ({account_name}): {clean_err}")
-                
-                db_manager.update_request_status(request_id, "Atlandı")
-                logger.warning(f"❌ İstek başarısız: {account_name} -> {channel_link} ({message})")
-                return False
+            if result.code in QUARANTINE_FOLDERS:
+                # Frozen/geçersiz hesabı karantinaya al, isteklerini sağlıklı hesaplara devret
+                return await self.hand_over_request(request_data, result, client)
+            
+            return self.record_result(request_data, result)
                 
         except Exception as e:
             logger.error(f"💥 İstek işlenirken hata ({account_name} -> {channel_link}): {e}")
-            db_manager.update_request_status(request_id, "Atlandı")
+            return self.record_result(request_data, JoinResult(JoinErrorCode.INTERNAL, str(e)))
+    
+    async def hand_over_request(self, request_data: Dict, result: JoinResult, client: TelegramClient = None) -> bool:
+        """Hesabı karantinaya alır; elindeki istek başka hesaba devredildiyse sonuç yazılmaz"""
+        request_id = request_data['id']
+        account_name = request_data['account_name']
+        reassigned = await self.lifecycle.quarantine(account_name, result.code, client, request_id)
+        if request_id not in reassigned:
+            return self.record_result(request_data, result)
+        
+        JOIN_REQUESTS.inc(outcome=result.outcome)
+        logger.warning("🔀 İstek başka hesaba devredildi (%s): %s -> %s", result.outcome, account_name,
+                       request_data['channel_link'],
+                       extra={'request_id': request_id, 'account': account_name, 'outcome': result.outcome})
+        return False
+    
+    def record_result(self, request_data: Dict, result: JoinResult) -> bool:
+        """Katılım sonucunu politikasına göre işler; istek başarılıysa True döndürür.
+
+        Başarılı sonuçlar 'Gönderildi' olur ("zaten üye" dahil). Geçici hatalar ve
+        FloodWait deneme sınırına kadar yeniden kuyruğa alınır; diğerleri 'Atlandı'
+        olur ve kanala ait hatalar devre kesiciye bildirilir.
+        """
+        request_id = request_data['id']
+        account_name = request_data['account_name']
+        channel_id = request_data['channel_id']
+        channel_link = request_data['channel_link']
+        # İstek başına tek INFO/WARNING satırı; alanlar JSON çıktıda ayrı anahtarlar olur
+        extra = {'request_id': request_id, 'account': account_name, 'outcome': result.outcome}
+        JOIN_REQUESTS.inc(outcome=result.outcome)
+        
+        if result.success:
+            self.circuit_breaker.record_success(channel_id)
+            db_manager.update_request_status(request_id, "Gönderildi", result.error_code)
+            # İstek geçmişini kaydet
+            db_manager.record_account_channel_request(account_name, channel_link)
+            logger.info("✅ İstek başarılı: %s -> %s", account_name, channel_link, extra=extra)
+            return True
+        
+        delay = result.retry_delay()
+        if delay is not None and db_manager.retry_request(request_id, delay, result.error_code):
+            logger.info("🔁 İstek %s sn sonra tekrar denenecek: %s -> %s (%s)", delay, account_name, channel_link,
+                        result.message, extra=extra)
             return False
+        
+        db_manager.update_request_status(request_id, "Atlandı", result.error_code)
+        logger.warning("❌ İstek başarısız: %s -> %s (%s)", account_name, channel_link, result.message, extra=extra)
+        if self.circuit_breaker.record_failure(channel_id, result.signature):
+            self.trip_channel(channel_id, channel_link, result.signature)
+        return False
+    
+    def trip_channel(self, channel_id: int, channel_link: str, signature: str) -> None:
+        """Aynı kanal hatası eşik kadar tekrarlandı: kampanyayı durdurur, sahibine bildirim bırakır"""
+        logger.error(f"⛔ Devre kesici açıldı, kampanya durduruluyor: {channel_link} ({signature})")
+        if signature in DEAD_LINK_ERRORS:
+            db_manager.save_channel_metadata(channel_link, {'link_status': LINK_DEAD, 'error': signature})
+        db_manager.stop_channel(channel_id, JoinErrorCode.CHANNEL_STOPPED, signature)
+        self.circuit_breaker.reset(channel_id)
+    
+    async def check_channel_link(self, channel_link: str, session_files: List[str], attempts: int = 3) -> Dict:
+        """Kanal linkini sağlıklı bir hesapla çözer (havuz oluşturmadan önce ön kontrol).
+
+        Davet linkleri CheckChatInviteRequest, kullanıcı adları ResolveUsernameRequest
+        ile kontrol edilir; katılım isteği gönderilmez. Dönen sözlükte link_status
+        'ok' ise başlık, kimlik, onay gereksinimi ve üye sayısı bulunur; 'dead' link
+        kalıcı olarak geçersizdir; 'unknown' hiçbir hesapla doğrulanamadı demektir.
+
+        Bot iş parçacığından çağrılır: her deneme havuza eklenmeyen ayrı bir client
+        kullanır ve yetkisiz session'ları karantinaya almaz; karantina işleyicinin
+        kendi döngüsünde, istek işlenirken yapılır.
+        """
+        kind, identifier = parse_channel_link(channel_link)
+        # İşleyicinin açık tuttuğu session dosyaları kilitli olabilir; boştaki hesaplar denenir
+        idle = [name for name in session_files if name not in self.clients]
+        load = await asyncio.to_thread(db_manager.get_account_load)
+        last_error = "Uygun hesap bulunamadı"
+        
+        for account_name in select_accounts(idle, attempts, load):
+            proxy_info = self.account_proxy_cache.get(account_name) or proxy_manager.get_random_proxy()
+            client = await self.create_client(account_name, proxy_info, quarantine=False)
+            if not client:
+                last_error = "Client oluşturulamadı"
+                continue
+            try:
+                if kind == 'invite':
+                    metadata = metadata_from_invite(await client(CheckChatInviteRequest(identifier)))
+                else:
+                    resolved = await client(ResolveUsernameRequest(identifier))
+                    if not resolved.chats:
+                        # Kullanıcı adı bir kişiye ait, kanal değil
+                        return {'link_status': LINK_DEAD, 'error': 'NOT_A_CHANNEL'}
+                    chat = resolved.chats[0]
+                    participants = None
+                    if getattr(chat, 'participants_count', None) is None:
+                        try:
+                            full = await client(GetFullChannelRequest(chat))
+                            participants = full.full_chat.participants_count
+                        except Exception as e:
+                            logger.debug("Üye sayısı alınamadı (%s): %s", channel_link, e)
+                    metadata = metadata_from_chat(chat, participants)
+                logger.info("🔎 Kanal linki doğrulandı: %s (%s, %s üye)", channel_link,
+                            metadata['title'], metadata['participants_count'])
+                return metadata
+            except FloodWaitError as e:
+                FLOODWAIT_SECONDS.observe(e.seconds)
+                last_error = f"Rate limit: {e.seconds} saniye bekle"
+            except Exception as e:
+                reason = dead_link_reason(e)
+                if reason:
+                    logger.warning(f"💀 Kanal linki geçersiz ({reason}): {channel_link}")
+                    return {'link_status': LINK_DEAD, 'error': reason}
+                last_error = str(e)
+                logger.warning(f"Kanal linki kontrol edilemedi ({account_name} -> {channel_link}): {e}")
+            finally:
+                try:
+                    await client.disconnect()
+                except Exception:
+                    pass
+        
+        return {'link_status': LINK_UNKNOWN, 'error': last_error}
     
     async def process_pending_requests(self, limit: int = 1) -> int:
         """Bekleyen istekleri işler (sıralı olarak)"""
@@ -278,12 +366,13 @@ class TelethonManager:
                 logger.debug("📭 Bekleyen istek bulunamadı")
                 return 0
             
-            logger.info(f"📋 {len(requests)} bekleyen istek işlenecek (sıralı)")
+            logger.debug("📋 %d bekleyen istek işlenecek (sıralı)", len(requests))
             
             # İstekleri sıralı olarak işle (paralel değil)
             successful = 0
             for request in requests:
-                logger.info(f"📝 İstek işleniyor: {request['account_name']} -> {request['channel_link']} (Zaman: {request['scheduled_time']})")
+                logger.debug("📝 İstek işleniyor: %s -> %s (Zaman: %s)", request['account_name'], request['channel_link'], request['scheduled_time'])
+                db_manager.mark_request_claimed(request['id'])
                 
                 # İstek zamanını kontrol et
                 scheduled_time = datetime.fromisoformat(request['scheduled_time'])
@@ -292,19 +381,23 @@ class TelethonManager:
                 if scheduled_time > now:
                     # Henüz zamanı gelmemiş, bekle
                     wait_seconds = (scheduled_time - now).total_seconds()
-                    logger.info(f"⏳ İstek zamanı bekleniyor: {wait_seconds:.1f} saniye")
+                    logger.debug("⏳ İstek zamanı bekleniyor: %.1f saniye", wait_seconds)
                     await asyncio.sleep(wait_seconds)
                 
+                # Planlanan zamandan ne kadar geç başlandı
+                SCHEDULER_LAG_SECONDS.observe(max(0.0, (datetime.now() - scheduled_time).total_seconds()))
+                db_manager.mark_request_started(request['id'])
+                
                 # İsteği işle
                 result = await self.process_request(request)
                 if result:
                     successful += 1
                 
-                # Her istekten sonra minimum 5 saniye bekle
-                logger.info("⏳ Minimum 5 saniye bekleme...")
-                await asyncio.sleep(5)
+                # Her istekten sonra minimum bekleme
+                logger.debug("⏳ Minimum %s saniye bekleme...", self.min_request_interval)
+                await asyncio.sleep(self.min_request_interval)
             
-            logger.info(f"📊 İstek sonuçları: {successful} başarılı, {len(requests) - successful} başarısız")
+            logger.info("📊 İstek sonuçları: %d başarılı, %d başarısız", successful, len(requests) - successful)
             return successful
             
         except Exception as e:
@@ -379,7 +472,7 @@ class TelethonManager:
         await self.cleanup_clients()
 
 # Global telethon manager instance'ı
-telethon_manager = TelethonManager()
+telethon_manager = LazySingleton('telethon_manager', TelethonManager)
 
 if __name__ == "__main__":
     # Test
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Hesap-kanal dizini test dosyası
+Bit kümesi işlemlerini, '.session' uzantısı eşleşmesini, tablodan yüklemeyi ve
+100 bin hesaplık uygunluk sorgusunu test eder
+"""
+
+import os
+import time
+import sqlite3
+import tempfile
+from account_index import AccountChannelIndex
+from database import DatabaseManager
+
+def test_bitmap_operations():
+    """Ekleme, sorgu, küme farkı ve hesap silme"""
+    index = AccountChannelIndex()
+    index.load([("a.session", "@k1"), ("b", "@k1"), ("a", "@k2")])
+    assert index.contains("a", "@k1") and index.contains("b.session", "@k1")
+    assert not index.contains("b", "@k2") and not index.contains("c", "@k1")
+    assert index.available("@k1", ["a.session", "b.session", "c.session"]) == ["c.session"]
+    assert sorted(index.channels_for_account("a.session")) == ["@k1", "@k2"]
+    assert index.channel_count("@k1") == 2
+
+    candidates = index.mask_for(["a", "b", "c"])
+    assert index.names_for(index.available_mask("@k1", candidates)) == ["c"]
+
+    index.discard_account("a.session")
+    assert not index.contains("a", "@k1") and index.channel_count("@k1") == 1
+    print("✅ Bit kümesi işlemleri testi başarılı")
+
+def test_database_integration():
+    """Tablodan yüklenir, kayıtla güncellenir; allow_repeat=False uzantı farkına takılmaz"""
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'index_test.db'))
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("INSERT INTO account_channel_requests (account_name, channel_link) VALUES ('eski.session', '@kanal')")
+    sessions = ["eski.session", "yeni.session", "diger.session"]
+    assert db.get_available_accounts_for_channel("@kanal", False, sessions) == ["yeni.session", "diger.session"]
+
+    db.record_account_channel_request("yeni.session", "@kanal")
+    assert db.get_account_channel_requests("yeni", "@kanal")
+    assert db.get_available_accounts_for_channel("@kanal", False, sessions) == ["diger.session"]
+    assert db.get_available_accounts_for_channel("@kanal", True, sessions) == sessions
+    assert db.get_account_channels("eski") == ["@kanal"]
+
+    db.purge_account("eski.session")
+    assert db.get_available_accounts_for_channel("@kanal", False, sessions) == ["eski.session", "diger.session"]
+    print("✅ Veritabanı entegrasyonu testi başarılı")
+
+def test_large_available_query():
+    """100 bin hesaplık uygunluk sorgusu SQL döngüsü olmadan yapılır"""
+    accounts = [f"hesap_{i}.session" for i in range(100000)]
+    index = AccountChannelIndex()
+    started = time.perf_counter()
+    index.load((account, f"@kanal_{i % 50}") for i, account in enumerate(accounts))
+    load_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    available = index.available("@kanal_7", accounts)
+    list_ms = (time.perf_counter() - started) * 1000
+    assert len(available) == 98000
+
+    candidates = index.mask_for(accounts)
+    started = time.perf_counter()
+    mask = index.available_mask("@kanal_7", candidates)
+    mask_us = (time.perf_counter() - started) * 1e6
+    assert mask.bit_count() == 98000
+    print(f"✅ Büyük sorgu testi başarılı (yükleme {load_ms:.0f} ms, liste {list_ms:.1f} ms, bit kümesi {mask_us:.0f} µs)")
+
+if __name__ == "__main__":
+    print("🧪 Hesap-Kanal Dizini Testi")
+    print("=" * 50)
+    test_bitmap_operations()
+    test_database_integration()
+    test_large_available_query()
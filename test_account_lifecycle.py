@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Hesap karantinası test dosyası
+Session dosyalarının taşınmasını, bekleyen isteklerin sağlıklı hesaplara tek
+işlemde devredilmesini, yürütücünün elindeki isteğin korunmasını ve hesabın
+veritabanı ile dizinden silinmesini test eder
+"""
+
+import os
+import asyncio
+import sqlite3
+import tempfile
+import pytest
+from datetime import datetime, timedelta
+from container import override, reset
+from database import DatabaseManager, db_manager
+from session_manager import SessionManager, session_manager
+from account_lifecycle import AccountLifecycle, move_session_files
+from join_result import JoinErrorCode
+
+NOW = datetime.now()
+PROXIES = ["10.0.0.1:1080", "10.0.0.2:1080", "10.0.0.3:1080"]
+FROZEN_PROXY = "10.0.0.9:1080"
+
+class FakeClient:
+    """Yalnızca disconnect çağrısını kaydeden client"""
+    def __init__(self):
+        self.disconnected = False
+
+    async def disconnect(self):
+        self.disconnected = True
+
+@pytest.fixture(autouse=True)
+def _reset_overrides():
+    """_setup'ın geçici veritabanı ve session yöneticisi sonraki testlere sızmaz"""
+    yield
+    reset(db_manager)
+    reset(session_manager)
+
+def _setup(monkeypatch):
+    monkeypatch.setenv("ACCOUNT_MIN_INTERVAL", "0")
+    root = tempfile.mkdtemp()
+    sessions_dir = os.path.join(root, "Sessions")
+    os.makedirs(sessions_dir)
+    for name in ["frozen", "saglam_1", "saglam_2", "saglam_3"]:
+        with open(os.path.join(sessions_dir, f"{name}.session"), 'wb') as f:
+            f.write(b'SQLite format 3\x00')
+    db = DatabaseManager(os.path.join(root, 'lifecycle_test.db'))
+    override(db_manager, db)
+    override(session_manager, SessionManager(sessions_dir))
+
+    channel_a = db.add_channel("@kanal_a", 10, 60, "1", allow_repeat=False)
+    channel_b = db.add_channel("@kanal_b", 10, 60, "1")
+    rows = [
+        # frozen hesabın iki bekleyen isteği ve yürütücünün elindeki bir isteği
+        (channel_a, "frozen.session", NOW + timedelta(minutes=5), 'Bekliyor', None, FROZEN_PROXY),
+        (channel_b, "frozen.session", NOW + timedelta(minutes=6), 'Bekliyor', None, FROZEN_PROXY),
+        (channel_b, "frozen.session", NOW, 'Bekliyor', NOW, FROZEN_PROXY),
+        # saglam_1 kanal A'da zaten istek atmış, saglam_2 kanal B'de bekliyor
+        (channel_a, "saglam_1.session", NOW - timedelta(hours=1), 'Gönderildi', NOW - timedelta(hours=1), PROXIES[0]),
+        (channel_b, "saglam_2.session", NOW + timedelta(minutes=7), 'Bekliyor', None, PROXIES[1]),
+    ]
+    with sqlite3.connect(db.db_path) as conn:
+        conn.executemany('''
+            INSERT INTO request_pool (channel_id, account_name, scheduled_time, status, claimed_at, proxy_address)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+    # Sağlam hesapların kendi proxy atamaları
+    db.distribute_proxies(["saglam_1.session", "saglam_2.session", "saglam_3.session"], PROXIES, 1)
+    db.record_account_channel_request("frozen.session", "@kanal_a")
+    db.record_account_channel_request("saglam_1.session", "@kanal_a")
+    return db, sessions_dir
+
+def _accounts(db, status='Bekliyor'):
+    with sqlite3.connect(db.db_path) as conn:
+        return conn.execute('''
+            SELECT rp.id, c.channel_link, rp.account_name FROM request_pool rp
+            JOIN channels c ON rp.channel_id = c.id WHERE rp.status = ? ORDER BY rp.id
+        ''', (status,)).fetchall()
+
+def test_move_session_files():
+    """Session ve yan dosyaları klasöre taşınır, hedefteki eski kopya ezilir"""
+    sessions_dir = tempfile.mkdtemp()
+    for name in ["a.session", "a.session-journal", os.path.join("Frozens", "a.session")]:
+        os.makedirs(os.path.dirname(os.path.join(sessions_dir, name)), exist_ok=True)
+        with open(os.path.join(sessions_dir, name), 'w') as f:
+            f.write(name)
+    assert move_session_files(sessions_dir, "a.session", "Frozens")
+    assert sorted(os.listdir(os.path.join(sessions_dir, "Frozens"))) == ["a.session", "a.session-journal"]
+    with open(os.path.join(sessions_dir, "Frozens", "a.session")) as f:
+        assert f.read() == "a.session"
+    assert not move_session_files(sessions_dir, "a.session", "Frozens")
+    print("✅ Dosya taşıma testi başarılı")
+
+def test_quarantine(monkeypatch):
+    """Karantina tek işlemde: client kapanır, dosya taşınır, istekler devredilir, hesap silinir"""
+    db, sessions_dir = _setup(monkeypatch)
+    client = FakeClient()
+    clients = {"frozen.session": client}
+    proxy_cache = {"frozen.session": None}
+    lifecycle = AccountLifecycle(clients, sessions_dir, proxy_cache, proxy_source=lambda: PROXIES)
+
+    reassigned = asyncio.run(lifecycle.quarantine("frozen.session", JoinErrorCode.ACCOUNT_FROZEN))
+    assert client.disconnected and not clients and not proxy_cache
+    assert os.path.exists(os.path.join(sessions_dir, "Frozens", "frozen.session"))
+    assert lifecycle.is_quarantined("frozen.session")
+
+    pending = _accounts(db)
+    assert len(reassigned) == 2
+    by_id = {row_id: (link, account) for row_id, link, account in pending}
+    for row_id in reassigned:
+        link, account = by_id[row_id]
+        assert account != "frozen.session"
+        # Tekrar kapalı kanal A'ya istek atmış saglam_1, kanal B'de isteği olan saglam_2 seçilmez
+        assert not (link == "@kanal_a" and account == "saglam_1.session")
+        assert not (link == "@kanal_b" and account == "saglam_2.session")
+    # Devredilen satır devralan hesabın kendi proxy'sini taşır
+    with sqlite3.connect(db.db_path) as conn:
+        own = dict(conn.execute("SELECT session_file, proxy_address FROM accounts"))
+        moved = conn.execute(f"SELECT account_name, proxy_address FROM request_pool "
+                             f"WHERE id IN ({', '.join('?' for _ in reassigned)})", reassigned).fetchall()
+    assert moved and all(proxy == own[account] != FROZEN_PROXY for account, proxy in moved)
+    # Yürütücünün elindeki istek silinmedi, geçmiş ve dizin temizlendi
+    assert [account for _, _, account in pending].count("frozen.session") == 1
+    assert db.get_account_channels("frozen.session") == []
+    assert db.account_index.channels_for_account("frozen") == []
+
+    # İkinci çağrı yalnızca yürütücünün elindeki isteği devreder
+    in_flight = next(row_id for row_id, _, account in pending if account == "frozen.session")
+    again = asyncio.run(lifecycle.quarantine("frozen.session", JoinErrorCode.ACCOUNT_FROZEN, request_id=in_flight))
+    assert again == [in_flight]
+    assert all(account != "frozen.session" for _, _, account in _accounts(db))
+    print("✅ Karantina testi başarılı")
+
+def test_restored_session(monkeypatch):
+    """Session geri içe aktarılırsa hesap karantinada sayılmaz"""
+    db, sessions_dir = _setup(monkeypatch)
+    lifecycle = AccountLifecycle({}, sessions_dir)
+    asyncio.run(lifecycle.quarantine("saglam_3.session", JoinErrorCode.ACCOUNT_INVALID))
+    assert os.path.exists(os.path.join(sessions_dir, "Invalid", "saglam_3.session"))
+    assert lifecycle.is_quarantined("saglam_3.session")
+    os.replace(os.path.join(sessions_dir, "Invalid", "saglam_3.session"),
+               os.path.join(sessions_dir, "saglam_3.session"))
+    assert not lifecycle.is_quarantined("saglam_3.session")
+    print("✅ Geri yükleme testi başarılı")
+
+def test_purge_keeps_finished_requests(monkeypatch):
+    """Hesap silinirken yalnızca bekleyen, alınmamış istekler silinir; istatistik değişmez"""
+    db, _ = _setup(monkeypatch)
+    with sqlite3.connect(db.db_path) as conn:
+        channel_id = conn.execute("SELECT id FROM channels WHERE channel_link = '@kanal_b'").fetchone()[0]
+        conn.executemany("""
+            INSERT INTO request_pool (channel_id, account_name, scheduled_time, status, claimed_at)
+            VALUES (?, 'frozen.session', ?, ?, ?)
+        """, [(channel_id, NOW - timedelta(hours=2), 'Gönderildi', NOW - timedelta(hours=2)),
+              (channel_id, NOW - timedelta(hours=1), 'Atlandı', NOW - timedelta(hours=1))])
+    before = db.get_request_stats(channel_id)
+
+    db.purge_account("frozen.session")
+    after = db.get_request_stats(channel_id)
+    assert after['Gönderildi'] == before['Gönderildi'] == 1
+    assert after['Atlandı'] == before['Atlandı'] == 1
+    # Alınmamış bekleyen istek silindi, yürütücünün elindeki kaldı
+    assert after['Bekliyor'] == before['Bekliyor'] - 1
+    assert [account for _, _, account in _accounts(db)].count("frozen.session") == 1
+    print("✅ Sonuçlanmış isteklerin korunması testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Hesap Karantinası Testi")
+    print("=" * 50)
+    test_move_session_files()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_quarantine(monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_restored_session(monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_purge_keeps_finished_requests(monkeypatch)
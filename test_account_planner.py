@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Hesap planlayıcı test dosyası
+Kanal başına tekil hesap seçimini, yük/sağlık önceliğini, günlük sınırı ve
+istek havuzunun hesapları kanallar arasında dengelemesini test eder
+"""
+
+import os
+import time
+import random
+import sqlite3
+import tempfile
+import pytest
+from account_planner import select_accounts, effective_account_spacing, account_health
+from database import DatabaseManager
+from join_result import JoinErrorCode
+
+def test_distinct_accounts():
+    """Bir kanala aynı hesap iki kez atanmaz, hesap sayısından fazla istek üretilmez"""
+    accounts = [f"hesap_{i}.session" for i in range(50)]
+    selected = select_accounts(accounts + accounts[:10], 40, rng=random.Random(1))
+    assert len(selected) == 40 and len(set(selected)) == 40
+    assert len(select_accounts(accounts, 80)) == 50
+    print("✅ Tekil hesap testi başarılı")
+
+def test_load_health_and_caps():
+    """Az yüklü hesaplar önce, eşitlikte sağlıklı olan önce; günlük sınırdakiler elenir"""
+    load = {
+        "yuklu.session": {'pending': 3, 'used_24h': 0, 'health': 1.0},
+        "hasta.session": {'pending': 0, 'used_24h': 4, 'health': account_health(4, 0)},
+        "dolu.session": {'pending': 1, 'used_24h': 9, 'health': 1.0},
+    }
+    accounts = ["yuklu.session", "hasta.session", "dolu.session", "bos.session"]
+    assert select_accounts(accounts, 2, load, daily_cap=10) == ["bos.session", "hasta.session"]
+    assert "dolu.session" not in select_accounts(accounts, 4, load, daily_cap=10)
+    assert effective_account_spacing(60, 0) == 60
+    assert effective_account_spacing(60, 4) == 900
+    print("✅ Yük, sağlık ve sınır testi başarılı")
+
+def test_large_candidate_set():
+    """100 bin aday hesaptan seçim hızlıdır"""
+    accounts = [f"hesap_{i}.session" for i in range(100000)]
+    load = {account: {'pending': i % 7, 'used_24h': 0, 'health': 1.0} for i, account in enumerate(accounts)}
+    started = time.perf_counter()
+    selected = select_accounts(accounts, 20000, load, rng=random.Random(2))
+    elapsed = time.perf_counter() - started
+    assert len(selected) == 20000
+    assert all(load[account]['pending'] == 0 for account in selected[:14000])
+    print(f"✅ Büyük aday kümesi testi başarılı ({elapsed * 1000:.0f} ms)")
+
+def test_pool_balances_accounts(monkeypatch):
+    """İkinci kanal, önce hiç isteği olmayan hesapları kullanır"""
+    monkeypatch.setenv("ACCOUNT_MIN_INTERVAL", "0")
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'planner_test.db'))
+    sessions = [f"hesap_{i}.session" for i in range(50)]
+    proxies = [f"10.0.0.{i}:1080" for i in range(10)]
+
+    first_id = db.add_channel("@birinci", 30, 60, "1")
+    second_id = db.add_channel("@ikinci", 30, 60, "1")
+    assert db.create_request_pool(first_id, sessions, proxies)
+    assert db.create_request_pool(second_id, sessions, proxies)
+
+    with sqlite3.connect(db.db_path) as conn:
+        first = [row[0] for row in conn.execute("SELECT account_name FROM request_pool WHERE channel_id = ?", (first_id,))]
+        second = [row[0] for row in conn.execute("SELECT account_name FROM request_pool WHERE channel_id = ?", (second_id,))]
+    assert len(first) == len(set(first)) == 30
+    assert len(second) == len(set(second)) == 30
+    assert len(set(first) & set(second)) == 10
+    assert max(load['pending'] for load in db.get_account_load().values()) == 2
+    print("✅ Havuz dengeleme testi başarılı")
+
+def test_stopped_channel_keeps_load(monkeypatch):
+    """Durdurulan kanalın atlanan istekleri günlük sınırı ve sağlığı etkilemez"""
+    monkeypatch.setenv("ACCOUNT_MIN_INTERVAL", "0")
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'planner_stop_test.db'))
+    sessions = [f"hesap_{i}.session" for i in range(5)]
+    channel_id = db.add_channel("@durdurulan", 5, 60, "1")
+    assert db.create_request_pool(channel_id, sessions, ["10.0.0.1:1080"])
+
+    # Bir istek denenip başarısız oldu, biri kanal hatası aldı; kalanlar kanal durunca atlanır
+    with sqlite3.connect(db.db_path) as conn:
+        ids = [row[0] for row in conn.execute("SELECT id FROM request_pool ORDER BY id")]
+    for request_id, code in ((ids[0], JoinErrorCode.JOIN_FAILED), (ids[1], JoinErrorCode.CHANNEL_FULL)):
+        db.mark_request_claimed(request_id)
+        db.mark_request_started(request_id)
+        db.update_request_status(request_id, 'Atlandı', code)
+    before = db.get_account_load()
+
+    assert db.stop_channel(channel_id, JoinErrorCode.CHANNEL_STOPPED, 'CHANNEL_PRIVATE') == 3
+    after = db.get_account_load()
+    assert {name: (load['used_24h'], load['health']) for name, load in after.items()} == \
+           {name: (load['used_24h'], load['health']) for name, load in before.items()}
+    assert sum(load['used_24h'] for load in after.values()) == 1
+    assert sorted(load['health'] for load in after.values()) == [0.5, 1.0, 1.0, 1.0, 1.0]
+    print("✅ Durdurulan kanal yük testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Hesap Planlayıcı Testi")
+    print("=" * 50)
+    test_distinct_accounts()
+    test_load_health_and_caps()
+    test_large_candidate_set()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_pool_balances_accounts(monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_stopped_channel_keeps_load(monkeypatch)
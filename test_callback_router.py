@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Callback yönlendirici test dosyası
+Tam eşleşme, önek ağacı, tipli parametreler ve bottaki tüm callback_data değerlerini test eder
+"""
+
+import os
+import ast
+import asyncio
+from callback_router import CallbackRouter
+
+def _handler(name):
+    async def handler(owner, update, context, **kwargs):
+        owner.append((name, kwargs))
+    handler.__name__ = name
+    return handler
+
+def test_exact_and_prefix():
+    """Tam eşleşme ve parametreli önekler"""
+    router = CallbackRouter()
+    router.add_route("main_menu", _handler("main"))
+    router.add_route("session_list_{page:int}", _handler("session_list"))
+    router.add_route("admin_session_list_{page:int}", _handler("admin_session_list"))
+    router.add_route("download_active_sessions", _handler("download"), session_type="active")
+
+    handler, kwargs = router.resolve("main_menu")
+    assert handler.__name__ == "main" and kwargs == {}
+
+    handler, kwargs = router.resolve("session_list_3")
+    assert handler.__name__ == "session_list" and kwargs == {'page': 3}
+
+    # Daha uzun önek, kayıt sırasından bağımsız olarak kazanmalı
+    handler, kwargs = router.resolve("admin_session_list_2")
+    assert handler.__name__ == "admin_session_list" and kwargs == {'page': 2}
+
+    handler, kwargs = router.resolve("download_active_sessions")
+    assert kwargs == {'session_type': 'active'}
+    print("✅ Tam eşleşme ve önek testi başarılı")
+
+def test_nested_prefixes():
+    """İç içe önekler: channel_delete_ / channel_confirm_delete_"""
+    router = CallbackRouter()
+    router.add_route("channel_delete_{channel_id:int}", _handler("delete"), action_type="delete")
+    router.add_route("channel_confirm_delete_{channel_id:int}", _handler("confirm"), action_type="confirm_delete")
+    router.add_route("show_logs", _handler("logs"))
+    router.add_route("show_logs_{level:str}", _handler("logs_level"))
+
+    handler, kwargs = router.resolve("channel_confirm_delete_15")
+    assert handler.__name__ == "confirm" and kwargs == {'channel_id': 15, 'action_type': 'confirm_delete'}
+
+    handler, kwargs = router.resolve("channel_delete_15")
+    assert handler.__name__ == "delete" and kwargs['channel_id'] == 15
+
+    handler, kwargs = router.resolve("show_logs_ERROR")
+    assert handler.__name__ == "logs_level" and kwargs == {'level': 'ERROR'}
+    print("✅ İç içe önek testi başarılı")
+
+def test_invalid_data():
+    """Eşleşmeyen veya hatalı parametreli veriler"""
+    router = CallbackRouter()
+    router.add_route("proxy_list_{page:int}", _handler("proxy_list"))
+
+    assert router.resolve("proxy_list_") is None
+    assert router.resolve("proxy_list_abc") is None
+    assert router.resolve("unknown") is None
+    assert router.resolve("") is None
+    print("✅ Geçersiz veri testi başarılı")
+
+def test_duplicate_registration():
+    """Aynı desen iki kez kaydedilemez"""
+    router = CallbackRouter()
+    router.add_route("main_menu", _handler("a"))
+    router.add_route("session_list_{page:int}", _handler("b"))
+    for pattern in ("main_menu", "session_list_{n:int}"):
+        try:
+            router.add_route(pattern, _handler("c"))
+        except ValueError:
+            continue
+        raise AssertionError(f"Çift kayıt kabul edildi: {pattern}")
+    print("✅ Çift kayıt testi başarılı")
+
+def test_dispatch():
+    """dispatch handler'ı çağırır ve sonucu döndürür"""
+    router = CallbackRouter()
+    router.add_route("frozen_list_{page:int}", _handler("frozen"))
+    calls = []
+    assert asyncio.run(router.dispatch(calls, None, None, "frozen_list_4"))
+    assert calls == [("frozen", {'page': 4})]
+    assert not asyncio.run(router.dispatch(calls, None, None, "nope"))
+    print("✅ Dispatch testi başarılı")
+
+def _parse_bot_source() -> ast.Module:
+    """telegram_bot.py'yi içe aktarmadan ayrıştırır (telegram kurulu olmasa da çalışır)"""
+    source_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "telegram_bot.py")
+    with open(source_path, 'r', encoding='utf-8') as f:
+        return ast.parse(f.read(), source_path)
+
+def _sample_string(node: ast.AST):
+    """Sabit metni aynen, f-string'i parametreleri örnek bir değerle doldurarak döndürür"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        return ''.join(part.value if isinstance(part, ast.Constant) else '7' for part in node.values)
+    return None
+
+def build_bot_router(tree: ast.Module) -> CallbackRouter:
+    """``@callback_router.route(...)`` dekoratörlerinden botun rota tablosunu kurar"""
+    router = CallbackRouter()
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            if (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)
+                    and decorator.func.attr == 'route'
+                    and isinstance(decorator.func.value, ast.Name)
+                    and decorator.func.value.id == 'callback_router'):
+                fixed_kwargs = {kw.arg: ast.literal_eval(kw.value) for kw in decorator.keywords}
+                router.add_route(ast.literal_eval(decorator.args[0]), _handler(node.name), **fixed_kwargs)
+    return router
+
+def collect_bot_callback_data(tree: ast.Module) -> list:
+    """telegram_bot.py içindeki tüm callback_data değerlerini örnek değerlerle döndürür.
+
+    ``callback_data=degisken`` biçiminde verilen değerler için değişkene atanan
+    tüm metinler toplanır.
+    """
+    assigned = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign):
+            value = _sample_string(node.value)
+            for target in node.targets:
+                if value is not None and isinstance(target, ast.Name):
+                    assigned.setdefault(target.id, set()).add(value)
+
+    values = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.keyword) and node.arg == 'callback_data':
+            value = _sample_string(node.value)
+            if value is not None:
+                values.add(value)
+            elif isinstance(node.value, ast.Name):
+                values |= assigned.get(node.value.id, set())
+            else:
+                raise AssertionError(f"Çözümlenemeyen callback_data (satır {node.value.lineno})")
+    return sorted(values)
+
+def test_bot_callback_coverage():
+    """Botun ürettiği her callback_data değeri bir handler'a çözülmeli"""
+    tree = _parse_bot_source()
+    router = build_bot_router(tree)
+    assert len(router.get_patterns()) > 40
+    values = collect_bot_callback_data(tree)
+    assert "show_logs_level_ERROR" in values and "channel_start_7" in values
+    missing = [value for value in values if router.resolve(value) is None]
+    assert not missing, f"Handler'ı olmayan callback_data: {missing}"
+    print(f"✅ {len(values)} callback_data değerinin tamamı çözüldü")
+
+if __name__ == "__main__":
+    print("🧪 Callback Yönlendirici Testi")
+    print("=" * 50)
+    test_exact_and_prefix()
+    test_nested_prefixes()
+    test_invalid_data()
+    test_duplicate_registration()
+    test_dispatch()
+    test_bot_callback_coverage()
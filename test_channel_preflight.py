@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Kanal linki ön kontrol test dosyası
+Link ayrıştırmayı, ölü link hatalarının tanınmasını, Telegram yanıtlarından kanal
+bilgisi çıkarmayı ve kanal bilgisi önbelleğini test eder
+"""
+
+import os
+import tempfile
+import pytest
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+from channel_preflight import (parse_channel_link, dead_link_reason, metadata_from_invite, metadata_from_chat,
+                               LINK_OK, LINK_DEAD)
+from database import DatabaseManager
+
+def _rpc_error(message: str, code: int = 400) -> Exception:
+    """Telethon'un Telegram yanıtından ürettiği gerçek hata örneği"""
+    pytest.importorskip("telethon")
+    from bench.fake_telethon import rpc_error
+    from telethon.tl.functions.messages import CheckChatInviteRequest
+    return rpc_error(CheckChatInviteRequest('abc123'), code, message)
+
+def test_parse_channel_link():
+    """Bot'un kabul ettiği tüm link biçimleri ayrıştırılır"""
+    assert parse_channel_link("@kanal_adi") == ('username', 'kanal_adi')
+    assert parse_channel_link("https://t.me/kanal_adi") == ('username', 'kanal_adi')
+    assert parse_channel_link("t.me/kanal_adi") == ('username', 'kanal_adi')
+    assert parse_channel_link("https://t.me/+abc123-_") == ('invite', 'abc123-_')
+    assert parse_channel_link("t.me/+abc123") == ('invite', 'abc123')
+    assert parse_channel_link("+abc123") == ('invite', 'abc123')
+    assert parse_channel_link("https://t.me/joinchat/abc123") == ('invite', 'abc123')
+    print("✅ Link ayrıştırma testi başarılı")
+
+def test_dead_link_reason():
+    """Kalıcı hatalar ölü link sayılır, geçici hatalar sayılmaz"""
+    assert dead_link_reason(ValueError('No user has "yok" as username')) == 'USERNAME_NOT_OCCUPIED'
+    assert dead_link_reason(ConnectionError('timeout')) is None
+    print("✅ Ölü link tanıma testi başarılı")
+
+def test_dead_link_reason_telethon():
+    """Telethon'un gerçek hata örnekleri de ölü link olarak tanınır"""
+    assert dead_link_reason(_rpc_error('INVITE_HASH_EXPIRED')) == 'INVITE_HASH_EXPIRED'
+    assert dead_link_reason(_rpc_error('USERNAME_NOT_OCCUPIED')) == 'USERNAME_NOT_OCCUPIED'
+    assert dead_link_reason(_rpc_error('USERNAME_INVALID')) == 'USERNAME_INVALID'
+    assert dead_link_reason(_rpc_error('FLOOD_WAIT_30', 420)) is None
+    print("✅ Telethon ölü link tanıma testi başarılı")
+
+def test_metadata_extraction():
+    """ChatInvite ve kanal nesnelerinden başlık, kimlik, onay ve üye sayısı çıkarılır"""
+    invite = SimpleNamespace(title="Gizli", request_needed=True, participants_count=1200)
+    metadata = metadata_from_invite(invite)
+    assert metadata == {'link_status': LINK_OK, 'chat_id': None, 'title': "Gizli",
+                        'requires_approval': True, 'participants_count': 1200}
+
+    channel = SimpleNamespace(id=777, title="Açık", join_request=False, participants_count=None)
+    already = SimpleNamespace(chat=channel)
+    assert metadata_from_invite(already)['chat_id'] == 777
+    assert metadata_from_chat(channel, participants_count=50)['participants_count'] == 50
+    print("✅ Kanal bilgisi çıkarma testi başarılı")
+
+def test_metadata_cache():
+    """Önbellek süresi uygulanır; ölü işaretlemesi önceki bilgileri silmez"""
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'preflight_test.db'))
+    link = "https://t.me/+abc123"
+    assert db.save_channel_metadata(link, {'link_status': LINK_OK, 'title': "Kanal", 'participants_count': 10,
+                                           'requires_approval': True})
+    assert db.get_channel_metadata(link, max_age_minutes=60)['title'] == "Kanal"
+
+    # Ölü işaretlemesi önceki başlığı silmez; eski kayıt süresi dolunca None döner
+    db.save_channel_metadata(link, {'link_status': LINK_DEAD, 'error': 'INVITE_HASH_EXPIRED',
+                                    'checked_at': datetime.now() - timedelta(hours=2)})
+    assert db.get_channel_metadata(link, max_age_minutes=60) is None
+    cached = db.get_channel_metadata(link)
+    assert cached['link_status'] == LINK_DEAD and cached['title'] == "Kanal" and cached['requires_approval']
+    print("✅ Önbellek testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Kanal Linki Ön Kontrol Testi")
+    print("=" * 50)
+    test_parse_channel_link()
+    test_dead_link_reason()
+    test_metadata_extraction()
+    test_metadata_cache()
+    test_dead_link_reason_telethon()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Kanal devre kesicisi test dosyası
+Kanal/hesap hatası ayrımını, ardışık aynı hata sayacını, kanalın tek sorguda
+durdurulmasını ve sahibine bildirim kuyruğunu test eder
+"""
+
+import os
+import sqlite3
+import tempfile
+import pytest
+from circuit_breaker import ChannelCircuitBreaker, describe_failure
+from join_result import JoinErrorCode, classify_join_error
+from database import DatabaseManager, ERROR_CHANNEL_STOPPED
+
+def _rpc_error(message: str, code: int = 400) -> Exception:
+    """Telethon'un Telegram yanıtından ürettiği gerçek hata örneği"""
+    pytest.importorskip("telethon")
+    from bench.fake_telethon import rpc_error
+    from telethon.tl.functions.channels import JoinChannelRequest
+    return rpc_error(JoinChannelRequest('kanal'), code, message)
+
+def test_classifier():
+    """Kanala ait hatalar imza üretir, hesaba ait hatalar üretmez"""
+    assert classify_join_error(ConnectionError("bağlantı koptu")).signature is None
+    assert describe_failure('INVITE_HASH_EXPIRED') != describe_failure('CHANNEL_PRIVATE')
+    print("✅ Hata sınıflandırma testi başarılı")
+
+def test_telethon_errors_trip_breaker():
+    """Telethon'un gerçek kanal hataları imza üretir ve eşikte devreyi açar"""
+    assert classify_join_error(_rpc_error('CHANNEL_PRIVATE')).signature == 'CHANNEL_PRIVATE'
+    assert classify_join_error(_rpc_error('USERS_TOO_MUCH')).signature == 'USERS_TOO_MUCH'
+    assert classify_join_error(_rpc_error('INVITE_HASH_EXPIRED')).signature == 'INVITE_HASH_EXPIRED'
+    assert classify_join_error(_rpc_error('FROZEN_METHOD_INVALID', 420)).signature is None
+    assert classify_join_error(_rpc_error('CHANNELS_TOO_MUCH')).signature is None
+    assert classify_join_error(_rpc_error('FLOOD_WAIT_30', 420)).signature is None
+
+    breaker = ChannelCircuitBreaker(threshold=3)
+    tripped = [breaker.record_failure(1, classify_join_error(_rpc_error('CHANNEL_PRIVATE')).signature)
+               for _ in range(3)]
+    assert tripped == [False, False, True]
+    print("✅ Telethon hatalarıyla devre kesici testi başarılı")
+
+def test_breaker_streaks():
+    """Yalnızca ardışık aynı kanal hatası devreyi açar; eşik bir kez tetiklenir"""
+    breaker = ChannelCircuitBreaker(threshold=3)
+    assert not breaker.record_failure(1, 'CHANNEL_PRIVATE')
+    assert not breaker.record_failure(1, None)  # hesap hatası sayılmaz, diziyi de bozmaz
+    assert not breaker.record_failure(1, 'CHANNEL_PRIVATE')
+    assert breaker.record_failure(1, 'CHANNEL_PRIVATE')
+    assert not breaker.record_failure(1, 'CHANNEL_PRIVATE')
+
+    breaker.reset(1)
+    breaker.record_failure(1, 'CHANNEL_PRIVATE')
+    breaker.record_failure(1, 'USERS_TOO_MUCH')
+    assert breaker.streak(1) == ('USERS_TOO_MUCH', 1)
+    breaker.record_success(1)
+    assert breaker.streak(1) == (None, 0)
+    print("✅ Devre kesici sayaç testi başarılı")
+
+def test_stop_and_notify(monkeypatch):
+    """Durdurma bekleyenleri tek sorguda atlar; yalnızca otomatik durdurma bildirilir"""
+    monkeypatch.setenv("ACCOUNT_MIN_INTERVAL", "0")
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'breaker_test.db'))
+    sessions = [f"hesap_{i}.session" for i in range(40)]
+    auto_id = db.add_channel("@ozel", 20, 60, "42")
+    manual_id = db.add_channel("@elle", 10, 60, "42")
+    assert db.create_request_pool(auto_id, sessions, ["10.0.0.1:1080"])
+    assert db.create_request_pool(manual_id, sessions, ["10.0.0.1:1080"])
+
+    assert db.stop_channel(auto_id, ERROR_CHANNEL_STOPPED, 'CHANNEL_PRIVATE') == 20
+    assert db.stop_channel(manual_id) == 10
+    with sqlite3.connect(db.db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM request_pool WHERE status = 'Bekliyor'").fetchone()[0] == 0
+        # Elle duraklatma devre kesiciden ayrı kodla işaretlenir
+        codes = dict(conn.execute("SELECT channel_id, error_code FROM request_pool GROUP BY channel_id"))
+    assert codes == {auto_id: JoinErrorCode.CHANNEL_STOPPED, manual_id: JoinErrorCode.CHANNEL_PAUSED}
+    assert all(load['used_24h'] == 0 and load['health'] == 1.0 for load in db.get_account_load().values())
+    assert db.get_channel(auto_id)['status'] == 'paused'
+
+    pending = db.get_stopped_channels_to_notify()
+    assert [(c['id'], c['stop_reason'], c['skipped']) for c in pending] == [(auto_id, 'CHANNEL_PRIVATE', 20)]
+    assert db.mark_stop_notified(auto_id)
+    assert db.get_stopped_channels_to_notify() == []
+
+    # Yeniden eklenen kanalın durdurma nedeni temizlenir
+    db.add_channel("@ozel", 20, 60, "42")
+    with sqlite3.connect(db.db_path) as conn:
+        assert conn.execute("SELECT stop_reason FROM channels WHERE id = ?", (auto_id,)).fetchone()[0] is None
+    print("✅ Durdurma ve bildirim testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Kanal Devre Kesici Testi")
+    print("=" * 50)
+    test_classifier()
+    test_breaker_streaks()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_stop_and_notify(monkeypatch)
+    test_telethon_errors_trip_breaker()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tembel global örnek test dosyası
+İçe aktarmanın veritabanı oluşturmadığını, ilk erişimde tek kez oluşturmayı ve
+override ile geçici veritabanına yönlendirmeyi test eder
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import subprocess
+from container import LazySingleton, get_instance, is_initialized, override, reset, get_startup_report
+
+class _Counter:
+    created = 0
+
+    def __init__(self):
+        _Counter.created += 1
+        self.value = 1
+
+def test_lazy_creation_once():
+    """İlk erişimde bir kez oluşturulur, okuma/yazma gerçek örneğe gider"""
+    _Counter.created = 0
+    singleton = LazySingleton('test_counter', _Counter)
+    assert not is_initialized(singleton) and _Counter.created == 0
+
+    threads = [threading.Thread(target=lambda: singleton.value) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert _Counter.created == 1 and is_initialized(singleton)
+
+    singleton.value = 5
+    assert get_instance(singleton).value == 5
+    assert 'test_counter' in get_startup_report()
+    print("✅ Tek seferlik oluşturma testi başarılı")
+
+def test_override_and_reset():
+    """Testler gerçek örnek yerine kendi örneğini verebilir"""
+    from database import DatabaseManager, db_manager
+    tmpdir = tempfile.mkdtemp()
+    temp_db = DatabaseManager(os.path.join(tmpdir, 'container_test.db'))
+    override(db_manager, temp_db)
+    try:
+        assert db_manager.db_path == temp_db.db_path
+        channel_id = db_manager.add_channel("@container", 1, 1, "1")
+        assert temp_db.get_channel(channel_id)['channel_link'] == "@container"
+    finally:
+        reset(db_manager)
+    assert not is_initialized(db_manager)
+    print("✅ Override testi başarılı")
+
+def test_import_is_side_effect_free():
+    """database/proxy_manager içe aktarılınca veritabanı dosyası oluşmaz"""
+    workdir = tempfile.mkdtemp()
+    repo_root = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=repo_root)
+    code = "import database, session_manager; import os; print(os.path.exists(os.path.join('data', 'telegram_bot.db')))"
+    output = subprocess.run([sys.executable, '-c', code], cwd=workdir, env=env,
+                            capture_output=True, text=True, check=True).stdout.strip()
+    assert output == "False", output
+    assert not os.path.exists(os.path.join(workdir, 'Sessions'))
+    print("✅ Yan etkisiz içe aktarma testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Tembel Global Örnek Testi")
+    print("=" * 50)
+    test_lazy_creation_once()
+    test_override_and_reset()
+    test_import_is_side_effect_free()
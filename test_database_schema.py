@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Veritabanı şema sürümü test dosyası
+Yeni veritabanında sürümün yazılmasını, eski şemanın yükseltilmesini ve güncel
+şemada DDL çalıştırılmamasını test eder
+"""
+
+import os
+import sqlite3
+import tempfile
+import database
+from database import DatabaseManager, SCHEMA_VERSION
+
+def _temp_path() -> str:
+    return os.path.join(tempfile.mkdtemp(), 'schema_test.db')
+
+def _user_version(path: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def test_fresh_database():
+    """Yeni dosyada tablolar oluşur ve user_version yazılır"""
+    path = _temp_path()
+    DatabaseManager(path)
+    assert _user_version(path) == SCHEMA_VERSION
+    with sqlite3.connect(path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {'channels', 'request_pool', 'accounts', 'user_states', 'account_channel_requests', 'admins'} <= tables
+    print("✅ Yeni veritabanı testi başarılı")
+
+def test_legacy_upgrade():
+    """Sürümsüz eski şemaya eksik sütunlar eklenir, veriler korunur"""
+    path = _temp_path()
+    with sqlite3.connect(path) as conn:
+        conn.execute('''
+            CREATE TABLE channels (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, channel_link TEXT NOT NULL,
+                total_requests INTEGER NOT NULL, duration_minutes INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, status TEXT DEFAULT 'active',
+                user_id TEXT NOT NULL, UNIQUE(channel_link, user_id)
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE request_pool (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, channel_id INTEGER NOT NULL,
+                account_name TEXT NOT NULL, scheduled_time TIMESTAMP NOT NULL,
+                status TEXT DEFAULT 'Bekliyor', proxy_address TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.execute("INSERT INTO channels (channel_link, total_requests, duration_minutes, user_id) VALUES ('@eski', 5, 10, '1')")
+
+    db = DatabaseManager(path)
+    assert _user_version(path) == SCHEMA_VERSION
+    with sqlite3.connect(path) as conn:
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(request_pool)')}
+        # Artımlı vakuma geçiş şema geçişinde yapılır, işleyicinin sıkıştırmasına kalmaz
+        auto_vacuum = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+    assert {'claimed_at', 'started_at', 'finished_at', 'attempts', 'error_code'} <= columns
+    assert auto_vacuum == 2
+    channel = db.get_channel(1)
+    assert channel['channel_link'] == '@eski' and channel['allow_repeat']
+    print("✅ Eski şema yükseltme testi başarılı")
+
+def test_current_schema_skips_ddl():
+    """Sürüm güncelse (yeni süreçte bile) geçişler çalışmaz"""
+    path = _temp_path()
+    DatabaseManager(path)
+
+    # Yeni bir süreci taklit et: süreç önbelleğini boşalt, geçişleri patlat
+    database._schema_ready_paths.discard(os.path.abspath(path))
+    original = database._MIGRATIONS
+    def fail(cursor):
+        raise AssertionError("Güncel şemada geçiş çalıştı")
+    database._MIGRATIONS = tuple((target, fail) for target, _ in original)
+    try:
+        DatabaseManager(path)
+        DatabaseManager(path)
+    finally:
+        database._MIGRATIONS = original
+    assert os.path.abspath(path) in database._schema_ready_paths
+    print("✅ Hızlı yol testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Veritabanı Şema Testi")
+    print("=" * 50)
+    test_fresh_database()
+    test_legacy_upgrade()
+    test_current_schema_skips_ddl()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Katılım sonucu test dosyası
+Telegram hatalarının kodlara ve yeniden deneme politikalarına eşlenmesini,
+mevcut hata kodlarının korunmasını ve yeniden kuyruğa almanın deneme sınırını test eder
+"""
+
+import os
+import sqlite3
+import tempfile
+import pytest
+from datetime import datetime
+from join_result import (JoinResult, JoinErrorCode, RetryPolicy, classify_join_error, rpc_error_name,
+                         RETRY_POLICIES, JOIN_ERROR_NAMES, RETRY_DELAY_SECONDS, MAX_RESCHEDULE_SECONDS)
+from database import DatabaseManager, ERROR_ACCOUNT_FROZEN, ERROR_DEAD_LINK, ERROR_CODE_NAMES
+
+def _rpc_error(message: str, code: int = 400) -> Exception:
+    """Telethon'un Telegram yanıtından ürettiği gerçek hata örneği"""
+    pytest.importorskip("telethon")
+    from bench.fake_telethon import rpc_error
+    from telethon.tl.functions.channels import JoinChannelRequest
+    return rpc_error(JoinChannelRequest('kanal'), code, message)
+
+def test_rpc_error_mapping():
+    """Telethon'un fırlattığı RPC hataları doğru koda ve politikaya eşlenir"""
+    cases = {
+        ('USER_ALREADY_PARTICIPANT', 400): (JoinErrorCode.ALREADY_PARTICIPANT, RetryPolicy.SUCCESS),
+        ('INVITE_REQUEST_SENT', 400): (JoinErrorCode.OK, RetryPolicy.SUCCESS),
+        ('CHANNEL_PRIVATE', 400): (JoinErrorCode.CHANNEL_UNAVAILABLE, RetryPolicy.TERMINAL_CHANNEL),
+        ('CHANNEL_PUBLIC_GROUP_NA', 403): (JoinErrorCode.CHANNEL_UNAVAILABLE, RetryPolicy.TERMINAL_CHANNEL),
+        ('USERS_TOO_MUCH', 400): (JoinErrorCode.CHANNEL_FULL, RetryPolicy.TERMINAL_CHANNEL),
+        ('INVITE_HASH_EXPIRED', 400): (JoinErrorCode.DEAD_LINK, RetryPolicy.TERMINAL_CHANNEL),
+        ('CHANNELS_TOO_MUCH', 400): (JoinErrorCode.ACCOUNT_LIMIT, RetryPolicy.TERMINAL_ACCOUNT),
+        ('USER_DEACTIVATED_BAN', 401): (JoinErrorCode.ACCOUNT_INVALID, RetryPolicy.TERMINAL_ACCOUNT),
+        ('AUTH_KEY_UNREGISTERED', 401): (JoinErrorCode.ACCOUNT_INVALID, RetryPolicy.TERMINAL_ACCOUNT),
+        # Telethon'un tanımadığı hata: temel sınıfla, adı message alanında gelir
+        ('FROZEN_METHOD_INVALID', 420): (JoinErrorCode.ACCOUNT_FROZEN, RetryPolicy.TERMINAL_ACCOUNT),
+        ('SOMETHING_NEW', 400): (JoinErrorCode.JOIN_FAILED, RetryPolicy.TERMINAL_REQUEST),
+    }
+    for (name, code), (expected, policy) in cases.items():
+        error = _rpc_error(name, code)
+        result = classify_join_error(error)
+        assert (result.code, result.policy) == (expected, policy), (name, type(error).__name__, result)
+        assert rpc_error_name(error) == name
+
+    flood = classify_join_error(_rpc_error('FLOOD_WAIT_42', 420))
+    assert flood.code == JoinErrorCode.FLOODWAIT and flood.retry_delay() == 42
+    assert classify_join_error(_rpc_error('CHANNEL_PRIVATE')).signature == 'CHANNEL_PRIVATE'
+    assert classify_join_error(_rpc_error('USER_ALREADY_PARTICIPANT')).success
+    print("✅ RPC hata eşleme testi başarılı")
+
+def test_error_mapping():
+    """RPC dışı hatalar ve kod tabloları"""
+    assert classify_join_error(ValueError('No user has "yok" as username')).code == JoinErrorCode.DEAD_LINK
+    assert classify_join_error(ConnectionError()).code == JoinErrorCode.NETWORK
+    assert classify_join_error(RuntimeError("beklenmeyen")).outcome == 'failed'
+    assert rpc_error_name(RuntimeError("x")) is None
+    # Telethon dışı bir hatanın büyük harfli message alanı RPC adı sayılmaz
+    fake = RuntimeError("CHANNEL_PRIVATE")
+    fake.message = "CHANNEL_PRIVATE"
+    assert rpc_error_name(fake) is None
+
+    # Her kodun politikası ve adı var; eski kodlar değişmedi
+    assert set(RETRY_POLICIES) == set(JoinErrorCode) == set(JOIN_ERROR_NAMES)
+    assert (ERROR_ACCOUNT_FROZEN, ERROR_DEAD_LINK) == (3, 5)
+    assert ERROR_CODE_NAMES[2] == 'join_failed'
+    print("✅ Hata eşleme testi başarılı")
+
+def test_retry_delay():
+    """Geçici hatalar ve FloodWait yeniden denenir, kalıcı hatalar denenmez"""
+    assert JoinResult(JoinErrorCode.FLOODWAIT, retry_after=42).retry_delay() == 42
+    long_flood = JoinResult(JoinErrorCode.FLOODWAIT, retry_after=MAX_RESCHEDULE_SECONDS + 1)
+    assert long_flood.retry_delay() is None
+    assert JoinResult(JoinErrorCode.NETWORK).retry_delay() == RETRY_DELAY_SECONDS
+    assert JoinResult(JoinErrorCode.CHANNEL_FULL).retry_delay() is None
+
+    assert JoinResult(JoinErrorCode.OK).error_code is None
+    already = JoinResult(JoinErrorCode.ALREADY_PARTICIPANT)
+    assert already.success and already.error_code == 7 and already.signature is None
+    print("✅ Yeniden deneme süresi testi başarılı")
+
+def test_retry_request_cap():
+    """Yeniden kuyruğa alma deneme sınırında durur"""
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'join_result_test.db'))
+    channel_id = db.add_channel("@sonuc", 1, 60, "1")
+    with sqlite3.connect(db.db_path) as conn:
+        request_id = conn.execute('''
+            INSERT INTO request_pool (channel_id, account_name, scheduled_time, status, attempts)
+            VALUES (?, 'hesap.session', ?, 'İşleniyor', 1)
+        ''', (channel_id, datetime.now())).lastrowid
+
+    assert db.retry_request(request_id, 60, JoinErrorCode.NETWORK, max_attempts=2)
+    with sqlite3.connect(db.db_path) as conn:
+        status, scheduled, error_code = conn.execute(
+            'SELECT status, scheduled_time, error_code FROM request_pool WHERE id = ?', (request_id,)).fetchone()
+        assert status == 'Bekliyor' and error_code == JoinErrorCode.NETWORK
+        assert datetime.fromisoformat(scheduled) > datetime.now()
+        conn.execute('UPDATE request_pool SET attempts = 2 WHERE id = ?', (request_id,))
+    assert not db.retry_request(request_id, 60, JoinErrorCode.NETWORK, max_attempts=2)
+    print("✅ Deneme sınırı testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Katılım Sonucu Testi")
+    print("=" * 50)
+    test_error_mapping()
+    test_retry_delay()
+    test_retry_request_cap()
+    test_rpc_error_mapping()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Gecikme raporu test dosyası
+claimed/started/finished sütunlarının dolmasını, yüzdelikleri ve neden tahminini test eder
+"""
+
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from database import DatabaseManager, ERROR_FLOODWAIT, ERROR_CLIENT_UNAVAILABLE, _percentile
+from lateness_report import diagnose_lateness, format_report
+
+def _temp_db() -> DatabaseManager:
+    tmpdir = tempfile.mkdtemp()
+    return DatabaseManager(os.path.join(tmpdir, 'lateness_test.db'))
+
+def _add_requests(db: DatabaseManager, channel_id: int, lags):
+    """Verilen gecikmelerle (saniye) başlamış istekler ekler"""
+    now = datetime.now()
+    with sqlite3.connect(db.db_path) as conn:
+        for i, lag in enumerate(lags):
+            scheduled = now - timedelta(seconds=600)
+            conn.execute('''
+                INSERT INTO request_pool (channel_id, account_name, scheduled_time, status,
+                                          claimed_at, started_at, finished_at, attempts)
+                VALUES (?, ?, ?, 'Gönderildi', ?, ?, ?, 1)
+            ''', (channel_id, f"acc{i}.session", scheduled, scheduled,
+                  scheduled + timedelta(seconds=lag), scheduled + timedelta(seconds=lag + 2)))
+
+def test_executor_columns():
+    """claim/start/finish işaretleri ve hata kodu yazılır"""
+    db = _temp_db()
+    channel_id = db.add_channel("@kanal", 1, 1, "1")
+    with sqlite3.connect(db.db_path) as conn:
+        cursor = conn.execute('''
+            INSERT INTO request_pool (channel_id, account_name, scheduled_time)
+            VALUES (?, 'a.session', ?)
+        ''', (channel_id, datetime.now()))
+        request_id = cursor.lastrowid
+
+    assert db.mark_request_claimed(request_id)
+    assert db.mark_request_claimed(request_id)
+    assert db.mark_request_started(request_id)
+    assert db.update_request_status(request_id, "Atlandı", ERROR_FLOODWAIT)
+    with sqlite3.connect(db.db_path) as conn:
+        row = conn.execute('''
+            SELECT claimed_at, started_at, finished_at, attempts, error_code
+            FROM request_pool WHERE id = ?
+        ''', (request_id,)).fetchone()
+    assert all(row[:3]) and row[3] == 2 and row[4] == ERROR_FLOODWAIT
+
+    report = db.get_lateness_report()
+    assert report['global']['count'] == 1
+    assert report['global']['errors'] == {'floodwait': 1}
+    assert report['channels'][channel_id]['channel_link'] == "@kanal"
+    print("✅ Yürütücü sütunları testi başarılı")
+
+def test_percentiles_per_channel():
+    """Kanal bazlı ve genel p50/p95/p99"""
+    db = _temp_db()
+    fast = db.add_channel("@hizli", 100, 10, "1")
+    slow = db.add_channel("@yavas", 100, 10, "1")
+    _add_requests(db, fast, [1] * 100)
+    _add_requests(db, slow, list(range(1, 101)))
+
+    report = db.get_lateness_report()
+    assert report['global']['count'] == 200
+    assert abs(report['channels'][fast]['p99'] - 1) < 0.01
+    slow_summary = report['channels'][slow]
+    assert abs(slow_summary['p50'] - 50) < 0.01
+    assert abs(slow_summary['p95'] - 95) < 0.01
+    assert abs(slow_summary['p99'] - 99) < 0.01
+    assert abs(slow_summary['avg_duration'] - 2) < 0.01
+
+    only_fast = db.get_lateness_report(fast)
+    assert list(only_fast['channels']) == [fast] and only_fast['global']['count'] == 100
+    assert "@yavas" in format_report(report).splitlines()[2]
+    print("✅ Yüzdelik testi başarılı")
+
+def test_diagnose():
+    """Neden tahmini"""
+    base = {'count': 100, 'p50': 1.0, 'p95': 5.0, 'p99': 8.0, 'avg_duration': 2.0, 'errors': {}}
+    assert diagnose_lateness(base) == "Zamanında"
+    assert "FloodWait" in diagnose_lateness(dict(base, p95=300.0, errors={'floodwait': 40}))
+    assert "Proxy" in diagnose_lateness(dict(base, p95=300.0, errors={'client_unavailable': 30}))
+    assert "Yürütücü" in diagnose_lateness(dict(base, p95=300.0))
+    assert diagnose_lateness({'count': 0}) == "Henüz başlamış istek yok"
+    assert _percentile([], 0.5) == 0.0 and _percentile([3.0], 0.99) == 3.0
+    assert ERROR_CLIENT_UNAVAILABLE == 1
+    print("✅ Neden tahmini testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Gecikme Raporu Testi")
+    print("=" * 50)
+    test_executor_columns()
+    test_percentiles_per_channel()
+    test_diagnose()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Log yöneticisi test dosyası
+Halka tampon, geriye doğru tail okuma, seviye/logger filtreleri, JSON çıktı,
+maskeleme ve örneklemeyi test eder
+"""
+
+import os
+import json
+import logging
+import tempfile
+from log_manager import (
+    RingBufferHandler, tail_file, tail_file_filtered, LOG_FORMAT,
+    JsonFormatter, RedactingFilter, SamplingFilter, redact
+)
+
+def test_ring_buffer_filters():
+    """Tampon sınırlı kalır, seviye ve logger filtreleri çalışır"""
+    handler = RingBufferHandler(capacity=50)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log = logging.getLogger("test_ring.request_processor")
+    other = logging.getLogger("test_ring_other")
+    for target in (log, other):
+        target.addHandler(handler)
+        target.setLevel(logging.DEBUG)
+        target.propagate = False
+    for i in range(100):
+        log.info("istek %d", i)
+    log.error("hata oluştu")
+    other.warning("başka uyarı")
+
+    assert len(handler.records) == 50
+    lines = handler.get_lines(5)
+    assert len(lines) == 5 and lines[-1].endswith("başka uyarı")
+    assert [l.rsplit(' - ', 1)[-1] for l in handler.get_lines(10, min_level=logging.ERROR)] == ["hata oluştu"]
+    # "test_ring" filtresi "test_ring_other" ile eşleşmemeli
+    matched = handler.get_lines(100, logger_name="test_ring")
+    assert matched and all(" - test_ring.request_processor - " in l for l in matched)
+    print("✅ Halka tampon testi başarılı")
+
+def test_tail_file():
+    """Dosyanın yalnızca sonu okunur ve doğru satırlar döner"""
+    path = os.path.join(tempfile.mkdtemp(), "bot.log")
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(5000):
+            level = "ERROR" if i % 1000 == 0 else "INFO"
+            f.write(f"2024-01-01 00:00:00,000 - request_processor - {level} - satır {i}\n")
+    assert tail_file(path, 3, block_size=64) == [
+        f"2024-01-01 00:00:00,000 - request_processor - INFO - satır {i}" for i in (4997, 4998, 4999)
+    ]
+    assert len(tail_file(path, 10000)) == 5000
+    errors = tail_file_filtered(path, 2, min_level=logging.ERROR)
+    assert [l.rsplit(' ', 1)[-1] for l in errors] == ["3000", "4000"]
+    print("✅ Tail testi başarılı")
+
+def test_redaction():
+    """Proxy kimlik bilgileri ve şifre alanları maskelenir"""
+    text = redact("proxy user1:pass1@10.0.0.1:1080 {'username': 'u', 'password': 'p'}")
+    assert "pass1" not in text and "'p'" not in text and "10.0.0.1:1080" in text
+    print("✅ Maskeleme testi başarılı")
+
+def test_json_sampling_pipeline():
+    """Örnekleme ve maskeleme birden fazla handler'da tek kez uygulanır; JSON extra alanları taşır"""
+    json_handler = RingBufferHandler(capacity=100)
+    json_handler.setFormatter(JsonFormatter())
+    text_handler = RingBufferHandler(capacity=100)
+    text_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    sampling, redacting = SamplingFilter(every=10), RedactingFilter()
+    for handler in (json_handler, text_handler):
+        handler.addFilter(sampling)
+        handler.addFilter(redacting)
+    log = logging.getLogger("test_json_pipeline")
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    log.addHandler(json_handler)
+    log.addHandler(text_handler)
+
+    for i in range(25):
+        log.info("proxy atandı %d", i, extra={'sample': 'proxy_assigned'})
+    log.info("İstek başarılı: %s", "a:b@1.2.3.4:80", extra={'request_id': 7, 'outcome': 'sent'})
+
+    # 25 olaydan 1., 10. ve 20. geçer (her iki handler'da aynı kayıtlar)
+    assert len(json_handler.records) == len(text_handler.records) == 4
+    payloads = [json.loads(line) for _, _, line in json_handler.records]
+    assert [p.get('sampled') for p in payloads[:3]] == [1, 10, 20]
+    assert payloads[-1]['request_id'] == 7 and payloads[-1]['outcome'] == 'sent'
+    assert "a:b@" not in payloads[-1]['msg'] and "a:b@" not in text_handler.records[-1][2]
+    print("✅ JSON/örnekleme testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Log Yöneticisi Testi")
+    print("=" * 50)
+    test_ring_buffer_filters()
+    test_tail_file()
+    test_redaction()
+    test_json_sampling_pipeline()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Metrik test dosyası
+Sayaç/gösterge/histogram davranışını ve /metrics uç noktasını test eder
+"""
+
+import socket
+import urllib.request
+from metrics import MetricsRegistry, start_metrics_server, metrics_registry, JOIN_REQUESTS
+
+def test_registry_render():
+    """Prometheus metin formatı ve yüzdelik tahmini"""
+    registry = MetricsRegistry()
+    joins = registry.counter('test_joins_total', 'Katılımlar', ['outcome'])
+    depth = registry.gauge('test_pool_depth', 'Havuz', ['status'])
+    latency = registry.histogram('test_latency_seconds', 'Süre', ['query'], buckets=(0.1, 1.0))
+
+    joins.inc(outcome='sent')
+    joins.inc(2, outcome='failed')
+    depth.set_function(lambda: {('Bekliyor',): 5})
+    for value in (0.05, 0.05, 0.5, 5.0):
+        latency.observe(value, query='get_pending_requests')
+
+    text = registry.render()
+    assert 'test_joins_total{outcome="failed"} 2' in text
+    assert 'test_pool_depth{status="Bekliyor"} 5' in text
+    assert 'test_latency_seconds_bucket{query="get_pending_requests",le="0.1"} 2' in text
+    assert 'test_latency_seconds_bucket{query="get_pending_requests",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_count{query="get_pending_requests"} 4' in text
+    assert latency.quantile(0.5) <= 0.1 and latency.get_count(query='get_pending_requests') == 4
+
+    try:
+        joins.inc(outcome='sent', extra='x')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Eksik/fazla etiket kabul edildi")
+    print("✅ Metrik kaydı testi başarılı")
+
+def _stable_lines(text: str) -> list:
+    """Okumalar arasında değişmeyen satırlar (tanımlar ve katılım sayacı)"""
+    return [line for line in text.splitlines() if line.startswith(('# ', 'tgbot_join_requests_total'))]
+
+def test_metrics_endpoint():
+    """/metrics uç noktası global kaydı döndürür"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = start_metrics_server(port, host='127.0.0.1')
+    try:
+        JOIN_REQUESTS.inc(outcome='sent')
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            body = response.read().decode('utf-8')
+        assert response.status == 200
+        assert '# TYPE tgbot_join_requests_total counter' in body
+        assert _stable_lines(body) == _stable_lines(metrics_registry.render())
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("✅ /metrics uç noktası testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Metrik Testi")
+    print("=" * 50)
+    test_registry_render()
+    test_metrics_endpoint()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Proxy atama motoru test dosyası
+Yeniden dağıtımda kararlılığı, hesap/proxy başına kapasite sınırını, sağlık
+ağırlıklarını ve accounts tablosuna kalıcı yazmayı test eder
+"""
+
+import os
+import sqlite3
+import tempfile
+from proxy_assignment import assign_proxies, get_proxy_health_weights
+from database import DatabaseManager
+from metrics import CLIENT_CREATE_SECONDS
+
+ACCOUNTS = [f"hesap_{i}.session" for i in range(200)]
+PROXIES = [f"user:pass@10.0.0.{i}:1080" for i in range(20)]
+
+def _moved(before, after) -> int:
+    return sum(1 for account in before if account in after and before[account] != after[account])
+
+def test_stable_across_rebuilds():
+    """Proxy/hesap eklenip çıkarıldığında yalnızca etkilenen hesaplar yer değiştirir"""
+    first = assign_proxies(ACCOUNTS, PROXIES)
+    assert all(first.values())
+    assert assign_proxies(list(reversed(ACCOUNTS)), PROXIES) == first
+
+    # Sıra değişse bile önceki atama korunur
+    assert assign_proxies(ACCOUNTS, list(reversed(PROXIES)), previous=first) == first
+
+    # Bir proxy çıkarıldı: yalnızca onun hesapları taşınır
+    removed = PROXIES[3]
+    second = assign_proxies(ACCOUNTS, [p for p in PROXIES if p != removed], previous=first)
+    orphaned = sum(1 for proxy in first.values() if proxy == removed)
+    assert _moved(first, second) == orphaned
+
+    # Hesap eklendi: eskiler yerinde kalır (kapasite sabit tutulur)
+    grown = ACCOUNTS + [f"yeni_{i}.session" for i in range(10)]
+    third = assign_proxies(grown, PROXIES, previous=first, max_accounts_per_proxy=12)
+    assert _moved(first, third) == 0 and all(third.values())
+    print(f"✅ Kararlılık testi başarılı ({orphaned} hesap taşındı)")
+
+def test_capacity_limit():
+    """Proxy başına hesap sınırı aşılmaz, fazla hesaplar proxy'siz kalır"""
+    assignment = assign_proxies(ACCOUNTS, PROXIES, max_accounts_per_proxy=5)
+    loads = {}
+    for proxy in assignment.values():
+        loads[proxy] = loads.get(proxy, 0) + 1
+    assert loads.pop("") == 100
+    assert set(loads.values()) == {5} and len(loads) == 20
+
+    # Otomatik kapasite: tüm proxy'ler kullanılır, yük dengelidir
+    auto = assign_proxies(ACCOUNTS, PROXIES)
+    auto_loads = {}
+    for proxy in auto.values():
+        auto_loads[proxy] = auto_loads.get(proxy, 0) + 1
+    assert len(auto_loads) == 20 and max(auto_loads.values()) == 10
+    assert assign_proxies(ACCOUNTS[:3], []) == {account: "" for account in ACCOUNTS[:3]}
+    print("✅ Kapasite testi başarılı")
+
+def test_health_weights():
+    """Başarısız proxy'lerin ağırlığı düşer, sağlıksız proxy'deki hesaplar taşınır"""
+    bad = "9.9.9.9:1080"
+    good = "8.8.8.8:1080"
+    for _ in range(20):
+        CLIENT_CREATE_SECONDS.observe(0.1, proxy=bad, result="proxy_error")
+        CLIENT_CREATE_SECONDS.observe(0.1, proxy=good, result="ok")
+    weights = get_proxy_health_weights([f"u:p@{bad}", good, "7.7.7.7:1080"])
+    assert weights[f"u:p@{bad}"] < 0.1
+    assert weights[good] == 1.0 and weights["7.7.7.7:1080"] == 1.0
+
+    accounts = ACCOUNTS[:40]
+    previous = {account: bad for account in accounts}
+    assignment = assign_proxies(accounts, [bad, good], previous=previous,
+                                weights={bad: 0.05, good: 1.0}, max_accounts_per_proxy=40)
+    assert sum(1 for proxy in assignment.values() if proxy == good) >= 35
+    print("✅ Sağlık ağırlığı testi başarılı")
+
+def test_persisted_assignments():
+    """distribute_proxies atamayı accounts tablosuna yazar ve sonraki çağrıda korur"""
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'assignment_test.db'))
+    sessions = ACCOUNTS[:30]
+    proxies = PROXIES[:6]
+    first = db.distribute_proxies(sessions, proxies, max_accounts_per_proxy=0)
+    with sqlite3.connect(db.db_path) as conn:
+        stored = dict(conn.execute('SELECT session_file, proxy_address FROM accounts'))
+    assert stored == first
+
+    # Proxy listesi büyüdü: kalıcı atamalar yerinde kalır
+    second = db.distribute_proxies(sessions, PROXIES[:10], max_accounts_per_proxy=5)
+    assert _moved(first, second) == 0
+    print("✅ Kalıcı atama testi başarılı")
+
+def test_channel_subset_keeps_affinity():
+    """Bir kanalın hesap alt kümesiyle çağrı diğer hesapların yükünü sayar, kimseyi taşımaz"""
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'subset_test.db'))
+    sessions = ACCOUNTS[:100]
+    proxies = PROXIES[:10]
+    first = db.distribute_proxies(sessions, proxies, max_accounts_per_proxy=10)
+    subset = db.distribute_proxies(sessions[40:50], proxies, max_accounts_per_proxy=10)
+    assert set(subset) == set(sessions[40:50])
+    assert _moved(first, subset) == 0
+
+    # Dolu proxy'lere yeni hesap eklenmez, mevcut hesaplar yerinde kalır
+    db.distribute_proxies(ACCOUNTS[100:105], proxies, max_accounts_per_proxy=10)
+    with sqlite3.connect(db.db_path) as conn:
+        stored = dict(conn.execute("SELECT session_file, proxy_address FROM accounts"))
+        loads = [count for _, count in conn.execute(
+            "SELECT proxy_address, COUNT(*) FROM accounts WHERE proxy_address IS NOT NULL GROUP BY proxy_address")]
+    assert max(loads) <= 10
+    assert _moved(first, stored) == 0
+    print("✅ Kanal alt kümesi testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Proxy Atama Testi")
+    print("=" * 50)
+    test_stable_across_rebuilds()
+    test_capacity_limit()
+    test_health_weights()
+    test_persisted_assignments()
+    test_channel_subset_keeps_affinity()
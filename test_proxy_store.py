@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Proxy deposu test dosyası
+Satır dizini, toplu ekleme/silme, mtime tabanlı yeniden yükleme ve büyük listeleri test eder
+"""
+
+import os
+import time
+import tempfile
+from proxy_store import ProxyStore
+
+class _CountingParser:
+    """host:port satırlarını ayrıştırır ve çağrı sayısını tutar"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, line: str):
+        self.calls += 1
+        parts = line.split(':')
+        if len(parts) < 2 or not parts[1].isdigit():
+            return None
+        return {'host': parts[0], 'port': int(parts[1]), 'username': None, 'password': None, 'type': 'socks5'}
+
+def _temp_file(lines) -> str:
+    path = os.path.join(tempfile.mkdtemp(), 'proxies.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+def test_load_and_lookup():
+    """Yorumlar korunur, geçersiz satırlar proxy sayılmaz, arama satır metniyle yapılır"""
+    path = _temp_file(["# yorum", "1.1.1.1:1080", "", "bozuk", "2.2.2.2:1080", "1.1.1.1:1080"])
+    store = ProxyStore(path, _CountingParser())
+    store.refresh()
+    assert store.lines == ["# yorum", "1.1.1.1:1080", "bozuk", "2.2.2.2:1080"]
+    assert len(store) == 2
+    assert "2.2.2.2:1080" in store and store.get("2.2.2.2:1080")['port'] == 1080
+    assert store.get_line(2) == "1.1.1.1:1080"
+    print("✅ Yükleme ve arama testi başarılı")
+
+def test_incremental_reload():
+    """Dosya değişmedikçe okunmaz, değişince yalnızca yeni satırlar ayrıştırılır"""
+    path = _temp_file([f"10.0.0.{i}:1080" for i in range(100)])
+    parser = _CountingParser()
+    store = ProxyStore(path, parser)
+    assert store.refresh() and parser.calls == 100
+    assert not store.refresh() and parser.calls == 100
+
+    time.sleep(0.01)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write("10.0.1.1:1080\n")
+    assert store.refresh()
+    assert parser.calls == 101 and len(store) == 101
+    print("✅ Artımlı yeniden yükleme testi başarılı")
+
+def test_bulk_add_remove():
+    """Toplu işlemler dosyayı bir kez yazar; kendi yazdığı dosyayı yeniden ayrıştırmaz"""
+    path = _temp_file(["1.1.1.1:1080"])
+    parser = _CountingParser()
+    store = ProxyStore(path, parser)
+    store.refresh()
+
+    assert store.add(["2.2.2.2:1080", "3.3.3.3:1080", "1.1.1.1:1080"]) == 2
+    assert store.remove(["1.1.1.1:1080", "yok:1"]) == 1
+    assert store.remove_indexes([2, 99]) == 1
+    calls = parser.calls
+    assert not store.refresh() and parser.calls == calls
+    with open(path, 'r', encoding='utf-8') as f:
+        assert f.read().splitlines() == ["2.2.2.2:1080"]
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith('.tmp')]
+
+    assert store.replace_all(["4.4.4.4:1080", "2.2.2.2:1080"])
+    assert store.lines == ["4.4.4.4:1080", "2.2.2.2:1080"]
+    print("✅ Toplu ekleme/silme testi başarılı")
+
+def test_large_list():
+    """50 bin proxy: tek silme tüm listeyi yeniden ayrıştırmaz"""
+    lines = [f"10.{i // 65536}.{i // 256 % 256}.{i % 256}:1080" for i in range(50000)]
+    path = _temp_file(lines)
+    parser = _CountingParser()
+    store = ProxyStore(path, parser)
+    store.refresh()
+    assert len(store) == 50000
+
+    started = time.perf_counter()
+    assert store.remove([lines[12345]]) == 1
+    assert lines[12345] not in store
+    store.refresh()
+    elapsed = time.perf_counter() - started
+    assert parser.calls == 50000
+    print(f"✅ Büyük liste testi başarılı ({elapsed * 1000:.1f} ms)")
+
+if __name__ == "__main__":
+    print("🧪 Proxy Deposu Testi")
+    print("=" * 50)
+    test_load_and_lookup()
+    test_incremental_reload()
+    test_bulk_add_remove()
+    test_large_list()
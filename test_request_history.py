@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+İstek arşivi test dosyası
+Sonuçlanmış isteklerin request_history'ye taşınmasını, sayaçların ve raporların
+doğru kalmasını, arşiv sorgularını ve havuz tamamlamanın arşivi saymasını test eder
+"""
+
+import os
+import sqlite3
+import tempfile
+import pytest
+from datetime import datetime, timedelta
+from database import DatabaseManager
+
+NOW = datetime.now()
+
+def _seed(db, channel_id):
+    old = NOW - timedelta(days=3)
+    recent = NOW - timedelta(hours=1)
+    rows = []
+    for i in range(50):
+        rows.append((channel_id, f"eski_{i}.session", old, 'Gönderildi', old, old + timedelta(seconds=2)))
+    for i in range(10):
+        rows.append((channel_id, f"atlanan_{i}.session", old, 'Atlandı', old, old + timedelta(seconds=1)))
+    for i in range(5):
+        rows.append((channel_id, f"yeni_{i}.session", recent, 'Gönderildi', recent, recent))
+    for i in range(20):
+        rows.append((channel_id, f"bekleyen_{i}.session", NOW + timedelta(minutes=i), 'Bekliyor', None, None))
+    with sqlite3.connect(db.db_path) as conn:
+        conn.executemany('''
+            INSERT INTO request_pool (channel_id, account_name, scheduled_time, status, started_at, finished_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+
+def _setup():
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'history_test.db'))
+    channel_id = db.add_channel("@arsiv", 85, 60, "1")
+    _seed(db, channel_id)
+    return db, channel_id
+
+def test_compaction_keeps_counters():
+    """Taşıma sonrası sıcak tablo küçülür, istatistik ve gecikme raporu değişmez"""
+    db, channel_id = _setup()
+    stats_before = db.get_request_stats(channel_id)
+    lateness_before = db.get_lateness_report(channel_id)['global']['count']
+
+    assert db.compact_request_pool(batch_size=7) == 60
+    with sqlite3.connect(db.db_path) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM request_pool').fetchone()[0] == 25
+        assert conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+    assert db.get_request_stats(channel_id) == stats_before
+    assert db.get_lateness_report(channel_id)['global']['count'] == lateness_before
+    assert db.get_lateness_report(channel_id, include_archive=False)['global']['count'] == 5
+    assert db.compact_request_pool() == 0
+    print("✅ Sayaç koruma testi başarılı")
+
+def test_history_queries():
+    """Arşiv ay, durum ve kanal ile sorgulanabilir"""
+    db, channel_id = _setup()
+    db.compact_request_pool()
+    month = (NOW - timedelta(days=3)).strftime('%Y-%m')
+    skipped = db.get_request_history(channel_id=channel_id, month=month, status='Atlandı')
+    assert len(skipped) == 10 and skipped[0]['archive_month'] == month
+    assert len(db.get_request_history(limit=5)) == 5
+    assert db.get_request_history_summary()[month] == {'Gönderildi': 50, 'Atlandı': 10}
+    print("✅ Arşiv sorgu testi başarılı")
+
+def test_topup_counts_archive(monkeypatch):
+    """Havuz tamamlama arşivdeki gönderimleri sayar ve o hesapları tekrar kullanmaz"""
+    monkeypatch.setenv("ACCOUNT_MIN_INTERVAL", "0")
+    db, channel_id = _setup()
+    db.compact_request_pool()
+    sessions = [f"eski_{i}.session" for i in range(50)] + [f"taze_{i}.session" for i in range(50)]
+    assert db.create_request_pool(channel_id, sessions, ["10.0.0.1:1080"])
+
+    # Hedef 85: 55 gönderildi (50 arşivde) + 20 bekliyor -> 10 yeni istek
+    with sqlite3.connect(db.db_path) as conn:
+        new_accounts = [row[0] for row in conn.execute(
+            "SELECT account_name FROM request_pool WHERE status = 'Bekliyor' AND account_name NOT LIKE 'bekleyen_%'")]
+    assert len(new_accounts) == 10
+    assert all(account.startswith('taze_') for account in new_accounts)
+    print("✅ Arşivli tamamlama testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 İstek Arşivi Testi")
+    print("=" * 50)
+    test_compaction_keeps_counters()
+    test_history_queries()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_topup_counts_archive(monkeypatch)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+İstek havuzu tamamlama test dosyası
+Kanal yeniden başlatıldığında/güncellendiğinde yalnızca eksik isteklerin
+eklendiğini ve mevcut bekleyen zamanların değişmediğini test eder
+"""
+
+import os
+import sqlite3
+import tempfile
+import pytest
+import database
+from database import DatabaseManager
+
+SESSIONS = [f"hesap_{i}.session" for i in range(300)]
+PROXIES = [f"10.0.0.{i}:1080" for i in range(30)]
+
+def _rows(db, channel_id):
+    with sqlite3.connect(db.db_path) as conn:
+        return conn.execute('''
+            SELECT id, account_name, status, scheduled_time FROM request_pool
+            WHERE channel_id = ? ORDER BY id
+        ''', (channel_id,)).fetchall()
+
+def _pending_times(db, channel_id):
+    return {row[0]: row[3] for row in _rows(db, channel_id) if row[2] == 'Bekliyor'}
+
+def _setup(monkeypatch):
+    monkeypatch.setenv("ACCOUNT_MIN_INTERVAL", "0")
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'topup_test.db'))
+    channel_id = db.add_channel("@kampanya", 100, 60, "1")
+    assert db.create_request_pool(channel_id, SESSIONS, PROXIES)
+    # İlk 40 istek gönderilmiş olsun
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute('''
+            UPDATE request_pool SET status = 'Gönderildi'
+            WHERE id IN (SELECT id FROM request_pool WHERE channel_id = ? ORDER BY scheduled_time LIMIT 40)
+        ''', (channel_id,))
+    return db, channel_id
+
+def test_restart_is_noop(monkeypatch):
+    """Havuz tamamsa yeniden başlatma hiçbir satırı değiştirmez"""
+    db, channel_id = _setup(monkeypatch)
+    before = _rows(db, channel_id)
+    assert db.create_request_pool(channel_id, SESSIONS, PROXIES)
+    assert _rows(db, channel_id) == before
+    print("✅ Değişiklik yok testi başarılı")
+
+def test_resume_after_pause(monkeypatch):
+    """Duraklatma sonrası yalnızca gönderilmemiş kısım yeniden eklenir"""
+    db, channel_id = _setup(monkeypatch)
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("UPDATE channels SET status = 'paused' WHERE id = ?", (channel_id,))
+        conn.execute("UPDATE request_pool SET status = 'Atlandı' WHERE channel_id = ? AND status = 'Bekliyor'", (channel_id,))
+        conn.execute("UPDATE channels SET status = 'active' WHERE id = ?", (channel_id,))
+    assert db.create_request_pool(channel_id, SESSIONS, PROXIES)
+
+    rows = _rows(db, channel_id)
+    sent_accounts = {row[1] for row in rows if row[2] == 'Gönderildi'}
+    pending_accounts = [row[1] for row in rows if row[2] == 'Bekliyor']
+    assert len(sent_accounts) == 40 and len(pending_accounts) == 60
+    assert not sent_accounts & set(pending_accounts)
+    print("✅ Devam ettirme testi başarılı")
+
+def test_edit_keeps_visible_schedule(monkeypatch):
+    """Hedef artırılınca mevcut bekleyen zamanlar korunur; azaltılınca fazlası silinir"""
+    db, channel_id = _setup(monkeypatch)
+    before = _pending_times(db, channel_id)
+
+    db.add_channel("@kampanya", 120, 60, "1")
+    assert db.create_request_pool(channel_id, SESSIONS, PROXIES)
+    after = _pending_times(db, channel_id)
+    assert len(after) == 80
+    assert all(after[request_id] == scheduled for request_id, scheduled in before.items())
+    assert len(set(after.values())) == 80
+
+    db.add_channel("@kampanya", 50, 60, "1")
+    assert db.create_request_pool(channel_id, SESSIONS, PROXIES)
+    trimmed = _pending_times(db, channel_id)
+    assert len(trimmed) == 10
+    assert max(trimmed.values()) <= sorted(after.values())[9]
+    print("✅ Güncelleme testi başarılı")
+
+def test_failed_schedule_inserts_nothing(monkeypatch):
+    """Planlama başarısız olursa yeni istekler eklenmez (hepsi aynı anda tetiklenmez)"""
+    monkeypatch.setenv("ACCOUNT_MIN_INTERVAL", "0")
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'topup_fail_test.db'))
+    channel_id = db.add_channel("@kampanya", 50, 60, "1")
+
+    def broken_plan(*args, **kwargs):
+        raise RuntimeError("planlayıcı hatası")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(database, "plan_fair_schedule", broken_plan)
+        assert not db.create_request_pool(channel_id, SESSIONS, PROXIES)
+    assert _rows(db, channel_id) == []
+
+    assert db.create_request_pool(channel_id, SESSIONS, PROXIES)
+    assert len(set(_pending_times(db, channel_id).values())) == 50
+    print("✅ Başarısız planlama testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 İstek Havuzu Tamamlama Testi")
+    print("=" * 50)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_restart_is_noop(monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_resume_after_pause(monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_edit_keeps_visible_schedule(monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_failed_schedule_inserts_nothing(monkeypatch)
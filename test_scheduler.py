@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Adil zamanlayıcı test dosyası
+Kanalların serpiştirilmesini, bitiş zamanlarına uyulmasını, hesap aralığını ve
+kanal ekleme/duraklatmada veritabanı üzerinde yeniden planlamayı test eder
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import pytest
+from datetime import datetime, timedelta
+from scheduler import plan_fair_schedule, SLOT_SECONDS
+from database import DatabaseManager
+
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+def _queue(prefix: int, count: int, minutes: int, accounts: int = 1000):
+    return {
+        'requests': [(prefix * 10000 + i, f"hesap_{i % accounts}") for i in range(count)],
+        'deadline': START + timedelta(minutes=minutes),
+    }
+
+def test_new_channel_interleaves():
+    """Sonradan eklenen kısa kanal, uzun kanalın bitmesini beklemez"""
+    queues = {1: _queue(1, 300, 60), 2: _queue(2, 40, 10)}
+    plan = plan_fair_schedule(queues, START, rng=random.Random(1))
+    assert len(plan) == 340
+    assert len(set(plan.values())) == 340
+    last_short = max(t for rid, t in plan.items() if rid // 10000 == 2)
+    last_long = max(t for rid, t in plan.items() if rid // 10000 == 1)
+    assert last_short <= queues[2]['deadline'], last_short
+    assert last_long <= queues[1]['deadline'], last_long
+    print(f"✅ Serpiştirme testi başarılı (kısa kanal {(last_short - START).seconds // 60} dk'da bitti)")
+
+def test_overload_is_fair():
+    """Kapasite yetmezse kanallar pencerelerine orantılı gecikir, biri diğerini aç bırakmaz"""
+    # 10 dakikada 120 slot var; iki kanal toplam 240 istek istiyor
+    queues = {1: _queue(1, 120, 10), 2: _queue(2, 120, 10)}
+    plan = plan_fair_schedule(queues, START, rng=random.Random(2))
+    first_half = [rid // 10000 for rid, t in plan.items() if t < START + timedelta(minutes=10)]
+    assert abs(first_half.count(1) - first_half.count(2)) <= 2
+    assert all(
+        (t - START).total_seconds() % SLOT_SECONDS == 0 for t in plan.values()
+    )
+    print("✅ Aşırı yük adalet testi başarılı")
+
+def test_account_spacing():
+    """Aynı hesabın iki isteği arasında en az account_spacing saniye bulunur"""
+    queues = {1: _queue(1, 60, 30, accounts=5), 2: _queue(2, 60, 30, accounts=5)}
+    plan = plan_fair_schedule(queues, START, account_spacing=60, rng=random.Random(3))
+    accounts = {rid: account for queue in queues.values() for rid, account in queue['requests']}
+    by_account = {}
+    for rid, scheduled in plan.items():
+        by_account.setdefault(accounts[rid], []).append(scheduled)
+    for times in by_account.values():
+        times.sort()
+        assert all((b - a).total_seconds() >= 60 for a, b in zip(times, times[1:]))
+    print("✅ Hesap aralığı testi başarılı")
+
+def _pending_times(db, channel_id):
+    with sqlite3.connect(db.db_path) as conn:
+        return dict(conn.execute(
+            "SELECT id, scheduled_time FROM request_pool WHERE channel_id = ? AND status = 'Bekliyor'", (channel_id,)))
+
+def test_late_requests_use_freed_slots(monkeypatch):
+    """Tam planlamada yalnızca bitiş zamanını aşmış istekler boşalan slotlara taşınır"""
+    monkeypatch.setenv("ACCOUNT_MIN_INTERVAL", "0")
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'late_test.db'))
+    sessions = [f"hesap_{i}.session" for i in range(50)]
+    channel_id = db.add_channel("@gecikmeli", 10, 60, "1")
+    assert db.create_request_pool(channel_id, sessions, ["10.0.0.1:1080"])
+    before = _pending_times(db, channel_id)
+    late_id = max(before)
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("UPDATE request_pool SET scheduled_time = ? WHERE id = ?",
+                     (datetime.now() + timedelta(hours=3), late_id))
+    assert db.reschedule_pending() == 1
+    after = _pending_times(db, channel_id)
+    assert datetime.fromisoformat(after[late_id]) < datetime.now() + timedelta(hours=1)
+    assert {k: v for k, v in after.items() if k != late_id} == {k: v for k, v in before.items() if k != late_id}
+    print("✅ Gecikmiş istek testi başarılı")
+
+def test_database_reschedule(monkeypatch):
+    """Yeni kanal havuzu mevcut kanalların arasına yerleşir, alınmış istek yerinde kalır"""
+    monkeypatch.setenv("ACCOUNT_MIN_INTERVAL", "0")
+    db = DatabaseManager(os.path.join(tempfile.mkdtemp(), 'scheduler_test.db'))
+    sessions = [f"hesap_{i}.session" for i in range(200)]
+    proxies = [f"10.0.0.{i}:1080" for i in range(20)]
+
+    long_id = db.add_channel("@uzun", 150, 60, "1")
+    assert db.create_request_pool(long_id, sessions, proxies)
+    with sqlite3.connect(db.db_path) as conn:
+        claimed_id, claimed_time = conn.execute(
+            "SELECT id, scheduled_time FROM request_pool ORDER BY scheduled_time LIMIT 1").fetchone()
+        conn.execute("UPDATE request_pool SET claimed_at = ? WHERE id = ?", (datetime.now(), claimed_id))
+    long_before = _pending_times(db, long_id)
+
+    short_id = db.add_channel("@kisa", 30, 5, "1")
+    assert db.create_request_pool(short_id, sessions, proxies)
+    deadline = datetime.now() + timedelta(minutes=5)
+    with sqlite3.connect(db.db_path) as conn:
+        last_short = conn.execute(
+            "SELECT MAX(scheduled_time) FROM request_pool WHERE channel_id = ?", (short_id,)).fetchone()[0]
+        assert conn.execute("SELECT scheduled_time FROM request_pool WHERE id = ?",
+                            (claimed_id,)).fetchone()[0] == claimed_time
+    assert datetime.fromisoformat(last_short) <= deadline
+    # Yeni kanal eklemek mevcut kanalın görünen planını değiştirmez
+    assert _pending_times(db, long_id) == long_before
+    with sqlite3.connect(db.db_path) as conn:
+        slots = conn.execute("SELECT COUNT(DISTINCT scheduled_time) FROM request_pool").fetchone()[0]
+    assert slots == 180
+
+    # Duraklatma/durdurma diğer kanalların isteklerini yeniden yazmaz
+    short_before = _pending_times(db, short_id)
+    db.stop_channel(long_id)
+    assert db.reschedule_pending() == 0
+    assert _pending_times(db, short_id) == short_before
+    print("✅ Veritabanı yeniden planlama testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Adil Zamanlayıcı Testi")
+    print("=" * 50)
+    test_new_channel_interleaves()
+    test_overload_is_fair()
+    test_account_spacing()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_database_reschedule(monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_late_requests_use_freed_slots(monkeypatch)
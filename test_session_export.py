@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Session dışa aktarma test dosyası
+ZIP arşivlerinin boyut sınırında bölünmesini ve içeriğin korunmasını test eder
+"""
+
+import os
+import zipfile
+import tempfile
+from session_export import build_session_archives, get_archive_size
+
+def _make_sessions(count: int, size: int) -> str:
+    source_dir = tempfile.mkdtemp()
+    for i in range(count):
+        with open(os.path.join(source_dir, f"{i:04d}.session"), 'wb') as f:
+            f.write(os.urandom(size))
+    return source_dir
+
+def test_single_archive_stored():
+    """Sınırın altında tek arşiv, ZIP_STORED ile"""
+    source_dir = _make_sessions(5, 1024)
+    files = sorted(os.listdir(source_dir)) + ["missing.session"]
+    progress = []
+    archives = build_session_archives(source_dir, files, "active_sessions.zip",
+                                      report=lambda done, total: progress.append((done, total)))
+    try:
+        assert [name for name, _ in archives] == ["active_sessions.zip"]
+        with zipfile.ZipFile(archives[0][1]) as zf:
+            assert sorted(zf.namelist()) == files[:-1]
+            assert all(info.compress_type == zipfile.ZIP_STORED for info in zf.infolist())
+            assert zf.testzip() is None
+        assert progress[-1] == (6, 6)
+    finally:
+        for _, archive in archives:
+            archive.close()
+    print("✅ Tek arşiv testi başarılı")
+
+def test_split_under_limit():
+    """Boyut sınırı aşılınca arşiv parçalara bölünür, hiçbir parça sınırı aşmaz"""
+    source_dir = _make_sessions(20, 10 * 1024)
+    files = sorted(os.listdir(source_dir))
+    limit = 50 * 1024
+    archives = build_session_archives(source_dir, files, "frozen_sessions.zip",
+                                      max_archive_bytes=limit, compression_level=6)
+    try:
+        assert len(archives) > 1
+        assert archives[0][0] == "frozen_sessions_part1.zip"
+        names = []
+        for _, archive in archives:
+            assert get_archive_size(archive) <= limit
+            with zipfile.ZipFile(archive) as zf:
+                names.extend(zf.namelist())
+                assert zf.testzip() is None
+        assert names == files
+    finally:
+        for _, archive in archives:
+            archive.close()
+    print(f"✅ Bölme testi başarılı ({len(archives)} parça)")
+
+if __name__ == "__main__":
+    print("🧪 Session Dışa Aktarma Testi")
+    print("=" * 50)
+    test_single_archive_stored()
+    test_split_under_limit()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Session içe aktarma test dosyası
+ZIP'ten paralel içe aktarma, doğrulama ve auth key tekrar elemeyi test eder
+"""
+
+import io
+import os
+import sqlite3
+import zipfile
+import tempfile
+from session_manager import SessionManager
+
+def make_session_bytes(auth_key: bytes) -> bytes:
+    """Telethon session tablosu yapısında SQLite içeriği üretir"""
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE version (version integer primary key)")
+    conn.execute("CREATE TABLE sessions (dc_id integer primary key, server_address text, "
+                 "port integer, auth_key blob, takeout_id integer)")
+    conn.execute("INSERT INTO sessions VALUES (2, '149.154.167.51', 443, ?, NULL)", (auth_key,))
+    conn.commit()
+    data = conn.serialize()
+    conn.close()
+    return data
+
+def make_zip(members) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        for name, data in members:
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+def test_zip_import_dedupe():
+    """Aynı hesabın farklı adlı kopyaları tek kez kaydedilir"""
+    manager = SessionManager(tempfile.mkdtemp())
+    key_a, key_b = os.urandom(256), os.urandom(256)
+    archive = make_zip([
+        ("a.session", make_session_bytes(key_a)),
+        ("copy/a_renamed.session", make_session_bytes(key_a)),
+        ("b.session", make_session_bytes(key_b)),
+        ("broken.session", b"not a sqlite file" * 10),
+        ("notes.txt", b"ignored"),
+    ])
+    result = manager.import_sessions_from_zip(archive)
+    assert result == {'saved': 2, 'duplicate': 1, 'invalid': 1, 'failed': 0}, result
+    assert len(manager.get_session_files()) == 2
+
+    # Aynı arşiv tekrar yüklenirse hiçbir şey eklenmez
+    result = manager.import_sessions_from_zip(io.BytesIO(archive))
+    assert result['saved'] == 0 and result['duplicate'] == 3, result
+    assert len(manager.get_session_files()) == 2
+    assert not [f for f in os.listdir(manager.sessions_dir) if f.endswith('.tmp')]
+    print("✅ ZIP tekrar eleme testi başarılı")
+
+def test_single_import_name_collision():
+    """Aynı adlı farklı hesap parmak iziyle benzersizleştirilir"""
+    manager = SessionManager(tempfile.mkdtemp())
+    status, first = manager.import_session_bytes("acc.session", make_session_bytes(os.urandom(256)))
+    assert (status, first) == ('saved', 'acc.session')
+    status, second = manager.import_session_bytes("acc.session", make_session_bytes(os.urandom(256)))
+    assert status == 'saved' and second != first and second.startswith('acc_')
+    data = make_session_bytes(os.urandom(256))
+    assert manager.import_session_bytes("x.session", data)[0] == 'saved'
+    assert manager.import_session_bytes("y.session", data) == ('duplicate', 'x.session')
+    print("✅ Tekil içe aktarma testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Session İçe Aktarma Testi")
+    print("=" * 50)
+    test_zip_import_dedupe()
+    test_single_import_name_collision()
@@ -5,7 +5,7 @@ Session dosyalarını test etmek için yardımcı script
 
 import os
 import glob
-from telegram_bot import SessionManager
+from session_manager import SessionManager
 
 def create_test_sessions():
     """Test için örnek session dosyaları oluşturur"""
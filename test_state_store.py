@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Kullanıcı durum önbelleği test dosyası
+Bellek içi okuma/yazma, TTL ve kalıcı yazma/geri yüklemeyi test eder
+"""
+
+import os
+import time
+import tempfile
+from database import DatabaseManager
+from state_store import UserStateStore
+
+def _temp_db() -> DatabaseManager:
+    tmpdir = tempfile.mkdtemp()
+    return DatabaseManager(os.path.join(tmpdir, 'state_test.db'))
+
+def test_form_flow_and_persistence():
+    """Kanal ekleme formu adımları bellekten yürür, flush sonrası tabloya yazılır"""
+    db = _temp_db()
+    store = UserStateStore(db)
+
+    store.set_user_state("42", "waiting_request_count", {'channel_link': '@kanal'})
+    state, temp_data = store.get_user_state("42")
+    assert state == "waiting_request_count" and temp_data == {'channel_link': '@kanal'}
+
+    # Çağıranın değiştirdiği kopya depodaki veriyi bozmamalı
+    temp_data['total_requests'] = 10
+    assert store.get_user_state("42")[1] == {'channel_link': '@kanal'}
+    store.set_user_state("42", "waiting_duration", temp_data)
+
+    # Henüz flush edilmedi
+    assert db.get_user_state("42") == (None, {})
+    assert store.flush()
+    assert db.get_user_state("42") == ("waiting_duration", {'channel_link': '@kanal', 'total_requests': 10})
+
+    store.clear_user_state("42")
+    assert store.get_user_state("42") == (None, {})
+    store.flush()
+    assert db.get_user_state("42") == (None, {})
+    print("✅ Form akışı ve kalıcı yazma testi başarılı")
+
+def test_restore_on_start():
+    """Yeni depo, tablodaki durumları başlangıçta yükler"""
+    db = _temp_db()
+    db.set_user_state("7", "waiting_upload", {})
+    store = UserStateStore(db)
+    assert store.restore() == 1
+    assert store.get_user_state("7") == ("waiting_upload", {})
+    print("✅ Geri yükleme testi başarılı")
+
+def test_ttl_expiry():
+    """Süresi dolan yarım formlar silinir"""
+    db = _temp_db()
+    store = UserStateStore(db, ttl_seconds=0.05)
+    store.set_user_state("9", "waiting_channel_link", {})
+    store.flush()
+    time.sleep(0.1)
+    assert store.get_user_state("9") == (None, {})
+    store.flush()
+    assert db.get_user_state("9") == (None, {})
+    print("✅ TTL testi başarılı")
+
+def test_background_writer():
+    """Yazıcı thread'i değişiklikleri kendiliğinden aktarır"""
+    db = _temp_db()
+    store = UserStateStore(db, flush_interval=0.01)
+    store.start()
+    try:
+        store.set_user_state("5", "waiting_admin_id", {})
+        deadline = time.time() + 2
+        while time.time() < deadline and db.get_user_state("5")[0] is None:
+            time.sleep(0.02)
+        assert db.get_user_state("5")[0] == "waiting_admin_id"
+    finally:
+        store.stop()
+    print("✅ Arka plan yazıcı testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Kullanıcı Durum Önbelleği Testi")
+    print("=" * 50)
+    test_form_flow_and_persistence()
+    test_restore_on_start()
+    test_ttl_expiry()
+    test_background_writer()
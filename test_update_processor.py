@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Sohbet sıralı güncelleme işleme test dosyası
+Aynı sohbetin güncellemelerinin sırayla, farklı sohbetlerinkinin paralel
+işlendiğini ve sohbet kilitlerinin işten sonra bırakılıp silindiğini test eder
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from chat_locks import ChatLocks
+
+async def _job(locks: ChatLocks, chat_id: int, name: str, events: list, delay: float = 0.02):
+    async with locks.hold(chat_id):
+        events.append(('start', name))
+        await asyncio.sleep(delay)
+        events.append(('end', name))
+
+def test_same_chat_in_order():
+    """Aynı sohbetin işleri geliş sırasıyla ve üst üste binmeden çalışır"""
+    async def scenario():
+        locks = ChatLocks()
+        events = []
+        # İlk iş daha uzun sürse de ikincisi onu bekler
+        await asyncio.gather(_job(locks, 1, 'a', events, 0.05), _job(locks, 1, 'b', events, 0.01),
+                             _job(locks, 1, 'c', events, 0.01))
+        return events
+
+    events = asyncio.run(scenario())
+    assert events == [('start', 'a'), ('end', 'a'), ('start', 'b'), ('end', 'b'), ('start', 'c'), ('end', 'c')]
+    print("✅ Aynı sohbet sıralama testi başarılı")
+
+def test_different_chats_overlap():
+    """Farklı sohbetlerin işleri birbirini beklemez"""
+    async def scenario():
+        locks = ChatLocks()
+        events = []
+        await asyncio.gather(_job(locks, 1, 'a', events), _job(locks, 2, 'b', events))
+        return events
+
+    events = asyncio.run(scenario())
+    assert events[:2] == [('start', 'a'), ('start', 'b')]
+    print("✅ Farklı sohbet paralellik testi başarılı")
+
+def test_locks_released_and_removed():
+    """Kilit işten sonra (hata olsa da) bırakılır; bekleyeni kalmayan sohbet silinir"""
+    async def scenario():
+        locks = ChatLocks()
+        events = []
+        first = asyncio.create_task(_job(locks, 1, 'a', events))
+        second = asyncio.create_task(_job(locks, 1, 'b', events))
+        other = asyncio.create_task(_job(locks, 2, 'c', events, 0.2))
+        await asyncio.sleep(0)
+        assert len(locks) == 2
+        await first
+        # Sırada bekleyen varken kilit silinmez
+        assert len(locks) == 2
+        await asyncio.gather(second, other)
+        assert len(locks) == 0
+
+        with pytest.raises(RuntimeError):
+            async with locks.hold(3):
+                raise RuntimeError("işleyici hatası")
+        assert len(locks) == 0
+        # Hatadan sonra aynı sohbet yeniden kilitlenebilir
+        await asyncio.wait_for(_job(locks, 3, 'd', events), timeout=1)
+        assert len(locks) == 0
+
+    asyncio.run(scenario())
+    print("✅ Kilit bırakma testi başarılı")
+
+def test_processor_orders_by_chat():
+    """ChatOrderedUpdateProcessor gerçek Update'leri sohbete göre sıralar"""
+    pytest.importorskip("telegram")
+    from telegram import Chat, Message, Update
+    from update_processor import ChatOrderedUpdateProcessor
+
+    def make_update(update_id: int, chat_id: int) -> Update:
+        chat = Chat(chat_id, Chat.PRIVATE)
+        return Update(update_id, message=Message(update_id, datetime.now(), chat))
+
+    async def handler(name: str, events: list, delay: float):
+        events.append(('start', name))
+        await asyncio.sleep(delay)
+        events.append(('end', name))
+
+    async def scenario():
+        processor = ChatOrderedUpdateProcessor(4)
+        events = []
+        await asyncio.gather(
+            processor.process_update(make_update(1, 10), handler('a', events, 0.05)),
+            processor.process_update(make_update(2, 10), handler('b', events, 0.01)),
+            processor.process_update(make_update(3, 20), handler('c', events, 0.01)),
+        )
+        assert processor.get_active_chat_count() == 0
+        return events
+
+    events = asyncio.run(scenario())
+    assert events.index(('end', 'a')) < events.index(('start', 'b'))
+    assert events.index(('start', 'c')) < events.index(('end', 'a'))
+    print("✅ Güncelleme işleyici testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Sohbet Sıralı Güncelleme İşleme Testi")
+    print("=" * 50)
+    test_same_chat_in_order()
+    test_different_chats_overlap()
+    test_locks_released_and_removed()
+    test_processor_orders_by_chat()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Webhook/polling seçimi test dosyası
+Ortam değişkenlerinden webhook ayarlarının üretilmesini ve botun boş URL'de
+polling, dolu URL'de webhook ile çalışmasını test eder
+"""
+
+import pytest
+from types import SimpleNamespace
+from config import get_webhook_settings
+
+def _webhook_env(monkeypatch, url: str):
+    monkeypatch.setenv("WEBHOOK_URL", url)
+    monkeypatch.setenv("WEBHOOK_PORT", "9443")
+    monkeypatch.setenv("WEBHOOK_LISTEN", "127.0.0.1")
+    monkeypatch.setenv("WEBHOOK_PATH", "/tg/")
+    monkeypatch.setenv("WEBHOOK_SECRET", "gizli_anahtar")
+
+def test_webhook_settings(monkeypatch):
+    """Boş URL polling demektir; dolu URL'den run_webhook argümanları üretilir"""
+    _webhook_env(monkeypatch, "  ")
+    assert get_webhook_settings() is None
+
+    _webhook_env(monkeypatch, "https://bot.example.com/")
+    assert get_webhook_settings() == {
+        'listen': "127.0.0.1",
+        'port': 9443,
+        'url_path': "tg",
+        'webhook_url': "https://bot.example.com/tg",
+        'secret_token': "gizli_anahtar",
+    }
+    print("✅ Webhook ayarları testi başarılı")
+
+class FakeApplication:
+    """run_polling/run_webhook çağrılarını kaydeden Application"""
+    def __init__(self):
+        self.calls = []
+
+    def run_polling(self, **kwargs):
+        self.calls.append(('polling', kwargs))
+
+    def run_webhook(self, **kwargs):
+        self.calls.append(('webhook', kwargs))
+
+def test_run_selects_mode(monkeypatch):
+    """TelegramBot.run URL'e göre polling veya webhook başlatır"""
+    telegram_bot = pytest.importorskip("telegram_bot")
+    monkeypatch.setattr(telegram_bot.user_state_store, "stop", lambda: None)
+    bot = SimpleNamespace(application=FakeApplication())
+    bot.run_webhook = lambda webhook: telegram_bot.TelegramBot.run_webhook(bot, webhook)
+
+    _webhook_env(monkeypatch, "")
+    telegram_bot.TelegramBot.run(bot)
+    _webhook_env(monkeypatch, "https://bot.example.com")
+    telegram_bot.TelegramBot.run(bot)
+
+    assert [mode for mode, _ in bot.application.calls] == ['polling', 'webhook']
+    webhook = bot.application.calls[1][1]
+    assert webhook['webhook_url'] == "https://bot.example.com/tg" and webhook['port'] == 9443
+    assert webhook['secret_token'] == "gizli_anahtar"
+    print("✅ Çalışma modu seçimi testi başarılı")
+
+if __name__ == "__main__":
+    print("🧪 Webhook Ayarları Testi")
+    print("=" * 50)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_webhook_settings(monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_run_selects_mode(monkeypatch)
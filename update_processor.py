@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Güncelleme işleyici
+Farklı sohbetlerden gelen güncellemeleri paralel, aynı sohbettekileri sıralı işler
+"""
+
+import logging
+from typing import Any, Awaitable, Optional
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+from chat_locks import ChatLocks
+
+logger = logging.getLogger(__name__)
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Sohbet bazlı sıralamayı koruyan eşzamanlı güncelleme işleyicisi
+
+    Aynı sohbete ait güncellemeler geliş sırasıyla tek tek işlenir; farklı
+    sohbetler ise en fazla ``max_concurrent_updates`` kadar paralel çalışır.
+    """
+
+    def __init__(self, max_concurrent_updates: int = 16):
+        super().__init__(max_concurrent_updates)
+        self._chat_locks = ChatLocks()
+
+    @staticmethod
+    def _get_chat_id(update: object) -> Optional[int]:
+        """Güncellemenin ait olduğu sohbet ID'sini döndürür"""
+        if isinstance(update, Update) and update.effective_chat:
+            return update.effective_chat.id
+        return None
+
+    async def process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """Sohbet kilidini, eşzamanlılık limitinden ÖNCE alır.
+
+        Böylece aynı sohbette sıra bekleyen güncellemeler diğer sohbetlerin
+        eşzamanlılık slotlarını işgal etmez.
+        """
+        chat_id = self._get_chat_id(update)
+        if chat_id is None:
+            await super().process_update(update, coroutine)
+            return
+
+        async with self._chat_locks.hold(chat_id):
+            await super().process_update(update, coroutine)
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """Güncellemeyi işler"""
+        await coroutine
+
+    async def initialize(self) -> None:
+        """Başlatma (ek kaynak gerekmiyor)"""
+
+    async def shutdown(self) -> None:
+        """Kapatma - bekleyen kilitleri temizler"""
+        self._chat_locks.clear()
+
+    def get_active_chat_count(self) -> int:
+        """Şu an işlenen veya sıra bekleyen sohbet sayısını döndürür"""
+        return len(self._chat_locks)